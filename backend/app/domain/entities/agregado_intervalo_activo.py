@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Optional
+from datetime import date
+
+@dataclass
+class AgregadoIntervaloActivoEntity:
+    idAgregadoActivo: Optional[int] = None
+    granularidad: Optional[str] = None
+    inicioPeriodo: Optional[date] = None
+    numIntervalos: int = 0
+    energiaGenerada_kWh: Optional[float] = None
+    intervalosConProduccion: Optional[int] = None
+    energiaCargada_kWh: Optional[float] = None
+    energiaDescargada_kWh: Optional[float] = None
+    SoCMedio_kWh: Optional[float] = None
+    SoCMin_kWh: Optional[float] = None
+    SoCMax_kWh: Optional[float] = None
+    idResultadoActivoGen: Optional[int] = None
+    idResultadoActivoAlm: Optional[int] = None
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Optional
+from datetime import date
+
+@dataclass
+class AgregadoIntervaloParticipanteEntity:
+    idAgregadoParticipante: Optional[int] = None
+    granularidad: Optional[str] = None
+    inicioPeriodo: Optional[date] = None
+    numIntervalos: int = 0
+    consumoTotal_kWh: float = 0.0
+    energiaAutoconsumidaDirecta_kWh: float = 0.0
+    energiaRecibidaRepartoConsumida_kWh: float = 0.0
+    energiaAlmacenamiento_kWh: float = 0.0
+    energiaAlmacenamientoDescargada_kWh: float = 0.0
+    energiaAlmacenamientoCargada_kWh: float = 0.0
+    energiaImportadaRed_kWh: float = 0.0
+    energiaExportadaRed_kWh: float = 0.0
+    costeImportacion_eur: float = 0.0
+    ingresoExportacion_eur: float = 0.0
+    costeBaseEstimado_eur: float = 0.0
+    idResultadoParticipante: Optional[int] = None
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict
+from .estado_simulacion import EstadoSimulacion
+
+@dataclass
+class BarridoSimulacionEntity:
+    idBarrido: int = None
+    idSimulacion: int = None
+    nombre: str = None
+    # Rejilla de parámetros (estrategias, factores FV, almacenamiento, coeficientes)
+    parametros: Dict[str, Any] = None
+    estado: EstadoSimulacion = EstadoSimulacion.PENDIENTE
+    numVariantes: int = 0
+    mensajeError: str = None
+    fechaCreacion: datetime = None
+    fechaFin: datetime = None
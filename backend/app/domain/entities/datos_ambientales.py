@@ -10,4 +10,8 @@ class DatosAmbientalesEntity:
     radiacionGlobalHoriz_Wh_m2: float = None
     temperaturaAmbiente_C: float = None
     velocidadViento_m_s: float = None
-    idSimulacion: int = None
\ No newline at end of file
+    idSimulacion: int = None
+    
+    # Componentes horizontales de PVGIS (solo en memoria, para el modelo FV local)
+    radiacionDirectaHoriz_Wh_m2: Optional[float] = None
+    radiacionDifusaHoriz_Wh_m2: Optional[float] = None
\ No newline at end of file
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict
+from app.domain.entities.simulacion_job import EstadoJob
+
+@dataclass
+class ImportacionComunidadJobEntity:
+    idImportacion: int = None
+    idUsuario: int = None
+    nombreArchivo: str = None
+    estado: EstadoJob = EstadoJob.PENDIENTE
+    # Comunidad creada por la importación (informada al completarse)
+    idComunidadEnergetica: int = None
+    mensajeError: str = None
+    fechaCreacion: datetime = None
+    fechaInicio: datetime = None
+    fechaFin: datetime = None
+    fechaActualizacion: datetime = None
+    progreso: Dict[str, Any] = None
+    # Estadísticas de la importación (entidades y registros creados)
+    resultado: Dict[str, Any] = None
@@ -0,0 +1,10 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+@dataclass
+class PaginaIntervalosEntity:
+    # Filas proyectadas a los campos pedidos, ordenadas por (timestamp, id)
+    datos: List[Dict[str, Any]] = field(default_factory=list)
+    campos: List[str] = field(default_factory=list)
+    # Cursor opaco para pedir la página siguiente (None en la última)
+    siguienteCursor: Optional[str] = None
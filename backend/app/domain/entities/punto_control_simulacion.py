@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict
+
+@dataclass
+class PuntoControlSimulacionEntity:
+    idSimulacion: int = None
+    # Resultado provisional al que pertenecen los intervalos ya persistidos
+    idResultado: int = None
+    huellaEntradas: str = None
+    ultimoTimestamp: datetime = None
+    intervalosCompletados: int = 0
+    # Agregador de resultados y SoC de cada batería al final del último bloque persistido,
+    # guardados como datos planos versionados (ver puntos_control.restaurar_punto_control)
+    estadoMotor: Dict[str, Any] = None
+    # Datos ambientales y generación FV ya obtenidos (se guardan una sola vez)
+    entradas: Dict[str, Any] = None
+    fechaActualizacion: datetime = None
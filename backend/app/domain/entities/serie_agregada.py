@@ -0,0 +1,9 @@
+from dataclasses import dataclass, field
+from typing import Any, List
+
+@dataclass
+class SerieAgregadaEntity:
+    # Periodo pedido (dia, semana, mes o anio) y tabla de agregados que lo ha resuelto (DIA o MES)
+    granularidad: str
+    fuente: str
+    periodos: List[Any] = field(default_factory=list)
@@ -0,0 +1,12 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List
+
+@dataclass
+class SerieIntervalosEntity:
+    campo: str
+    # Método de reducción aplicado ('lttb', 'minmax' o 'ninguno' si la serie ya cabía)
+    metodo: str
+    puntosOriginales: int = 0
+    timestamps: List[datetime] = field(default_factory=list)
+    valores: List[float] = field(default_factory=list)
@@ -13,4 +13,5 @@ class SimulacionEntity:
     estado: EstadoSimulacion = EstadoSimulacion.PENDIENTE
     tipoEstrategiaExcedentes: TipoEstrategiaExcedentes = None
     idUsuario_creador: int = None
-    idComunidadEnergetica: int = None
\ No newline at end of file
+    idComunidadEnergetica: int = None
+    huellaEntradas: str = None
\ No newline at end of file
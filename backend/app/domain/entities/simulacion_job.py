@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict
+from enum import Enum
+
+class EstadoJob(str, Enum):
+    PENDIENTE = "PENDIENTE"
+    EJECUTANDO = "EJECUTANDO"
+    COMPLETADO = "COMPLETADO"
+    FALLIDO = "FALLIDO"
+    CANCELADO = "CANCELADO"
+
+@dataclass
+class SimulacionJobEntity:
+    idJob: int = None
+    idSimulacion: int = None
+    # Informado cuando el trabajo es un barrido de escenarios sobre la simulación
+    idBarrido: int = None
+    estado: EstadoJob = EstadoJob.PENDIENTE
+    prioridad: int = 0
+    cancelacionSolicitada: bool = False
+    intentos: int = 0
+    worker: str = None
+    mensajeError: str = None
+    fechaCreacion: datetime = None
+    fechaInicio: datetime = None
+    fechaFin: datetime = None
+    ultimoLatido: datetime = None
+    progreso: Dict[str, Any] = None
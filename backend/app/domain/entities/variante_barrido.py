@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+@dataclass
+class VarianteBarridoEntity:
+    idVariante: Optional[int] = None
+    idBarrido: Optional[int] = None
+    indice: Optional[int] = None
+    parametros: Optional[Dict[str, Any]] = None
+    costeTotalEnergia_eur: Optional[float] = None
+    ahorroTotal_eur: Optional[float] = None
+    ingresoTotalExportacion_eur: Optional[float] = None
+    paybackPeriod_anios: Optional[float] = None
+    roi_pct: Optional[float] = None
+    tasaAutoconsumoSCR_pct: Optional[float] = None
+    tasaAutosuficienciaSSR_pct: Optional[float] = None
+    energiaTotalImportada_kWh: Optional[float] = None
+    energiaTotalExportada_kWh: Optional[float] = None
+    reduccionCO2_kg: Optional[float] = None
+    mensajeError: Optional[str] = None
@@ -0,0 +1,11 @@
+from typing import List, Optional
+from datetime import date, datetime
+from app.domain.entities.agregado_intervalo_activo import AgregadoIntervaloActivoEntity
+
+class AgregadoIntervaloActivoRepository:
+    def recalcular_por_resultado_simulacion(self, resultado_simulacion_id: int, desde: Optional[datetime] = None) -> int:
+        raise NotImplementedError
+    
+    def get_by_resultado_activo(self, resultado_activo_id: int, is_generacion: bool, granularidad: str,
+                                desde: Optional[date], hasta: Optional[date]) -> List[AgregadoIntervaloActivoEntity]:
+        raise NotImplementedError
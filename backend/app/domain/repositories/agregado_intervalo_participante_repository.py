@@ -0,0 +1,11 @@
+from typing import List, Optional
+from datetime import date, datetime
+from app.domain.entities.agregado_intervalo_participante import AgregadoIntervaloParticipanteEntity
+
+class AgregadoIntervaloParticipanteRepository:
+    def recalcular_por_resultado_simulacion(self, resultado_simulacion_id: int, desde: Optional[datetime] = None) -> int:
+        raise NotImplementedError
+    
+    def get_by_resultado_participante(self, resultado_participante_id: int, granularidad: str,
+                                      desde: Optional[date], hasta: Optional[date]) -> List[AgregadoIntervaloParticipanteEntity]:
+        raise NotImplementedError
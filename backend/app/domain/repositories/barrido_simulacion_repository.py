@@ -0,0 +1,18 @@
+from typing import List, Optional
+from app.domain.entities.barrido_simulacion import BarridoSimulacionEntity
+
+class BarridoSimulacionRepository:
+    def get_by_id(self, barrido_id: int) -> Optional[BarridoSimulacionEntity]:
+        raise NotImplementedError
+    
+    def list_by_simulacion(self, simulacion_id: int) -> List[BarridoSimulacionEntity]:
+        raise NotImplementedError
+    
+    def create(self, barrido: BarridoSimulacionEntity) -> BarridoSimulacionEntity:
+        raise NotImplementedError
+    
+    def update_estado(self, barrido_id: int, estado: str, mensaje_error: Optional[str] = None) -> BarridoSimulacionEntity:
+        raise NotImplementedError
+    
+    def delete(self, barrido_id: int) -> None:
+        raise NotImplementedError
@@ -21,6 +21,12 @@ class DatosAmbientalesRepository:
     def create_bulk(self, datos_list: List[DatosAmbientalesEntity]) -> List[DatosAmbientalesEntity]:
         raise NotImplementedError
     
+    def copiar_de_simulacion(self, idSimulacionOrigen: int, idSimulacionDestino: int) -> int:
+        raise NotImplementedError
+    
+    def delete_by_simulacion(self, idSimulacion: int) -> int:
+        raise NotImplementedError
+    
     def get_datos_ambientales(self, lat: float, lon: float, start_date: datetime, end_date: datetime) -> List[DatosAmbientalesEntity]:
         raise NotImplementedError
     
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from datetime import datetime
 from app.domain.entities.datos_intervalo_activo import DatosIntervaloActivoEntity
 
@@ -15,6 +15,16 @@ class DatosIntervaloActivoRepository:
     def get_by_timestamp_range(self, resultado_activo_id: int, is_generacion: bool, start_time: datetime, end_time: datetime) -> List[DatosIntervaloActivoEntity]:
         raise NotImplementedError
     
+    def get_pagina(self, resultado_activo_id: int, is_generacion: bool, campos: List[str], start_time: Optional[datetime], end_time: Optional[datetime],
+                   despues_de: Optional[Tuple[datetime, int]], limite: int) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+    
+    def get_series(self, resultado_activo_id: int, is_generacion: bool, campos: List[str], start_time: Optional[datetime], end_time: Optional[datetime]) -> List[Tuple]:
+        raise NotImplementedError
+    
+    def iterar_exportacion(self, resultado_simulacion_id: int, is_generacion: bool, campos: List[str], tamano_bloque: int) -> Iterator[List[Tuple]]:
+        raise NotImplementedError
+    
     def list(self, skip: int = 0, limit: int = 100) -> List[DatosIntervaloActivoEntity]:
         raise NotImplementedError
     
@@ -27,6 +37,12 @@ class DatosIntervaloActivoRepository:
     def create_bulk(self, datos_intervalos: List[DatosIntervaloActivoEntity]) -> List[DatosIntervaloActivoEntity]:
         return self.create_many(datos_intervalos)
     
+    def insertar_bulk(self, filas: List[Dict[str, Any]], tamano_lote: int = 5000) -> int:
+        raise NotImplementedError
+    
+    def delete_posteriores(self, resultado_activo_gen_ids: List[int], resultado_activo_alm_ids: List[int], timestamp: datetime) -> int:
+        raise NotImplementedError
+    
     def update(self, datos_intervalo_id: int, datos_intervalo: DatosIntervaloActivoEntity) -> DatosIntervaloActivoEntity:
         raise NotImplementedError
     
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from datetime import datetime
 from app.domain.entities.datos_intervalo_participante import DatosIntervaloParticipanteEntity
 
@@ -12,6 +12,16 @@ class DatosIntervaloParticipanteRepository:
     def get_by_timestamp_range(self, resultado_participante_id: int, start_time: datetime, end_time: datetime) -> List[DatosIntervaloParticipanteEntity]:
         raise NotImplementedError
     
+    def get_pagina(self, resultado_participante_id: int, campos: List[str], start_time: Optional[datetime], end_time: Optional[datetime],
+                   despues_de: Optional[Tuple[datetime, int]], limite: int) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+    
+    def get_series(self, resultado_participante_id: int, campos: List[str], start_time: Optional[datetime], end_time: Optional[datetime]) -> List[Tuple]:
+        raise NotImplementedError
+    
+    def iterar_exportacion(self, resultado_simulacion_id: int, campos: List[str], tamano_bloque: int) -> Iterator[List[Tuple]]:
+        raise NotImplementedError
+    
     def list(self, skip: int = 0, limit: int = 100) -> List[DatosIntervaloParticipanteEntity]:
         raise NotImplementedError
     
@@ -21,6 +31,12 @@ class DatosIntervaloParticipanteRepository:
     def create_bulk(self, datos_intervalos: List[DatosIntervaloParticipanteEntity]) -> List[DatosIntervaloParticipanteEntity]:
         return self.create_many(datos_intervalos)
     
+    def insertar_bulk(self, filas: List[Dict[str, Any]], tamano_lote: int = 5000) -> int:
+        raise NotImplementedError
+    
+    def delete_posteriores(self, resultado_participante_ids: List[int], timestamp: datetime) -> int:
+        raise NotImplementedError
+    
     def update(self, datos_intervalo_id: int, datos_intervalo: DatosIntervaloParticipanteEntity) -> DatosIntervaloParticipanteEntity:
         raise NotImplementedError
     
@@ -0,0 +1,22 @@
+from typing import Any, Dict, Optional
+from app.domain.entities.importacion_comunidad_job import ImportacionComunidadJobEntity
+
+class ImportacionComunidadJobRepository:
+    def get_by_id(self, importacion_id: int) -> Optional[ImportacionComunidadJobEntity]:
+        raise NotImplementedError
+    
+    def crear(self, id_usuario: int, nombre_archivo: str) -> ImportacionComunidadJobEntity:
+        raise NotImplementedError
+    
+    def iniciar(self, importacion_id: int) -> ImportacionComunidadJobEntity:
+        raise NotImplementedError
+    
+    def registrar_progreso(self, importacion_id: int, progreso: Dict[str, Any]) -> None:
+        raise NotImplementedError
+    
+    def finalizar(self, importacion_id: int, estado: str, resultado: Optional[Dict[str, Any]] = None,
+                  id_comunidad: Optional[int] = None, mensaje_error: Optional[str] = None) -> ImportacionComunidadJobEntity:
+        raise NotImplementedError
+    
+    def marcar_interrumpidas(self, timeout_segundos: float) -> int:
+        raise NotImplementedError
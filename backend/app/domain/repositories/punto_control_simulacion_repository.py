@@ -0,0 +1,15 @@
+from typing import Optional
+from app.domain.entities.punto_control_simulacion import PuntoControlSimulacionEntity
+
+class PuntoControlSimulacionRepository:
+    def get_by_simulacion(self, simulacion_id: int, incluir_entradas: bool = True) -> Optional[PuntoControlSimulacionEntity]:
+        raise NotImplementedError
+    
+    def guardar(self, punto_control: PuntoControlSimulacionEntity) -> None:
+        raise NotImplementedError
+    
+    def descartar_entradas(self, simulacion_id: int) -> None:
+        raise NotImplementedError
+    
+    def delete_by_simulacion(self, simulacion_id: int) -> None:
+        raise NotImplementedError
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
 from app.domain.entities.pvpc_precios import PvpcPreciosEntity
 
@@ -11,4 +11,8 @@ class PvpcPreciosRepository(ABC):
     
     @abstractmethod 
     def get_precios_range(self, fecha_inicio: datetime, fecha_fin: datetime) -> List[PvpcPreciosEntity]:
+        pass
+    
+    @abstractmethod
+    def resumen_range(self, fecha_inicio: datetime, fecha_fin: datetime) -> Tuple:
         pass 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 from app.domain.entities.registro_consumo import RegistroConsumoEntity
 
@@ -18,12 +18,21 @@ class RegistroConsumoRepository:
     def get_range_for_participantes(self, id_participantes: List[int], fecha_inicio: datetime, fecha_fin: datetime) -> List[RegistroConsumoEntity]:
         raise NotImplementedError
     
+    def resumen_range_for_participantes(self, id_participantes: List[int], fecha_inicio: datetime, fecha_fin: datetime) -> List[Tuple]:
+        raise NotImplementedError
+    
+    def iterar_por_participante(self, idParticipante: int, fecha_inicio: Optional[datetime], fecha_fin: Optional[datetime], tamano_bloque: int) -> Iterator[List[Tuple]]:
+        raise NotImplementedError
+    
     def list(self) -> List[RegistroConsumoEntity]:
         raise NotImplementedError
 
     def create(self, registro: RegistroConsumoEntity) -> RegistroConsumoEntity:
         raise NotImplementedError
 
+    def upsert_bulk(self, filas: List[Dict[str, Any]], tamano_lote: int = 5000) -> Tuple[int, int]:
+        raise NotImplementedError
+
     def update(self, registro: RegistroConsumoEntity) -> RegistroConsumoEntity:
         raise NotImplementedError
 
@@ -17,5 +17,8 @@ class ResultadoSimulacionRepository:
     def update(self, resultado_id: int, resultado: ResultadoSimulacionEntity) -> ResultadoSimulacionEntity:
         raise NotImplementedError
     
+    def clonar(self, resultado_id: int, simulacion_id: int) -> Optional[ResultadoSimulacionEntity]:
+        raise NotImplementedError
+    
     def delete(self, resultado_id: int) -> None:
         raise NotImplementedError
\ No newline at end of file
@@ -0,0 +1,33 @@
+from typing import Any, Dict, List, Optional
+from app.domain.entities.simulacion_job import SimulacionJobEntity
+
+class SimulacionJobRepository:
+    def get_by_id(self, job_id: int) -> Optional[SimulacionJobEntity]:
+        raise NotImplementedError
+    
+    def get_ultimo_by_simulacion(self, simulacion_id: int) -> Optional[SimulacionJobEntity]:
+        raise NotImplementedError
+    
+    def get_ultimo_by_barrido(self, barrido_id: int) -> Optional[SimulacionJobEntity]:
+        raise NotImplementedError
+    
+    def list_activos(self) -> List[SimulacionJobEntity]:
+        raise NotImplementedError
+    
+    def encolar(self, simulacion_id: int, prioridad: int = 0, barrido_id: Optional[int] = None) -> SimulacionJobEntity:
+        raise NotImplementedError
+    
+    def reclamar_siguiente(self, worker: str, timeout_latido_segundos: float, max_intentos: int) -> Optional[SimulacionJobEntity]:
+        raise NotImplementedError
+    
+    def registrar_latido(self, job_id: int, progreso: Optional[Dict[str, Any]] = None) -> bool:
+        raise NotImplementedError
+    
+    def solicitar_cancelacion(self, job_id: int) -> SimulacionJobEntity:
+        raise NotImplementedError
+    
+    def finalizar(self, job_id: int, estado: str, mensaje_error: Optional[str] = None) -> SimulacionJobEntity:
+        raise NotImplementedError
+    
+    def marcar_abandonados(self, timeout_latido_segundos: float, max_intentos: int) -> List[SimulacionJobEntity]:
+        raise NotImplementedError
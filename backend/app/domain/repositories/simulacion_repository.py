@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List, Optional
 from app.domain.entities.simulacion import SimulacionEntity
 
@@ -23,5 +24,15 @@ class SimulacionRepository:
     def update_estado(self, simulacion_id: int, estado: str) -> SimulacionEntity:
         raise NotImplementedError
     
+    def update_estado_si(self, simulacion_id: int, estados_origen: List[str], estado: str,
+                         fecha_fin: Optional[datetime] = None) -> bool:
+        raise NotImplementedError
+    
+    def update_huella(self, simulacion_id: int, huella: Optional[str]) -> None:
+        raise NotImplementedError
+    
+    def get_completada_by_huella(self, huella: str, excluir_id: Optional[int] = None) -> Optional[SimulacionEntity]:
+        raise NotImplementedError
+    
     def delete(self, simulacion_id: int) -> None:
         raise NotImplementedError
\ No newline at end of file
@@ -0,0 +1,12 @@
+from typing import List, Optional
+from app.domain.entities.variante_barrido import VarianteBarridoEntity
+
+class VarianteBarridoRepository:
+    def get_by_barrido(self, barrido_id: int, ordenar_por: Optional[str] = None, descendente: bool = False) -> List[VarianteBarridoEntity]:
+        raise NotImplementedError
+    
+    def create_bulk(self, variantes: List[VarianteBarridoEntity]) -> int:
+        raise NotImplementedError
+    
+    def delete_by_barrido(self, barrido_id: int) -> int:
+        raise NotImplementedError
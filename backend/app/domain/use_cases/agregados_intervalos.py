@@ -0,0 +1,85 @@
+import calendar
+from dataclasses import fields, replace
+from datetime import date, timedelta
+from typing import Callable, List, Optional
+
+from fastapi import HTTPException
+
+from app.domain.entities.serie_agregada import SerieAgregadaEntity
+
+
+# Periodos que se pueden pedir y tabla de agregados más gruesa que puede resolver cada uno
+GRANULARIDADES = ('dia', 'semana', 'mes', 'anio')
+FUENTE_DIA = 'DIA'
+FUENTE_MES = 'MES'
+
+
+def elegir_fuente(granularidad: str, desde: Optional[date], hasta: Optional[date]) -> str:
+
+    # Los agregados mensuales solo sirven para meses y años si el rango empieza y acaba en
+    # límites de mes; si no (o para días y semanas) se parte de los diarios
+    if granularidad not in GRANULARIDADES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Granularidad no válida: {granularidad} (valores admitidos: {', '.join(GRANULARIDADES)})"
+        )
+    if desde is not None and hasta is not None and desde > hasta:
+        raise HTTPException(status_code=400, detail="La fecha de inicio debe ser anterior a la de fin")
+    if granularidad in ('dia', 'semana'):
+        return FUENTE_DIA
+    empieza_en_mes = desde is None or desde.day == 1
+    acaba_en_mes = hasta is None or hasta.day == calendar.monthrange(hasta.year, hasta.month)[1]
+    return FUENTE_MES if empieza_en_mes and acaba_en_mes else FUENTE_DIA
+
+
+def inicio_periodo(dia: date, granularidad: str) -> date:
+    if granularidad == 'semana':
+        return dia - timedelta(days=dia.weekday())
+    if granularidad == 'mes':
+        return dia.replace(day=1)
+    if granularidad == 'anio':
+        return dia.replace(month=1, day=1)
+    return dia
+
+
+def agregar_periodos(
+    obtener_agregados: Callable[[str], List],
+    granularidad: str,
+    desde: Optional[date],
+    hasta: Optional[date],
+    combinar: Callable[[object, object], object]
+) -> SerieAgregadaEntity:
+
+    # obtener_agregados(fuente) -> filas DIA o MES ordenadas; combinar(acumulado, fila) suma
+    # dos periodos de la misma serie. Si la fuente ya es el periodo pedido no se reagrupa
+    fuente = elegir_fuente(granularidad, desde, hasta)
+    filas = obtener_agregados(fuente)
+    if (granularidad, fuente) in (('dia', FUENTE_DIA), ('mes', FUENTE_MES)):
+        return SerieAgregadaEntity(granularidad=granularidad, fuente=fuente, periodos=filas)
+
+    periodos = {}
+    for fila in filas:
+        inicio = inicio_periodo(fila.inicioPeriodo, granularidad)
+        acumulado = periodos.get(inicio)
+        if acumulado is None:
+            periodos[inicio] = replace(fila, **{_campo_id(fila): None}, granularidad=granularidad, inicioPeriodo=inicio)
+        else:
+            periodos[inicio] = combinar(acumulado, fila)
+    return SerieAgregadaEntity(granularidad=granularidad, fuente=fuente, periodos=list(periodos.values()))
+
+
+def sumar_campos(acumulado, fila, campos) -> object:
+    return replace(acumulado, **{
+        campo: _sumar(getattr(acumulado, campo), getattr(fila, campo)) for campo in campos
+    })
+
+
+def _sumar(a, b):
+    if a is None or b is None:
+        return b if a is None else a
+    return a + b
+
+
+def _campo_id(fila) -> str:
+    # Clave primaria de la fila de agregados (el primer campo de la entidad)
+    return fields(fila)[0].name
@@ -0,0 +1,20 @@
+from fastapi import HTTPException
+from app.domain.repositories.barrido_simulacion_repository import BarridoSimulacionRepository
+from app.domain.repositories.simulacion_job_repository import SimulacionJobRepository
+from app.domain.entities.simulacion_job import SimulacionJobEntity, EstadoJob
+from app.domain.entities.estado_simulacion import EstadoSimulacion
+
+def cancelar_barrido_simulacion_use_case(barrido_id: int, barrido_repo: BarridoSimulacionRepository, job_repo: SimulacionJobRepository) -> SimulacionJobEntity:
+    barrido = barrido_repo.get_by_id(barrido_id)
+    if not barrido:
+        raise HTTPException(status_code=404, detail="Barrido no encontrado")
+    
+    job = job_repo.get_ultimo_by_barrido(barrido_id)
+    if not job or job.estado not in [EstadoJob.PENDIENTE, EstadoJob.EJECUTANDO]:
+        raise HTTPException(status_code=400, detail="El barrido no tiene ninguna ejecución en curso")
+    
+    # Un barrido cancelado no se relanza (se crea otro), así que queda como fallido
+    job = job_repo.solicitar_cancelacion(job.idJob)
+    if job.estado == EstadoJob.CANCELADO:
+        barrido_repo.update_estado(barrido_id, EstadoSimulacion.FALLIDA.value, "Barrido cancelado")
+    return job
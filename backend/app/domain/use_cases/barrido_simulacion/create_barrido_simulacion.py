@@ -0,0 +1,43 @@
+from fastapi import HTTPException
+from app.domain.repositories.simulacion_repository import SimulacionRepository
+from app.domain.repositories.barrido_simulacion_repository import BarridoSimulacionRepository
+from app.domain.repositories.simulacion_job_repository import SimulacionJobRepository
+from app.domain.entities.barrido_simulacion import BarridoSimulacionEntity
+from app.domain.entities.estado_simulacion import EstadoSimulacion
+from app.domain.use_cases.simulacion.motor_simulacion.barrido_escenarios import generar_variantes, errores_variantes
+from app.domain.use_cases.simulacion.motor_simulacion.plan_coeficientes import PlanCoeficientesReparto
+
+def crear_barrido_simulacion_use_case(
+    simulacion_id: int,
+    barrido: BarridoSimulacionEntity,
+    prioridad: int,
+    max_variantes: int,
+    plan_coeficientes: PlanCoeficientesReparto,
+    simulacion_repo: SimulacionRepository,
+    barrido_repo: BarridoSimulacionRepository,
+    job_repo: SimulacionJobRepository
+) -> BarridoSimulacionEntity:
+    simulacion = simulacion_repo.get_by_id(simulacion_id)
+    if not simulacion:
+        raise HTTPException(status_code=404, detail="Simulación no encontrada")
+    
+    variantes = generar_variantes(barrido.parametros)
+    if len(variantes) > max_variantes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El barrido genera {len(variantes)} variantes (máximo {max_variantes})"
+        )
+    
+    # Las variantes sin coeficientes propios usan los de la simulación base
+    errores = errores_variantes(variantes, plan_coeficientes.ids_participantes)
+    if any(v.coeficientes is None for v in variantes):
+        errores = plan_coeficientes.errores() + errores
+    if errores:
+        raise HTTPException(status_code=400, detail="; ".join(errores))
+    
+    barrido.idSimulacion = simulacion_id
+    barrido.estado = EstadoSimulacion.PENDIENTE
+    barrido.numVariantes = len(variantes)
+    barrido_creado = barrido_repo.create(barrido)
+    job_repo.encolar(simulacion_id, prioridad, barrido_creado.idBarrido)
+    return barrido_creado
@@ -0,0 +1,9 @@
+from fastapi import HTTPException
+from app.domain.repositories.barrido_simulacion_repository import BarridoSimulacionRepository
+from app.domain.entities.barrido_simulacion import BarridoSimulacionEntity
+
+def mostrar_barrido_simulacion_use_case(barrido_id: int, repo: BarridoSimulacionRepository) -> BarridoSimulacionEntity:
+    barrido = repo.get_by_id(barrido_id)
+    if not barrido:
+        raise HTTPException(status_code=404, detail="Barrido no encontrado")
+    return barrido
@@ -1,18 +1,20 @@
-import os
+import io
 import json
 import csv
 import zipfile
-import tempfile
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from sqlalchemy.orm import Session
 
+# Registros de consumo que se leen del cursor de servidor y se comprimen juntos
+TAMANO_BLOQUE_EXPORTACION = 20000
+
 def exportar_comunidad_completa_use_case(
     comunidad_id: int, 
     db: Session,
     fecha_inicio: Optional[datetime] = None,
     fecha_fin: Optional[datetime] = None
-) -> tuple[str, Dict[str, Any]]:
+) -> tuple[str, Dict[str, Any], Iterator[bytes]]:
     
     try:
         print(f"Iniciando exportación para comunidad {comunidad_id}")
@@ -24,6 +26,7 @@ def exportar_comunidad_completa_use_case(
         from app.infrastructure.persistance.repository.sqlalchemy_coeficiente_reparto_repository import SqlAlchemyCoeficienteRepartoRepository
         from app.infrastructure.persistance.repository.sqlalchemy_registro_consumo_repository import SqlAlchemyRegistroConsumoRepository
         from app.infrastructure.persistance.repository.sqlalchemy_contrato_autoconsumo_repository import SqlAlchemyContratoAutoconsumoRepository
+        from app.infrastructure.persistance.database import SessionLocal
         
         # Inicializar repositorios
         comunidad_repo = SqlAlchemyComunidadEnergeticaRepository(db)
@@ -31,7 +34,6 @@ def exportar_comunidad_completa_use_case(
         activo_gen_repo = SqlAlchemyActivoGeneracionRepository(db)
         activo_alm_repo = SqlAlchemyActivoAlmacenamientoRepository(db)
         coeficiente_repo = SqlAlchemyCoeficienteRepartoRepository(db)
-        registro_consumo_repo = SqlAlchemyRegistroConsumoRepository(db)
         contrato_repo = SqlAlchemyContratoAutoconsumoRepository(db)
         
         print("Repositorios inicializados")
@@ -42,10 +44,6 @@ def exportar_comunidad_completa_use_case(
             raise ValueError(f"Comunidad con ID {comunidad_id} no encontrada")
 
         print(f"Comunidad encontrada: {comunidad.nombre}")
-
-        # Crear directorio temporal
-        temp_dir = tempfile.mkdtemp()
-        print(f"Directorio temporal creado: {temp_dir}")
         
         # Recopilar todos los datos
         datos_comunidad = _recopilar_datos_comunidad(
@@ -60,46 +58,31 @@ def exportar_comunidad_completa_use_case(
         
         print("Datos de comunidad recopilados")
         
-        # Crear estructura de directorios
-        metadatos_dir = os.path.join(temp_dir, "metadatos")
-        consumo_dir = os.path.join(temp_dir, "datos_consumo")
-        os.makedirs(metadatos_dir, exist_ok=True)
-        os.makedirs(consumo_dir, exist_ok=True)
-        
-        # Generar archivos JSON
-        _generar_archivos_json(metadatos_dir, datos_comunidad)
-        print("Archivos JSON generados")
-        
-        # Generar archivos CSV de consumo
-        _generar_archivos_csv_consumo(
-            consumo_dir, 
-            datos_comunidad['participantes'], 
-            registro_consumo_repo,
-            fecha_inicio, 
-            fecha_fin
-        )
-        print("Archivos CSV generados")
-        
-        # Crear archivo ZIP
         nombre_comunidad = comunidad.nombre.replace(" ", "_").replace("/", "_")
         fecha_str = datetime.now().strftime("%Y%m%d_%H%M%S")
         nombre_zip = f"comunidad_{nombre_comunidad}_{fecha_str}.zip"
-        ruta_zip = os.path.join(temp_dir, nombre_zip)
-        
-        _crear_archivo_zip(temp_dir, ruta_zip, ['metadatos', 'datos_consumo'])
-        print(f"Archivo ZIP creado: {ruta_zip}")
         
         # Crear metadatos de exportación
         metadatos = _crear_metadatos_exportacion(datos_comunidad, fecha_inicio, fecha_fin)
         
-        return ruta_zip, metadatos
+        # El ZIP se genera mientras se envía: los consumos se leen con una sesión propia,
+        # porque la de la petición se cierra antes de terminar la descarga
+        def contenido_zip():
+            db_exportacion = SessionLocal()
+            try:
+                yield from _generar_zip(
+                    datos_comunidad,
+                    SqlAlchemyRegistroConsumoRepository(db_exportacion),
+                    fecha_inicio,
+                    fecha_fin
+                )
+            finally:
+                db_exportacion.close()
+        
+        return nombre_zip, metadatos, contenido_zip()
         
     except Exception as e:
         print(f"Error en exportación: {str(e)}")
-        # Limpiar directorio temporal en caso de error
-        import shutil
-        if 'temp_dir' in locals():
-            shutil.rmtree(temp_dir, ignore_errors=True)
         raise e
 
 def _recopilar_datos_comunidad(
@@ -178,7 +161,7 @@ def _recopilar_datos_comunidad(
         print(f"Error recopilando datos de comunidad: {e}")
         raise e
 
-def _generar_archivos_json(metadatos_dir: str, datos: Dict[str, Any]):
+def _contenido_archivos_json(datos: Dict[str, Any]) -> Dict[str, Any]:
     
     try:
         # Comunidad
@@ -191,8 +174,6 @@ def _generar_archivos_json(metadatos_dir: str, datos: Dict[str, Any]):
             'idUsuario': datos['comunidad'].idUsuario
         }
         
-        with open(os.path.join(metadatos_dir, 'comunidad.json'), 'w', encoding='utf-8') as f:
-            json.dump(comunidad_dict, f, indent=2, ensure_ascii=False)
         
         # Participantes
         participantes_list = []
@@ -203,8 +184,6 @@ def _generar_archivos_json(metadatos_dir: str, datos: Dict[str, Any]):
                 'idComunidadEnergetica': p.idComunidadEnergetica
             })
         
-        with open(os.path.join(metadatos_dir, 'participantes.json'), 'w', encoding='utf-8') as f:
-            json.dump(participantes_list, f, indent=2, ensure_ascii=False)
         
         # Activos de generación
         activos_gen_list = []
@@ -228,8 +207,6 @@ def _generar_archivos_json(metadatos_dir: str, datos: Dict[str, Any]):
                 'idComunidadEnergetica': a.idComunidadEnergetica
             })
         
-        with open(os.path.join(metadatos_dir, 'activos_generacion.json'), 'w', encoding='utf-8') as f:
-            json.dump(activos_gen_list, f, indent=2, ensure_ascii=False)
         
         # Activos de almacenamiento
         activos_alm_list = []
@@ -244,8 +221,6 @@ def _generar_archivos_json(metadatos_dir: str, datos: Dict[str, Any]):
                 'idComunidadEnergetica': a.idComunidadEnergetica
             })
         
-        with open(os.path.join(metadatos_dir, 'activos_almacenamiento.json'), 'w', encoding='utf-8') as f:
-            json.dump(activos_alm_list, f, indent=2, ensure_ascii=False)
         
         # Coeficientes de reparto
         coeficientes_list = []
@@ -257,8 +232,6 @@ def _generar_archivos_json(metadatos_dir: str, datos: Dict[str, Any]):
                 'idParticipante': c.idParticipante
             })
         
-        with open(os.path.join(metadatos_dir, 'coeficientes_reparto.json'), 'w', encoding='utf-8') as f:
-            json.dump(coeficientes_list, f, indent=2, ensure_ascii=False)
         
         # Contratos
         contratos_list = []
@@ -273,66 +246,84 @@ def _generar_archivos_json(metadatos_dir: str, datos: Dict[str, Any]):
                 'idParticipante': c.idParticipante
             })
         
-        with open(os.path.join(metadatos_dir, 'contratos.json'), 'w', encoding='utf-8') as f:
-            json.dump(contratos_list, f, indent=2, ensure_ascii=False)
+        return {
+            'comunidad.json': comunidad_dict,
+            'participantes.json': participantes_list,
+            'activos_generacion.json': activos_gen_list,
+            'activos_almacenamiento.json': activos_alm_list,
+            'coeficientes_reparto.json': coeficientes_list,
+            'contratos.json': contratos_list
+        }
             
     except Exception as e:
         print(f"Error generando archivos JSON: {e}")
         raise e
 
-def _generar_archivos_csv_consumo(consumo_dir: str, participantes: list, registro_consumo_repo, fecha_inicio: Optional[datetime] = None, fecha_fin: Optional[datetime] = None):
+def _generar_zip(datos: Dict[str, Any], registro_consumo_repo, fecha_inicio: Optional[datetime] = None, fecha_fin: Optional[datetime] = None) -> Iterator[bytes]:
     
-    for participante in participantes:
-        try:
-            print(f"Generando CSV para participante {participante.idParticipante}")
-            
-            # Obtener datos de consumo del participante usando el método correcto
-            if fecha_inicio and fecha_fin:
-                registros = registro_consumo_repo.get_by_participante_y_periodo(
-                    participante.idParticipante,
-                    fecha_inicio=fecha_inicio,
-                    fecha_fin=fecha_fin
-                )
-            else:
-                registros = registro_consumo_repo.get_by_participante(participante.idParticipante)
-            
-            print(f"Encontrados {len(registros)} registros para participante {participante.idParticipante}")
-            
-            if registros:
-                nombre_archivo = f"participante_{participante.idParticipante}_{participante.nombre.replace(' ', '_')}_consumo.csv"
-                ruta_archivo = os.path.join(consumo_dir, nombre_archivo)
-                
-                with open(ruta_archivo, 'w', newline='', encoding='utf-8') as csvfile:
-                    fieldnames = ['timestamp', 'consumoEnergia_kWh', 'idParticipante']
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    
-                    writer.writeheader()
-                    for registro in registros:
-                        writer.writerow({
-                            'timestamp': registro.timestamp.isoformat(),
-                            'consumoEnergia_kWh': registro.consumoEnergia,
-                            'idParticipante': registro.idParticipante
-                        })
-                        
-        except Exception as e:
-            print(f"Error generando CSV para participante {participante.idParticipante}: {e}")
-            continue
+    # Estructura metadatos/*.json y datos_consumo/*.csv comprimida sobre la marcha: cada
+    # trozo se entrega en cuanto sale del compresor, sin ficheros intermedios
+    salida = _SalidaZip()
+    with zipfile.ZipFile(salida, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for nombre, contenido in _contenido_archivos_json(datos).items():
+            zipf.writestr(f"metadatos/{nombre}", json.dumps(contenido, indent=2, ensure_ascii=False))
+            yield salida.vaciar()
+        print("Archivos JSON generados")
+        
+        for participante in datos['participantes']:
+            yield from _generar_csv_consumo(zipf, salida, participante, registro_consumo_repo, fecha_inicio, fecha_fin)
+        print("Archivos CSV generados")
+    yield salida.vaciar()
 
-def _crear_archivo_zip(temp_dir: str, ruta_zip: str, directorios: list):
+def _generar_csv_consumo(zipf: zipfile.ZipFile, salida, participante, registro_consumo_repo, fecha_inicio: Optional[datetime] = None, fecha_fin: Optional[datetime] = None) -> Iterator[bytes]:
     
+    # Solo se filtra por periodo si se indican las dos fechas
+    if not (fecha_inicio and fecha_fin):
+        fecha_inicio = fecha_fin = None
+    bloques = registro_consumo_repo.iterar_por_participante(
+        participante.idParticipante, fecha_inicio, fecha_fin, TAMANO_BLOQUE_EXPORTACION
+    )
+    
+    # La entrada se abre con el primer bloque: los participantes sin registros no tienen CSV
+    archivo = None
+    registros = 0
     try:
-        with zipfile.ZipFile(ruta_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for directorio in directorios:
-                dir_path = os.path.join(temp_dir, directorio)
-                if os.path.exists(dir_path):
-                    for root, dirs, files in os.walk(dir_path):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            arc_name = os.path.relpath(file_path, temp_dir)
-                            zipf.write(file_path, arc_name)
-    except Exception as e:
-        print(f"Error creando archivo ZIP: {e}")
-        raise e
+        for bloque in bloques:
+            if archivo is None:
+                nombre_archivo = f"participante_{participante.idParticipante}_{participante.nombre.replace(' ', '_')}_consumo.csv"
+                archivo = io.TextIOWrapper(zipf.open(f"datos_consumo/{nombre_archivo}", 'w'), encoding='utf-8', newline='')
+                writer = csv.writer(archivo)
+                writer.writerow(['timestamp', 'consumoEnergia_kWh', 'idParticipante'])
+            writer.writerows(
+                (timestamp.isoformat(), consumo, participante.idParticipante) for timestamp, consumo in bloque
+            )
+            archivo.flush()
+            registros += len(bloque)
+            yield salida.vaciar()
+    finally:
+        if archivo is not None:
+            archivo.close()
+    print(f"Encontrados {registros} registros para participante {participante.idParticipante}")
+
+class _SalidaZip:
+    
+    # Destino sin seek para zipfile (escribe descriptores de datos tras cada entrada):
+    # acumula los bytes comprimidos hasta que el generador los envía
+    
+    def __init__(self):
+        self._partes = []
+    
+    def write(self, datos) -> int:
+        self._partes.append(bytes(datos))
+        return len(datos)
+    
+    def flush(self):
+        pass
+    
+    def vaciar(self) -> bytes:
+        datos = b''.join(self._partes)
+        self._partes = []
+        return datos
 
 def _crear_metadatos_exportacion(datos: Dict[str, Any], fecha_inicio: Optional[datetime] = None, fecha_fin: Optional[datetime] = None) -> Dict[str, Any]:
     
@@ -1,17 +1,24 @@
 import os
 import json
-import csv
 import zipfile
 import tempfile
-from datetime import datetime
-from typing import Dict, Any, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import pandas as pd
 from sqlalchemy.orm import Session
+from app.domain.use_cases.registro_consumo.importar_registros_consumo_csv import TAMANO_BLOQUE_IMPORTACION
 
 def importar_comunidad_completa_use_case(
     archivo_zip_path: str, 
     db: Session,
-    id_usuario: int
+    id_usuario: int,
+    notificar_progreso: Optional[Callable[[Dict[str, Any]], None]] = None,
+    crear_sesion: Optional[Callable[[], Session]] = None,
+    hilos: int = 1
 ) -> Dict[str, Any]:
+    # notificar_progreso(progreso) recibe el avance de la importación. Con crear_sesion los
+    # CSV de consumo se cargan en paralelo (hasta `hilos` a la vez), cada uno con su sesión
     
     try:
         print(f"Iniciando importación desde: {archivo_zip_path}")
@@ -44,6 +51,8 @@ def importar_comunidad_completa_use_case(
             zip_ref.extractall(temp_dir)
         
         print("Archivo ZIP extraído")
+        if notificar_progreso:
+            notificar_progreso({'fase': 'metadatos'})
         
         # Leer y parsear datos
         datos_importacion = _leer_datos_zip(temp_dir)
@@ -59,7 +68,10 @@ def importar_comunidad_completa_use_case(
             activo_alm_repo,
             coeficiente_repo,
             registro_consumo_repo,
-            contrato_repo
+            contrato_repo,
+            notificar_progreso,
+            crear_sesion,
+            hilos
         )
         
         print("Entidades creadas en base de datos")
@@ -78,6 +90,22 @@ def importar_comunidad_completa_use_case(
             shutil.rmtree(temp_dir, ignore_errors=True)
         raise e
 
+def resumen_importacion(resultado: Dict[str, Any]) -> Dict[str, Any]:
+    
+    # Estadísticas de la importación tal y como se devuelven al cliente
+    comunidad = resultado['comunidad_creada']
+    return {
+        "comunidad_nombre": comunidad.nombre if comunidad else None,
+        "comunidad_id": comunidad.idComunidadEnergetica if comunidad else None,
+        "participantes_creados": resultado['participantes_creados'],
+        "activos_generacion_creados": resultado['activos_generacion_creados'],
+        "activos_almacenamiento_creados": resultado['activos_almacenamiento_creados'],
+        "coeficientes_creados": resultado['coeficientes_creados'],
+        "contratos_creados": resultado['contratos_creados'],
+        "registros_consumo_creados": resultado['registros_consumo_creados'],
+        "registros_consumo_actualizados": resultado['registros_consumo_actualizados']
+    }
+
 def _leer_datos_zip(temp_dir: str) -> Dict[str, Any]:
     
     datos = {}
@@ -127,18 +155,14 @@ def _leer_datos_zip(temp_dir: str) -> Dict[str, Any]:
                 datos['contratos'] = json.load(f)
                 print(f"Contratos leídos: {len(datos['contratos'])}")
     
-    # Leer CSVs de datos de consumo
+    # CSVs de datos de consumo: se leen por bloques al cargarlos, no se guardan en memoria
     consumo_dir = os.path.join(temp_dir, "datos_consumo")
     if os.path.exists(consumo_dir):
-        datos['registros_consumo'] = []
-        for archivo in os.listdir(consumo_dir):
-            if archivo.endswith('.csv'):
-                archivo_path = os.path.join(consumo_dir, archivo)
-                with open(archivo_path, 'r', encoding='utf-8') as csvfile:
-                    reader = csv.DictReader(csvfile)
-                    registros = list(reader)
-                    datos['registros_consumo'].extend(registros)
-                    print(f"Registros de consumo leídos desde {archivo}: {len(registros)}")
+        datos['archivos_consumo'] = [
+            os.path.join(consumo_dir, archivo)
+            for archivo in sorted(os.listdir(consumo_dir)) if archivo.endswith('.csv')
+        ]
+        print(f"Archivos de consumo encontrados: {len(datos['archivos_consumo'])}")
     
     return datos
 
@@ -151,7 +175,10 @@ def _crear_entidades_bd(
     activo_alm_repo,
     coeficiente_repo,
     registro_consumo_repo,
-    contrato_repo
+    contrato_repo,
+    notificar_progreso=None,
+    crear_sesion=None,
+    hilos=1
 ) -> Dict[str, Any]:
     
     from app.domain.entities.comunidad_energetica import ComunidadEnergeticaEntity
@@ -159,13 +186,12 @@ def _crear_entidades_bd(
     from app.domain.entities.activo_generacion import ActivoGeneracionEntity
     from app.domain.entities.activo_almacenamiento import ActivoAlmacenamientoEntity
     from app.domain.entities.coeficiente_reparto import CoeficienteRepartoEntity
-    from app.domain.entities.registro_consumo import RegistroConsumoEntity
     from app.domain.entities.contrato_autoconsumo import ContratoAutoconsumoEntity
     from app.domain.entities.tipo_estrategia_excedentes import TipoEstrategiaExcedentes
     from app.domain.entities.tipo_activo_generacion import TipoActivoGeneracion
     from app.domain.entities.tipo_reparto import TipoReparto
     from app.domain.entities.tipo_contrato import TipoContrato
-    from datetime import datetime, date
+    from datetime import datetime
     
     resultado = {
         'comunidad_creada': None,
@@ -175,6 +201,7 @@ def _crear_entidades_bd(
         'coeficientes_creados': 0,
         'contratos_creados': 0,
         'registros_consumo_creados': 0,
+        'registros_consumo_actualizados': 0,
         'mapeo_participantes': {}  # mapeo de ID original -> nuevo ID
     }
     
@@ -326,36 +353,100 @@ def _crear_entidades_bd(
                 contrato_repo.create(nuevo_contrato)
                 resultado['contratos_creados'] += 1
     
-    # 7. Crear registros de consumo
-    if 'registros_consumo' in datos and resultado['mapeo_participantes']:
-        for registro_data in datos['registros_consumo']:
-            id_participante_original = int(registro_data['idParticipante'])
-            if id_participante_original in resultado['mapeo_participantes']:
-                nuevo_id_participante = resultado['mapeo_participantes'][id_participante_original]
-                
-                # Convertir timestamp
-                timestamp = datetime.fromisoformat(registro_data['timestamp'])
-                
-                nuevo_registro = RegistroConsumoEntity(
-                    timestamp=timestamp,
-                    consumoEnergia=float(registro_data['consumoEnergia_kWh']),
-                    idParticipante=nuevo_id_participante
-                )
-                
-                registro_consumo_repo.create(nuevo_registro)
-                resultado['registros_consumo_creados'] += 1
-                
-                # Mostrar progreso cada 100 registros
-                if resultado['registros_consumo_creados'] % 100 == 0:
-                    print(f"Registros de consumo creados: {resultado['registros_consumo_creados']}")
+    # 7. Crear registros de consumo (en bloque; los instantes repetidos se actualizan)
+    if 'archivos_consumo' in datos and resultado['mapeo_participantes']:
+        resultado['registros_consumo_creados'], resultado['registros_consumo_actualizados'] = _cargar_registros_consumo(
+            datos['archivos_consumo'],
+            resultado['mapeo_participantes'],
+            registro_consumo_repo,
+            notificar_progreso,
+            crear_sesion,
+            hilos
+        )
+        print(f"Registros de consumo creados: {resultado['registros_consumo_creados']}, "
+              f"actualizados: {resultado['registros_consumo_actualizados']}")
     
-    print(f"Importación completada:")
+    print("Importación completada:")
     print(f"- Comunidad: {resultado['comunidad_creada'].nombre if resultado['comunidad_creada'] else 'No creada'}")
     print(f"- Participantes: {resultado['participantes_creados']}")
     print(f"- Activos generación: {resultado['activos_generacion_creados']}")
     print(f"- Activos almacenamiento: {resultado['activos_almacenamiento_creados']}")
     print(f"- Coeficientes: {resultado['coeficientes_creados']}")
     print(f"- Contratos: {resultado['contratos_creados']}")
-    print(f"- Registros consumo: {resultado['registros_consumo_creados']}")
+    print(f"- Registros consumo: {resultado['registros_consumo_creados']} creados, "
+          f"{resultado['registros_consumo_actualizados']} actualizados")
+    
+    return resultado 
+
+def _cargar_registros_consumo(
+    archivos: List[str],
+    mapeo_participantes: Dict[int, int],
+    registro_consumo_repo,
+    notificar_progreso=None,
+    crear_sesion=None,
+    hilos: int = 1
+) -> Tuple[int, int]:
+    
+    from app.infrastructure.persistance.repository.sqlalchemy_registro_consumo_repository import SqlAlchemyRegistroConsumoRepository
+    
+    # La exportación genera un CSV por participante: cada fichero es independiente y se
+    # puede cargar en su propio hilo. El progreso se comparte entre hilos
+    progreso = {'fase': 'consumos', 'archivosTotales': len(archivos), 'archivosCompletados': 0, 'registrosConsumo': 0}
+    cerrojo = threading.Lock()
+    
+    def al_guardar(registros: int, archivo_completado: bool = False):
+        with cerrojo:
+            progreso['registrosConsumo'] += registros
+            progreso['archivosCompletados'] += int(archivo_completado)
+            if notificar_progreso:
+                notificar_progreso(dict(progreso))
+    
+    def cargar(archivo_path: str) -> Tuple[int, int]:
+        if crear_sesion is None:
+            return _cargar_archivo_consumo(archivo_path, mapeo_participantes, registro_consumo_repo, al_guardar)
+        sesion = crear_sesion()
+        try:
+            return _cargar_archivo_consumo(archivo_path, mapeo_participantes, SqlAlchemyRegistroConsumoRepository(sesion), al_guardar)
+        finally:
+            sesion.close()
+    
+    # (creados, actualizados) sumados sobre todos los ficheros
+    if crear_sesion is None or hilos <= 1 or len(archivos) <= 1:
+        totales = [cargar(archivo_path) for archivo_path in archivos]
+    else:
+        with ThreadPoolExecutor(max_workers=min(hilos, len(archivos)), thread_name_prefix="importacion-consumo") as ejecutor:
+            totales = list(ejecutor.map(cargar, archivos))
+    return sum(creados for creados, _ in totales), sum(actualizados for _, actualizados in totales)
+
+def _cargar_archivo_consumo(archivo_path: str, mapeo_participantes: Dict[int, int], registro_consumo_repo, al_guardar) -> Tuple[int, int]:
+    
+    # Conversión vectorizada por bloques y upsert multi-fila: una transacción por bloque
+    creados = 0
+    actualizados = 0
+    with pd.read_csv(archivo_path, dtype={'timestamp': str}, encoding='utf-8', chunksize=TAMANO_BLOQUE_IMPORTACION) as lector:
+        for bloque in lector:
+            nuevos_ids = bloque['idParticipante'].astype('int64').map(mapeo_participantes)
+            bloque = bloque[nuevos_ids.notna()]
+            if bloque.empty:
+                continue
+            
+            timestamps = pd.to_datetime(bloque['timestamp'], format='ISO8601')
+            if timestamps.dt.tz is not None:
+                timestamps = timestamps.dt.tz_localize(None)
+            filas = [
+                {'timestamp': timestamp, 'consumoEnergia': consumo, 'idParticipante': id_participante}
+                for timestamp, consumo, id_participante in zip(
+                    timestamps.dt.to_pydatetime().tolist(),
+                    pd.to_numeric(bloque['consumoEnergia_kWh']).astype(float).tolist(),
+                    nuevos_ids[nuevos_ids.notna()].astype('int64').tolist()
+                )
+            ]
+            creados_bloque, actualizados_bloque = registro_consumo_repo.upsert_bulk(filas)
+            creados += creados_bloque
+            actualizados += actualizados_bloque
+            al_guardar(len(filas))
     
-    return resultado 
\ No newline at end of file
+    print(f"Registros de consumo cargados desde {os.path.basename(archivo_path)}: "
+          f"{creados} creados, {actualizados} actualizados")
+    al_guardar(0, archivo_completado=True)
+    return creados, actualizados
@@ -0,0 +1,44 @@
+from dataclasses import replace
+from typing import Optional
+from datetime import date
+from app.domain.entities.agregado_intervalo_activo import AgregadoIntervaloActivoEntity
+from app.domain.entities.serie_agregada import SerieAgregadaEntity
+from app.domain.repositories.agregado_intervalo_activo_repository import AgregadoIntervaloActivoRepository
+from app.domain.use_cases.agregados_intervalos import agregar_periodos, sumar_campos
+
+CAMPOS_SUMA = (
+    'energiaGenerada_kWh',
+    'intervalosConProduccion',
+    'energiaCargada_kWh',
+    'energiaDescargada_kWh',
+)
+
+def _combinar(acumulado: AgregadoIntervaloActivoEntity, fila: AgregadoIntervaloActivoEntity) -> AgregadoIntervaloActivoEntity:
+    # El SoC medio se pondera por el número de intervalos de cada periodo
+    num_intervalos = acumulado.numIntervalos + fila.numIntervalos
+    soc_medio = acumulado.SoCMedio_kWh if fila.SoCMedio_kWh is None else fila.SoCMedio_kWh
+    if acumulado.SoCMedio_kWh is not None and fila.SoCMedio_kWh is not None and num_intervalos:
+        soc_medio = (acumulado.SoCMedio_kWh * acumulado.numIntervalos + fila.SoCMedio_kWh * fila.numIntervalos) / num_intervalos
+    return replace(
+        sumar_campos(acumulado, fila, CAMPOS_SUMA),
+        numIntervalos=num_intervalos,
+        SoCMedio_kWh=soc_medio,
+        SoCMin_kWh=min((v for v in (acumulado.SoCMin_kWh, fila.SoCMin_kWh) if v is not None), default=None),
+        SoCMax_kWh=max((v for v in (acumulado.SoCMax_kWh, fila.SoCMax_kWh) if v is not None), default=None)
+    )
+
+def get_agregados_datos_intervalo_activo_use_case(
+    resultado_activo_id: int,
+    is_generacion: bool,
+    granularidad: str,
+    desde: Optional[date],
+    hasta: Optional[date],
+    repo: AgregadoIntervaloActivoRepository
+) -> SerieAgregadaEntity:
+    return agregar_periodos(
+        lambda fuente: repo.get_by_resultado_activo(resultado_activo_id, is_generacion, fuente, desde, hasta),
+        granularidad,
+        desde,
+        hasta,
+        _combinar
+    )
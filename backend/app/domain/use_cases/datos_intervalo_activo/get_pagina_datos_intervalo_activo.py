@@ -0,0 +1,27 @@
+from typing import Optional
+from datetime import datetime
+from app.domain.entities.datos_intervalo_activo import DatosIntervaloActivoEntity
+from app.domain.entities.pagina_intervalos import PaginaIntervalosEntity
+from app.domain.repositories.datos_intervalo_activo_repository import DatosIntervaloActivoRepository
+from app.domain.use_cases.paginacion_intervalos import campos_entidad, resolver_campos, paginar_intervalos
+
+def get_pagina_datos_intervalo_activo_use_case(
+    resultado_activo_id: int,
+    is_generacion: bool,
+    campos: Optional[str],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    cursor: Optional[str],
+    limite: int,
+    repo: DatosIntervaloActivoRepository
+) -> PaginaIntervalosEntity:
+    campos_pagina = resolver_campos(campos, campos_entidad(DatosIntervaloActivoEntity))
+    return paginar_intervalos(
+        lambda despues_de, limite_filas: repo.get_pagina(
+            resultado_activo_id, is_generacion, campos_pagina, start_time, end_time, despues_de, limite_filas
+        ),
+        'idDatosIntervaloActivo',
+        campos_pagina,
+        cursor,
+        limite
+    )
@@ -0,0 +1,24 @@
+from typing import List, Optional
+from datetime import datetime
+from app.domain.entities.datos_intervalo_activo import DatosIntervaloActivoEntity
+from app.domain.entities.serie_intervalos import SerieIntervalosEntity
+from app.domain.repositories.datos_intervalo_activo_repository import DatosIntervaloActivoRepository
+from app.domain.use_cases.series_intervalos import campos_numericos, resolver_campos_serie, construir_series
+
+def get_series_datos_intervalo_activo_use_case(
+    resultado_activo_id: int,
+    is_generacion: bool,
+    campos: Optional[str],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    ancho: int,
+    metodo: str,
+    repo: DatosIntervaloActivoRepository
+) -> List[SerieIntervalosEntity]:
+    campos_serie = resolver_campos_serie(campos, campos_numericos(DatosIntervaloActivoEntity))
+    return construir_series(
+        lambda: repo.get_series(resultado_activo_id, is_generacion, campos_serie, start_time, end_time),
+        campos_serie,
+        ancho,
+        metodo
+    )
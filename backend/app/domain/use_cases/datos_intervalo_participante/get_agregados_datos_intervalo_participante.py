@@ -0,0 +1,35 @@
+from typing import Optional
+from datetime import date
+from app.domain.entities.serie_agregada import SerieAgregadaEntity
+from app.domain.repositories.agregado_intervalo_participante_repository import AgregadoIntervaloParticipanteRepository
+from app.domain.use_cases.agregados_intervalos import agregar_periodos, sumar_campos
+
+CAMPOS_SUMA = (
+    'numIntervalos',
+    'consumoTotal_kWh',
+    'energiaAutoconsumidaDirecta_kWh',
+    'energiaRecibidaRepartoConsumida_kWh',
+    'energiaAlmacenamiento_kWh',
+    'energiaAlmacenamientoDescargada_kWh',
+    'energiaAlmacenamientoCargada_kWh',
+    'energiaImportadaRed_kWh',
+    'energiaExportadaRed_kWh',
+    'costeImportacion_eur',
+    'ingresoExportacion_eur',
+    'costeBaseEstimado_eur',
+)
+
+def get_agregados_datos_intervalo_participante_use_case(
+    resultado_participante_id: int,
+    granularidad: str,
+    desde: Optional[date],
+    hasta: Optional[date],
+    repo: AgregadoIntervaloParticipanteRepository
+) -> SerieAgregadaEntity:
+    return agregar_periodos(
+        lambda fuente: repo.get_by_resultado_participante(resultado_participante_id, fuente, desde, hasta),
+        granularidad,
+        desde,
+        hasta,
+        lambda acumulado, fila: sumar_campos(acumulado, fila, CAMPOS_SUMA)
+    )
@@ -0,0 +1,26 @@
+from typing import Optional
+from datetime import datetime
+from app.domain.entities.datos_intervalo_participante import DatosIntervaloParticipanteEntity
+from app.domain.entities.pagina_intervalos import PaginaIntervalosEntity
+from app.domain.repositories.datos_intervalo_participante_repository import DatosIntervaloParticipanteRepository
+from app.domain.use_cases.paginacion_intervalos import campos_entidad, resolver_campos, paginar_intervalos
+
+def get_pagina_datos_intervalo_participante_use_case(
+    resultado_participante_id: int,
+    campos: Optional[str],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    cursor: Optional[str],
+    limite: int,
+    repo: DatosIntervaloParticipanteRepository
+) -> PaginaIntervalosEntity:
+    campos_pagina = resolver_campos(campos, campos_entidad(DatosIntervaloParticipanteEntity))
+    return paginar_intervalos(
+        lambda despues_de, limite_filas: repo.get_pagina(
+            resultado_participante_id, campos_pagina, start_time, end_time, despues_de, limite_filas
+        ),
+        'idDatosIntervaloParticipante',
+        campos_pagina,
+        cursor,
+        limite
+    )
@@ -0,0 +1,23 @@
+from typing import List, Optional
+from datetime import datetime
+from app.domain.entities.datos_intervalo_participante import DatosIntervaloParticipanteEntity
+from app.domain.entities.serie_intervalos import SerieIntervalosEntity
+from app.domain.repositories.datos_intervalo_participante_repository import DatosIntervaloParticipanteRepository
+from app.domain.use_cases.series_intervalos import campos_numericos, resolver_campos_serie, construir_series
+
+def get_series_datos_intervalo_participante_use_case(
+    resultado_participante_id: int,
+    campos: Optional[str],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    ancho: int,
+    metodo: str,
+    repo: DatosIntervaloParticipanteRepository
+) -> List[SerieIntervalosEntity]:
+    campos_serie = resolver_campos_serie(campos, campos_numericos(DatosIntervaloParticipanteEntity))
+    return construir_series(
+        lambda: repo.get_series(resultado_participante_id, campos_serie, start_time, end_time),
+        campos_serie,
+        ancho,
+        metodo
+    )
@@ -0,0 +1,72 @@
+import base64
+from dataclasses import fields
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.domain.entities.pagina_intervalos import PaginaIntervalosEntity
+
+
+LIMITE_PAGINA_DEFECTO = 1000
+LIMITE_PAGINA_MAXIMO = 10000
+
+
+def campos_entidad(entidad) -> List[str]:
+    return [campo.name for campo in fields(entidad)]
+
+
+def resolver_campos(campos_pedidos: Optional[str], campos_validos: List[str]) -> List[str]:
+
+    # "timestamp,consumoReal_kWh" -> lista validada; sin campos se devuelven todos
+    if not campos_pedidos:
+        return list(campos_validos)
+    campos = [campo.strip() for campo in campos_pedidos.split(',') if campo.strip()]
+    desconocidos = [campo for campo in campos if campo not in campos_validos]
+    if desconocidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos no válidos: {', '.join(desconocidos)}. Campos disponibles: {', '.join(campos_validos)}"
+        )
+    return list(dict.fromkeys(campos))
+
+
+def codificar_cursor(timestamp: datetime, id_fila: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{id_fila}".encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    if not cursor:
+        return None
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        timestamp, id_fila = base64.urlsafe_b64decode(cursor + relleno).decode().split('|')
+        return datetime.fromisoformat(timestamp), int(id_fila)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Cursor de paginación no válido")
+
+
+def paginar_intervalos(
+    obtener_filas: Callable[[Optional[Tuple[datetime, int]], int], List[Dict[str, Any]]],
+    columna_id: str,
+    campos: List[str],
+    cursor: Optional[str],
+    limite: int
+) -> PaginaIntervalosEntity:
+
+    # Paginación por clave (timestamp, id): cada página continúa justo después de la última
+    # fila de la anterior, sin OFFSET. Se pide una fila de más para saber si hay otra página
+    if limite < 1 or limite > LIMITE_PAGINA_MAXIMO:
+        raise HTTPException(status_code=400, detail=f"El límite debe estar entre 1 y {LIMITE_PAGINA_MAXIMO}")
+    filas = obtener_filas(decodificar_cursor(cursor), limite + 1)
+
+    siguiente_cursor = None
+    if len(filas) > limite:
+        filas = filas[:limite]
+        siguiente_cursor = codificar_cursor(filas[-1]['timestamp'], filas[-1][columna_id])
+
+    return PaginaIntervalosEntity(
+        datos=[{campo: fila[campo] for campo in campos} for fila in filas],
+        campos=campos,
+        siguienteCursor=siguiente_cursor
+    )
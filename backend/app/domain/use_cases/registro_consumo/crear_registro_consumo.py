@@ -14,5 +14,9 @@ def crear_registro_consumo_use_case(registro: RegistroConsumoEntity, participant
     if registro.consumoEnergia <= 0:
         raise HTTPException(status_code=400, detail="El consumo de energía debe ser un valor positivo")
     
+    # Solo puede haber un registro por participante e instante
+    if registro_repo.get_by_participante_y_periodo(registro.idParticipante, registro.timestamp, registro.timestamp):
+        raise HTTPException(status_code=409, detail="Ya existe un registro de consumo del participante en ese instante")
+    
     # Crear el registro de consumo
     return registro_repo.create(registro)
\ No newline at end of file
@@ -3,7 +3,6 @@ from app.domain.repositories.participante_repository import ParticipanteReposito
 import json
 from fastapi import HTTPException
 from typing import Dict, Any
-from app.domain.entities.registro_consumo import RegistroConsumoEntity
 from datetime import datetime
 
 def importar_registros_consumo_use_case(
@@ -27,8 +26,10 @@ def importar_registros_consumo_use_case(
     
     # Inicializar contadores
     registros_creados = 0
+    registros_actualizados = 0
     registros_fallidos = 0
     errores = []
+    filas = []
     
     # Procesar cada registro
     for idx, item in enumerate(registros_data):
@@ -52,15 +53,11 @@ def importar_registros_consumo_use_case(
             if not isinstance(consumo, (int, float)) or consumo <= 0:
                 raise ValueError(f"El consumo debe ser un número positivo: {consumo}")
             
-            # Crear la entidad y guardarla
-            registro_entity = RegistroConsumoEntity(
-                timestamp=timestamp,
-                consumoEnergia=consumo,
-                idParticipante=id_participante
-            )
-            
-            registro_repo.create(registro_entity)
-            registros_creados += 1
+            filas.append({
+                'timestamp': timestamp,
+                'consumoEnergia': consumo,
+                'idParticipante': id_participante
+            })
             
         except Exception as e:
             registros_fallidos += 1
@@ -70,9 +67,14 @@ def importar_registros_consumo_use_case(
                 "datos": item
             })
     
+    # Los registros válidos se guardan juntos; los instantes ya existentes se actualizan
+    if filas:
+        registros_creados, registros_actualizados = registro_repo.upsert_bulk(filas)
+    
     # Resumen de la importación
     resultado = {
         "registros_creados": registros_creados,
+        "registros_actualizados": registros_actualizados,
         "registros_fallidos": registros_fallidos,
         "id_participante": id_participante,
         "detalle_errores": errores if registros_fallidos > 0 else []
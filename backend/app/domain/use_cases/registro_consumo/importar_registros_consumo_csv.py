@@ -0,0 +1,138 @@
+from datetime import datetime
+from typing import Any, BinaryIO, Dict
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+
+from app.domain.repositories.participante_repository import ParticipanteRepository
+from app.domain.repositories.registro_consumo_repository import RegistroConsumoRepository
+
+
+# Filas del CSV que se leen, validan e insertan (o actualizan) juntas, en una transacción por bloque
+TAMANO_BLOQUE_IMPORTACION = 20000
+COLUMNAS_OBLIGATORIAS = ('timestamp', 'consumoEnergia')
+
+
+def importar_registros_consumo_csv_use_case(
+    archivo: BinaryIO,
+    id_participante: int,
+    participante_repo: ParticipanteRepository,
+    registro_repo: RegistroConsumoRepository,
+    tamano_bloque: int = TAMANO_BLOQUE_IMPORTACION
+) -> Dict[str, Any]:
+    # Verificar que el participante existe
+    participante = participante_repo.get_by_id(id_participante)
+    if not participante:
+        raise HTTPException(status_code=404, detail="Participante no encontrado")
+
+    # El CSV se lee por bloques desde el fichero subido, sin cargarlo entero en memoria
+    try:
+        lector = pd.read_csv(
+            archivo,
+            dtype=str,
+            keep_default_na=False,
+            encoding='utf-8-sig',
+            chunksize=tamano_bloque
+        )
+    except pd.errors.EmptyDataError:
+        raise HTTPException(status_code=400, detail="El archivo CSV está vacío o no contiene datos válidos")
+
+    registros_creados = 0
+    registros_actualizados = 0
+    registros_fallidos = 0
+    errores = []
+    posicion = 0
+
+    with lector:
+        for bloque in lector:
+            if any(columna not in bloque.columns for columna in COLUMNAS_OBLIGATORIAS):
+                raise HTTPException(
+                    status_code=400,
+                    detail="El CSV debe contener las columnas 'timestamp' y 'consumoEnergia'"
+                )
+
+            filas, errores_bloque = _validar_bloque(bloque, posicion, id_participante)
+            if filas:
+                creados, actualizados = registro_repo.upsert_bulk(filas)
+                registros_creados += creados
+                registros_actualizados += actualizados
+            registros_fallidos += len(errores_bloque)
+            errores.extend(errores_bloque)
+            posicion += len(bloque)
+
+    if posicion == 0:
+        raise HTTPException(status_code=400, detail="El archivo CSV está vacío o no contiene datos válidos")
+
+    # Resumen de la importación
+    return {
+        "registros_creados": registros_creados,
+        "registros_actualizados": registros_actualizados,
+        "registros_fallidos": registros_fallidos,
+        "id_participante": id_participante,
+        "detalle_errores": errores
+    }
+
+
+def _validar_bloque(bloque: pd.DataFrame, posicion_inicial: int, id_participante: int):
+
+    # Normalizar el formato de timestamp ('2024-01-01 00:00' -> '2024-01-01T00:00')
+    textos_ts = bloque['timestamp'].str.strip()
+    sin_t = ~textos_ts.str.contains('T', regex=False)
+    textos_ts = textos_ts.where(~sin_t, textos_ts.str.replace(' ', 'T', n=1, regex=False))
+
+    timestamps = _parsear_timestamps(textos_ts)
+    textos_consumo = bloque['consumoEnergia'].str.strip()
+    consumos = pd.to_numeric(textos_consumo, errors='coerce').to_numpy(dtype=np.float64)
+
+    ts_validos = ~pd.isna(timestamps)
+    # NaN no supera la comparación: los valores no numéricos también son inválidos
+    consumos_validos = consumos > 0
+    validos = ts_validos & consumos_validos
+
+    filas = [
+        {'timestamp': ts, 'consumoEnergia': consumo, 'idParticipante': id_participante}
+        for ts, consumo in zip(timestamps[validos].tolist(), consumos[validos].tolist())
+    ]
+
+    errores = []
+    for idx in np.flatnonzero(~validos).tolist():
+        texto_ts = textos_ts.iat[idx]
+        consumo = float(consumos[idx]) if consumos[idx] == consumos[idx] else textos_consumo.iat[idx]
+        if not ts_validos[idx]:
+            error = f"Formato de fecha inválido: {texto_ts}"
+        else:
+            error = f"El consumo debe ser un número positivo: {consumo}"
+        errores.append({
+            "posicion": posicion_inicial + idx,
+            "error": error,
+            "datos": {'timestamp': texto_ts, 'consumoEnergia': consumo}
+        })
+    return filas, errores
+
+
+def _parsear_timestamps(textos: pd.Series) -> np.ndarray:
+
+    # Conversión vectorizada de todo el bloque; si pandas no la admite (zonas horarias
+    # mezcladas) o deja huecos, esas filas se interpretan con datetime.fromisoformat
+    try:
+        convertidos = pd.to_datetime(textos, format='ISO8601', errors='coerce')
+        if convertidos.dt.tz is not None:
+            convertidos = convertidos.dt.tz_localize(None)
+        timestamps = np.array(convertidos.dt.to_pydatetime(), dtype=object)
+        timestamps[convertidos.isna().to_numpy()] = None
+    except (ValueError, TypeError):
+        timestamps = np.full(len(textos), None, dtype=object)
+
+    for idx in np.flatnonzero(pd.isna(timestamps)).tolist():
+        timestamps[idx] = _parsear_timestamp(textos.iat[idx])
+    return timestamps
+
+
+def _parsear_timestamp(texto: str):
+    try:
+        timestamp = datetime.fromisoformat(texto.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    # La columna DATETIME no guarda zona horaria: se conserva la hora local del registro
+    return timestamp.replace(tzinfo=None)
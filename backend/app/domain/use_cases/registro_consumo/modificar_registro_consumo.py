@@ -17,6 +17,12 @@ def modificar_registro_consumo_use_case(id_registro: int, registro_datos: Regist
     registro_datos.idRegistroConsumo = id_registro
     registro_datos.idParticipante = registro_existente.idParticipante
     
+    # Solo puede haber un registro por participante e instante
+    if registro_datos.timestamp:
+        coincidentes = repo.get_by_participante_y_periodo(registro_datos.idParticipante, registro_datos.timestamp, registro_datos.timestamp)
+        if any(r.idRegistroConsumo != id_registro for r in coincidentes):
+            raise HTTPException(status_code=409, detail="Ya existe un registro de consumo del participante en ese instante")
+    
     # Actualizar en la base de datos
     registro_actualizado = repo.update(registro_datos)
     return registro_actualizado
\ No newline at end of file
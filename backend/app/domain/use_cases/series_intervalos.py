@@ -0,0 +1,122 @@
+from dataclasses import fields
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.domain.entities.serie_intervalos import SerieIntervalosEntity
+
+
+METODOS_REDUCCION = ('lttb', 'minmax')
+ANCHO_DEFECTO = 1000
+ANCHO_MAXIMO = 10000
+
+
+def campos_numericos(entidad) -> List[str]:
+    # Magnitudes del intervalo: todo salvo el instante y las claves (id*)
+    return [campo.name for campo in fields(entidad) if campo.name != 'timestamp' and not campo.name.startswith('id')]
+
+
+def resolver_campos_serie(campos_pedidos: Optional[str], campos_numericos: List[str]) -> List[str]:
+
+    # Solo se pueden reducir magnitudes numéricas; sin campos se devuelven todas
+    if not campos_pedidos:
+        return list(campos_numericos)
+    campos = [campo.strip() for campo in campos_pedidos.split(',') if campo.strip()]
+    desconocidos = [campo for campo in campos if campo not in campos_numericos]
+    if desconocidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos no válidos: {', '.join(desconocidos)}. Campos disponibles: {', '.join(campos_numericos)}"
+        )
+    return list(dict.fromkeys(campos))
+
+
+def construir_series(
+    obtener_filas: Callable[[], List[Tuple]],
+    campos: List[str],
+    ancho: int,
+    metodo: str
+) -> List[SerieIntervalosEntity]:
+
+    # obtener_filas() -> [(timestamp, valor_campo_1, ...)] ordenadas por instante
+    if metodo not in METODOS_REDUCCION:
+        raise HTTPException(status_code=400, detail=f"Método no válido: {metodo} (valores admitidos: {', '.join(METODOS_REDUCCION)})")
+    if ancho < 2 or ancho > ANCHO_MAXIMO:
+        raise HTTPException(status_code=400, detail=f"El ancho debe estar entre 2 y {ANCHO_MAXIMO}")
+
+    filas = obtener_filas()
+    if not filas:
+        return [SerieIntervalosEntity(campo=campo, metodo='ninguno') for campo in campos]
+
+    timestamps = np.array([fila[0] for fila in filas], dtype='datetime64[s]')
+    # None (intervalo sin dato) pasa a NaN y se descarta en cada serie
+    matriz = np.array([fila[1:] for fila in filas], dtype=np.float64)
+    eje_x = timestamps.astype(np.int64).astype(np.float64)
+
+    series = []
+    for idx, campo in enumerate(campos):
+        valores = matriz[:, idx]
+        con_dato = ~np.isnan(valores)
+        x, y = eje_x[con_dato], valores[con_dato]
+        if len(y) <= ancho:
+            posiciones, metodo_aplicado = np.arange(len(y)), 'ninguno'
+        elif metodo == 'lttb':
+            posiciones, metodo_aplicado = lttb(x, y, ancho), metodo
+        else:
+            posiciones, metodo_aplicado = min_max(y, ancho), metodo
+        series.append(SerieIntervalosEntity(
+            campo=campo,
+            metodo=metodo_aplicado,
+            puntosOriginales=len(y),
+            timestamps=timestamps[con_dato][posiciones].tolist(),
+            valores=y[posiciones].tolist()
+        ))
+    return series
+
+
+def lttb(x: np.ndarray, y: np.ndarray, puntos: int) -> np.ndarray:
+
+    # Largest-Triangle-Three-Buckets: se conservan el primer y el último punto y, de cada
+    # cubeta intermedia, el punto que forma el triángulo de mayor área con el punto elegido
+    # en la cubeta anterior y la media de la siguiente. Devuelve las posiciones elegidas
+    n = len(y)
+    if puntos >= n or puntos < 3:
+        return np.arange(n) if puntos >= n else np.array([0, n - 1])
+
+    limites = np.linspace(1, n - 1, puntos - 1).astype(np.int64)
+    # Media de cada cubeta (la siguiente a la actual en cada paso); la última es el punto final
+    sumas_x = np.add.reduceat(x[1:n - 1], limites[:-1] - 1)
+    sumas_y = np.add.reduceat(y[1:n - 1], limites[:-1] - 1)
+    tamanos = np.diff(limites)
+    medias_x = np.append(sumas_x / tamanos, x[n - 1])
+    medias_y = np.append(sumas_y / tamanos, y[n - 1])
+
+    elegidos = np.empty(puntos, dtype=np.int64)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    anterior = 0
+    for cubeta in range(puntos - 2):
+        inicio, fin = limites[cubeta], limites[cubeta + 1]
+        ax, ay = x[anterior], y[anterior]
+        cx, cy = medias_x[cubeta + 1], medias_y[cubeta + 1]
+        # Área (doble, sin signo) de cada triángulo (anterior, candidato, media siguiente)
+        areas = np.abs((ax - cx) * (y[inicio:fin] - ay) - (ax - x[inicio:fin]) * (cy - ay))
+        anterior = inicio + int(np.argmax(areas))
+        elegidos[cubeta + 1] = anterior
+    return elegidos
+
+
+def min_max(y: np.ndarray, puntos: int) -> np.ndarray:
+
+    # Mínimo y máximo de cada cubeta (dos puntos por cubeta, en orden temporal): conserva
+    # los picos, que es lo que se ve de una serie densa dibujada en pocos píxeles
+    n = len(y)
+    if puntos >= n:
+        return np.arange(n)
+    cubetas = max(puntos // 2, 1)
+    cubeta = (np.arange(n) * cubetas) // n
+    # Orden por (cubeta, valor): el primero de cada cubeta es su mínimo y el último su máximo
+    orden = np.lexsort((y, cubeta))
+    primeras = np.flatnonzero(np.r_[True, np.diff(cubeta[orden]) != 0])
+    ultimas = np.r_[primeras[1:] - 1, n - 1]
+    return np.unique(np.concatenate([orden[primeras], orden[ultimas]]))
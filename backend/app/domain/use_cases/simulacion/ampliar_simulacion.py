@@ -0,0 +1,33 @@
+from datetime import datetime
+from fastapi import HTTPException
+from app.domain.repositories.simulacion_repository import SimulacionRepository
+from app.domain.repositories.simulacion_job_repository import SimulacionJobRepository
+from app.domain.entities.simulacion_job import SimulacionJobEntity
+from app.domain.entities.estado_simulacion import EstadoSimulacion
+
+def ampliar_simulacion_use_case(simulacion_id: int, fecha_fin: datetime, prioridad: int, simulacion_repo: SimulacionRepository, job_repo: SimulacionJobRepository) -> SimulacionJobEntity:
+    simulacion = simulacion_repo.get_by_id(simulacion_id)
+    if not simulacion:
+        raise HTTPException(status_code=404, detail="Simulación no encontrada")
+    
+    if simulacion.estado != EstadoSimulacion.COMPLETADA.value:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Solo se puede ampliar una simulación completada (estado actual '{simulacion.estado}')"
+        )
+    if fecha_fin <= simulacion.fechaFin:
+        raise HTTPException(
+            status_code=400,
+            detail=f"La nueva fecha de fin debe ser posterior a la actual ({simulacion.fechaFin})"
+        )
+    
+    # El motor detecta la ampliación por el punto de control final de la simulación: si las
+    # entradas de la ventana anterior no han cambiado solo simula los intervalos nuevos y
+    # actualiza los resultados; si no (o si no hay punto de control legible), la vuelve a
+    # simular entera. Estado y fecha de fin se cambian en un único UPDATE condicionado: de
+    # dos peticiones simultáneas solo una encola
+    if not simulacion_repo.update_estado_si(
+        simulacion_id, [EstadoSimulacion.COMPLETADA.value], EstadoSimulacion.EJECUTANDO.value, fecha_fin=fecha_fin
+    ):
+        raise HTTPException(status_code=409, detail="La simulación ya se ha puesto en ejecución")
+    return job_repo.encolar(simulacion_id, prioridad)
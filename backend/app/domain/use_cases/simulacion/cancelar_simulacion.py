@@ -0,0 +1,23 @@
+from fastapi import HTTPException
+from app.domain.repositories.simulacion_repository import SimulacionRepository
+from app.domain.repositories.simulacion_job_repository import SimulacionJobRepository
+from app.domain.entities.simulacion_job import SimulacionJobEntity, EstadoJob
+from app.domain.entities.estado_simulacion import EstadoSimulacion
+
+def cancelar_simulacion_use_case(simulacion_id: int, simulacion_repo: SimulacionRepository, job_repo: SimulacionJobRepository) -> SimulacionJobEntity:
+    simulacion = simulacion_repo.get_by_id(simulacion_id)
+    if not simulacion:
+        raise HTTPException(status_code=404, detail="Simulación no encontrada")
+    
+    job = job_repo.get_ultimo_by_simulacion(simulacion_id)
+    if not job or job.estado not in [EstadoJob.PENDIENTE, EstadoJob.EJECUTANDO]:
+        raise HTTPException(status_code=400, detail="La simulación no tiene ninguna ejecución en curso")
+    
+    job = job_repo.solicitar_cancelacion(job.idJob)
+    
+    # Un trabajo que aún no había empezado se cancela en el acto; si ya está en ejecución
+    # es el worker quien lo detiene y devuelve la simulación a PENDIENTE
+    if job.estado == EstadoJob.CANCELADO:
+        simulacion.estado = EstadoSimulacion.PENDIENTE
+        simulacion_repo.update(simulacion_id, simulacion)
+    return job
@@ -1,7 +1,15 @@
 from fastapi import HTTPException
 from app.domain.repositories.simulacion_repository import SimulacionRepository
 from app.domain.entities.simulacion import SimulacionEntity
+from app.domain.use_cases.simulacion.motor_simulacion.resolucion_temporal import PASOS_MINUTOS
+
+def validar_tiempo_medicion(tiempo_medicion: int):
+    if tiempo_medicion is not None and tiempo_medicion not in PASOS_MINUTOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"tiempo_medicion debe ser uno de {', '.join(str(p) for p in PASOS_MINUTOS)} minutos"
+        )
 
 def crear_simulacion_use_case(simulacion: SimulacionEntity, repo: SimulacionRepository) -> SimulacionEntity:
-    # Aquí puedes agregar validaciones si es necesario
+    validar_tiempo_medicion(simulacion.tiempo_medicion)
     return repo.create(simulacion)
\ No newline at end of file
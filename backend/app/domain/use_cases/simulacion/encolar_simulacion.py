@@ -0,0 +1,24 @@
+from fastapi import HTTPException
+from app.domain.repositories.simulacion_repository import SimulacionRepository
+from app.domain.repositories.simulacion_job_repository import SimulacionJobRepository
+from app.domain.entities.simulacion_job import SimulacionJobEntity
+from app.domain.entities.estado_simulacion import EstadoSimulacion
+
+def encolar_simulacion_use_case(simulacion_id: int, prioridad: int, simulacion_repo: SimulacionRepository, job_repo: SimulacionJobRepository) -> SimulacionJobEntity:
+    simulacion = simulacion_repo.get_by_id(simulacion_id)
+    if not simulacion:
+        raise HTTPException(status_code=404, detail="Simulación no encontrada")
+    
+    # Verificar que la simulación esté en estado que permita ejecución
+    estados_permitidos = [EstadoSimulacion.PENDIENTE.value, EstadoSimulacion.FALLIDA.value]
+    if simulacion.estado not in estados_permitidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"La simulación no puede ser ejecutada desde el estado '{simulacion.estado}'"
+        )
+    
+    # La simulación queda en ejecución mientras el trabajo espera en la cola. El cambio se
+    # vuelve a condicionar al estado en el UPDATE: de dos peticiones simultáneas solo una encola
+    if not simulacion_repo.update_estado_si(simulacion_id, estados_permitidos, EstadoSimulacion.EJECUTANDO.value):
+        raise HTTPException(status_code=409, detail="La simulación ya se ha puesto en ejecución")
+    return job_repo.encolar(simulacion_id, prioridad)
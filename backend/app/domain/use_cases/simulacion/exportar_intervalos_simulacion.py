@@ -0,0 +1,161 @@
+import csv
+import io
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import HTTPException
+
+from app.domain.entities.estado_simulacion import EstadoSimulacion
+from app.domain.repositories.simulacion_repository import SimulacionRepository
+from app.domain.repositories.resultado_simulacion_repository import ResultadoSimulacionRepository
+
+
+# Filas que se leen del cursor de servidor y se escriben juntas (un row group en Parquet)
+TAMANO_BLOQUE_EXPORTACION = 50000
+
+FORMATOS = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+    'csv': ('text/csv', 'csv'),
+}
+
+# Conjunto de intervalos -> columnas exportadas (la primera identifica al participante o activo)
+DATASETS = {
+    'participantes': (
+        'idParticipante', 'timestamp', 'consumoReal_kWh', 'autoconsumo_kWh', 'energiaRecibidaReparto_kWh',
+        'energiaAlmacenamiento_kWh', 'energiaDiferencia_kWh', 'excedenteVertidoCompensado_kWh',
+        'precioImportacionIntervalo', 'precioExportacionIntervalo',
+    ),
+    'activos-generacion': ('idActivoGeneracion', 'timestamp', 'energiaGenerada_kWh'),
+    'activos-almacenamiento': (
+        'idActivoAlmacenamiento', 'timestamp', 'energiaCargada_kWh', 'energiaDescargada_kWh', 'SoC_kWh',
+    ),
+}
+
+
+@dataclass
+class ExportacionIntervalos:
+    idResultado: int
+    dataset: str
+    formato: str
+    columnas: Tuple[str, ...]
+    tipoContenido: str
+    nombreArchivo: str
+
+
+def preparar_exportacion_intervalos_use_case(
+    simulacion_id: int,
+    dataset: str,
+    formato: str,
+    simulacion_repo: SimulacionRepository,
+    resultado_repo: ResultadoSimulacionRepository
+) -> ExportacionIntervalos:
+
+    # Validaciones antes de empezar a enviar la respuesta (después ya no se puede devolver un error)
+    if formato not in FORMATOS:
+        raise HTTPException(status_code=400, detail=f"Formato no válido: {formato} (valores admitidos: {', '.join(FORMATOS)})")
+    if dataset not in DATASETS:
+        raise HTTPException(status_code=400, detail=f"Conjunto no válido: {dataset} (valores admitidos: {', '.join(DATASETS)})")
+
+    simulacion = simulacion_repo.get_by_id(simulacion_id)
+    if not simulacion:
+        raise HTTPException(status_code=404, detail="Simulación no encontrada")
+    if simulacion.estado != EstadoSimulacion.COMPLETADA.value:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Solo se pueden exportar los resultados de una simulación completada (estado actual '{simulacion.estado}')"
+        )
+    resultado = resultado_repo.get_by_simulacion_id(simulacion_id)
+    if not resultado:
+        raise HTTPException(status_code=404, detail="La simulación no tiene resultados")
+
+    tipo_contenido, extension = FORMATOS[formato]
+    return ExportacionIntervalos(
+        idResultado=resultado.idResultado,
+        dataset=dataset,
+        formato=formato,
+        columnas=DATASETS[dataset],
+        tipoContenido=tipo_contenido,
+        nombreArchivo=f"simulacion_{simulacion_id}_{dataset}.{extension}"
+    )
+
+
+def generar_exportacion(exportacion: ExportacionIntervalos, bloques: Iterable[List[tuple]]) -> Iterator[bytes]:
+
+    # bloques: filas (tuplas en el orden de columnas) leídas por bloques del cursor de servidor.
+    # Cada bloque se codifica y se entrega en cuanto se lee, así la memoria no depende del total
+    if exportacion.formato == 'csv':
+        return _generar_csv(exportacion.columnas, bloques)
+    esquema = _esquema_arrow(exportacion.columnas)
+    if exportacion.formato == 'parquet':
+        return _generar_arrow(esquema, bloques, lambda salida: pq.ParquetWriter(salida, esquema, compression='zstd'))
+    return _generar_arrow(esquema, bloques, lambda salida: pa.ipc.new_stream(salida, esquema))
+
+
+def _generar_csv(columnas: Tuple[str, ...], bloques: Iterable[List[tuple]]) -> Iterator[bytes]:
+    texto = io.StringIO()
+    escritor = csv.writer(texto, lineterminator='\n')
+    escritor.writerow(columnas)
+    for filas in bloques:
+        escritor.writerows(filas)
+        yield texto.getvalue().encode('utf-8')
+        texto.seek(0)
+        texto.truncate()
+    if texto.tell():
+        yield texto.getvalue().encode('utf-8')
+
+
+def _esquema_arrow(columnas: Tuple[str, ...]) -> pa.Schema:
+    return pa.schema([
+        (columna, pa.int32() if columna.startswith('id') else pa.timestamp('s') if columna == 'timestamp' else pa.float64())
+        for columna in columnas
+    ])
+
+
+def _generar_arrow(esquema: pa.Schema, bloques: Iterable[List[tuple]], abrir_escritor: Callable) -> Iterator[bytes]:
+    salida = _SalidaIncremental()
+    escritor = abrir_escritor(salida)
+    try:
+        for filas in bloques:
+            columnas = list(zip(*filas))
+            escritor.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(valores, type=campo.type) for valores, campo in zip(columnas, esquema)],
+                schema=esquema
+            ))
+            yield salida.vaciar()
+    finally:
+        escritor.close()
+    yield salida.vaciar()
+
+
+class _SalidaIncremental:
+
+    # Fichero de solo escritura para los escritores de pyarrow: acumula lo escrito hasta que
+    # el generador lo entrega a la respuesta (vaciar)
+
+    def __init__(self):
+        self._partes = []
+        self._posicion = 0
+        self.closed = False
+
+    def write(self, datos) -> int:
+        datos = bytes(datos)
+        self._partes.append(datos)
+        self._posicion += len(datos)
+        return len(datos)
+
+    def tell(self) -> int:
+        return self._posicion
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def vaciar(self) -> bytes:
+        datos = b''.join(self._partes)
+        self._partes = []
+        return datos
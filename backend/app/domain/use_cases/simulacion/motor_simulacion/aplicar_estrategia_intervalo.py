@@ -1,6 +1,7 @@
 from app.domain.entities.tipo_estrategia_excedentes import TipoEstrategiaExcedentes
 from app.domain.entities.tipo_reparto import TipoReparto
 from app.domain.use_cases.simulacion.motor_simulacion.obtener_precio_energia import obtener_precio_energia
+from app.domain.use_cases.simulacion.motor_simulacion.resolucion_temporal import horas_por_intervalo
 
 def aplicar_estrategia_intervalo(simulacion, comunidad, participantes, gen_activos,
                                       consumo_int, contratos, coefs, intervalo, estado_alm, activos_alm, pvpc_repo=None):
@@ -12,6 +13,7 @@ def aplicar_estrategia_intervalo(simulacion, comunidad, participantes, gen_activ
             
             # Calcular valores agregados
             generacion_total = sum(gen_activos.values())
+            horas_intervalo = horas_por_intervalo(simulacion)
             
             # 1. Determinar tipo de estrategia de excedentes de la simulación
             estrategia = simulacion.tipoEstrategiaExcedentes
@@ -25,7 +27,7 @@ def aplicar_estrategia_intervalo(simulacion, comunidad, participantes, gen_activ
                 for p in participantes:
                     id_p = p.idParticipante
                     consumo = consumo_int.get(id_p, 0)
-                    coeficiente = _obtener_coeficiente_reparto(coefs.get(id_p, []), intervalo)
+                    coeficiente = coefs.coeficiente(id_p, intervalo)  # PlanCoeficientesReparto precompilado
                     
                     # Asignar energía según coeficiente (nunca más que su consumo en caso de sin excedentes)
                     energia_asignada[id_p] = generacion_total * (coeficiente / 100)
@@ -50,7 +52,7 @@ def aplicar_estrategia_intervalo(simulacion, comunidad, participantes, gen_activ
                         ciclos_acumulados[activo.idActivoAlmacenamiento] = estado_alm[activo.idActivoAlmacenamiento]['ciclos_acumulados']
                     
                     energia_gestionada, estado_alm, resultados_alm = _gestionar_almacenamiento(
-                        comunidad, energia_diferencia, estado_alm, intervalo, activos_alm, ciclos_acumulados
+                        comunidad, energia_diferencia, estado_alm, intervalo, activos_alm, ciclos_acumulados, horas_intervalo
                     )
                     
                     intervalo_activos_almacenamiento.extend(resultados_alm)
@@ -99,7 +101,7 @@ def aplicar_estrategia_intervalo(simulacion, comunidad, participantes, gen_activ
                         ciclos_acumulados[activo.idActivoAlmacenamiento] = estado_alm[activo.idActivoAlmacenamiento]['ciclos_acumulados']
                     
                     energia_gestionada, estado_alm, resultados_alm = _gestionar_almacenamiento(
-                        comunidad, energia_diferencia, estado_alm, intervalo, activos_alm, ciclos_acumulados
+                        comunidad, energia_diferencia, estado_alm, intervalo, activos_alm, ciclos_acumulados, horas_intervalo
                     )
                     
                     intervalo_activos_almacenamiento.extend(resultados_alm)
@@ -200,7 +202,7 @@ def _calcular_degradacion_bateria(activo, ciclos_acumulados, tiempo_transcurrido
     }
 
 
-def _gestionar_almacenamiento(comunidad, excedentes_o_deficit, estado_alm, intervalo, activos_alm, ciclos_acumulados=None):
+def _gestionar_almacenamiento(comunidad, excedentes_o_deficit, estado_alm, intervalo, activos_alm, ciclos_acumulados=None, horas_intervalo=1.0):
     
     energia_gestionada = 0.0
     intervalo_activos_alm = []
@@ -263,8 +265,8 @@ def _gestionar_almacenamiento(comunidad, excedentes_o_deficit, estado_alm, inter
                 )
                 continue
 
-            # 3.3. Límite por potencia en 1 h
-            energia_max_interval = activo.potenciaMaximaCarga_kW * 1  # kWh
+            # 3.3. Límite por potencia en la duración del intervalo
+            energia_max_interval = activo.potenciaMaximaCarga_kW * horas_intervalo  # kWh
 
             # 3.4. Energía a cargar (antes de pérdidas)
             energia_a_cargar = min(energia_restante, capacidad_disponible, energia_max_interval)
@@ -346,8 +348,8 @@ def _gestionar_almacenamiento(comunidad, excedentes_o_deficit, estado_alm, inter
             # 4.2. Cuánta energía neta puedo extraer sin bajar de soc_min
             energia_disponible = soc_actual - soc_min
             
-            # 4.3. Límite por potencia en 1 h
-            energia_max_descarga = activo.potenciaMaximaDescarga_kW * 1  # kWh
+            # 4.3. Límite por potencia en la duración del intervalo
+            energia_max_descarga = activo.potenciaMaximaDescarga_kW * horas_intervalo  # kWh
             
             # 4.4. Energía bruta a descargar (antes de pérdidas)
             deficit_ajustado = deficit / eta_descarga
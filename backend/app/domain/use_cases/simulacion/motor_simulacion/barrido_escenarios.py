@@ -0,0 +1,231 @@
+import contextlib
+import io
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.domain.entities.activo_almacenamiento import ActivoAlmacenamientoEntity
+from app.domain.entities.tipo_activo_generacion import TipoActivoGeneracion
+from app.domain.entities.tipo_estrategia_excedentes import TipoEstrategiaExcedentes
+from app.domain.use_cases.simulacion.motor_simulacion.calcular_resultados import AgregadorResultados
+from app.domain.use_cases.simulacion.motor_simulacion.plan_coeficientes import PlanCoeficientesReparto
+from app.domain.use_cases.simulacion.motor_simulacion.simulacion_vectorizada import simular_intervalos_vectorizado
+
+
+# Batería añadida por una variante: solo existe en memoria, no se persiste
+ID_ALMACENAMIENTO_ADICIONAL = -1
+
+METRICAS_VARIANTE = (
+    'costeTotalEnergia_eur',
+    'ahorroTotal_eur',
+    'ingresoTotalExportacion_eur',
+    'paybackPeriod_anios',
+    'roi_pct',
+    'tasaAutoconsumoSCR_pct',
+    'tasaAutosuficienciaSSR_pct',
+    'energiaTotalImportada_kWh',
+    'energiaTotalExportada_kWh',
+    'reduccionCO2_kg',
+)
+
+
+@dataclass
+class ContextoBarrido:
+    # Entradas de la simulación base cargadas una sola vez (fases 2 y 3 del motor) y
+    # compartidas por todas las variantes; se envía una vez a cada proceso del pool
+    simulacion: Any
+    participantes: List[Any]
+    activos_gen: List[Any]
+    activos_alm: List[Any]
+    contratos: Dict[int, Any]
+    coeficientes: Optional[PlanCoeficientesReparto]
+    timestamps: List[datetime]
+    consumo_por_intervalo: Dict[datetime, Dict[int, float]]
+    ambiental_por_intervalo: Dict[datetime, Dict[str, float]]
+    cache_generacion_pv: Dict[int, Dict[datetime, float]]
+    precios_pvpc: Any = None
+
+
+@dataclass
+class VarianteBarrido:
+    indice: int
+    # None: se mantiene el valor de la simulación base
+    tipoEstrategiaExcedentes: Optional[TipoEstrategiaExcedentes] = None
+    factorPotenciaFV: float = 1.0
+    almacenamientoAdicional: Optional[Dict[str, float]] = None
+    coeficientes: Optional[Dict[int, float]] = None
+
+    def parametros(self) -> Dict[str, Any]:
+        return {
+            'tipoEstrategiaExcedentes': self.tipoEstrategiaExcedentes.value if self.tipoEstrategiaExcedentes else None,
+            'factorPotenciaFV': self.factorPotenciaFV,
+            'almacenamientoAdicional': self.almacenamientoAdicional,
+            'coeficientes': self.coeficientes,
+        }
+
+
+def generar_variantes(parametros: Dict[str, Any]) -> List[VarianteBarrido]:
+
+    # Producto cartesiano de la rejilla; parametros es el JSON guardado con el barrido.
+    # Una dimensión vacía u omitida equivale a [None] (valor de la simulación base)
+    estrategias = [TipoEstrategiaExcedentes(valor) if valor is not None else None
+                   for valor in (parametros.get('tiposEstrategiaExcedentes') or [None])]
+    factores_fv = [float(factor) for factor in (parametros.get('factoresPotenciaFV') or [1.0])]
+    almacenamiento = parametros.get('almacenamientoAdicional') or [None]
+    conjuntos_coeficientes = [
+        {int(id_p): float(valor) for id_p, valor in conjunto.items()} if conjunto is not None else None
+        for conjunto in (parametros.get('conjuntosCoeficientes') or [None])
+    ]
+
+    return [
+        VarianteBarrido(indice, estrategia, factor_fv, dict(bateria) if bateria else None, coeficientes)
+        for indice, (estrategia, factor_fv, bateria, coeficientes) in enumerate(
+            itertools.product(estrategias, factores_fv, almacenamiento, conjuntos_coeficientes)
+        )
+    ]
+
+
+def plan_coeficientes_fijos(coeficientes: Dict[int, float]) -> PlanCoeficientesReparto:
+    # Coeficiente constante en las 24 franjas
+    ids = list(coeficientes.keys())
+    return PlanCoeficientesReparto(ids, np.tile(np.array([coeficientes[i] for i in ids], dtype=np.float64), (24, 1)))
+
+
+def errores_variantes(variantes: List[VarianteBarrido], ids_participantes: List[int]) -> List[str]:
+
+    errores = []
+    ids_participantes = set(ids_participantes)
+    for variante in variantes:
+        if variante.factorPotenciaFV < 0:
+            errores.append(f"Variante {variante.indice}: el factor de potencia FV no puede ser negativo")
+        if variante.coeficientes is not None:
+            desconocidos = sorted(set(variante.coeficientes) - ids_participantes)
+            if desconocidos:
+                errores.append(f"Variante {variante.indice}: participantes ajenos a la comunidad {desconocidos}")
+            faltan = sorted(ids_participantes - set(variante.coeficientes))
+            if faltan:
+                errores.append(f"Variante {variante.indice}: faltan coeficientes para los participantes {faltan}")
+            errores.extend(f"Variante {variante.indice}: {error}"
+                           for error in plan_coeficientes_fijos(variante.coeficientes).errores())
+    # Los conjuntos de coeficientes se repiten en muchas variantes
+    return list(dict.fromkeys(errores))
+
+
+def _escalar_generacion_fv(contexto: ContextoBarrido, factor: float):
+
+    # La generación FV es lineal en la potencia pico: se escala la serie ya calculada
+    # (y el coste de instalación, para que payback y ROI sigan siendo comparables)
+    if factor == 1.0:
+        return contexto.activos_gen, contexto.cache_generacion_pv
+
+    activos_gen = []
+    cache = dict(contexto.cache_generacion_pv)
+    for activo in contexto.activos_gen:
+        if activo.tipo_activo != TipoActivoGeneracion.INSTALACION_FOTOVOLTAICA:
+            activos_gen.append(activo)
+            continue
+        activos_gen.append(replace(
+            activo,
+            potenciaNominal_kWp=(activo.potenciaNominal_kWp or 1.0) * factor,
+            costeInstalacion_eur=(activo.costeInstalacion_eur or 0) * factor
+        ))
+        serie = contexto.cache_generacion_pv.get(activo.idActivoGeneracion)
+        if serie:
+            cache[activo.idActivoGeneracion] = {ts: energia * factor for ts, energia in serie.items()}
+    return activos_gen, cache
+
+
+def _bateria_adicional(parametros: Dict[str, float], id_comunidad: int) -> ActivoAlmacenamientoEntity:
+    return ActivoAlmacenamientoEntity(
+        idActivoAlmacenamiento=ID_ALMACENAMIENTO_ADICIONAL,
+        nombreDescriptivo="Almacenamiento adicional (barrido)",
+        capacidadNominal_kWh=parametros['capacidad_kWh'],
+        potenciaMaximaCarga_kW=parametros['potencia_kW'],
+        potenciaMaximaDescarga_kW=parametros['potencia_kW'],
+        eficienciaCicloCompleto_pct=parametros.get('eficienciaCicloCompleto_pct', 90.0),
+        profundidadDescargaMax_pct=parametros.get('profundidadDescargaMax_pct', 90.0),
+        idComunidadEnergetica=id_comunidad
+    )
+
+
+def evaluar_variante(contexto: ContextoBarrido, variante: VarianteBarrido):
+
+    # Simulación vectorizada completa de la variante, sin persistir intervalos:
+    # solo se devuelve el resultado global
+    simulacion = contexto.simulacion
+    if variante.tipoEstrategiaExcedentes is not None:
+        simulacion = replace(simulacion, tipoEstrategiaExcedentes=variante.tipoEstrategiaExcedentes)
+
+    activos_gen, cache_generacion_pv = _escalar_generacion_fv(contexto, variante.factorPotenciaFV)
+
+    activos_alm = list(contexto.activos_alm)
+    if variante.almacenamientoAdicional and variante.almacenamientoAdicional.get('capacidad_kWh'):
+        activos_alm.append(_bateria_adicional(variante.almacenamientoAdicional, simulacion.idComunidadEnergetica))
+
+    coeficientes = contexto.coeficientes
+    if variante.coeficientes is not None:
+        coeficientes = plan_coeficientes_fijos(variante.coeficientes)
+
+    estado_almacenamiento = {alm.idActivoAlmacenamiento: {'soc_kwh': 0.0} for alm in activos_alm}
+    resultado_vectorizado = simular_intervalos_vectorizado(
+        simulacion, contexto.participantes, activos_gen, activos_alm, contexto.contratos, coeficientes,
+        contexto.timestamps, contexto.consumo_por_intervalo, contexto.ambiental_por_intervalo,
+        cache_generacion_pv, estado_almacenamiento, contexto.precios_pvpc
+    )
+
+    # El cálculo de resultados imprime un resumen por activo que no interesa para cada variante
+    agregador = AgregadorResultados()
+    with contextlib.redirect_stdout(io.StringIO()):
+        agregador.agregar(*resultado_vectorizado.a_columnas())
+        resultado_global, _, _, _ = agregador.calcular(simulacion, activos_gen, activos_alm, contexto.contratos)
+    return resultado_global
+
+
+def _evaluar_sin_excepcion(contexto, variante):
+    # Una variante fallida no detiene el barrido: se devuelve el error
+    try:
+        return evaluar_variante(contexto, variante), None
+    except Exception as e:
+        return None, str(e)
+
+
+# Contexto del proceso del pool (se recibe una vez en el inicializador)
+_contexto_proceso = None
+
+
+def _iniciar_proceso(contexto):
+    global _contexto_proceso
+    _contexto_proceso = contexto
+
+
+def _evaluar_en_proceso(variante):
+    return _evaluar_sin_excepcion(_contexto_proceso, variante)
+
+
+def evaluar_variantes(contexto: ContextoBarrido, variantes: List[VarianteBarrido], procesos: int = 1):
+
+    # Genera (variante, resultado_global, error) según van terminando. Con más de un
+    # proceso las variantes se reparten en un pool; si el consumidor deja de iterar
+    # (p. ej. por una cancelación) las variantes pendientes se descartan
+    if procesos <= 1 or len(variantes) <= 1:
+        for variante in variantes:
+            yield (variante, *_evaluar_sin_excepcion(contexto, variante))
+        return
+
+    executor = ProcessPoolExecutor(
+        max_workers=min(procesos, len(variantes)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_iniciar_proceso,
+        initargs=(contexto,)
+    )
+    try:
+        futuros = {executor.submit(_evaluar_en_proceso, variante): variante for variante in variantes}
+        for futuro in as_completed(futuros):
+            yield (futuros[futuro], *futuro.result())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
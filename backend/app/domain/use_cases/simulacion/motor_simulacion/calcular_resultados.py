@@ -1,5 +1,7 @@
+import copy
 from typing import List, Dict, Any
-from datetime import datetime
+
+import numpy as np
 
 from app.domain.entities.resultado_simulacion import ResultadoSimulacionEntity
 from app.domain.entities.resultado_simulacion_participante import ResultadoSimulacionParticipanteEntity
@@ -8,6 +10,13 @@ from app.domain.entities.resultado_simulacion_activo_almacenamiento import Resul
 from app.domain.entities.simulacion import SimulacionEntity
 from app.domain.entities.activo_generacion import ActivoGeneracionEntity
 from app.domain.entities.activo_almacenamiento import ActivoAlmacenamientoEntity
+from app.domain.use_cases.simulacion.motor_simulacion.intervalos_columnares import (
+    IntervalosColumnares,
+    IntervalosParticipantes,
+    IntervalosActivosGeneracion,
+    IntervalosActivosAlmacenamiento,
+)
+from app.domain.use_cases.simulacion.motor_simulacion.resolucion_temporal import horas_por_intervalo
 
 
 def calcular_termino_potencia(contrato, fecha_inicio, fecha_fin):
@@ -50,9 +59,11 @@ def calcular_factura_completa_espanola(coste_energia_bruto, termino_potencia):
     }
 
 
-def calcular_resultados_participantes(resultados_intervalo_participantes, contratos=None, simulacion=None):
+def calcular_resultados_participantes(resultados_intervalo_participantes, contratos=None, simulacion=None, participantes_dict=None):
     
-    participantes_dict = _agregar_datos_energeticos_participantes(resultados_intervalo_participantes)
+    # Si ya vienen agregados (agregación incremental) no se recorren los intervalos
+    if participantes_dict is None:
+        participantes_dict = _datos_agregados(_agregar_datos_energeticos_participantes(resultados_intervalo_participantes))
     
     resultados = []
     for participante_id, datos_agregados in participantes_dict.items():
@@ -84,52 +95,49 @@ def calcular_resultados_participantes(resultados_intervalo_participantes, contra
     return resultados
 
 
-def _agregar_datos_energeticos_participantes(resultados_intervalo_participantes):
+CAMPOS_ENERGETICOS_PARTICIPANTE = (
+    'consumoTotal_kWh',
+    'energiaAutoconsumidaDirecta_kWh',
+    'energiaRecibidaRepartoConsumida_kWh',
+    'energiaAlmacenamiento_kWh',
+    'energiaAlmacenamientoDescargada_kWh',
+    'energiaAlmacenamientoCargada_kWh',
+    'energiaImportadaRed_kWh',
+    'energiaExportadaRed_kWh',
+    'costeImportacion_eur',
+    'ingresoExportacion_eur',
+    'costeBaseEstimado_eur',
+)
+
+
+class AcumuladorParticipante:
     
-    participantes_dict = {}
+    # Totales y buckets mensuales de un participante, actualizados intervalo a intervalo
+    # (o con las sumas de un bloque) sin guardar los intervalos. `datos` mantiene el
+    # formato de diccionario que usan el cálculo de costes y de métricas
     
-    for resultado in resultados_intervalo_participantes:
-        participante_id = resultado.get('idParticipante')
-        timestamp = resultado.get('timestamp')
-        
-        if participante_id not in participantes_dict:
-            participantes_dict[participante_id] = {
-                'consumoTotal_kWh': 0.0,
-                'energiaAutoconsumidaDirecta_kWh': 0.0,
-                'energiaRecibidaRepartoConsumida_kWh': 0.0,
-                'energiaAlmacenamiento_kWh': 0.0,
-                'energiaAlmacenamientoDescargada_kWh': 0.0,
-                'energiaAlmacenamientoCargada_kWh': 0.0,
-                'energiaImportadaRed_kWh': 0.0,
-                'energiaExportadaRed_kWh': 0.0,
-                'costeImportacion_eur': 0.0,
-                'ingresoExportacion_eur': 0.0,
-                'costeBaseEstimado_eur': 0.0,
-                'numIntervalos': 0,
-                'datos_mensuales': {}
-            }
-        
-        datos_part = participantes_dict[participante_id]
-        
-        mes_key = _obtener_clave_mes(timestamp)
-        
-        if mes_key not in datos_part['datos_mensuales']:
-            datos_part['datos_mensuales'][mes_key] = {
-                'consumoTotal_kWh': 0.0,
-                'energiaAutoconsumidaDirecta_kWh': 0.0,
-                'energiaRecibidaRepartoConsumida_kWh': 0.0,
-                'energiaAlmacenamiento_kWh': 0.0,
-                'energiaAlmacenamientoDescargada_kWh': 0.0,
-                'energiaAlmacenamientoCargada_kWh': 0.0,
-                'energiaImportadaRed_kWh': 0.0,
-                'energiaExportadaRed_kWh': 0.0,
-                'costeImportacion_eur': 0.0,
-                'ingresoExportacion_eur': 0.0,
-                'costeBaseEstimado_eur': 0.0,
-                'numIntervalos': 0
-            }
-        
-        datos_mes = datos_part['datos_mensuales'][mes_key]
+    def __init__(self):
+        self.datos = self._nuevo_bucket()
+        self.datos['datos_mensuales'] = {}
+    
+    @staticmethod
+    def _nuevo_bucket():
+        bucket = {campo: 0.0 for campo in CAMPOS_ENERGETICOS_PARTICIPANTE}
+        bucket['numIntervalos'] = 0
+        return bucket
+    
+    def sumar(self, mes_key, num_intervalos=1, **incrementos):
+        datos_mes = self.datos['datos_mensuales'].get(mes_key)
+        if datos_mes is None:
+            datos_mes = self.datos['datos_mensuales'][mes_key] = self._nuevo_bucket()
+        
+        for campo, valor in incrementos.items():
+            self.datos[campo] += valor
+            datos_mes[campo] += valor
+        self.datos['numIntervalos'] += num_intervalos
+        datos_mes['numIntervalos'] += num_intervalos
+    
+    def actualizar(self, resultado):
         
         consumo = resultado.get('consumoReal_kWh', 0) or 0
         autoconsumo = resultado.get('autoconsumo_kWh', 0) or 0
@@ -138,46 +146,47 @@ def _agregar_datos_energeticos_participantes(resultados_intervalo_participantes)
         excedente_vertido = resultado.get('excedenteVertidoCompensado_kWh', 0) or 0
         diferencia = resultado.get('energiaDiferencia_kWh', 0) or 0
         
-        
         if diferencia < 0:
             energia_importada = abs(diferencia - energia_almacenamiento)
         else:
             energia_importada = 0
-            
-                    
+        
         precio_importacion = resultado.get('precioImportacionIntervalo', 0) or 0
         precio_exportacion = resultado.get('precioExportacionIntervalo', 0) or 0
         
-        coste_importacion = energia_importada * precio_importacion
-        ingreso_exportacion = excedente_vertido * precio_exportacion
-        
-        datos_part['consumoTotal_kWh'] += consumo
-        datos_part['energiaAutoconsumidaDirecta_kWh'] += autoconsumo
-        datos_part['energiaRecibidaRepartoConsumida_kWh'] += energia_recibida_reparto
-        datos_part['energiaAlmacenamiento_kWh'] += energia_almacenamiento
-        datos_part['energiaAlmacenamientoDescargada_kWh'] += energia_almacenamiento if energia_almacenamiento < 0 else 0
-        datos_part['energiaAlmacenamientoCargada_kWh'] += energia_almacenamiento if energia_almacenamiento > 0 else 0
-        datos_part['energiaImportadaRed_kWh'] += energia_importada
-        datos_part['energiaExportadaRed_kWh'] += excedente_vertido
-        datos_part['costeImportacion_eur'] += coste_importacion
-        datos_part['ingresoExportacion_eur'] += ingreso_exportacion
-        datos_part['costeBaseEstimado_eur'] += consumo * precio_importacion
-        datos_part['numIntervalos'] += 1
-        
-        datos_mes['consumoTotal_kWh'] += consumo
-        datos_mes['energiaAutoconsumidaDirecta_kWh'] += autoconsumo
-        datos_mes['energiaRecibidaRepartoConsumida_kWh'] += energia_recibida_reparto
-        datos_mes['energiaAlmacenamiento_kWh'] += energia_almacenamiento
-        datos_mes['energiaAlmacenamientoDescargada_kWh'] += energia_almacenamiento if energia_almacenamiento < 0 else 0
-        datos_mes['energiaAlmacenamientoCargada_kWh'] += energia_almacenamiento if energia_almacenamiento > 0 else 0
-        datos_mes['energiaImportadaRed_kWh'] += energia_importada
-        datos_mes['energiaExportadaRed_kWh'] += excedente_vertido
-        datos_mes['costeImportacion_eur'] += coste_importacion
-        datos_mes['ingresoExportacion_eur'] += ingreso_exportacion
-        datos_mes['costeBaseEstimado_eur'] += consumo * precio_importacion
-        datos_mes['numIntervalos'] += 1
-    
-    return participantes_dict
+        self.sumar(
+            _obtener_clave_mes(resultado.get('timestamp')),
+            consumoTotal_kWh=consumo,
+            energiaAutoconsumidaDirecta_kWh=autoconsumo,
+            energiaRecibidaRepartoConsumida_kWh=energia_recibida_reparto,
+            energiaAlmacenamiento_kWh=energia_almacenamiento,
+            energiaAlmacenamientoDescargada_kWh=energia_almacenamiento if energia_almacenamiento < 0 else 0,
+            energiaAlmacenamientoCargada_kWh=energia_almacenamiento if energia_almacenamiento > 0 else 0,
+            energiaImportadaRed_kWh=energia_importada,
+            energiaExportadaRed_kWh=excedente_vertido,
+            costeImportacion_eur=energia_importada * precio_importacion,
+            ingresoExportacion_eur=excedente_vertido * precio_exportacion,
+            costeBaseEstimado_eur=consumo * precio_importacion
+        )
+
+
+def _agregar_datos_energeticos_participantes(resultados_intervalo_participantes, acumuladores=None):
+    
+    if acumuladores is None:
+        acumuladores = {}
+    
+    for resultado in resultados_intervalo_participantes:
+        participante_id = resultado.get('idParticipante')
+        acumulador = acumuladores.get(participante_id)
+        if acumulador is None:
+            acumulador = acumuladores[participante_id] = AcumuladorParticipante()
+        acumulador.actualizar(resultado)
+    
+    return acumuladores
+
+
+def _datos_agregados(acumuladores):
+    return {clave: acumulador.datos for clave, acumulador in acumuladores.items()}
 
 
 def _calcular_costes_economicos_mensuales(datos_agregados, contrato, simulacion, participante_id):
@@ -330,44 +339,69 @@ def _mostrar_desglose_calculo(participante_id, costes_economicos, datos_agregado
 
 def calcular_resultados_activos_gen(resultados_intervalo_activos, activos_gen):
     
-    activos_gen_dict = {}
-    
-    mapa_activos = {activo.idActivoGeneracion: activo for activo in activos_gen}
-    
     if resultados_intervalo_activos:
         timestamps = set(resultado.get('timestamp') for resultado in resultados_intervalo_activos)
         horas_simulacion = len(timestamps)
     else:
         horas_simulacion = 0
     
-    print(f"  • Duración de la simulación: {horas_simulacion} horas")
+    acumuladores = _agregar_datos_activos_gen(resultados_intervalo_activos)
+    return _calcular_resultados_activos_gen_agregados(_datos_agregados(acumuladores), activos_gen, horas_simulacion)
+
+
+class AcumuladorActivoGeneracion:
     
-    for resultado in resultados_intervalo_activos:
-        activo_id = resultado.get('idActivoGeneracion')
-        if activo_id not in activos_gen_dict:
-            activos_gen_dict[activo_id] = {
-                'idActivoGeneracion': activo_id,
-                'energiaTotalGenerada_kWh': 0.0,
-                'horasProduccionEfectiva': 0,
-                'potenciaTotal_kW': 0.0,
-                'numIntervalos': 0,
-                'radiacion_total': 0.0,    
-                'intervalos_con_radiacion': 0  
-            }
-        
-        datos_activo = activos_gen_dict[activo_id]
+    def __init__(self, activo_id):
+        self.datos = {
+            'idActivoGeneracion': activo_id,
+            'energiaTotalGenerada_kWh': 0.0,
+            'horasProduccionEfectiva': 0,
+            'potenciaTotal_kW': 0.0,
+            'numIntervalos': 0,
+            'radiacion_total': 0.0,
+            'intervalos_con_radiacion': 0
+        }
+    
+    def sumar(self, energia_generada, num_intervalos=1, horas_produccion=0, radiacion=0.0, intervalos_con_radiacion=0):
+        datos = self.datos
+        datos['energiaTotalGenerada_kWh'] += energia_generada
+        datos['potenciaTotal_kW'] += energia_generada
+        datos['numIntervalos'] += num_intervalos
+        datos['horasProduccionEfectiva'] += horas_produccion
+        datos['radiacion_total'] += radiacion
+        datos['intervalos_con_radiacion'] += intervalos_con_radiacion
+    
+    def actualizar(self, resultado):
         energia_generada = resultado.get('energiaGenerada_kWh', 0) or 0
-        datos_activo['energiaTotalGenerada_kWh'] += energia_generada
-        datos_activo['numIntervalos'] += 1
-        datos_activo['potenciaTotal_kW'] += energia_generada
-        
-        if energia_generada > 0:
-            datos_activo['horasProduccionEfectiva'] += 1
-        
         radiacion = resultado.get('radiacion_kWh_m2', 0) or 0
-        if radiacion > 0:
-            datos_activo['radiacion_total'] += radiacion
-            datos_activo['intervalos_con_radiacion'] += 1
+        self.sumar(
+            energia_generada,
+            horas_produccion=1 if energia_generada > 0 else 0,
+            radiacion=radiacion if radiacion > 0 else 0.0,
+            intervalos_con_radiacion=1 if radiacion > 0 else 0
+        )
+
+
+def _agregar_datos_activos_gen(resultados_intervalo_activos, acumuladores=None):
+    
+    if acumuladores is None:
+        acumuladores = {}
+    
+    for resultado in resultados_intervalo_activos:
+        activo_id = resultado.get('idActivoGeneracion')
+        acumulador = acumuladores.get(activo_id)
+        if acumulador is None:
+            acumulador = acumuladores[activo_id] = AcumuladorActivoGeneracion(activo_id)
+        acumulador.actualizar(resultado)
+    
+    return acumuladores
+
+
+def _calcular_resultados_activos_gen_agregados(activos_gen_dict, activos_gen, horas_simulacion):
+    
+    mapa_activos = {activo.idActivoGeneracion: activo for activo in activos_gen}
+    
+    print(f"  • Duración de la simulación: {horas_simulacion:g} horas")
     
     resultados = []
     for activo_id, datos in activos_gen_dict.items():
@@ -415,50 +449,107 @@ def calcular_resultados_activos_gen(resultados_intervalo_activos, activos_gen):
 
 def calcular_resultados_activos_alm(resultados_intervalo_activos, activos_alm):
     
-    activos_alm_dict = {}
-    
-    mapa_activos = {activo.idActivoAlmacenamiento: activo for activo in activos_alm}
+    acumuladores = _agregar_datos_activos_alm(resultados_intervalo_activos)
+    return _calcular_resultados_activos_alm_agregados(_datos_agregados(acumuladores), activos_alm)
+
+
+class AcumuladorActivoAlmacenamiento:
+    
+    # El SoC se resume con estadísticos acumulados (suma, mínimo, máximo) y la profundidad
+    # de descarga con la suma y el número de descensos entre intervalos consecutivos,
+    # así no hace falta guardar la serie de SoC de cada batería
+    
+    def __init__(self, activo_id):
+        self.soc_anterior = None
+        self.datos = {
+            'idActivoAlmacenamiento': activo_id,
+            'energiaTotalCargada_kWh': 0.0,
+            'energiaTotalDescargada_kWh': 0.0,
+            'ciclosCompletos': 0.0,
+            'horasCarga': 0,
+            'horasDescarga': 0,
+            'horasInactivo': 0,
+            'soc_suma_kWh': 0.0,
+            'soc_max_kWh': 0.0,
+            'soc_min_kWh': float('inf'),
+            'dod_suma_kWh': 0.0,
+            'dod_descensos': 0,
+            'numIntervalos': 0
+        }
     
-    for resultado in resultados_intervalo_activos:
-        activo_id = resultado.get('idActivoAlmacenamiento')
-        if activo_id not in activos_alm_dict:
-            activos_alm_dict[activo_id] = {
-                'idActivoAlmacenamiento': activo_id,
-                'energiaTotalCargada_kWh': 0.0,
-                'energiaTotalDescargada_kWh': 0.0,
-                'ciclosCompletos': 0.0,
-                'horasCarga': 0,
-                'horasDescarga': 0,
-                'horasInactivo': 0,
-                'soc_suma_kWh': 0.0,
-                'soc_valores': [],  
-                'soc_max_kWh': 0.0,
-                'soc_min_kWh': float('inf'),
-                'numIntervalos': 0
-            }
-        
-        datos_activo = activos_alm_dict[activo_id]
+    def actualizar(self, resultado):
+        datos = self.datos
         energia_cargada = resultado.get('energiaCargada_kWh', 0) or 0
         energia_descargada = resultado.get('energiaDescargada_kWh', 0) or 0
         soc_actual = resultado.get('SoC_kWh', 0) or 0
         
-        datos_activo['energiaTotalCargada_kWh'] += energia_cargada
-        datos_activo['energiaTotalDescargada_kWh'] += energia_descargada
-        datos_activo['soc_suma_kWh'] += soc_actual
-        datos_activo['soc_valores'].append(soc_actual)
-        datos_activo['numIntervalos'] += 1
+        datos['energiaTotalCargada_kWh'] += energia_cargada
+        datos['energiaTotalDescargada_kWh'] += energia_descargada
+        datos['soc_suma_kWh'] += soc_actual
+        datos['numIntervalos'] += 1
+        
+        if soc_actual > datos['soc_max_kWh']:
+            datos['soc_max_kWh'] = soc_actual
+        if soc_actual < datos['soc_min_kWh']:
+            datos['soc_min_kWh'] = soc_actual
         
-        if soc_actual > datos_activo['soc_max_kWh']:
-            datos_activo['soc_max_kWh'] = soc_actual
-        if soc_actual < datos_activo['soc_min_kWh']:
-            datos_activo['soc_min_kWh'] = soc_actual
+        if self.soc_anterior is not None and self.soc_anterior > soc_actual:
+            datos['dod_suma_kWh'] += self.soc_anterior - soc_actual
+            datos['dod_descensos'] += 1
+        self.soc_anterior = soc_actual
         
         if energia_cargada > 0:
-            datos_activo['horasCarga'] += 1
+            datos['horasCarga'] += 1
         elif energia_descargada > 0:
-            datos_activo['horasDescarga'] += 1
+            datos['horasDescarga'] += 1
         else:
-            datos_activo['horasInactivo'] += 1
+            datos['horasInactivo'] += 1
+    
+    def actualizar_serie(self, energia_cargada, energia_descargada, soc):
+        
+        # Versión por bloques para los arrays de la simulación vectorizada (en el orden de emisión)
+        if len(soc) == 0:
+            return
+        datos = self.datos
+        datos['energiaTotalCargada_kWh'] += float(energia_cargada.sum())
+        datos['energiaTotalDescargada_kWh'] += float(energia_descargada.sum())
+        datos['soc_suma_kWh'] += float(soc.sum())
+        datos['numIntervalos'] += len(soc)
+        datos['soc_max_kWh'] = max(datos['soc_max_kWh'], float(soc.max()))
+        datos['soc_min_kWh'] = min(datos['soc_min_kWh'], float(soc.min()))
+        
+        serie = soc if self.soc_anterior is None else np.concatenate(([self.soc_anterior], soc))
+        descensos = -np.diff(serie)
+        descensos = descensos[descensos > 0]
+        datos['dod_suma_kWh'] += float(descensos.sum())
+        datos['dod_descensos'] += len(descensos)
+        self.soc_anterior = float(soc[-1])
+        
+        carga = energia_cargada > 0
+        descarga = ~carga & (energia_descargada > 0)
+        datos['horasCarga'] += int(carga.sum())
+        datos['horasDescarga'] += int(descarga.sum())
+        datos['horasInactivo'] += len(soc) - int(carga.sum()) - int(descarga.sum())
+
+
+def _agregar_datos_activos_alm(resultados_intervalo_activos, acumuladores=None):
+    
+    if acumuladores is None:
+        acumuladores = {}
+    
+    for resultado in resultados_intervalo_activos:
+        activo_id = resultado.get('idActivoAlmacenamiento')
+        acumulador = acumuladores.get(activo_id)
+        if acumulador is None:
+            acumulador = acumuladores[activo_id] = AcumuladorActivoAlmacenamiento(activo_id)
+        acumulador.actualizar(resultado)
+    
+    return acumuladores
+
+
+def _calcular_resultados_activos_alm_agregados(activos_alm_dict, activos_alm):
+    
+    mapa_activos = {activo.idActivoAlmacenamiento: activo for activo in activos_alm}
     
     resultados = []
     for activo_id, datos in activos_alm_dict.items():
@@ -488,14 +579,10 @@ def calcular_resultados_activos_alm(resultados_intervalo_activos, activos_alm):
         degradacion_por_ciclo = 0.004
         degradacion_estimada = ciclos_equivalentes * degradacion_por_ciclo
         
-        if len(datos['soc_valores']) > 1:
-            dod_valores = []
-            for i in range(1, len(datos['soc_valores'])):
-                dif = datos['soc_valores'][i-1] - datos['soc_valores'][i]
-                if dif > 0:
-                    dod_valores.append(dif / capacidad_nominal * 100)
-            
-            dod_medio = sum(dod_valores) / len(dod_valores) if dod_valores else 0
+        if datos['numIntervalos'] > 1:
+            dod_medio = 0
+            if datos['dod_descensos'] > 0:
+                dod_medio = datos['dod_suma_kWh'] / datos['dod_descensos'] / capacidad_nominal * 100
             
             factor_dod = 1.0 + (dod_medio / 100)
             degradacion_estimada *= factor_dod
@@ -532,10 +619,18 @@ def calcular_resultados_globales(simulacion, resultados_participantes,
                                resultados_intervalo_activos_almacenamiento,
                                resultados_intervalo_participantes=None,
                                activos_gen=None, activos_alm=None):
+    
+    participantes_dict = _datos_agregados(_agregar_datos_energeticos_participantes(resultados_intervalo_participantes)) if resultados_intervalo_participantes else {}
+    return _calcular_resultado_global_agregado(simulacion, resultados_participantes, participantes_dict, activos_gen, activos_alm)
+
+
+def _calcular_resultado_global_agregado(simulacion, resultados_participantes, participantes_dict,
+                                        activos_gen=None, activos_alm=None):
     total_consumo = 0.0
     total_autoconsumo = 0.0
     total_energia_reparto = 0.0
     total_energia_almacenamiento_descargada = 0.0
+    total_energia_almacenamiento_cargada = 0.0
     coste_total_energia = 0.0
     ahorro_total = 0.0
     total_ingreso_exportacion = 0.0
@@ -547,30 +642,16 @@ def calcular_resultados_globales(simulacion, resultados_participantes,
         coste_total_energia += resultado_participante.costeNetoParticipante_eur
         ahorro_total += resultado_participante.ahorroParticipante_eur
     
-    total_energia_almacenamiento_cargada = 0.0
-    if resultados_intervalo_participantes:
-        for resultado in resultados_intervalo_participantes:
-            energia_almacenamiento = resultado.get('energiaAlmacenamiento_kWh', 0) or 0
-            if energia_almacenamiento < 0:
-                total_energia_almacenamiento_descargada += energia_almacenamiento
-            elif energia_almacenamiento > 0:
-                total_energia_almacenamiento_cargada += energia_almacenamiento
-        
-
-    
-    total_generacion = 0.0
     total_importacion = 0.0
     total_exportacion = 0.0
     
-    for resultado in resultados_intervalo_activos_generacion:
-        total_generacion += resultado.get('energiaGenerada_kWh', 0) or 0
-    
     # Calcular totales desde los datos agregados de participantes (no desde intervalos)
-    participantes_dict = _agregar_datos_energeticos_participantes(resultados_intervalo_participantes) if resultados_intervalo_participantes else {}
     for participante_id, datos_agregados in participantes_dict.items():
         total_importacion += datos_agregados['energiaImportadaRed_kWh']
         total_exportacion += datos_agregados['energiaExportadaRed_kWh']
         total_ingreso_exportacion += datos_agregados['ingresoExportacion_eur']
+        total_energia_almacenamiento_descargada += datos_agregados['energiaAlmacenamientoDescargada_kWh']
+        total_energia_almacenamiento_cargada += datos_agregados['energiaAlmacenamientoCargada_kWh']
     
     datos_agregados = {
         'consumoTotal_kWh': total_consumo,
@@ -643,24 +724,202 @@ def calcular_resultados_globales(simulacion, resultados_participantes,
     return resultado_global
 
 
+def _grupos_por_id(intervalos):
+    
+    # Ids únicos en orden de primera aparición e índice de grupo de cada fila
+    ids_unicos, primera_aparicion, idx_grupo = np.unique(intervalos.ids(), return_index=True, return_inverse=True)
+    orden = np.argsort(primera_aparicion, kind='stable')
+    rango = np.empty_like(orden)
+    rango[orden] = np.arange(len(orden))
+    return ids_unicos[orden].tolist(), rango[idx_grupo]
+
+
+def _agregar_columnas_participantes(intervalos, acumuladores):
+    
+    if len(intervalos) == 0:
+        return
+    
+    ids, idx_id = _grupos_por_id(intervalos)
+    claves_mes, idx_mes_eje = np.unique([_obtener_clave_mes(ts) for ts in intervalos.timestamps], return_inverse=True)
+    idx_mes = idx_mes_eje.reshape(-1)[intervalos.idx_tiempo()]
+    num_meses = len(claves_mes)
+    grupos = idx_id * num_meses + idx_mes
+    num_grupos = len(ids) * num_meses
+    
+    def sumar(valores):
+        return np.bincount(grupos, weights=valores, minlength=num_grupos).reshape(len(ids), num_meses)
+    
+    columna = lambda campo: np.nan_to_num(intervalos.columna(campo), nan=0.0)
+    consumo = columna('consumoReal_kWh')
+    almacenamiento = columna('energiaAlmacenamiento_kWh')
+    diferencia = columna('energiaDiferencia_kWh')
+    excedente = columna('excedenteVertidoCompensado_kWh')
+    precio_importacion = columna('precioImportacionIntervalo')
+    precio_exportacion = columna('precioExportacionIntervalo')
+    energia_importada = np.where(diferencia < 0, np.abs(diferencia - almacenamiento), 0.0)
+    
+    sumas = {
+        'consumoTotal_kWh': sumar(consumo),
+        'energiaAutoconsumidaDirecta_kWh': sumar(columna('autoconsumo_kWh')),
+        'energiaRecibidaRepartoConsumida_kWh': sumar(columna('energiaRecibidaReparto_kWh')),
+        'energiaAlmacenamiento_kWh': sumar(almacenamiento),
+        'energiaAlmacenamientoDescargada_kWh': sumar(np.where(almacenamiento < 0, almacenamiento, 0.0)),
+        'energiaAlmacenamientoCargada_kWh': sumar(np.where(almacenamiento > 0, almacenamiento, 0.0)),
+        'energiaImportadaRed_kWh': sumar(energia_importada),
+        'energiaExportadaRed_kWh': sumar(excedente),
+        'costeImportacion_eur': sumar(energia_importada * precio_importacion),
+        'ingresoExportacion_eur': sumar(excedente * precio_exportacion),
+        'costeBaseEstimado_eur': sumar(consumo * precio_importacion),
+    }
+    conteos = np.bincount(grupos, minlength=num_grupos).reshape(len(ids), num_meses)
+    
+    for idx_p, participante_id in enumerate(ids):
+        acumulador = acumuladores.get(participante_id)
+        if acumulador is None:
+            acumulador = acumuladores[participante_id] = AcumuladorParticipante()
+        for idx_m, mes_key in enumerate(claves_mes.tolist()):
+            if conteos[idx_p, idx_m] == 0:
+                continue
+            acumulador.sumar(
+                mes_key, int(conteos[idx_p, idx_m]),
+                **{campo: float(valores[idx_p, idx_m]) for campo, valores in sumas.items()}
+            )
+
+
+def _agregar_columnas_activos_gen(intervalos, acumuladores):
+    
+    if len(intervalos) == 0:
+        return
+    
+    ids, idx_id = _grupos_por_id(intervalos)
+    energia = np.nan_to_num(intervalos.columna('energiaGenerada_kWh'), nan=0.0)
+    energia_total = np.bincount(idx_id, weights=energia, minlength=len(ids))
+    num_intervalos = np.bincount(idx_id, minlength=len(ids))
+    horas_produccion = np.bincount(idx_id, weights=(energia > 0).astype(np.float64), minlength=len(ids))
+    
+    for idx_a, activo_id in enumerate(ids):
+        acumulador = acumuladores.get(activo_id)
+        if acumulador is None:
+            acumulador = acumuladores[activo_id] = AcumuladorActivoGeneracion(activo_id)
+        acumulador.sumar(float(energia_total[idx_a]), int(num_intervalos[idx_a]),
+                         horas_produccion=int(horas_produccion[idx_a]))
+
+
+def _agregar_columnas_activos_alm(intervalos, acumuladores):
+    
+    if len(intervalos) == 0:
+        return
+    
+    # El DoD depende del orden de la serie de SoC de cada batería: se conserva el de las filas
+    ids, idx_id = _grupos_por_id(intervalos)
+    cargada = np.nan_to_num(intervalos.columna('energiaCargada_kWh'), nan=0.0)
+    descargada = np.nan_to_num(intervalos.columna('energiaDescargada_kWh'), nan=0.0)
+    soc = np.nan_to_num(intervalos.columna('SoC_kWh'), nan=0.0)
+    
+    for idx_b, activo_id in enumerate(ids):
+        acumulador = acumuladores.get(activo_id)
+        if acumulador is None:
+            acumulador = acumuladores[activo_id] = AcumuladorActivoAlmacenamiento(activo_id)
+        filas = idx_id == idx_b
+        acumulador.actualizar_serie(cargada[filas], descargada[filas], soc[filas])
+
+
+class AgregadorResultados:
+    
+    # Agregación incremental: el motor le pasa los intervalos (uno a uno o por bloques)
+    # a medida que se simulan y al final calcula los resultados sin volver a recorrerlos.
+    # Los bloques columnares se agregan con numpy; las listas de diccionarios, registro a registro
+    
+    def __init__(self):
+        self.participantes = {}
+        self.activos_gen = {}
+        self.activos_alm = {}
+        self.intervalos_simulacion = 0
+    
+    def agregar(self, intervalos_participantes, intervalos_activos_gen, intervalos_activos_alm):
+        if isinstance(intervalos_participantes, IntervalosColumnares):
+            _agregar_columnas_participantes(intervalos_participantes, self.participantes)
+        else:
+            _agregar_datos_energeticos_participantes(intervalos_participantes, self.participantes)
+        
+        # Los bloques no se solapan en el tiempo: basta con sumar los intervalos de cada uno
+        if isinstance(intervalos_activos_gen, IntervalosColumnares):
+            _agregar_columnas_activos_gen(intervalos_activos_gen, self.activos_gen)
+            self.intervalos_simulacion += len(np.unique(intervalos_activos_gen.idx_tiempo()))
+        else:
+            _agregar_datos_activos_gen(intervalos_activos_gen, self.activos_gen)
+            self.intervalos_simulacion += len(set(resultado.get('timestamp') for resultado in intervalos_activos_gen))
+        
+        if isinstance(intervalos_activos_alm, IntervalosColumnares):
+            _agregar_columnas_activos_alm(intervalos_activos_alm, self.activos_alm)
+        else:
+            _agregar_datos_activos_alm(intervalos_activos_alm, self.activos_alm)
+    
+    def calcular(self, simulacion, activos_gen, activos_alm, contratos=None):
+        participantes_dict = _datos_agregados(self.participantes)
+        resultados_participantes = calcular_resultados_participantes(
+            None, contratos, simulacion, participantes_dict=participantes_dict
+        )
+        resultados_activos_gen = _calcular_resultados_activos_gen_agregados(
+            _datos_agregados(self.activos_gen), activos_gen, self.intervalos_simulacion * horas_por_intervalo(simulacion)
+        )
+        resultados_activos_alm = _calcular_resultados_activos_alm_agregados(_datos_agregados(self.activos_alm), activos_alm)
+        resultado_global = _calcular_resultado_global_agregado(
+            simulacion, resultados_participantes, participantes_dict, activos_gen, activos_alm
+        )
+        return resultado_global, resultados_participantes, resultados_activos_gen, resultados_activos_alm
+    
+    def exportar_estado(self) -> Dict[str, Any]:
+        
+        # Sumas acumuladas como datos planos (los ids pasan a texto como claves JSON); es una
+        # copia, el agregador puede seguir acumulando mientras se guarda
+        return {
+            'participantes': {str(id_p): copy.deepcopy(acumulador.datos) for id_p, acumulador in self.participantes.items()},
+            'activos_gen': {str(id_a): dict(acumulador.datos) for id_a, acumulador in self.activos_gen.items()},
+            'activos_alm': {
+                str(id_a): {'datos': dict(acumulador.datos), 'soc_anterior': acumulador.soc_anterior}
+                for id_a, acumulador in self.activos_alm.items()
+            },
+            'intervalos_simulacion': self.intervalos_simulacion,
+        }
+    
+    @classmethod
+    def desde_estado(cls, estado: Dict[str, Any]) -> 'AgregadorResultados':
+        
+        # Inversa de exportar_estado; un estado incompleto es un error (ValueError/KeyError)
+        agregador = cls()
+        for id_p, datos in estado['participantes'].items():
+            acumulador = agregador.participantes[int(id_p)] = AcumuladorParticipante()
+            _restaurar_datos(acumulador, datos)
+        for id_a, datos in estado['activos_gen'].items():
+            acumulador = agregador.activos_gen[int(id_a)] = AcumuladorActivoGeneracion(int(id_a))
+            _restaurar_datos(acumulador, datos)
+        for id_a, estado_alm in estado['activos_alm'].items():
+            acumulador = agregador.activos_alm[int(id_a)] = AcumuladorActivoAlmacenamiento(int(id_a))
+            _restaurar_datos(acumulador, estado_alm['datos'])
+            acumulador.soc_anterior = estado_alm['soc_anterior']
+        agregador.intervalos_simulacion = int(estado['intervalos_simulacion'])
+        return agregador
+
+
+def _restaurar_datos(acumulador, datos):
+    
+    if set(datos) != set(acumulador.datos):
+        raise ValueError(f"Campos inesperados en el estado de {type(acumulador).__name__}")
+    acumulador.datos = datos
+
+
 def calcular_todos_resultados(simulacion: SimulacionEntity, 
-                               resultados_intervalo_participantes: List[Dict[str, Any]],
-                               resultados_intervalo_activos_generacion: List[Dict[str, Any]],
-                               resultados_intervalo_activos_almacenamiento: List[Dict[str, Any]],
+                               resultados_intervalo_participantes: IntervalosParticipantes,
+                               resultados_intervalo_activos_generacion: IntervalosActivosGeneracion,
+                               resultados_intervalo_activos_almacenamiento: IntervalosActivosAlmacenamiento,
                                activos_gen: List[ActivoGeneracionEntity], 
                                activos_alm: List[ActivoAlmacenamientoEntity],
                                contratos: Dict[int, Any] = None) -> Dict[str, Any]:
-    resultados_participantes = calcular_resultados_participantes(resultados_intervalo_participantes, contratos, simulacion)
-    
-    resultados_activos_gen = calcular_resultados_activos_gen(resultados_intervalo_activos_generacion, activos_gen)
-    
-    resultados_activos_alm = calcular_resultados_activos_alm(resultados_intervalo_activos_almacenamiento, activos_alm)
-    
-    resultado_global = calcular_resultados_globales(simulacion, 
-                                                    resultados_participantes,
-                                                    resultados_intervalo_activos_generacion,
-                                                    resultados_intervalo_activos_almacenamiento,
-                                                    resultados_intervalo_participantes,
-                                                    activos_gen, activos_alm)
-    
-    return resultado_global, resultados_participantes, resultados_activos_gen, resultados_activos_alm
\ No newline at end of file
+    agregador = AgregadorResultados()
+    agregador.agregar(
+        resultados_intervalo_participantes,
+        resultados_intervalo_activos_generacion,
+        resultados_intervalo_activos_almacenamiento
+    )
+    return agregador.calcular(simulacion, activos_gen, activos_alm, contratos)
@@ -0,0 +1,81 @@
+import hashlib
+import json
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.domain.use_cases.simulacion.motor_simulacion.plan_coeficientes import PlanCoeficientesReparto
+
+
+# Se incrementa cuando cambia el cálculo del motor: las huellas anteriores dejan de coincidir
+VERSION_CALCULO = 1
+
+
+def calcular_huella_entradas(
+    simulacion,
+    comunidad,
+    participantes: List[Any],
+    activos_gen: List[Any],
+    activos_alm: List[Any],
+    contratos: Dict[int, Any],
+    coeficientes: PlanCoeficientesReparto,
+    resumen_consumo: List[Tuple],
+    resumen_pvpc: Optional[Tuple],
+    fuente_pv: str
+) -> str:
+
+    # SHA-256 determinista de todo lo que determina el resultado. La configuración (pocas
+    # filas) entra completa; los consumos y precios PVPC de la ventana, por su resumen
+    # agregado (registros, suma, suma ponderada por posición y extremos), que se obtiene sin
+    # leer las filas. El nombre, el estado y el creador de la simulación no afectan al
+    # resultado
+    entradas = {
+        'version': VERSION_CALCULO,
+        'fuentePV': fuente_pv,
+        'simulacion': {
+            'fechaInicio': simulacion.fechaInicio,
+            'fechaFin': simulacion.fechaFin,
+            'tiempo_medicion': simulacion.tiempo_medicion,
+            'tipoEstrategiaExcedentes': simulacion.tipoEstrategiaExcedentes,
+            'idComunidadEnergetica': simulacion.idComunidadEnergetica,
+        },
+        'comunidad': comunidad,
+        'participantes': sorted(participantes, key=lambda p: p.idParticipante),
+        'activosGeneracion': sorted(activos_gen, key=lambda a: a.idActivoGeneracion),
+        'activosAlmacenamiento': sorted(activos_alm, key=lambda a: a.idActivoAlmacenamiento),
+        'contratos': {str(id_p): contrato for id_p, contrato in sorted(contratos.items())},
+        'coeficientes': {
+            'participantes': coeficientes.ids_participantes,
+            'matrizHoraria': coeficientes.matriz_horaria.tolist(),
+        },
+        'consumo': resumen_consumo,
+        'pvpc': resumen_pvpc,
+    }
+    contenido = json.dumps(_normalizar(entradas), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def _normalizar(valor):
+
+    if is_dataclass(valor) and not isinstance(valor, type):
+        return _normalizar(asdict(valor))
+    if isinstance(valor, dict):
+        return {str(clave): _normalizar(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(v) for v in valor]
+    if isinstance(valor, Enum):
+        return valor.value
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, float) and valor != valor:
+        return None  # NaN (participante sin coeficiente en una franja)
+    if isinstance(valor, float):
+        # 12 cifras significativas: las sumas agregadas en BD no dependen del orden de suma
+        return float(f"{valor:.12g}")
+    if isinstance(valor, Decimal):
+        return _normalizar(float(valor))  # Sumas agregadas en BD
+    if valor is None or isinstance(valor, (str, int, bool)):
+        return valor
+    return str(valor)
@@ -0,0 +1,191 @@
+from datetime import datetime, timedelta
+from typing import List, Dict, Tuple, Optional
+import numpy as np
+
+from app.domain.entities.datos_ambientales import DatosAmbientalesEntity
+
+
+# Modelo FV local: a partir de una única serie horaria de irradiancia horizontal
+# (GHI, con componentes directa/difusa si están disponibles) y temperatura se
+# calcula la generación de cualquier número de instalaciones. Pasos:
+#   1. Posición solar (Spencer) en el centro de cada hora
+#   2. Separación directa/difusa (Erbs) cuando no vienen las componentes
+#   3. Transposición al plano del panel (modelo isotrópico + albedo)
+#   4. Temperatura de célula (Faiman) y pérdida por temperatura
+
+CONSTANTE_SOLAR_W_M2 = 1367.0
+ALBEDO_SUELO = 0.2
+COS_CENIT_MINIMO = 0.065  # ~86º: por debajo se descarta la componente directa
+
+# Coeficientes de Faiman (W/m²K, W·s/m³K) como los usa PVGIS para silicio cristalino
+FAIMAN_U0 = 26.9
+FAIMAN_U1 = 6.2
+
+# Coeficiente de temperatura de potencia (1/ºC) por tecnología PVGIS
+COEFICIENTE_TEMPERATURA = {
+    'crystSi': -0.0040,
+    'CIS': -0.0036,
+    'CdTe': -0.0025,
+    'Unknown': -0.0040,
+}
+
+
+def parametros_instalacion(activo) -> Tuple[float, float, float, float]:
+
+    # Mismos valores por defecto que el precálculo con PVGIS
+    if (activo.inclinacionGrados is None or
+        activo.azimutGrados is None or
+        activo.potenciaNominal_kWp is None or
+        activo.perdidaSistema is None):
+        inclinacion = activo.inclinacionGrados or 35.0  # Valor típico en España
+        azimut = activo.azimutGrados or 0.0  # 0 = orientación sur
+        potencia = activo.potenciaNominal_kWp or 1.0  # Valor mínimo para evitar error
+        perdida = activo.perdidaSistema or 14.0  # Valor típico
+    else:
+        inclinacion = activo.inclinacionGrados
+        azimut = activo.azimutGrados
+        potencia = activo.potenciaNominal_kWp
+        perdida = activo.perdidaSistema
+    return inclinacion, azimut, potencia, perdida
+
+
+def posicion_solar(timestamps: List[datetime], lat: float, lon: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+
+    # Timestamps en UTC (naive) al inicio de hora: se evalúa en el centro del intervalo
+    instantes = [ts + timedelta(minutes=30) for ts in timestamps]
+    dia_anio = np.array([t.timetuple().tm_yday for t in instantes], dtype=np.float64)
+    minutos_utc = np.array([t.hour * 60 + t.minute for t in instantes], dtype=np.float64)
+
+    gamma = 2 * np.pi * (dia_anio - 1) / 365.0
+    declinacion = (0.006918 - 0.399912 * np.cos(gamma) + 0.070257 * np.sin(gamma)
+                   - 0.006758 * np.cos(2 * gamma) + 0.000907 * np.sin(2 * gamma)
+                   - 0.002697 * np.cos(3 * gamma) + 0.00148 * np.sin(3 * gamma))
+    ecuacion_tiempo_min = 229.18 * (0.000075 + 0.001868 * np.cos(gamma) - 0.032077 * np.sin(gamma)
+                                    - 0.014615 * np.cos(2 * gamma) - 0.040849 * np.sin(2 * gamma))
+    irradiancia_extraterrestre = CONSTANTE_SOLAR_W_M2 * (1.00011 + 0.034221 * np.cos(gamma) + 0.00128 * np.sin(gamma)
+                                                         + 0.000719 * np.cos(2 * gamma) + 0.000077 * np.sin(2 * gamma))
+
+    tiempo_solar_min = minutos_utc + 4 * lon + ecuacion_tiempo_min
+    angulo_horario = np.radians(tiempo_solar_min / 4.0 - 180.0)
+
+    phi = np.radians(lat)
+    cos_cenit = np.sin(phi) * np.sin(declinacion) + np.cos(phi) * np.cos(declinacion) * np.cos(angulo_horario)
+    cos_cenit = np.clip(cos_cenit, -1.0, 1.0)
+    sin_cenit = np.sqrt(1.0 - cos_cenit ** 2)
+
+    # Azimut solar con la convención de PVGIS: 0 = sur, positivo hacia el oeste
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cos_azimut = (cos_cenit * np.sin(phi) - np.sin(declinacion)) / (sin_cenit * np.cos(phi))
+    azimut_solar = np.sign(angulo_horario) * np.arccos(np.clip(np.nan_to_num(cos_azimut), -1.0, 1.0))
+
+    return cos_cenit, azimut_solar, irradiancia_extraterrestre
+
+
+def descomponer_erbs(ghi: np.ndarray, cos_cenit: np.ndarray, irradiancia_extraterrestre: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+    horizontal_extraterrestre = irradiancia_extraterrestre * np.maximum(cos_cenit, COS_CENIT_MINIMO)
+    kt = np.clip(ghi / horizontal_extraterrestre, 0.0, 1.0)
+
+    fraccion_difusa = np.where(
+        kt <= 0.22, 1.0 - 0.09 * kt,
+        np.where(kt <= 0.80,
+                 0.9511 - 0.1604 * kt + 4.388 * kt ** 2 - 16.638 * kt ** 3 + 12.336 * kt ** 4,
+                 0.165)
+    )
+    # Con el sol muy bajo toda la radiación se considera difusa
+    fraccion_difusa = np.where(cos_cenit > COS_CENIT_MINIMO, fraccion_difusa, 1.0)
+
+    difusa = ghi * fraccion_difusa
+    return ghi - difusa, difusa
+
+
+def irradiancia_plano(
+    directa_h: np.ndarray,
+    difusa_h: np.ndarray,
+    ghi: np.ndarray,
+    cos_cenit: np.ndarray,
+    azimut_solar: np.ndarray,
+    inclinacion: float,
+    azimut_panel: float,
+    albedo: float = ALBEDO_SUELO
+) -> np.ndarray:
+
+    beta = np.radians(inclinacion)
+    gamma_panel = np.radians(azimut_panel)
+    sin_cenit = np.sqrt(1.0 - cos_cenit ** 2)
+
+    cos_incidencia = cos_cenit * np.cos(beta) + sin_cenit * np.sin(beta) * np.cos(azimut_solar - gamma_panel)
+    sol_visible = cos_cenit > COS_CENIT_MINIMO
+    directa_normal = np.where(sol_visible, directa_h / np.maximum(cos_cenit, COS_CENIT_MINIMO), 0.0)
+
+    directa = directa_normal * np.maximum(cos_incidencia, 0.0)
+    difusa = difusa_h * (1 + np.cos(beta)) / 2
+    reflejada = ghi * albedo * (1 - np.cos(beta)) / 2
+
+    return np.maximum(directa + difusa + reflejada, 0.0)
+
+
+def potencia_fotovoltaica(
+    irradiancia_poa: np.ndarray,
+    temperatura_ambiente: np.ndarray,
+    velocidad_viento: np.ndarray,
+    potencia_kwp: float,
+    perdida_pct: float,
+    tecnologia: Optional[str] = 'crystSi'
+) -> np.ndarray:
+
+    # Temperatura de célula (Faiman) y corrección lineal de potencia respecto a STC (25 ºC)
+    temperatura_celula = temperatura_ambiente + irradiancia_poa / (FAIMAN_U0 + FAIMAN_U1 * velocidad_viento)
+    coef = COEFICIENTE_TEMPERATURA.get(tecnologia or 'crystSi', COEFICIENTE_TEMPERATURA['Unknown'])
+    factor_temperatura = 1 + coef * (temperatura_celula - 25.0)
+
+    # Energía horaria en kWh: kWp * (G/1000) * factor térmico * pérdidas del sistema
+    return np.maximum(potencia_kwp * irradiancia_poa / 1000.0 * factor_temperatura * (1 - perdida_pct / 100.0), 0.0)
+
+
+def calcular_generacion_local(
+    activos_pv: list,
+    datos_ambientales: List[DatosAmbientalesEntity],
+    lat: float,
+    lon: float
+) -> Dict[int, Dict[datetime, float]]:
+
+    # Devuelve el mismo formato que el precálculo PVGIS: {idActivo: {timestamp: kWh}}
+    registros = sorted(datos_ambientales, key=lambda d: d.timestamp)
+    timestamps = [d.timestamp for d in registros]
+    if not timestamps:
+        return {activo.idActivoGeneracion: {} for activo in activos_pv}
+
+    ghi = np.array([d.radiacionGlobalHoriz_Wh_m2 or 0.0 for d in registros], dtype=np.float64)
+    temperatura = np.array([20.0 if d.temperaturaAmbiente_C is None else d.temperaturaAmbiente_C for d in registros], dtype=np.float64)
+    viento = np.array([d.velocidadViento_m_s or 0.0 for d in registros], dtype=np.float64)
+
+    # Componentes directa/difusa de PVGIS si vienen en la serie, Erbs en caso contrario
+    directa_pvgis = np.array([np.nan if getattr(d, 'radiacionDirectaHoriz_Wh_m2', None) is None
+                              else d.radiacionDirectaHoriz_Wh_m2 for d in registros], dtype=np.float64)
+    difusa_pvgis = np.array([np.nan if getattr(d, 'radiacionDifusaHoriz_Wh_m2', None) is None
+                             else d.radiacionDifusaHoriz_Wh_m2 for d in registros], dtype=np.float64)
+
+    resultado = {}
+    posiciones = {}
+    for activo in activos_pv:
+        inclinacion, azimut, potencia, perdida = parametros_instalacion(activo)
+        lat_activo = activo.latitud if activo.latitud else lat
+        lon_activo = activo.longitud if activo.longitud else lon
+
+        # La geometría solar solo depende del emplazamiento: se reutiliza entre activos
+        clave = (lat_activo, lon_activo)
+        if clave not in posiciones:
+            cos_cenit, azimut_solar, extraterrestre = posicion_solar(timestamps, lat_activo, lon_activo)
+            directa_erbs, difusa_erbs = descomponer_erbs(ghi, cos_cenit, extraterrestre)
+            tiene_componentes = ~np.isnan(directa_pvgis) & ~np.isnan(difusa_pvgis)
+            directa_h = np.where(tiene_componentes, directa_pvgis, directa_erbs)
+            difusa_h = np.where(tiene_componentes, difusa_pvgis, difusa_erbs)
+            posiciones[clave] = (cos_cenit, azimut_solar, directa_h, difusa_h)
+        cos_cenit, azimut_solar, directa_h, difusa_h = posiciones[clave]
+
+        poa = irradiancia_plano(directa_h, difusa_h, ghi, cos_cenit, azimut_solar, inclinacion, azimut)
+        energia = potencia_fotovoltaica(poa, temperatura, viento, potencia, perdida, activo.tecnologiaPanel)
+        resultado[activo.idActivoGeneracion] = dict(zip(timestamps, energia.tolist()))
+
+    return resultado
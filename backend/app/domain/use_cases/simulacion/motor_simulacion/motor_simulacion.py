@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
+from dataclasses import replace
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import time
 from fastapi import HTTPException
+from sqlalchemy.orm import Session
 from app.domain.repositories.simulacion_repository import SimulacionRepository
 from app.domain.repositories.comunidad_energetica_repository import ComunidadEnergeticaRepository
 from app.domain.repositories.participante_repository import ParticipanteRepository
@@ -19,19 +22,73 @@ from app.domain.repositories.resultado_simulacion_activo_almacenamiento_reposito
 from app.domain.repositories.datos_intervalo_participante_repository import DatosIntervaloParticipanteRepository
 from app.domain.repositories.datos_intervalo_activo_repository import DatosIntervaloActivoRepository
 from app.domain.repositories.pvpc_precios_repository import PvpcPreciosRepository
+from app.domain.repositories.punto_control_simulacion_repository import PuntoControlSimulacionRepository
+from app.domain.repositories.agregado_intervalo_participante_repository import AgregadoIntervaloParticipanteRepository
+from app.domain.repositories.agregado_intervalo_activo_repository import AgregadoIntervaloActivoRepository
+from app.domain.use_cases.simulacion.motor_simulacion.precios_pvpc_precargados import PvpcPreciosPrecargados
 from app.domain.entities.estado_simulacion import EstadoSimulacion
 from app.domain.entities.datos_intervalo_participante import DatosIntervaloParticipanteEntity
 from app.domain.entities.datos_intervalo_activo import DatosIntervaloActivoEntity
 from app.domain.entities.tipo_activo_generacion import TipoActivoGeneracion
+from app.infrastructure.persistance.config import settings
 import logging
 
 from app.domain.use_cases.simulacion.motor_simulacion.aplicar_estrategia_intervalo import aplicar_estrategia_intervalo
-from app.domain.use_cases.simulacion.motor_simulacion.persistir_resultados import persistir_todos_los_resultados
-from app.domain.use_cases.simulacion.motor_simulacion.calcular_resultados import calcular_todos_resultados
+from app.domain.use_cases.simulacion.motor_simulacion.persistir_resultados import (
+    persistir_todos_los_resultados,
+    persistir_datos_ambientales,
+    persistir_agregados_intervalos,
+)
+from app.domain.use_cases.simulacion.motor_simulacion.calcular_resultados import AgregadorResultados
+from app.domain.use_cases.simulacion.motor_simulacion.simulacion_vectorizada import simular_intervalos_vectorizado, rangos_mensuales
+from app.domain.use_cases.simulacion.motor_simulacion.plan_coeficientes import PlanCoeficientesReparto
+from app.domain.use_cases.simulacion.motor_simulacion.intervalos_columnares import (
+    IntervalosParticipantes, IntervalosActivosGeneracion, IntervalosActivosAlmacenamiento
+)
+from app.domain.use_cases.simulacion.motor_simulacion.persistencia_streaming import (
+    EscritorIntervalosStreaming, crear_resultados_provisionales, completar_resultados_provisionales
+)
+from app.domain.use_cases.simulacion.motor_simulacion.progreso_simulacion import ProgresoSimulacion
+from app.domain.use_cases.simulacion.motor_simulacion.barrido_escenarios import ContextoBarrido
+from app.domain.use_cases.simulacion.motor_simulacion.huella_entradas import calcular_huella_entradas
+from app.domain.use_cases.simulacion.motor_simulacion.puntos_control import GuardadoPuntosControl, restaurar_punto_control
+from app.domain.use_cases.simulacion.motor_simulacion.resolucion_temporal import (
+    paso_simulacion_minutos,
+    horas_por_intervalo,
+    remuestrear_consumo,
+    remuestrear_ambiental,
+    remuestrear_generacion,
+)
+from app.domain.use_cases.simulacion.motor_simulacion.modelo_fotovoltaico import calcular_generacion_local, parametros_instalacion
+
+
+class SimulacionCancelada(Exception):
+    pass
 
 
 class MotorSimulacion:
     
+    # Modos del motor: el vectorizado trabaja con matrices NumPy (timestamps x participantes/activos);
+    # el de referencia conserva el bucle por intervalo con diccionarios para poder contrastar resultados
+    MODO_VECTORIZADO = "vectorizado"
+    MODO_REFERENCIA = "referencia"
+
+    # Fuentes de generación FV: el modelo local transpone la serie ambiental a cada activo
+    # (una sola descarga); PVGIS hace una petición por activo y queda como referencia
+    FUENTE_PV_LOCAL = "local"
+    FUENTE_PV_PVGIS = "pvgis"
+
+    # Persistencia: en streaming un hilo escritor guarda cada mes mientras se simula el
+    # siguiente; la diferida guarda todos los intervalos al final
+    PERSISTENCIA_STREAMING = "streaming"
+    PERSISTENCIA_DIFERIDA = "diferida"
+
+    # Máximo de descargas PVGIS simultáneas (ambientales + generación de cada activo FV)
+    MAX_DESCARGAS_CONCURRENTES = settings.PVGIS_MAX_DESCARGAS_CONCURRENTES
+
+    # Filas por lote en la inserción masiva de DATOS_INTERVALO_*
+    TAMANO_LOTE_PERSISTENCIA = settings.PERSISTENCIA_TAMANO_LOTE
+    
     def __init__(
         self,
         simulacion_repo: SimulacionRepository,
@@ -51,8 +108,24 @@ class MotorSimulacion:
         datos_intervalo_activo_repo: DatosIntervaloActivoRepository,
         pvpc_precios_repo: PvpcPreciosRepository,
         datos_ambientales_api_repo,
-        db_session
+        db_session,
+        punto_control_repo: PuntoControlSimulacionRepository = None,
+        agregado_participante_repo: AgregadoIntervaloParticipanteRepository = None,
+        agregado_activo_repo: AgregadoIntervaloActivoRepository = None,
+        modo: str = MODO_VECTORIZADO,
+        fuente_pv: str = FUENTE_PV_LOCAL,
+        persistencia: str = PERSISTENCIA_STREAMING,
+        comprobar_cancelacion=None,
+        notificar_progreso=None,
+        memoizar: bool = settings.SIMULACION_MEMOIZACION
     ):
+        if modo not in (self.MODO_VECTORIZADO, self.MODO_REFERENCIA):
+            raise ValueError(f"Modo de motor de simulación no soportado: {modo}")
+        if fuente_pv not in (self.FUENTE_PV_LOCAL, self.FUENTE_PV_PVGIS):
+            raise ValueError(f"Fuente de generación fotovoltaica no soportada: {fuente_pv}")
+        if persistencia not in (self.PERSISTENCIA_STREAMING, self.PERSISTENCIA_DIFERIDA):
+            raise ValueError(f"Modo de persistencia no soportado: {persistencia}")
+
         self.simulacion_repo = simulacion_repo
         self.comunidad_repo = comunidad_repo
         self.participante_repo = participante_repo
@@ -71,11 +144,29 @@ class MotorSimulacion:
         self.datos_intervalo_activo_repo = datos_intervalo_activo_repo
         self.pvpc_precios_repo = pvpc_precios_repo
         self.db_session = db_session
+        # Sin repositorio de puntos de control una simulación fallida se repite desde el principio
+        self.punto_control_repo = punto_control_repo
+        # Sin repositorios de agregados no se guardan los resúmenes diarios y mensuales
+        self.agregado_participante_repo = agregado_participante_repo
+        self.agregado_activo_repo = agregado_activo_repo
+        self.modo = modo
+        self.fuente_pv = fuente_pv
+        self.persistencia = persistencia
+        # comprobar_cancelacion() -> bool: el worker lo consulta entre fases y entre bloques
+        self.comprobar_cancelacion = comprobar_cancelacion
+        # notificar_progreso(dict) recibe el progreso estructurado (fase, intervalos, filas, ETA)
+        self.notificar_progreso = notificar_progreso
+        self.progreso = ProgresoSimulacion(notificar_progreso)
+        # memoizar: si otra ejecución completada tiene la misma huella de entradas se
+        # reutilizan sus resultados en lugar de volver a simular
+        self.memoizar = memoizar
         self._cache_generacion_pv = {}
+        self._precios_pvpc = None
 
     def ejecutar_simulacion(self, simulacion_id: int):
         
         self.simulacion_id = simulacion_id
+        self.progreso = ProgresoSimulacion(self.notificar_progreso)
         
         tiempo_inicio_total = time.time()
         print(f"\n{'='*60}")
@@ -84,105 +175,80 @@ class MotorSimulacion:
 
         try:
             tiempo_fase = time.time()
+            self.progreso.iniciar_fase(1)
             self.simulacion_repo.update_estado(simulacion_id, EstadoSimulacion.EJECUTANDO.value)
             self.db_session.commit()
             print(f"[1/7] Estado actualizado ({time.time() - tiempo_fase:.2f}s)")
 
             tiempo_fase = time.time()
-            simulacion = self.simulacion_repo.get_by_id(simulacion_id)
-            comunidad = self.comunidad_repo.get_by_id(simulacion.idComunidadEnergetica)
-            participantes = self.participante_repo.get_by_comunidad(comunidad.idComunidadEnergetica)
-            activos_gen = self.activo_gen_repo.get_by_comunidad(comunidad.idComunidadEnergetica)
-            activos_alm = self.activo_alm_repo.get_by_comunidad(comunidad.idComunidadEnergetica)
-            contratos = {p.idParticipante: self.contrato_repo.get_by_participante(p.idParticipante) for p in participantes}
-            coeficientes = {p.idParticipante: self.coeficiente_repo.get_by_participante(p.idParticipante) for p in participantes}
+            self.progreso.iniciar_fase(2)
+            (simulacion, comunidad, participantes, activos_gen, activos_alm,
+             contratos, coeficientes) = self._cargar_configuracion(simulacion_id)
             
             contratos_pvpc = [c for c in contratos.values() if c and c.tipoContrato.value == "PVPC"]
-            print(f"[2/7] Configuración cargada ({time.time() - tiempo_fase:.2f}s)")
-
-            tiempo_fase = time.time()
-            
-            datos_consumo = self.registro_consumo_repo.get_range_for_participantes(
-                [p.idParticipante for p in participantes],
-                simulacion.fechaInicio, simulacion.fechaFin
+            huella = self._calcular_huella(
+                simulacion, comunidad, participantes, activos_gen, activos_alm, contratos, coeficientes, contratos_pvpc
             )
-            consumo_por_intervalo = self._organize_consumo_by_interval(datos_consumo)
+            print(f"[2/7] Configuración cargada, huella {huella[:12]} ({time.time() - tiempo_fase:.2f}s)")
+            self._comprobar_cancelacion()
             
-            datos_ambientales = self.datos_ambientales_api_repo.get_datos_ambientales(
-                comunidad.latitud, comunidad.longitud, simulacion.fechaInicio, simulacion.fechaFin
-            )
-            for dato in datos_ambientales:
-                dato.idSimulacion = simulacion_id
-            ambiental_por_intervalo = self._organize_ambiental_by_interval(datos_ambientales)
+            if self.memoizar and self._reutilizar_resultados(simulacion, huella):
+                self.progreso.iniciar_fase(7)
+                self.simulacion_repo.update_estado(simulacion_id, EstadoSimulacion.COMPLETADA.value)
+                self.db_session.commit()
+                print(f"\n{'='*60}")
+                print(f"SIMULACIÓN COMPLETADA (RESULTADOS REUTILIZADOS) - {time.time() - tiempo_inicio_total:.2f}s".center(60))
+                print(f"{'='*60}\n")
+                return
             
-            self._gestionar_generacion_activos(
-                activos_gen, 
-                comunidad.latitud, comunidad.longitud,
-                simulacion.fechaInicio, simulacion.fechaFin
+            # Un intento fallido con las mismas entradas se reanuda desde su último punto de
+            # control y una simulación cuya ventana se ha ampliado continúa desde su estado
+            # final; cualquier otro resultado previo se descarta
+            punto_control = self._punto_control_reanudable(
+                simulacion, huella,
+                lambda fecha_fin: self._calcular_huella(
+                    replace(simulacion, fechaFin=fecha_fin), comunidad, participantes, activos_gen,
+                    activos_alm, contratos, coeficientes, contratos_pvpc
+                )
             )
+            ampliacion = punto_control is not None and punto_control.huellaEntradas != huella
+            if punto_control is None:
+                self._descartar_resultados_previos(simulacion_id)
+
+            tiempo_fase = time.time()
+            self.progreso.iniciar_fase(3)
             
-            self._verificar_consistencia_timestamps(consumo_por_intervalo, ambiental_por_intervalo, self._cache_generacion_pv)
+            # En una ampliación solo se cargan los datos posteriores al último intervalo simulado
+            ventana = simulacion
+            if ampliacion:
+                ventana = replace(simulacion, fechaInicio=punto_control.ultimoTimestamp + timedelta(seconds=1))
+            datos_ambientales, consumo_por_intervalo, ambiental_por_intervalo = self._obtener_datos(
+                ventana, comunidad, participantes, activos_gen,
+                entradas=punto_control.entradas if punto_control and not ampliacion else None
+            )
             
-            print(f"[3/7] Datos obtenidos ({time.time() - tiempo_fase:.2f}s)")
+            origen_datos = "punto de control" if punto_control and punto_control.entradas else f"PV {self.fuente_pv}"
+            if ampliacion:
+                origen_datos += f", posteriores a {punto_control.ultimoTimestamp}"
+            print(f"[3/7] Datos obtenidos [{origen_datos}] ({time.time() - tiempo_fase:.2f}s)")
+            self._comprobar_cancelacion()
 
             tiempo_fase = time.time()
+            self.progreso.iniciar_fase(4)
             timestamps = sorted(consumo_por_intervalo.keys())
-            total_intervalos = len(timestamps)
+            self.progreso.iniciar_intervalos(
+                len(timestamps) + (punto_control.intervalosCompletados if ampliacion else 0)
+            )
+            
+            # Precios PVPC de toda la ventana en una sola consulta, compartidos por todos los participantes
+            self._precios_pvpc = PvpcPreciosPrecargados(self.pvpc_precios_repo)
+            if contratos_pvpc and timestamps:
+                self._precios_pvpc.cargar(timestamps[0], timestamps[-1])
             
             estado_almacenamiento = {
                 alm.idActivoAlmacenamiento: {'soc_kwh': 0.0} for alm in activos_alm
             }
             
-            resultados_intervalo_activos_generacion = []
-            resultados_intervalo_participantes = []
-            resultados_intervalo_activos_almacenamiento = []
-            
-            ultimo_porcentaje = -1
-            for idx, current_time in enumerate(timestamps):
-                porcentaje_actual = int(((idx + 1) / total_intervalos) * 100)
-                if porcentaje_actual % 25 == 0 and porcentaje_actual != ultimo_porcentaje:
-                    print(f"      • Progreso: {porcentaje_actual}%")
-                    ultimo_porcentaje = porcentaje_actual
-
-                datos_amb = ambiental_por_intervalo.get(current_time, {})
-                consumo_int = consumo_por_intervalo.get(current_time, {})
-
-                gen_activos = self._gestionar_generacion_activos(
-                    activos_gen, 
-                    comunidad.latitud, comunidad.longitud,
-                    simulacion.fechaInicio, simulacion.fechaFin,
-                    datos_amb, current_time
-                )
-                
-                for activo_id, energia in gen_activos.items():
-                    resultados_intervalo_activos_generacion.append({
-                        'idActivoGeneracion': activo_id,
-                        'timestamp': current_time,
-                        'energiaGenerada_kWh': energia
-                    })
-
-                resultados_intervalo_participantes_aux, resultados_intervalo_activos_almacenamiento_aux, estado_almacenamiento = aplicar_estrategia_intervalo(
-                    simulacion, comunidad, participantes, gen_activos, consumo_int, contratos, coeficientes, current_time, estado_almacenamiento, activos_alm, self.pvpc_precios_repo
-                )
-                
-                resultados_intervalo_participantes.extend(resultados_intervalo_participantes_aux)
-                resultados_intervalo_activos_almacenamiento.extend(resultados_intervalo_activos_almacenamiento_aux)
-
-            print(f"[4/7] Simulación ejecutada ({time.time() - tiempo_fase:.2f}s)")
-
-            tiempo_fase = time.time()
-            resultados_globales, resultados_part, resultados_activos_gen, resultados_activos_alm = calcular_todos_resultados(
-                simulacion,
-                resultados_intervalo_participantes,
-                resultados_intervalo_activos_generacion,
-                resultados_intervalo_activos_almacenamiento,
-                activos_gen,
-                activos_alm,
-                contratos,
-            )
-            print(f"[5/7] Resultados calculados ({time.time() - tiempo_fase:.2f}s)")
-
-            tiempo_fase = time.time()
             repos = {
                 'resultado_simulacion_repo': self.resultado_simulacion_repo,
                 'resultado_participante_repo': self.resultado_participante_repo,
@@ -193,20 +259,100 @@ class MotorSimulacion:
                 'datos_intervalo_activo_repo': self.datos_intervalo_activo_repo
             }
             
-            resultados_persistidos = persistir_todos_los_resultados(
-                repos,
-                resultados_globales,
-                resultados_part,
-                resultados_activos_gen,
-                resultados_activos_alm,
-                datos_ambientales,
-                resultados_intervalo_participantes,
-                resultados_intervalo_activos_generacion,
-                resultados_intervalo_activos_almacenamiento
-            )
-            print(f"[6/7] Resultados persistidos ({time.time() - tiempo_fase:.2f}s)")
+            if self.persistencia == self.PERSISTENCIA_STREAMING:
+                # Los intervalos se escriben por bloques mensuales mientras se simula
+                agregador, provisionales = self._simular_en_streaming(
+                    simulacion, comunidad, participantes, activos_gen, activos_alm, contratos, coeficientes,
+                    timestamps, consumo_por_intervalo, ambiental_por_intervalo, estado_almacenamiento, repos,
+                    huella=huella, punto_control=punto_control, datos_ambientales=datos_ambientales
+                )
+                print(f"[4/7] Simulación ejecutada [{self.modo}, {self.persistencia}] ({time.time() - tiempo_fase:.2f}s)")
+                
+                tiempo_fase = time.time()
+                self.progreso.iniciar_fase(5)
+                resultados_globales, resultados_part, resultados_activos_gen, resultados_activos_alm = agregador.calcular(
+                    simulacion, activos_gen, activos_alm, contratos
+                )
+                print(f"[5/7] Resultados calculados ({time.time() - tiempo_fase:.2f}s)")
+                
+                tiempo_fase = time.time()
+                self.progreso.iniciar_fase(6)
+                completar_resultados_provisionales(
+                    repos, *provisionales,
+                    resultados_globales, resultados_part, resultados_activos_gen, resultados_activos_alm
+                )
+                persistir_datos_ambientales(repos['datos_ambientales_repo'], datos_ambientales)
+                # En una ampliación los agregados de la ventana anterior siguen siendo válidos: solo
+                # se rehacen desde el primer intervalo nuevo. Al reanudar un intento fallido aún no
+                # hay agregados y se calculan todos
+                self._persistir_agregados(
+                    provisionales[0].idResultado, desde=timestamps[0] if ampliacion and timestamps else None
+                )
+                if self.punto_control_repo is not None:
+                    # El estado final se conserva para poder ampliar la ventana más adelante
+                    self.punto_control_repo.descartar_entradas(simulacion_id)
+                print(f"[6/7] Resultados persistidos ({time.time() - tiempo_fase:.2f}s)")
+            else:
+                # La agregación se actualiza a la vez que se simula: el cálculo de resultados
+                # no vuelve a recorrer los intervalos
+                agregador = AgregadorResultados()
+                if self.modo == self.MODO_VECTORIZADO:
+                    resultado_vectorizado = simular_intervalos_vectorizado(
+                        simulacion, participantes, activos_gen, activos_alm, contratos, coeficientes,
+                        timestamps, consumo_por_intervalo, ambiental_por_intervalo,
+                        self._cache_generacion_pv, estado_almacenamiento, self._precios_pvpc
+                    )
+                    (resultados_intervalo_participantes,
+                     resultados_intervalo_activos_generacion,
+                     resultados_intervalo_activos_almacenamiento) = resultado_vectorizado.a_columnas()
+                    self.progreso.avanzar_intervalos(len(timestamps))
+                    agregador.agregar(resultados_intervalo_participantes, resultados_intervalo_activos_generacion,
+                                      resultados_intervalo_activos_almacenamiento)
+                else:
+                    (resultados_intervalo_participantes,
+                     resultados_intervalo_activos_generacion,
+                     resultados_intervalo_activos_almacenamiento) = self._simular_intervalos_referencia(
+                        simulacion, comunidad, participantes, activos_gen, activos_alm, contratos, coeficientes,
+                        timestamps, consumo_por_intervalo, ambiental_por_intervalo, estado_almacenamiento,
+                        agregador=agregador
+                    )
+
+                print(f"[4/7] Simulación ejecutada [{self.modo}, {self.persistencia}] ({time.time() - tiempo_fase:.2f}s)")
+                memoria_intervalos = (resultados_intervalo_participantes.nbytes + resultados_intervalo_activos_generacion.nbytes +
+                                      resultados_intervalo_activos_almacenamiento.nbytes)
+                print(f"      • Intervalos en memoria: {memoria_intervalos / (1024 * 1024):.1f} MB")
+                self._comprobar_cancelacion()
+
+                tiempo_fase = time.time()
+                self.progreso.iniciar_fase(5)
+                resultados_globales, resultados_part, resultados_activos_gen, resultados_activos_alm = agregador.calcular(
+                    simulacion, activos_gen, activos_alm, contratos
+                )
+                print(f"[5/7] Resultados calculados ({time.time() - tiempo_fase:.2f}s)")
+
+                tiempo_fase = time.time()
+                self.progreso.iniciar_fase(6)
+                resultados_persistidos = persistir_todos_los_resultados(
+                    repos,
+                    resultados_globales,
+                    resultados_part,
+                    resultados_activos_gen,
+                    resultados_activos_alm,
+                    datos_ambientales,
+                    resultados_intervalo_participantes,
+                    resultados_intervalo_activos_generacion,
+                    resultados_intervalo_activos_almacenamiento,
+                    tamano_lote=self.TAMANO_LOTE_PERSISTENCIA
+                )
+                self.progreso.sumar_filas(sum(resultados_persistidos[clave]['filas'] for clave in (
+                    'intervalos_participantes', 'intervalos_activos_generacion', 'intervalos_activos_almacenamiento'
+                )))
+                self._persistir_agregados(resultados_persistidos['resultado_global'].idResultado)
+                print(f"[6/7] Resultados persistidos ({time.time() - tiempo_fase:.2f}s)")
 
             tiempo_fase = time.time()
+            self.progreso.iniciar_fase(7)
+            self.simulacion_repo.update_huella(simulacion_id, huella)
             self.simulacion_repo.update_estado(simulacion_id, EstadoSimulacion.COMPLETADA.value)
             self.db_session.commit()
             print(f"[7/7] Estado finalizado ({time.time() - tiempo_fase:.2f}s)")
@@ -214,8 +360,18 @@ class MotorSimulacion:
             tiempo_total = time.time() - tiempo_inicio_total
             print(f"\n{'='*60}")
             print(f"SIMULACIÓN COMPLETADA - TIEMPO TOTAL: {tiempo_total:.2f}s".center(60))
+            if contratos_pvpc:
+                print(f"Precios PVPC: {self._precios_pvpc.resumen()}".center(60))
             print(f"{'='*60}\n")
 
+        except SimulacionCancelada:
+            # La simulación vuelve a PENDIENTE para poder lanzarla de nuevo
+            print(f"\nSimulación {simulacion_id} cancelada")
+            self.db_session.rollback()
+            self.simulacion_repo.update_estado(simulacion_id, EstadoSimulacion.PENDIENTE.value)
+            self.db_session.commit()
+            raise
+
         except Exception as e:
             print(f"\n{'!'*60}")
             print(f"ERROR EN LA SIMULACIÓN".center(60))
@@ -230,7 +386,427 @@ class MotorSimulacion:
             
             raise
 
-    def _gestionar_generacion_activos(self, activos_gen, lat, lon, fecha_inicio, fecha_fin, datos_ambientales=None, timestamp=None):
+    def cargar_contexto_barrido(self, simulacion_id: int, validar_coeficientes: bool = True) -> ContextoBarrido:
+        
+        # Fases 2 y 3 del motor (configuración, consumos, datos ambientales, generación FV y
+        # precios) una sola vez para evaluar todas las variantes de un barrido de escenarios
+        (simulacion, comunidad, participantes, activos_gen, activos_alm,
+         contratos, coeficientes) = self._cargar_configuracion(simulacion_id, validar_coeficientes)
+        datos_ambientales, consumo_por_intervalo, ambiental_por_intervalo = self._obtener_datos(
+            simulacion, comunidad, participantes, activos_gen
+        )
+        
+        timestamps = sorted(consumo_por_intervalo.keys())
+        precios_pvpc = PvpcPreciosPrecargados(self.pvpc_precios_repo)
+        if timestamps and any(c and c.tipoContrato.value == "PVPC" for c in contratos.values()):
+            precios_pvpc.cargar(timestamps[0], timestamps[-1])
+        
+        return ContextoBarrido(
+            simulacion=simulacion,
+            participantes=participantes,
+            activos_gen=activos_gen,
+            activos_alm=activos_alm,
+            contratos=contratos,
+            coeficientes=coeficientes,
+            timestamps=timestamps,
+            consumo_por_intervalo=consumo_por_intervalo,
+            ambiental_por_intervalo=ambiental_por_intervalo,
+            cache_generacion_pv=self._cache_generacion_pv,
+            precios_pvpc=precios_pvpc
+        )
+
+    def _cargar_configuracion(self, simulacion_id: int, validar_coeficientes: bool = True):
+        
+        simulacion = self.simulacion_repo.get_by_id(simulacion_id)
+        paso_simulacion_minutos(simulacion)  # Resolución temporal admitida antes de cargar datos
+        comunidad = self.comunidad_repo.get_by_id(simulacion.idComunidadEnergetica)
+        participantes = self.participante_repo.get_by_comunidad(comunidad.idComunidadEnergetica)
+        activos_gen = self.activo_gen_repo.get_by_comunidad(comunidad.idComunidadEnergetica)
+        activos_alm = self.activo_alm_repo.get_by_comunidad(comunidad.idComunidadEnergetica)
+        contratos = {p.idParticipante: self.contrato_repo.get_by_participante(p.idParticipante) for p in participantes}
+        # Coeficientes compilados a una matriz horaria y validados antes de empezar
+        coeficientes = PlanCoeficientesReparto.compilar(
+            {p.idParticipante: self.coeficiente_repo.get_by_participante(p.idParticipante) for p in participantes},
+            [p.idParticipante for p in participantes]
+        )
+        if validar_coeficientes:
+            coeficientes.validar()
+        return simulacion, comunidad, participantes, activos_gen, activos_alm, contratos, coeficientes
+
+    def _calcular_huella(self, simulacion, comunidad, participantes, activos_gen, activos_alm,
+                         contratos, coeficientes, contratos_pvpc) -> str:
+        
+        # Los consumos y precios de la ventana entran por su resumen agregado (una consulta
+        # cada uno); los datos ambientales dependen solo de ubicación, ventana y fuente PV
+        resumen_consumo = self.registro_consumo_repo.resumen_range_for_participantes(
+            [p.idParticipante for p in participantes], simulacion.fechaInicio, simulacion.fechaFin
+        )
+        resumen_pvpc = None
+        if contratos_pvpc:
+            resumen_pvpc = self.pvpc_precios_repo.resumen_range(simulacion.fechaInicio, simulacion.fechaFin)
+        return calcular_huella_entradas(
+            simulacion, comunidad, participantes, activos_gen, activos_alm, contratos, coeficientes,
+            resumen_consumo, resumen_pvpc, self.fuente_pv
+        )
+
+    def _reutilizar_resultados(self, simulacion, huella: str) -> bool:
+        
+        # Misma simulación sin cambios desde su última ejecución: se conservan sus resultados
+        resultado_actual = self.resultado_simulacion_repo.get_by_simulacion_id(simulacion.idSimulacion)
+        if resultado_actual and simulacion.huellaEntradas == huella:
+            print(f"      • Entradas sin cambios desde la última ejecución: se conservan los resultados")
+            return True
+        
+        # Otra simulación completada con las mismas entradas: se copian sus resultados
+        origen = self.simulacion_repo.get_completada_by_huella(huella, excluir_id=simulacion.idSimulacion)
+        if not origen:
+            return False
+        resultado_origen = self.resultado_simulacion_repo.get_by_simulacion_id(origen.idSimulacion)
+        
+        tiempo = time.time()
+        self._descartar_resultados_previos(simulacion.idSimulacion)
+        resultado_copiado = self.resultado_simulacion_repo.clonar(resultado_origen.idResultado, simulacion.idSimulacion)
+        self._persistir_agregados(resultado_copiado.idResultado)
+        filas_ambientales = self.datos_ambientales_repo.copiar_de_simulacion(origen.idSimulacion, simulacion.idSimulacion)
+        self.simulacion_repo.update_huella(simulacion.idSimulacion, huella)
+        print(f"      • Resultados copiados de la simulación {origen.idSimulacion} "
+              f"({filas_ambientales} datos ambientales, {time.time() - tiempo:.2f}s)")
+        return True
+
+    def _punto_control_reanudable(self, simulacion, huella: str, huella_hasta):
+        
+        # Solo la persistencia en streaming deja intervalos guardados desde los que continuar
+        if self.punto_control_repo is None or self.persistencia != self.PERSISTENCIA_STREAMING:
+            return None
+        try:
+            punto_control = self.punto_control_repo.get_by_simulacion(simulacion.idSimulacion)
+            if punto_control is not None:
+                punto_control = restaurar_punto_control(punto_control)
+        except Exception as e:
+            # Un punto de control ilegible (formato antiguo o dañado) no se usa: al devolver
+            # None se descartan los resultados previos y se simula desde cero
+            logging.warning(f"Punto de control de la simulación {simulacion.idSimulacion} descartado: {str(e)}")
+            return None
+        if punto_control is None or not self.resultado_simulacion_repo.get_by_id(punto_control.idResultado):
+            return None
+        
+        if punto_control.huellaEntradas == huella:
+            # Solo se reanuda un intento interrumpido. El punto de control final (se conserva para
+            # ampliar) no: con memoización los resultados ya se habrían reutilizado y sin ella se
+            # descartan y se vuelve a simular
+            if punto_control.ultimoTimestamp >= simulacion.fechaFin:
+                return None
+            # Los datos ambientales se guardan al terminar: los de un intento anterior sobran
+            self.datos_ambientales_repo.delete_by_simulacion(simulacion.idSimulacion)
+            return punto_control
+        
+        # Ventana ampliada: se continúa si las entradas de la ventana ya simulada no han cambiado
+        fecha_fin_anterior = punto_control.estadoMotor.get('fechaFin')
+        if (fecha_fin_anterior is None or fecha_fin_anterior >= simulacion.fechaFin
+                or huella_hasta(fecha_fin_anterior) != punto_control.huellaEntradas):
+            return None
+        print(f"      • Ventana ampliada desde {fecha_fin_anterior}: se continúa desde el estado final")
+        # Las entradas guardadas cubren solo la ventana anterior
+        self.simulacion_repo.update_huella(simulacion.idSimulacion, None)
+        self.punto_control_repo.descartar_entradas(simulacion.idSimulacion)
+        return punto_control
+
+    def _descartar_resultados_previos(self, simulacion_id: int):
+        
+        # La huella se borra antes que los resultados: solo una ejecución completa la vuelve a fijar
+        self.simulacion_repo.update_huella(simulacion_id, None)
+        if self.punto_control_repo is not None:
+            self.punto_control_repo.delete_by_simulacion(simulacion_id)
+        resultado_previo = self.resultado_simulacion_repo.get_by_simulacion_id(simulacion_id)
+        if resultado_previo:
+            self.resultado_simulacion_repo.delete(resultado_previo.idResultado)
+        self.datos_ambientales_repo.delete_by_simulacion(simulacion_id)
+
+    def _obtener_datos(self, simulacion, comunidad, participantes, activos_gen, entradas=None):
+        
+        datos_consumo = self.registro_consumo_repo.get_range_for_participantes(
+            [p.idParticipante for p in participantes],
+            simulacion.fechaInicio, simulacion.fechaFin
+        )
+        consumo_por_intervalo = self._organize_consumo_by_interval(datos_consumo)
+        
+        if entradas is not None:
+            # Reanudación: datos ambientales y generación FV del punto de control, sin descargas
+            datos_ambientales = entradas['datos_ambientales']
+            self._cache_generacion_pv = entradas['cache_generacion_pv']
+        elif self.fuente_pv == self.FUENTE_PV_LOCAL:
+            # Una única serie ambiental; la generación de cada activo FV se calcula en local
+            datos_ambientales = self.datos_ambientales_api_repo.get_datos_ambientales(
+                comunidad.latitud, comunidad.longitud, simulacion.fechaInicio, simulacion.fechaFin
+            )
+            activos_pv = [a for a in activos_gen if a.tipo_activo == TipoActivoGeneracion.INSTALACION_FOTOVOLTAICA]
+            self._cache_generacion_pv = calcular_generacion_local(
+                activos_pv, datos_ambientales, comunidad.latitud, comunidad.longitud
+            )
+        else:
+            # Las descargas PVGIS se lanzan en paralelo: la fase dura lo que la petición más lenta
+            with ThreadPoolExecutor(max_workers=self.MAX_DESCARGAS_CONCURRENTES) as executor:
+                futuro_ambiental = executor.submit(
+                    self.datos_ambientales_api_repo.get_datos_ambientales,
+                    comunidad.latitud, comunidad.longitud, simulacion.fechaInicio, simulacion.fechaFin
+                )
+                
+                self._gestionar_generacion_activos(
+                    activos_gen, 
+                    comunidad.latitud, comunidad.longitud,
+                    simulacion.fechaInicio, simulacion.fechaFin,
+                    executor=executor
+                )
+                
+                datos_ambientales = futuro_ambiental.result()
+        
+        for dato in datos_ambientales:
+            dato.idSimulacion = simulacion.idSimulacion
+        ambiental_por_intervalo = self._organize_ambiental_by_interval(datos_ambientales)
+        
+        # Consumos, datos ambientales y generación FV sobre la rejilla de la simulación
+        # (15/30/60 min); las series que ya tienen ese paso no se modifican
+        paso = paso_simulacion_minutos(simulacion)
+        consumo_por_intervalo = remuestrear_consumo(consumo_por_intervalo, paso)
+        ambiental_por_intervalo = remuestrear_ambiental(ambiental_por_intervalo, paso)
+        self._cache_generacion_pv = remuestrear_generacion(self._cache_generacion_pv, paso)
+        
+        self._verificar_consistencia_timestamps(consumo_por_intervalo, ambiental_por_intervalo, self._cache_generacion_pv)
+        
+        return datos_ambientales, consumo_por_intervalo, ambiental_por_intervalo
+
+    def _simular_en_streaming(self, simulacion, comunidad, participantes, activos_gen, activos_alm,
+                              contratos, coeficientes, timestamps, consumo_por_intervalo,
+                              ambiental_por_intervalo, estado_almacenamiento, repos,
+                              huella=None, punto_control=None, datos_ambientales=None):
+        
+        # Productor/consumidor: cada mes simulado se agrega de forma incremental y se encola
+        # para el hilo escritor, así la memoria queda acotada por el bloque y no por el horizonte.
+        # Con punto de control se continúa tras el último bloque persistido
+        if punto_control is not None:
+            provisionales = self._recuperar_resultados_provisionales(punto_control)
+            agregador = punto_control.estadoMotor['agregador']
+            estado_almacenamiento.update(punto_control.estadoMotor['estado_almacenamiento'])
+            completados = punto_control.intervalosCompletados
+            pendientes = [ts for ts in timestamps if ts > punto_control.ultimoTimestamp]
+            print(f"      • Reanudando desde el punto de control: {completados} intervalos simulados "
+                  f"(hasta {punto_control.ultimoTimestamp}), {len(pendientes)} pendientes")
+        else:
+            provisionales = crear_resultados_provisionales(repos, simulacion, participantes, activos_gen, activos_alm)
+            agregador = AgregadorResultados()
+            completados = 0
+            pendientes = timestamps
+        resultado_global, participantes_dict, activos_gen_dict, activos_alm_dict = provisionales
+        self.progreso.avanzar_intervalos(completados)
+        
+        puntos_control = None
+        if self.punto_control_repo is not None and huella is not None:
+            # El hilo escritor guarda los puntos de control con su propia sesión
+            puntos_control = GuardadoPuntosControl(
+                type(self.punto_control_repo)(Session(bind=self.db_session.get_bind())),
+                simulacion.idSimulacion, resultado_global.idResultado, huella, simulacion.fechaFin,
+                pendientes, completados, estado_almacenamiento,
+                entradas=None if punto_control else {
+                    'datos_ambientales': datos_ambientales,
+                    'cache_generacion_pv': self._cache_generacion_pv,
+                }
+            )
+        
+        def encolar_bloque(intervalos_part, intervalos_gen, intervalos_alm, num_intervalos):
+            instantanea = None
+            if puntos_control is not None:
+                instantanea = puntos_control.instantanea(agregador, intervalos_alm, num_intervalos)
+            escritor.encolar(intervalos_part, intervalos_gen, intervalos_alm, punto_control=instantanea)
+        
+        escritor = EscritorIntervalosStreaming(
+            self._crear_repos_escritura, participantes_dict, activos_gen_dict, activos_alm_dict,
+            tamano_lote=self.TAMANO_LOTE_PERSISTENCIA,
+            al_persistir=self.progreso.sumar_filas,
+            al_guardar_bloque=puntos_control.guardar if puntos_control else None
+        ).iniciar()
+        
+        try:
+            try:
+                if not pendientes:
+                    pass
+                elif self.modo == self.MODO_VECTORIZADO:
+                    # El núcleo se ejecuta mes a mes: las matrices solo cubren el bloque en curso y
+                    # el SoC final de cada mes (estado_almacenamiento) es el inicial del siguiente
+                    for desde, hasta in rangos_mensuales(pendientes):
+                        self._comprobar_cancelacion()
+                        bloque = simular_intervalos_vectorizado(
+                            simulacion, participantes, activos_gen, activos_alm, contratos, coeficientes,
+                            pendientes[desde:hasta], consumo_por_intervalo, ambiental_por_intervalo,
+                            self._cache_generacion_pv, estado_almacenamiento, self._precios_pvpc
+                        ).a_columnas()
+                        agregador.agregar(*bloque)
+                        encolar_bloque(*bloque, hasta - desde)
+                        self.progreso.avanzar_intervalos(completados + hasta)
+                else:
+                    # El motor de referencia entrega un bloque por mes, en el mismo orden que rangos_mensuales
+                    meses = iter(rangos_mensuales(pendientes))
+                    def al_completar_mes(*bloque):
+                        desde, hasta = next(meses)
+                        encolar_bloque(*bloque, hasta - desde)
+                    self._simular_intervalos_referencia(
+                        simulacion, comunidad, participantes, activos_gen, activos_alm, contratos, coeficientes,
+                        pendientes, consumo_por_intervalo, ambiental_por_intervalo, estado_almacenamiento,
+                        agregador=agregador, al_completar_bloque=al_completar_mes,
+                        intervalo_inicial=completados
+                    )
+                self._comprobar_cancelacion()
+            except Exception:
+                escritor.detener()
+                raise
+            escritor.finalizar()
+        except SimulacionCancelada:
+            # Al continuar desde un punto de control se conserva lo ya simulado
+            if punto_control is None:
+                self._eliminar_resultados_provisionales(resultado_global)
+            raise
+        except Exception:
+            if punto_control is None and (puntos_control is None or puntos_control.guardados == 0):
+                self._eliminar_resultados_provisionales(resultado_global)
+            else:
+                print(f"      • Intervalos conservados: la próxima ejecución se reanudará desde el último punto de control")
+            raise
+        finally:
+            if puntos_control is not None:
+                puntos_control.repo.db.close()
+        
+        return agregador, provisionales
+
+    def _recuperar_resultados_provisionales(self, punto_control):
+        
+        # Filas de resultados del intento anterior y descarte de los intervalos que se
+        # persistieron después del punto de control (el bloque que estaba en curso al fallar)
+        resultado_global = self.resultado_simulacion_repo.get_by_id(punto_control.idResultado)
+        participantes_dict = {
+            r.idParticipante: r.idResultadoParticipante
+            for r in self.resultado_participante_repo.get_by_resultado_simulacion(resultado_global.idResultado)
+        }
+        activos_gen_dict = {
+            r.idActivoGeneracion: r.idResultadoActivoGen
+            for r in self.resultado_activo_gen_repo.get_by_resultado_simulacion_id(resultado_global.idResultado)
+        }
+        activos_alm_dict = {
+            r.idActivoAlmacenamiento: r.idResultadoActivoAlm
+            for r in self.resultado_activo_alm_repo.get_by_resultado_simulacion_id(resultado_global.idResultado)
+        }
+        descartados = self.datos_intervalo_participante_repo.delete_posteriores(
+            list(participantes_dict.values()), punto_control.ultimoTimestamp
+        ) + self.datos_intervalo_activo_repo.delete_posteriores(
+            list(activos_gen_dict.values()), list(activos_alm_dict.values()), punto_control.ultimoTimestamp
+        )
+        if descartados:
+            print(f"      • Intervalos posteriores al punto de control descartados: {descartados}")
+        return resultado_global, participantes_dict, activos_gen_dict, activos_alm_dict
+
+    def _persistir_agregados(self, resultado_id: int, desde=None):
+        if self.agregado_participante_repo is not None and self.agregado_activo_repo is not None:
+            persistir_agregados_intervalos(self.agregado_participante_repo, self.agregado_activo_repo, resultado_id, desde)
+
+    def _comprobar_cancelacion(self):
+        if self.comprobar_cancelacion is not None and self.comprobar_cancelacion():
+            raise SimulacionCancelada(f"Simulación {self.simulacion_id} cancelada")
+
+    def _crear_repos_escritura(self):
+        
+        # El hilo escritor usa su propia sesión (las sesiones de SQLAlchemy no son thread-safe)
+        # con las mismas clases de repositorio que el motor
+        sesion = Session(bind=self.db_session.get_bind())
+        return (
+            type(self.datos_intervalo_participante_repo)(sesion),
+            type(self.datos_intervalo_activo_repo)(sesion),
+            sesion.close
+        )
+
+    def _eliminar_resultados_provisionales(self, resultado_global):
+        
+        try:
+            self.db_session.rollback()
+            if self.punto_control_repo is not None:
+                self.punto_control_repo.delete_by_simulacion(resultado_global.idSimulacion)
+            self.resultado_simulacion_repo.delete(resultado_global.idResultado)
+        except Exception as e:
+            logging.error(f"No se pudieron eliminar los resultados provisionales: {str(e)}")
+
+    def _simular_intervalos_referencia(self, simulacion, comunidad, participantes, activos_gen, activos_alm,
+                                       contratos, coeficientes, timestamps, consumo_por_intervalo,
+                                       ambiental_por_intervalo, estado_almacenamiento, agregador=None,
+                                       al_completar_bloque=None, intervalo_inicial=0):
+        
+        # Implementación de referencia: un intervalo cada vez con diccionarios.
+        # El agregador se actualiza con cada intervalo producido y, con al_completar_bloque,
+        # los intervalos se entregan por meses en lugar de acumularse
+        total_intervalos = len(timestamps)
+        horas_intervalo = horas_por_intervalo(simulacion)
+        
+        resultados_intervalo_activos_generacion = IntervalosActivosGeneracion()
+        resultados_intervalo_participantes = IntervalosParticipantes()
+        resultados_intervalo_activos_almacenamiento = IntervalosActivosAlmacenamiento()
+        
+        ultimo_porcentaje = -1
+        mes_actual = None
+        for idx, current_time in enumerate(timestamps):
+            if idx % 24 == 0:
+                self._comprobar_cancelacion()
+                self.progreso.avanzar_intervalos(intervalo_inicial + idx)
+            if al_completar_bloque is not None:
+                if mes_actual is not None and (current_time.year, current_time.month) != mes_actual:
+                    al_completar_bloque(resultados_intervalo_participantes, resultados_intervalo_activos_generacion,
+                                        resultados_intervalo_activos_almacenamiento)
+                    resultados_intervalo_participantes = IntervalosParticipantes()
+                    resultados_intervalo_activos_generacion = IntervalosActivosGeneracion()
+                    resultados_intervalo_activos_almacenamiento = IntervalosActivosAlmacenamiento()
+                mes_actual = (current_time.year, current_time.month)
+
+            porcentaje_actual = int(((idx + 1) / total_intervalos) * 100)
+            if porcentaje_actual % 25 == 0 and porcentaje_actual != ultimo_porcentaje:
+                print(f"      • Progreso: {porcentaje_actual}%")
+                ultimo_porcentaje = porcentaje_actual
+
+            datos_amb = ambiental_por_intervalo.get(current_time, {})
+            consumo_int = consumo_por_intervalo.get(current_time, {})
+
+            gen_activos = self._gestionar_generacion_activos(
+                activos_gen, 
+                comunidad.latitud, comunidad.longitud,
+                simulacion.fechaInicio, simulacion.fechaFin,
+                datos_amb, current_time, horas_intervalo=horas_intervalo
+            )
+            
+            resultados_intervalo_activos_generacion_aux = [
+                {
+                    'idActivoGeneracion': activo_id,
+                    'timestamp': current_time,
+                    'energiaGenerada_kWh': energia
+                }
+                for activo_id, energia in gen_activos.items()
+            ]
+
+            resultados_intervalo_participantes_aux, resultados_intervalo_activos_almacenamiento_aux, estado_almacenamiento = aplicar_estrategia_intervalo(
+                simulacion, comunidad, participantes, gen_activos, consumo_int, contratos, coeficientes, current_time, estado_almacenamiento, activos_alm, self._precios_pvpc
+            )
+            
+            if agregador is not None:
+                agregador.agregar(resultados_intervalo_participantes_aux, resultados_intervalo_activos_generacion_aux,
+                                  resultados_intervalo_activos_almacenamiento_aux)
+            
+            resultados_intervalo_activos_generacion.extender(resultados_intervalo_activos_generacion_aux)
+            resultados_intervalo_participantes.extender(resultados_intervalo_participantes_aux)
+            resultados_intervalo_activos_almacenamiento.extender(resultados_intervalo_activos_almacenamiento_aux)
+        
+        self.progreso.avanzar_intervalos(intervalo_inicial + total_intervalos)
+        
+        if al_completar_bloque is not None and mes_actual is not None:
+            al_completar_bloque(resultados_intervalo_participantes, resultados_intervalo_activos_generacion,
+                                resultados_intervalo_activos_almacenamiento)
+            return IntervalosParticipantes(), IntervalosActivosGeneracion(), IntervalosActivosAlmacenamiento()
+        
+        return resultados_intervalo_participantes, resultados_intervalo_activos_generacion, resultados_intervalo_activos_almacenamiento
+
+    def _gestionar_generacion_activos(self, activos_gen, lat, lon, fecha_inicio, fecha_fin, datos_ambientales=None, timestamp=None, executor=None, horas_intervalo=1.0):
         
         # Detectar modo de operación
         modo_precalculo = timestamp is None
@@ -242,42 +818,42 @@ class MotorSimulacion:
             # Identificar activos fotovoltaicos para precálculo
             activos_pv = [a for a in activos_gen if a.tipo_activo == TipoActivoGeneracion.INSTALACION_FOTOVOLTAICA]
             
+            # Sin executor externo se crea uno propio para este precálculo
+            executor_propio = None
+            if executor is None:
+                executor_propio = ThreadPoolExecutor(max_workers=self.MAX_DESCARGAS_CONCURRENTES)
+                executor = executor_propio
+            
+            futuros = {}
             for activo in activos_pv:
-                # Verificar que tiene los datos necesarios
-                if (activo.inclinacionGrados is None or 
-                    activo.azimutGrados is None or 
-                    activo.potenciaNominal_kWp is None or
-                    activo.perdidaSistema is None):
-                    # Asignar valores por defecto donde falten
-                    inclinacion = activo.inclinacionGrados or 35.0  # Valor típico en España
-                    azimut = activo.azimutGrados or 0.0  # 0 = orientación sur
-                    potencia = activo.potenciaNominal_kWp or 1.0  # Valor mínimo para evitar error
-                    perdida = activo.perdidaSistema or 14.0  # Valor típico
-                else:
-                    inclinacion = activo.inclinacionGrados
-                    azimut = activo.azimutGrados
-                    potencia = activo.potenciaNominal_kWp
-                    perdida = activo.perdidaSistema
+                # Parámetros de la instalación con valores por defecto donde falten
+                inclinacion, azimut, potencia, perdida = parametros_instalacion(activo)
                     
-                # Obtener generación PV para este activo
-                try:
-                    generacion = self.datos_ambientales_api_repo.get_generacion_fotovoltaica(
-                        lat=activo.latitud if activo.latitud else lat,
-                        lon=activo.longitud if activo.longitud else lon,
-                        start_date=fecha_inicio,
-                        end_date=fecha_fin,
-                        peak_power_kwp=potencia,
-                        angle=inclinacion,
-                        aspect=azimut,
-                        loss=perdida,
-                        tech=activo.tecnologiaPanel if activo.tecnologiaPanel else 'crystSi'
-                    )
-                    
-                    # Almacenar en caché
-                    self._cache_generacion_pv[activo.idActivoGeneracion] = generacion
-                except Exception as e:
-                    logging.error(f"Error al precalcular generación PV para activo {activo.idActivoGeneracion}: {e}")
-                    self._cache_generacion_pv[activo.idActivoGeneracion] = {}
+                # Lanzar la descarga de generación PV para este activo
+                futuros[activo.idActivoGeneracion] = executor.submit(
+                    self.datos_ambientales_api_repo.get_generacion_fotovoltaica,
+                    lat=activo.latitud if activo.latitud else lat,
+                    lon=activo.longitud if activo.longitud else lon,
+                    start_date=fecha_inicio,
+                    end_date=fecha_fin,
+                    peak_power_kwp=potencia,
+                    angle=inclinacion,
+                    aspect=azimut,
+                    loss=perdida,
+                    tech=activo.tecnologiaPanel if activo.tecnologiaPanel else 'crystSi'
+                )
+            
+            try:
+                for id_activo, futuro in futuros.items():
+                    try:
+                        # Almacenar en caché
+                        self._cache_generacion_pv[id_activo] = futuro.result()
+                    except Exception as e:
+                        logging.error(f"Error al precalcular generación PV para activo {id_activo}: {e}")
+                        self._cache_generacion_pv[id_activo] = {}
+            finally:
+                if executor_propio is not None:
+                    executor_propio.shutdown(wait=True)
             
             return None  # En modo precálculo no devolvemos nada
                 
@@ -311,7 +887,7 @@ class MotorSimulacion:
                                 factor_rendimiento *= (1 - activo.perdidaSistema / 100)
                             
                             # La fórmula simplificada: kWh = kWp * GHI/1000 * factor_rendimiento
-                            energia_generada = potencia_kw * (ghi/1000) * factor_rendimiento
+                            energia_generada = potencia_kw * (ghi/1000) * factor_rendimiento * horas_intervalo
                 
                 elif activo.tipo_activo == TipoActivoGeneracion.AEROGENERADOR:
                     # Cálculo para aerogenerador usando la curva de potencia proporcionada
@@ -326,7 +902,7 @@ class MotorSimulacion:
                             # Si la velocidad está en el JSON, usar ese valor; si no, devolver 0
                             if velocidad_str in activo.curvaPotencia:
                                 potencia_w = float(activo.curvaPotencia[velocidad_str])
-                                energia_generada = potencia_w / 1000.0  # Convertir W a kW 
+                                energia_generada = potencia_w / 1000.0 * horas_intervalo  # W a kWh en el intervalo
                             else:
                                 energia_generada = 0.0
                         else:
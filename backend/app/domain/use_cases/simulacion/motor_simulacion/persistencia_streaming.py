@@ -0,0 +1,218 @@
+import logging
+import queue
+import threading
+import time
+
+from app.domain.entities.resultado_simulacion import ResultadoSimulacionEntity
+from app.domain.entities.resultado_simulacion_participante import ResultadoSimulacionParticipanteEntity
+from app.domain.entities.resultado_simulacion_activo_generacion import ResultadoSimulacionActivoGeneracionEntity
+from app.domain.entities.resultado_simulacion_activo_almacenamiento import ResultadoSimulacionActivoAlmacenamientoEntity
+from app.domain.use_cases.simulacion.motor_simulacion.persistir_resultados import (
+    TAMANO_LOTE_DEFECTO,
+    construir_filas_intervalos_participantes,
+    construir_filas_intervalos_activos_generacion,
+    construir_filas_intervalos_activos_almacenamiento,
+)
+
+
+def crear_resultados_provisionales(repos, simulacion, participantes, activos_gen, activos_alm):
+
+    # Los intervalos se escriben mientras se simula, así que las filas de resultados
+    # (a las que apuntan por FK) se crean antes con valores a cero y se completan al final
+    resultado_global = repos['resultado_simulacion_repo'].create(
+        ResultadoSimulacionEntity(idSimulacion=simulacion.idSimulacion)
+    )
+
+    resultados_part = repos['resultado_participante_repo'].create_bulk(
+        [ResultadoSimulacionParticipanteEntity(idParticipante=p.idParticipante) for p in participantes],
+        resultado_global.idResultado
+    )
+    resultados_gen = repos['resultado_activo_gen_repo'].create_bulk(
+        [ResultadoSimulacionActivoGeneracionEntity(idActivoGeneracion=a.idActivoGeneracion) for a in activos_gen],
+        resultado_global.idResultado
+    )
+    resultados_alm = repos['resultado_activo_alm_repo'].create_bulk(
+        [ResultadoSimulacionActivoAlmacenamientoEntity(idActivoAlmacenamiento=a.idActivoAlmacenamiento) for a in activos_alm],
+        resultado_global.idResultado
+    )
+
+    return (
+        resultado_global,
+        {r.idParticipante: r.idResultadoParticipante for r in resultados_part},
+        {r.idActivoGeneracion: r.idResultadoActivoGen for r in resultados_gen},
+        {r.idActivoAlmacenamiento: r.idResultadoActivoAlm for r in resultados_alm},
+    )
+
+
+def completar_resultados_provisionales(
+    repos,
+    resultado_global,
+    participantes_dict,
+    activos_gen_dict,
+    activos_alm_dict,
+    resultados_globales,
+    resultados_part,
+    resultados_activos_gen,
+    resultados_activos_alm
+):
+    try:
+        repos['resultado_simulacion_repo'].update(resultado_global.idResultado, resultados_globales)
+        print("  Resultados globales guardados")
+
+        # Actualizar las filas provisionales; las que no recibieron intervalos se eliminan
+        # para dejar el mismo conjunto de filas que la persistencia diferida
+        pendientes = dict(participantes_dict)
+        for resultado in resultados_part:
+            repos['resultado_participante_repo'].update(pendientes.pop(resultado.idParticipante), resultado)
+        for id_resultado in pendientes.values():
+            repos['resultado_participante_repo'].delete(id_resultado)
+        print(f"  Resultados de participantes guardados: {len(resultados_part)} participantes")
+
+        pendientes = dict(activos_gen_dict)
+        for resultado in resultados_activos_gen:
+            repos['resultado_activo_gen_repo'].update(pendientes.pop(resultado.idActivoGeneracion), resultado)
+        for id_resultado in pendientes.values():
+            repos['resultado_activo_gen_repo'].delete(id_resultado)
+        print(f"  Resultados de activos de generación guardados: {len(resultados_activos_gen)} activos")
+
+        pendientes = dict(activos_alm_dict)
+        for resultado in resultados_activos_alm:
+            repos['resultado_activo_alm_repo'].update(pendientes.pop(resultado.idActivoAlmacenamiento), resultado)
+        for id_resultado in pendientes.values():
+            repos['resultado_activo_alm_repo'].delete(id_resultado)
+        print(f"  Resultados de activos de almacenamiento guardados: {len(resultados_activos_alm)} activos")
+    except Exception as e:
+        logging.error(f"Error al completar los resultados provisionales: {str(e)}")
+        raise
+
+
+class EscritorIntervalosStreaming:
+
+    # Consumidor de la tubería productor/consumidor: el bucle de simulación encola bloques
+    # de intervalos (un mes) en una cola acotada y este hilo los inserta en la BD, de modo
+    # que la escritura se solapa con el cálculo y la memoria queda acotada por el bloque
+
+    _FIN = object()
+
+    def __init__(
+        self,
+        crear_repos,
+        participantes_dict,
+        activos_gen_dict,
+        activos_alm_dict,
+        tamano_lote=TAMANO_LOTE_DEFECTO,
+        max_bloques_en_cola=2,
+        al_persistir=None,
+        al_guardar_bloque=None
+    ):
+        # crear_repos() -> (repo_intervalo_participante, repo_intervalo_activo, cerrar):
+        # el hilo escritor necesita su propia sesión de BD
+        self._crear_repos = crear_repos
+        self.participantes_dict = participantes_dict
+        self.activos_gen_dict = activos_gen_dict
+        self.activos_alm_dict = activos_alm_dict
+        self.tamano_lote = tamano_lote
+        # al_persistir(filas) se llama desde el hilo escritor tras guardar cada bloque
+        self._al_persistir = al_persistir
+        # al_guardar_bloque(punto_control) se llama desde el hilo escritor cuando las tres
+        # tablas del bloque están guardadas, con el dato que acompañó al bloque en encolar
+        self._al_guardar_bloque = al_guardar_bloque
+
+        self._cola = queue.Queue(maxsize=max_bloques_en_cola)
+        self._hilo = threading.Thread(target=self._ejecutar, name="escritor-intervalos", daemon=True)
+        self._error = None
+
+        self.bloques_escritos = 0
+        self.segundos_escritura = 0.0
+        self.filas = {
+            'participantes': 0,
+            'activos_generacion': 0,
+            'activos_almacenamiento': 0
+        }
+
+    def iniciar(self):
+        self._hilo.start()
+        return self
+
+    def encolar(self, intervalos_participantes, intervalos_activos_gen, intervalos_activos_alm, punto_control=None):
+        self._poner((intervalos_participantes, intervalos_activos_gen, intervalos_activos_alm, punto_control))
+
+    def finalizar(self):
+        # Espera a que se vacíe la cola y propaga cualquier error del hilo escritor
+        self._poner(self._FIN, comprobar_error=False)
+        self._hilo.join()
+        self._comprobar_error()
+
+        for tabla, filas in self.filas.items():
+            print(f"  Intervalos de {tabla.replace('_', ' ')} guardados: {filas} registros")
+        total = sum(self.filas.values())
+        filas_por_segundo = total / self.segundos_escritura if self.segundos_escritura > 0 else 0.0
+        print(f"  Escritura en streaming: {self.bloques_escritos} bloques, {total} registros "
+              f"({filas_por_segundo:,.0f} filas/s, lotes de {self.tamano_lote})")
+
+    def detener(self):
+        # Parada tras un fallo del productor: no se propagan errores del escritor
+        self._poner(self._FIN, comprobar_error=False)
+        self._hilo.join()
+
+    def _poner(self, elemento, comprobar_error=True):
+        # Bloquea mientras la cola está llena, pero sin quedarse colgado si el escritor ha fallado
+        while True:
+            if comprobar_error:
+                self._comprobar_error()
+            if not self._hilo.is_alive():
+                return
+            try:
+                self._cola.put(elemento, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def _comprobar_error(self):
+        if self._error is not None:
+            raise RuntimeError(f"Error en el hilo de escritura de intervalos: {self._error}") from self._error
+
+    def _ejecutar(self):
+        cerrar = None
+        try:
+            repo_participante, repo_activo, cerrar = self._crear_repos()
+            while True:
+                bloque = self._cola.get()
+                if bloque is self._FIN:
+                    break
+                if self._error is not None:
+                    continue  # Se vacía la cola para no bloquear al productor
+
+                intervalos_part, intervalos_gen, intervalos_alm, punto_control = bloque
+                inicio = time.time()
+                try:
+                    filas_part = repo_participante.insertar_bulk(
+                        construir_filas_intervalos_participantes(intervalos_part, self.participantes_dict),
+                        self.tamano_lote
+                    )
+                    filas_gen = repo_activo.insertar_bulk(
+                        construir_filas_intervalos_activos_generacion(intervalos_gen, self.activos_gen_dict),
+                        self.tamano_lote
+                    )
+                    filas_alm = repo_activo.insertar_bulk(
+                        construir_filas_intervalos_activos_almacenamiento(intervalos_alm, self.activos_alm_dict),
+                        self.tamano_lote
+                    )
+                    self.filas['participantes'] += filas_part
+                    self.filas['activos_generacion'] += filas_gen
+                    self.filas['activos_almacenamiento'] += filas_alm
+                    self.bloques_escritos += 1
+                    if self._al_persistir is not None:
+                        self._al_persistir(filas_part + filas_gen + filas_alm)
+                    if self._al_guardar_bloque is not None and punto_control is not None:
+                        self._al_guardar_bloque(punto_control)
+                except Exception as e:
+                    logging.error(f"Error al persistir bloque de intervalos: {str(e)}")
+                    self._error = e
+                self.segundos_escritura += time.time() - inicio
+        except Exception as e:
+            logging.error(f"Error en el hilo de escritura de intervalos: {str(e)}")
+            self._error = e
+        finally:
+            if cerrar is not None:
+                cerrar()
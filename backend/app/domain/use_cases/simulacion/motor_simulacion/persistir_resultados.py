@@ -1,8 +1,7 @@
 from typing import List, Dict, Any
 from datetime import datetime
+import time
 
-from app.domain.entities.datos_intervalo_participante import DatosIntervaloParticipanteEntity
-from app.domain.entities.datos_intervalo_activo import DatosIntervaloActivoEntity
 from app.domain.entities.resultado_simulacion import ResultadoSimulacionEntity
 from app.domain.entities.resultado_simulacion_participante import ResultadoSimulacionParticipanteEntity
 from app.domain.entities.resultado_simulacion_activo_generacion import ResultadoSimulacionActivoGeneracionEntity
@@ -12,6 +11,9 @@ from app.domain.entities.datos_ambientales import DatosAmbientalesEntity
 import logging
 
 
+TAMANO_LOTE_DEFECTO = 5000
+
+
 def persistir_resultado_global(resultado_simulacion_repo, resultados_globales):
     try:
         resultado_global = resultado_simulacion_repo.create(resultados_globales)
@@ -62,100 +64,103 @@ def persistir_datos_ambientales(datos_ambientales_repo, datos_ambientales):
         raise
 
 
-def convertir_y_persistir_intervalos_participantes(datos_intervalo_participante_repo, resultados_intervalo_participantes, resultados_participantes_dict):
+def persistir_agregados_intervalos(agregado_participante_repo, agregado_activo_repo, id_resultado_global, desde=None):
+    # Agregados diarios y mensuales de los intervalos ya guardados, para los gráficos por periodo.
+    # desde es el primer instante con intervalos nuevos: los periodos anteriores no se rehacen
     try:
-        # Convertir diccionarios a entidades
-        entidades_intervalo = []
-        
-        for resultado in resultados_intervalo_participantes:
-            id_participante = resultado.get('idParticipante')
-            if id_participante not in resultados_participantes_dict:
-                print(f"[ADVERTENCIA] No se encontró ResultadoParticipante para participante ID {id_participante}")
-                continue
-                
-            entidad = DatosIntervaloParticipanteEntity(
-                idDatosIntervaloParticipante=None,  # Será asignado por la base de datos
-                timestamp=resultado.get('timestamp'),
-                consumoReal_kWh=resultado.get('consumoReal_kWh'),
-                autoconsumo_kWh=resultado.get('autoconsumo_kWh'),
-                energiaRecibidaReparto_kWh=resultado.get('energiaRecibidaReparto_kWh'),
-                energiaAlmacenamiento_kWh=resultado.get('energiaAlmacenamiento_kWh'),
-                energiaDiferencia_kWh=resultado.get('energiaDiferencia_kWh'),
-                excedenteVertidoCompensado_kWh=resultado.get('excedenteVertidoCompensado_kWh'),
-                precioImportacionIntervalo=resultado.get('precioImportacionIntervalo'),
-                precioExportacionIntervalo=resultado.get('precioExportacionIntervalo'),
-                idResultadoParticipante=resultados_participantes_dict[id_participante]  # Asignamos el ID correcto
-            )
-            entidades_intervalo.append(entidad)
-        
-        # Persistir entidades
-        datos_persistidos = datos_intervalo_participante_repo.create_bulk(entidades_intervalo)
-        print(f"  Intervalos de participantes guardados: {len(entidades_intervalo)} registros")
-        return datos_persistidos
+        inicio = time.time()
+        filas = agregado_participante_repo.recalcular_por_resultado_simulacion(id_resultado_global, desde)
+        filas += agregado_activo_repo.recalcular_por_resultado_simulacion(id_resultado_global, desde)
+        print(f"  Agregados diarios y mensuales guardados: {filas} registros ({time.time() - inicio:.2f}s)")
+        return filas
+    except Exception as e:
+        logging.error(f"Error al persistir agregados de intervalos: {str(e)}")
+        raise
+
+
+def insertar_por_lotes(repo, lotes_filas, tamano_lote, descripcion):
+    # Inserción masiva por lotes con medición del rendimiento por tabla. Las filas se
+    # construyen lote a lote para no duplicar en memoria todo el almacén de intervalos
+    inicio = time.time()
+    total = 0
+    for filas in lotes_filas:
+        total += repo.insertar_bulk(filas, tamano_lote)
+    duracion = time.time() - inicio
+    filas_por_segundo = total / duracion if duracion > 0 else 0.0
+    print(f"  {descripcion}: {total} registros ({filas_por_segundo:,.0f} filas/s, lotes de {tamano_lote})")
+    return {'filas': total, 'segundos': duracion, 'filas_por_segundo': filas_por_segundo}
+
+
+def _construir_filas(intervalos, ids_resultado, campo_resultado, columnas_nulas, descripcion):
+    # Filas de la tabla directamente desde las columnas (sin entidades ni modelos ORM)
+    ids = intervalos.ids().tolist()
+    for id_entidad in set(ids) - set(ids_resultado):
+        print(f"[ADVERTENCIA] No se encontró {descripcion} para ID {id_entidad}")
+    
+    columnas = [intervalos.valores(campo) for campo in intervalos.CAMPOS]
+    filas = []
+    for id_entidad, timestamp, *valores in zip(ids, intervalos.timestamps_filas(), *columnas):
+        id_resultado = ids_resultado.get(id_entidad)
+        if id_resultado is None:
+            continue
+        fila = dict(zip(intervalos.CAMPOS, valores))
+        fila.update(columnas_nulas)
+        fila['timestamp'] = timestamp
+        fila[campo_resultado] = id_resultado
+        filas.append(fila)
+    return filas
+
+
+def construir_filas_intervalos_participantes(intervalos_participantes, resultados_participantes_dict):
+    return _construir_filas(
+        intervalos_participantes, resultados_participantes_dict,
+        'idResultadoParticipante', {}, "ResultadoParticipante"
+    )
+
+
+def construir_filas_intervalos_activos_generacion(intervalos_activos_generacion, resultados_activos_gen_dict):
+    return _construir_filas(
+        intervalos_activos_generacion, resultados_activos_gen_dict, 'idResultadoActivoGen',
+        {'energiaCargada_kWh': None, 'energiaDescargada_kWh': None, 'SoC_kWh': None, 'idResultadoActivoAlm': None},
+        "ResultadoActivoGeneracion"
+    )
+
+
+def construir_filas_intervalos_activos_almacenamiento(intervalos_activos_almacenamiento, resultados_activos_alm_dict):
+    return _construir_filas(
+        intervalos_activos_almacenamiento, resultados_activos_alm_dict, 'idResultadoActivoAlm',
+        {'energiaGenerada_kWh': None, 'idResultadoActivoGen': None},
+        "ResultadoActivoAlmacenamiento"
+    )
+
+
+def _lotes_filas(intervalos, construir_filas, ids_resultado, tamano_lote):
+    for inicio in range(0, len(intervalos), tamano_lote):
+        yield construir_filas(intervalos.bloque(inicio, inicio + tamano_lote), ids_resultado)
+
+
+def convertir_y_persistir_intervalos_participantes(datos_intervalo_participante_repo, resultados_intervalo_participantes, resultados_participantes_dict, tamano_lote=TAMANO_LOTE_DEFECTO):
+    try:
+        lotes = _lotes_filas(resultados_intervalo_participantes, construir_filas_intervalos_participantes, resultados_participantes_dict, tamano_lote)
+        return insertar_por_lotes(datos_intervalo_participante_repo, lotes, tamano_lote, "Intervalos de participantes guardados")
     except Exception as e:
         logging.error(f"Error al convertir y persistir intervalos de participantes: {str(e)}")
         raise
 
 
-def convertir_y_persistir_intervalos_activos_generacion(datos_intervalo_activo_repo, resultados_intervalo_activos_generacion, resultados_activos_gen_dict):
+def convertir_y_persistir_intervalos_activos_generacion(datos_intervalo_activo_repo, resultados_intervalo_activos_generacion, resultados_activos_gen_dict, tamano_lote=TAMANO_LOTE_DEFECTO):
     try:
-        # Convertir diccionarios a entidades
-        entidades_intervalo = []
-        
-        for resultado in resultados_intervalo_activos_generacion:
-            id_activo = resultado.get('idActivoGeneracion')
-            if id_activo not in resultados_activos_gen_dict:
-                print(f"[ADVERTENCIA] No se encontró ResultadoActivoGeneracion para activo ID {id_activo}")
-                continue
-                
-            entidad = DatosIntervaloActivoEntity(
-                idDatosIntervaloActivo=None,  # Será asignado por la base de datos
-                timestamp=resultado.get('timestamp'),
-                energiaGenerada_kWh=resultado.get('energiaGenerada_kWh'),
-                energiaCargada_kWh=None,
-                energiaDescargada_kWh=None,
-                SoC_kWh=None,
-                idResultadoActivoGen=resultados_activos_gen_dict[id_activo],  # Asignamos el ID correcto
-                idResultadoActivoAlm=None
-            )
-            entidades_intervalo.append(entidad)
-        
-        # Persistir entidades
-        datos_persistidos = datos_intervalo_activo_repo.create_bulk(entidades_intervalo)
-        print(f"  Intervalos de activos de generación guardados: {len(entidades_intervalo)} registros")
-        return datos_persistidos
+        lotes = _lotes_filas(resultados_intervalo_activos_generacion, construir_filas_intervalos_activos_generacion, resultados_activos_gen_dict, tamano_lote)
+        return insertar_por_lotes(datos_intervalo_activo_repo, lotes, tamano_lote, "Intervalos de activos de generación guardados")
     except Exception as e:
         logging.error(f"Error al convertir y persistir intervalos de activos de generación: {str(e)}")
         raise
 
 
-def convertir_y_persistir_intervalos_activos_almacenamiento(datos_intervalo_activo_repo, resultados_intervalo_activos_almacenamiento, resultados_activos_alm_dict):
+def convertir_y_persistir_intervalos_activos_almacenamiento(datos_intervalo_activo_repo, resultados_intervalo_activos_almacenamiento, resultados_activos_alm_dict, tamano_lote=TAMANO_LOTE_DEFECTO):
     try:
-        # Convertir diccionarios a entidades
-        entidades_intervalo = []
-        
-        for resultado in resultados_intervalo_activos_almacenamiento:
-            id_activo = resultado.get('idActivoAlmacenamiento')
-            if id_activo not in resultados_activos_alm_dict:
-                print(f"[ADVERTENCIA] No se encontró ResultadoActivoAlmacenamiento para activo ID {id_activo}")
-                continue
-                
-            entidad = DatosIntervaloActivoEntity(
-                idDatosIntervaloActivo=None,  # Será asignado por la base de datos
-                timestamp=resultado.get('timestamp'),
-                energiaGenerada_kWh=None,
-                energiaCargada_kWh=resultado.get('energiaCargada_kWh'),
-                energiaDescargada_kWh=resultado.get('energiaDescargada_kWh'),
-                SoC_kWh=resultado.get('SoC_kWh'),
-                idResultadoActivoGen=None,
-                idResultadoActivoAlm=resultados_activos_alm_dict[id_activo]  # Asignamos el ID correcto
-            )
-            entidades_intervalo.append(entidad)
-        
-        # Persistir entidades
-        datos_persistidos = datos_intervalo_activo_repo.create_bulk(entidades_intervalo)
-        print(f"  Intervalos de activos de almacenamiento guardados: {len(entidades_intervalo)} registros")
-        return datos_persistidos
+        lotes = _lotes_filas(resultados_intervalo_activos_almacenamiento, construir_filas_intervalos_activos_almacenamiento, resultados_activos_alm_dict, tamano_lote)
+        return insertar_por_lotes(datos_intervalo_activo_repo, lotes, tamano_lote, "Intervalos de activos de almacenamiento guardados")
     except Exception as e:
         logging.error(f"Error al convertir y persistir intervalos de activos de almacenamiento: {str(e)}")
         raise
@@ -170,7 +175,8 @@ def persistir_todos_los_resultados(
     datos_ambientales,
     resultados_intervalo_participantes,
     resultados_intervalo_activos_generacion,
-    resultados_intervalo_activos_almacenamiento
+    resultados_intervalo_activos_almacenamiento,
+    tamano_lote=TAMANO_LOTE_DEFECTO
 ):
     try:
         print(f"\nPersistiendo resultados en base de datos...")
@@ -225,7 +231,8 @@ def persistir_todos_los_resultados(
         intervalos_participantes = convertir_y_persistir_intervalos_participantes(
             repos['datos_intervalo_participante_repo'], 
             resultados_intervalo_participantes,
-            participantes_dict  # Pasamos el diccionario de mapeo
+            participantes_dict,  # Pasamos el diccionario de mapeo
+            tamano_lote
         )
         
         # 7. Convertir y persistir intervalos de activos de generación
@@ -233,7 +240,8 @@ def persistir_todos_los_resultados(
         intervalos_activos_generacion = convertir_y_persistir_intervalos_activos_generacion(
             repos['datos_intervalo_activo_repo'], 
             resultados_intervalo_activos_generacion,
-            activos_gen_dict  # Pasamos el diccionario de mapeo
+            activos_gen_dict,  # Pasamos el diccionario de mapeo
+            tamano_lote
         )
         
         # 8. Convertir y persistir intervalos de activos de almacenamiento
@@ -241,7 +249,8 @@ def persistir_todos_los_resultados(
         intervalos_activos_almacenamiento = convertir_y_persistir_intervalos_activos_almacenamiento(
             repos['datos_intervalo_activo_repo'], 
             resultados_intervalo_activos_almacenamiento,
-            activos_alm_dict  # Pasamos el diccionario de mapeo
+            activos_alm_dict,  # Pasamos el diccionario de mapeo
+            tamano_lote
         )
         
         print(f"  ✓ Todos los resultados guardados exitosamente")
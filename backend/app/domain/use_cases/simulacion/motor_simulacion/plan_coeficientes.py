@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.domain.use_cases.simulacion.motor_simulacion.aplicar_estrategia_intervalo import _obtener_coeficiente_reparto
+
+
+TOLERANCIA_SUMA_PCT = 0.01
+
+
+class PlanCoeficientesReparto:
+
+    # Coeficientes de reparto compilados una vez por simulación en una matriz
+    # (24 horas x participantes) en %, de modo que el bucle por intervalo solo indexa
+    # por hora en lugar de volver a recorrer las franjas de REPARTO_PROGRAMADO.
+    # Los participantes sin coeficiente quedan como NaN (coeficiente None).
+
+    def __init__(self, ids_participantes: List[int], matriz_horaria: np.ndarray):
+        self.ids_participantes = list(ids_participantes)
+        self.matriz_horaria = matriz_horaria
+        self._por_hora = [
+            {id_p: (None if np.isnan(valor) else valor) for id_p, valor in zip(self.ids_participantes, fila)}
+            for fila in matriz_horaria.tolist()
+        ]
+
+    @classmethod
+    def compilar(cls, coeficientes: Dict[int, list], ids_participantes: List[int]):
+
+        matriz = np.full((24, len(ids_participantes)), np.nan, dtype=np.float64)
+        for idx_p, id_p in enumerate(ids_participantes):
+            for hora in range(24):
+                coef = _obtener_coeficiente_reparto(coeficientes.get(id_p, []), datetime(2000, 1, 1, hora))
+                if coef is not None:
+                    matriz[hora, idx_p] = float(coef)
+        return cls(ids_participantes, matriz)
+
+    def coeficiente(self, id_participante: int, timestamp: datetime) -> Optional[float]:
+        return self._por_hora[timestamp.hour].get(id_participante)
+
+    def matriz(self, timestamps: List[datetime]) -> np.ndarray:
+        # Matriz (T x participantes) para la simulación vectorizada; sin coeficiente cuenta como 0
+        horas = np.array([ts.hour for ts in timestamps], dtype=np.int64)
+        return np.nan_to_num(self.matriz_horaria, nan=0.0)[horas]
+
+    def errores(self) -> List[str]:
+
+        errores = []
+        if not self.ids_participantes:
+            return errores
+
+        sin_coeficiente = [id_p for idx_p, id_p in enumerate(self.ids_participantes)
+                           if np.isnan(self.matriz_horaria[:, idx_p]).all()]
+        if sin_coeficiente:
+            errores.append(f"Participantes sin coeficiente de reparto: {sin_coeficiente}")
+
+        valores = np.nan_to_num(self.matriz_horaria, nan=0.0)
+        fuera_de_rango = sorted({self.ids_participantes[idx_p] for idx_p in np.where((valores < 0) | (valores > 100))[1]})
+        if fuera_de_rango:
+            errores.append(f"Coeficientes fuera del rango 0-100% para los participantes: {fuera_de_rango}")
+
+        # Las franjas con la misma suma se agrupan en un único mensaje
+        sumas = valores.sum(axis=1)
+        horas_por_suma = {}
+        for hora in np.where(np.abs(sumas - 100.0) > TOLERANCIA_SUMA_PCT)[0].tolist():
+            horas_por_suma.setdefault(round(float(sumas[hora]), 2), []).append(hora)
+        for suma, horas in horas_por_suma.items():
+            errores.append(f"Los coeficientes suman {suma:.2f}% (deben sumar 100%) en las franjas {_describir_horas(horas)}")
+
+        return errores
+
+    def validar(self):
+        errores = self.errores()
+        if errores:
+            raise ValueError("Coeficientes de reparto no válidos: " + "; ".join(errores))
+        return self
+
+
+def _describir_horas(horas: List[int]) -> str:
+
+    # [0, 1, 2, 5] -> "00:00-02:00, 05:00"
+    tramos = []
+    for hora in horas:
+        if tramos and tramos[-1][1] == hora - 1:
+            tramos[-1][1] = hora
+        else:
+            tramos.append([hora, hora])
+    return ", ".join(f"{inicio:02d}:00" if inicio == fin else f"{inicio:02d}:00-{fin:02d}:00" for inicio, fin in tramos)
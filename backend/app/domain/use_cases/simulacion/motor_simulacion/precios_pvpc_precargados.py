@@ -0,0 +1,113 @@
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple
+
+import numpy as np
+
+from app.domain.entities.pvpc_precios import PvpcPreciosEntity
+from app.domain.repositories.pvpc_precios_repository import PvpcPreciosRepository
+from app.domain.use_cases.simulacion.motor_simulacion.resolucion_temporal import timestamps_a_minutos
+
+
+class PvpcPreciosPrecargados(PvpcPreciosRepository):
+
+    # Tabla en memoria con los precios PVPC de toda la ventana de simulación.
+    # Se carga con una única consulta (get_precios_range) y se comparte entre
+    # todos los participantes; implementa la misma interfaz que el repositorio
+    # para que obtener_precio_energia pueda usarla sin cambios.
+    # Con intervalos de menos de una hora se aplica el último precio de la misma hora,
+    # de modo que sirven tanto precios horarios como cuartohorarios.
+
+    def __init__(self, pvpc_repo: PvpcPreciosRepository):
+        self.pvpc_repo = pvpc_repo
+        self._precios: Dict[datetime, PvpcPreciosEntity] = {}
+        self._indice = None
+        self.registros_cargados = 0
+        self.consultas_bd = 0
+        self.consultas = 0
+        self.aciertos = 0
+
+    def cargar(self, fecha_inicio: datetime, fecha_fin: datetime) -> "PvpcPreciosPrecargados":
+
+        precios = self.pvpc_repo.get_precios_range(fecha_inicio, fecha_fin)
+        self.consultas_bd += 1
+        self._precios = {precio.timestamp: precio for precio in precios}
+        self.registros_cargados = len(self._precios)
+        self._indice = None
+        return self
+
+    def __getstate__(self):
+        # Al enviarse a otro proceso (barridos) viajan los precios ya cargados, no el repositorio
+        estado = self.__dict__.copy()
+        estado['pvpc_repo'] = None
+        return estado
+
+    def get_precio_by_timestamp(self, timestamp: datetime) -> Optional[PvpcPreciosEntity]:
+
+        self.consultas += 1
+        precio = self._precios.get(timestamp)
+        if precio is None and timestamp.minute and self._precios:
+            minutos_precios, _, _, ordenados = self._indice_precios()
+            minuto = int(timestamps_a_minutos([timestamp])[0])
+            posicion = int(np.searchsorted(minutos_precios, minuto, side='right')) - 1
+            if posicion >= 0 and minutos_precios[posicion] >= (minuto // 60) * 60:
+                precio = ordenados[posicion]
+        if precio is not None:
+            self.aciertos += 1
+        return precio
+
+    def get_precios_range(self, fecha_inicio: datetime, fecha_fin: datetime) -> List[PvpcPreciosEntity]:
+
+        return [p for ts, p in sorted(self._precios.items()) if fecha_inicio <= ts <= fecha_fin]
+
+    def resumen_range(self, fecha_inicio: datetime, fecha_fin: datetime) -> Tuple:
+
+        precios = self.get_precios_range(fecha_inicio, fecha_fin)
+        return (
+            len(precios),
+            sum(p.precio_importacion for p in precios if p.precio_importacion is not None) if precios else None,
+            sum(p.precio_exportacion for p in precios if p.precio_exportacion is not None) if precios else None,
+            precios[-1].timestamp if precios else None
+        )
+
+    def vector_precios(self, timestamps: List[datetime], tipo_precio: str = "importacion") -> np.ndarray:
+
+        # Vector alineado con los timestamps; NaN donde no hay precio PVPC. Cada instante toma
+        # el último precio anterior o igual dentro de su misma hora (búsqueda binaria)
+        vector = np.full(len(timestamps), np.nan, dtype=np.float64)
+        self.consultas += len(timestamps)
+        if not timestamps or not self._precios:
+            return vector
+        
+        minutos_precios, importacion, exportacion, _ = self._indice_precios()
+        valores = importacion if tipo_precio == "importacion" else exportacion
+        minutos = timestamps_a_minutos(timestamps)
+        posicion = np.searchsorted(minutos_precios, minutos, side='right') - 1
+        encontrado = posicion >= 0
+        posicion = np.maximum(posicion, 0)
+        encontrado &= minutos_precios[posicion] >= (minutos // 60) * 60
+        
+        self.aciertos += int(encontrado.sum())
+        vector[encontrado] = valores[posicion[encontrado]]
+        return vector
+
+    def _indice_precios(self):
+
+        # Instantes ordenados (minutos) y precios como arrays, construidos una vez por carga
+        if self._indice is None:
+            ordenados = [p for _, p in sorted(self._precios.items())]
+            self._indice = (
+                timestamps_a_minutos([p.timestamp for p in ordenados]),
+                np.array([np.nan if p.precio_importacion is None else p.precio_importacion for p in ordenados], dtype=np.float64),
+                np.array([np.nan if p.precio_exportacion is None else p.precio_exportacion for p in ordenados], dtype=np.float64),
+                ordenados,
+            )
+        return self._indice
+
+    def tasa_aciertos_pct(self) -> float:
+
+        return (self.aciertos / self.consultas * 100) if self.consultas > 0 else 0.0
+
+    def resumen(self) -> str:
+
+        return (f"{self.registros_cargados} precios en {self.consultas_bd} consulta(s); "
+                f"aciertos {self.aciertos}/{self.consultas} ({self.tasa_aciertos_pct():.1f}%)")
@@ -0,0 +1,83 @@
+import threading
+import time
+
+
+FASES_SIMULACION = {
+    1: "Actualizando estado",
+    2: "Cargando configuración",
+    3: "Obteniendo datos",
+    4: "Simulando intervalos",
+    5: "Calculando resultados",
+    6: "Persistiendo resultados",
+    7: "Finalizando",
+}
+
+
+class ProgresoSimulacion:
+
+    # Progreso estructurado de una ejecución del motor. Cada cambio se entrega como
+    # diccionario a notificar(progreso); el worker guarda el último y lo publica en
+    # SIMULACION_JOB, de donde lo lee el endpoint SSE /simulaciones/{id}/progreso.
+    # El hilo escritor también suma filas, de ahí el cerrojo
+
+    def __init__(self, notificar=None):
+        self._notificar = notificar
+        self._cerrojo = threading.Lock()
+        self._inicio = time.time()
+        self._inicio_intervalos = None
+        self.fase = 0
+        self.intervalos_procesados = 0
+        self.intervalos_totales = 0
+        self.filas_persistidas = 0
+
+    def iniciar_fase(self, fase: int):
+        with self._cerrojo:
+            self.fase = fase
+        self._publicar()
+
+    def iniciar_intervalos(self, intervalos_totales: int):
+        with self._cerrojo:
+            self.intervalos_totales = intervalos_totales
+            self.intervalos_procesados = 0
+            self._inicio_intervalos = time.time()
+        self._publicar()
+
+    def avanzar_intervalos(self, intervalos_procesados: int):
+        with self._cerrojo:
+            self.intervalos_procesados = min(intervalos_procesados, self.intervalos_totales)
+        self._publicar()
+
+    def sumar_filas(self, filas: int):
+        with self._cerrojo:
+            self.filas_persistidas += filas
+        self._publicar()
+
+    def eta_segundos(self):
+        # Estimación lineal a partir del ritmo de la fase de simulación de intervalos
+        if not self._inicio_intervalos or self.intervalos_procesados <= 0:
+            return None
+        pendientes = self.intervalos_totales - self.intervalos_procesados
+        if pendientes <= 0:
+            return 0.0
+        transcurrido = time.time() - self._inicio_intervalos
+        return round(transcurrido / self.intervalos_procesados * pendientes, 1)
+
+    def a_dict(self):
+        with self._cerrojo:
+            porcentaje = (100.0 * self.intervalos_procesados / self.intervalos_totales
+                          if self.intervalos_totales else 0.0)
+            return {
+                'fase': self.fase,
+                'totalFases': len(FASES_SIMULACION),
+                'descripcionFase': FASES_SIMULACION.get(self.fase),
+                'intervalosProcesados': self.intervalos_procesados,
+                'intervalosTotales': self.intervalos_totales,
+                'porcentajeIntervalos': round(porcentaje, 1),
+                'filasPersistidas': self.filas_persistidas,
+                'segundosTranscurridos': round(time.time() - self._inicio, 1),
+                'etaSegundos': self.eta_segundos(),
+            }
+
+    def _publicar(self):
+        if self._notificar is not None:
+            self._notificar(self.a_dict())
@@ -0,0 +1,145 @@
+import copy
+import logging
+from dataclasses import asdict, replace
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.domain.entities.datos_ambientales import DatosAmbientalesEntity
+from app.domain.entities.punto_control_simulacion import PuntoControlSimulacionEntity
+from app.domain.use_cases.simulacion.motor_simulacion.calcular_resultados import AgregadorResultados
+
+
+# Versión del formato de estadoMotor y entradas: un punto de control guardado con otra
+# versión (o ilegible) no se interpreta, se descarta y la simulación se repite desde cero
+VERSION_PUNTO_CONTROL = 1
+
+
+class GuardadoPuntosControl:
+
+    # Puntos de control de la persistencia en streaming. El productor toma una instantánea
+    # del estado al encolar cada bloque (instantanea) y el hilo escritor la guarda cuando el
+    # bloque ya está en BD (guardar), así el punto de control nunca va por delante de los
+    # intervalos persistidos. El repositorio debe usar una sesión propia del hilo escritor.
+    # timestamps son los instantes que quedan por simular y completados los ya persistidos
+
+    def __init__(self, repo, simulacion_id: int, resultado_id: int, huella: str, fecha_fin,
+                 timestamps: List, completados: int, estado_almacenamiento: Dict[int, Dict[str, float]],
+                 entradas: Dict[str, Any] = None):
+        self.repo = repo
+        self.simulacion_id = simulacion_id
+        self.resultado_id = resultado_id
+        self.huella = huella
+        # Fin de la ventana simulada: permite continuar la simulación si se amplía
+        self.fecha_fin = fecha_fin
+        self.timestamps = timestamps
+        self.completados = completados
+        self._procesados = 0
+        self._estado_almacenamiento = copy.deepcopy(estado_almacenamiento)
+        # Las entradas solo viajan con el primer punto de control
+        self._entradas = entradas_a_datos(entradas) if entradas is not None else None
+        self.guardados = 0
+
+    def instantanea(self, agregador, intervalos_activos_alm, num_intervalos: int) -> Dict[str, Any]:
+
+        # Se llama en el hilo del productor justo después de agregar el bloque
+        self._procesados += num_intervalos
+        self.completados += num_intervalos
+        self._estado_almacenamiento.update(soc_al_final_del_bloque(intervalos_activos_alm))
+        return {
+            'ultimoTimestamp': self.timestamps[self._procesados - 1],
+            'intervalosCompletados': self.completados,
+            'estadoMotor': estado_motor_a_datos(agregador, self._estado_almacenamiento, self.fecha_fin),
+        }
+
+    def guardar(self, instantanea: Dict[str, Any]):
+
+        # Un fallo al guardar el punto de control no detiene la simulación
+        try:
+            self.repo.guardar(PuntoControlSimulacionEntity(
+                idSimulacion=self.simulacion_id,
+                idResultado=self.resultado_id,
+                huellaEntradas=self.huella,
+                entradas=self._entradas,
+                **instantanea
+            ))
+            self._entradas = None
+            self.guardados += 1
+        except Exception as e:
+            logging.error(f"Error al guardar el punto de control de la simulación {self.simulacion_id}: {str(e)}")
+
+
+def estado_motor_a_datos(agregador, estado_almacenamiento: Dict[int, Dict[str, float]], fecha_fin) -> Dict[str, Any]:
+
+    # Solo datos planos (sumas, SoC, instantes ISO) para que el estado guardado no dependa
+    # de las clases del motor
+    return {
+        'version': VERSION_PUNTO_CONTROL,
+        'agregador': agregador.exportar_estado(),
+        'estado_almacenamiento': {str(id_alm): float(estado['soc_kwh']) for id_alm, estado in estado_almacenamiento.items()},
+        'fechaFin': fecha_fin.isoformat() if fecha_fin is not None else None,
+    }
+
+
+def entradas_a_datos(entradas: Dict[str, Any]) -> Dict[str, Any]:
+
+    datos_ambientales = []
+    for dato in entradas['datos_ambientales']:
+        fila = asdict(dato)
+        fila['timestamp'] = dato.timestamp.isoformat()
+        datos_ambientales.append(fila)
+    return {
+        'version': VERSION_PUNTO_CONTROL,
+        'datos_ambientales': datos_ambientales,
+        'cache_generacion_pv': {
+            str(id_activo): [[ts.isoformat(), float(valor)] for ts, valor in generacion.items()]
+            for id_activo, generacion in entradas['cache_generacion_pv'].items()
+        },
+    }
+
+
+def restaurar_punto_control(punto_control: PuntoControlSimulacionEntity) -> PuntoControlSimulacionEntity:
+
+    # Convierte el estado guardado en los objetos que usa el motor. Lanza ValueError (o
+    # KeyError/TypeError si faltan datos) cuando el punto de control no se puede interpretar
+    estado = punto_control.estadoMotor
+    if not isinstance(estado, dict) or estado.get('version') != VERSION_PUNTO_CONTROL:
+        raise ValueError("Formato de punto de control no compatible")
+    estado_motor = {
+        'agregador': AgregadorResultados.desde_estado(estado['agregador']),
+        'estado_almacenamiento': {
+            int(id_alm): {'soc_kwh': float(soc)} for id_alm, soc in estado['estado_almacenamiento'].items()
+        },
+        'fechaFin': datetime.fromisoformat(estado['fechaFin']) if estado['fechaFin'] else None,
+    }
+
+    entradas = None
+    if punto_control.entradas is not None:
+        datos = punto_control.entradas
+        if datos.get('version') != VERSION_PUNTO_CONTROL:
+            raise ValueError("Formato de entradas del punto de control no compatible")
+        entradas = {
+            'datos_ambientales': [
+                DatosAmbientalesEntity(**{**fila, 'timestamp': datetime.fromisoformat(fila['timestamp'])})
+                for fila in datos['datos_ambientales']
+            ],
+            'cache_generacion_pv': {
+                int(id_activo): {datetime.fromisoformat(ts): valor for ts, valor in generacion}
+                for id_activo, generacion in datos['cache_generacion_pv'].items()
+            },
+        }
+    return replace(punto_control, estadoMotor=estado_motor, entradas=entradas)
+
+
+def soc_al_final_del_bloque(intervalos_activos_alm) -> Dict[int, Dict[str, float]]:
+
+    # Los intervalos de almacenamiento están en orden de simulación: el último SoC de cada
+    # batería es su estado de carga al terminar el bloque
+    if len(intervalos_activos_alm) == 0:
+        return {}
+    ids = intervalos_activos_alm.ids()
+    soc = intervalos_activos_alm.columna('SoC_kWh')
+    ids_unicos, ultima_posicion = np.unique(ids[::-1], return_index=True)
+    posiciones = len(ids) - 1 - ultima_posicion
+    return {int(id_alm): {'soc_kwh': float(soc[pos])} for id_alm, pos in zip(ids_unicos, posiciones)}
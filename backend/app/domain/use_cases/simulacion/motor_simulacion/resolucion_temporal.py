@@ -0,0 +1,141 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Pasos de simulación admitidos (SIMULACION.tiempo_medicion, en minutos)
+PASOS_MINUTOS = (15, 30, 60)
+PASO_DEFECTO_MINUTOS = 60
+
+CAMPOS_AMBIENTALES = ('radiacionGlobalHoriz_Wh_m2', 'temperaturaAmbiente_C', 'velocidadViento_m_s')
+
+
+def paso_simulacion_minutos(simulacion) -> int:
+
+    paso = simulacion.tiempo_medicion or PASO_DEFECTO_MINUTOS
+    if paso not in PASOS_MINUTOS:
+        raise ValueError(f"Resolución temporal no soportada: {paso} min "
+                         f"(valores admitidos: {', '.join(str(p) for p in PASOS_MINUTOS)})")
+    return paso
+
+
+def horas_por_intervalo(simulacion) -> float:
+
+    # Duración de cada intervalo en horas: convierte potencias (kW) en energía por intervalo
+    return paso_simulacion_minutos(simulacion) / 60.0
+
+
+def timestamps_a_minutos(timestamps) -> np.ndarray:
+    # Minutos desde epoch: la rejilla de 15/30/60 min queda alineada con las horas
+    return np.array(timestamps, dtype='datetime64[m]').astype(np.int64)
+
+
+def minutos_a_timestamps(minutos: np.ndarray) -> List[datetime]:
+    return minutos.astype('datetime64[m]').tolist()
+
+
+def paso_nativo_minutos(timestamps) -> Optional[int]:
+
+    # Separación más frecuente entre instantes consecutivos (None si no hay al menos dos)
+    minutos = np.unique(timestamps_a_minutos(timestamps))
+    if len(minutos) < 2:
+        return None
+    diferencias, cuentas = np.unique(np.diff(minutos), return_counts=True)
+    return int(diferencias[np.argmax(cuentas)])
+
+
+def remuestrear_consumo(consumo_por_intervalo: Dict[datetime, Dict[int, float]], paso: int) -> Dict[datetime, Dict[int, float]]:
+
+    # {timestamp: {idParticipante: kWh}}: la energía se suma al agregar y se reparte al desagregar
+    timestamps = list(consumo_por_intervalo.keys())
+    nativo = paso_nativo_minutos(timestamps)
+    if nativo is None or nativo == paso:
+        return consumo_por_intervalo
+
+    ids = sorted({id_p for valores in consumo_por_intervalo.values() for id_p in valores})
+    matriz = _matriz_desde_filas(
+        timestamps, ids, (consumo_por_intervalo[ts] for ts in timestamps)
+    )
+    minutos, matriz = _remuestrear_matriz(timestamps_a_minutos(timestamps), matriz, nativo, paso, acumulable=True)
+    return {
+        ts: {id_p: valor for id_p, valor in zip(ids, fila) if valor == valor}
+        for ts, fila in zip(minutos_a_timestamps(minutos), matriz.tolist())
+    }
+
+
+def remuestrear_generacion(cache_generacion: Dict[int, Dict[datetime, float]], paso: int) -> Dict[int, Dict[datetime, float]]:
+
+    # {idActivo: {timestamp: kWh}}: cada activo conserva la energía total de su serie
+    resultado = {}
+    for id_activo, serie in cache_generacion.items():
+        timestamps = list(serie.keys())
+        nativo = paso_nativo_minutos(timestamps)
+        if nativo is None or nativo == paso:
+            resultado[id_activo] = serie
+            continue
+        valores = np.array([serie[ts] for ts in timestamps], dtype=np.float64)[:, None]
+        minutos, valores = _remuestrear_matriz(timestamps_a_minutos(timestamps), valores, nativo, paso, acumulable=True)
+        resultado[id_activo] = dict(zip(minutos_a_timestamps(minutos), valores[:, 0].tolist()))
+    return resultado
+
+
+def remuestrear_ambiental(ambiental_por_intervalo: Dict[datetime, Dict[str, float]], paso: int) -> Dict[datetime, Dict[str, float]]:
+
+    # Radiación, temperatura y viento son magnitudes medias: se promedian al agregar y se
+    # repiten al desagregar (la radiación horaria en Wh/m² es la irradiancia media en W/m²)
+    timestamps = list(ambiental_por_intervalo.keys())
+    nativo = paso_nativo_minutos(timestamps)
+    if nativo is None or nativo == paso:
+        return ambiental_por_intervalo
+
+    matriz = _matriz_desde_filas(
+        timestamps, CAMPOS_AMBIENTALES, (ambiental_por_intervalo[ts] for ts in timestamps)
+    )
+    minutos, matriz = _remuestrear_matriz(timestamps_a_minutos(timestamps), matriz, nativo, paso, acumulable=False)
+    return {
+        ts: {campo: (valor if valor == valor else None) for campo, valor in zip(CAMPOS_AMBIENTALES, fila)}
+        for ts, fila in zip(minutos_a_timestamps(minutos), matriz.tolist())
+    }
+
+
+def _remuestrear_matriz(minutos: np.ndarray, matriz: np.ndarray, nativo: int, paso: int,
+                        acumulable: bool) -> Tuple[np.ndarray, np.ndarray]:
+
+    # matriz (T x columnas) con NaN donde falta el dato
+    if nativo < paso:
+        if paso % nativo:
+            raise ValueError(f"Los datos cada {nativo} min no se pueden agregar a intervalos de {paso} min")
+        # Agregación: cada instante va al intervalo de la rejilla que lo contiene
+        cubetas, posicion = np.unique((minutos // paso) * paso, return_inverse=True)
+        con_dato = ~np.isnan(matriz)
+        sumas = np.zeros((len(cubetas), matriz.shape[1]), dtype=np.float64)
+        cuentas = np.zeros((len(cubetas), matriz.shape[1]), dtype=np.float64)
+        np.add.at(sumas, posicion, np.where(con_dato, matriz, 0.0))
+        np.add.at(cuentas, posicion, con_dato)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            valores = sumas if acumulable else sumas / cuentas
+        return cubetas, np.where(cuentas > 0, valores, np.nan)
+
+    if nativo % paso:
+        raise ValueError(f"Los datos cada {nativo} min no se pueden repartir en intervalos de {paso} min")
+    # Desagregación: cada dato se reparte (energía) o se repite (medias) en sus subintervalos
+    subintervalos = nativo // paso
+    desplazamientos = np.arange(subintervalos) * paso
+    minutos_nuevos = (minutos[:, None] + desplazamientos[None, :]).reshape(-1)
+    valores = np.repeat(matriz, subintervalos, axis=0)
+    if acumulable:
+        valores = valores / subintervalos
+    return minutos_nuevos, valores
+
+
+def _matriz_desde_filas(timestamps: List[datetime], columnas, filas) -> np.ndarray:
+
+    indice = {columna: idx for idx, columna in enumerate(columnas)}
+    matriz = np.full((len(timestamps), len(indice)), np.nan, dtype=np.float64)
+    for idx_t, fila in enumerate(filas):
+        for columna, valor in fila.items():
+            idx_c = indice.get(columna)
+            if idx_c is not None and valor is not None:
+                matriz[idx_t, idx_c] = valor
+    return matriz
@@ -0,0 +1,445 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Dict
+import logging
+
+import numpy as np
+
+from app.domain.entities.tipo_activo_generacion import TipoActivoGeneracion
+from app.domain.entities.tipo_contrato import TipoContrato
+from app.domain.entities.tipo_estrategia_excedentes import TipoEstrategiaExcedentes
+from app.domain.use_cases.simulacion.motor_simulacion.aplicar_estrategia_intervalo import _calcular_degradacion_bateria
+from app.domain.use_cases.simulacion.motor_simulacion.obtener_precio_energia import obtener_precio_energia
+from app.domain.use_cases.simulacion.motor_simulacion.precios_pvpc_precargados import PvpcPreciosPrecargados
+from app.domain.use_cases.simulacion.motor_simulacion.resolucion_temporal import horas_por_intervalo
+from app.domain.use_cases.simulacion.motor_simulacion.intervalos_columnares import (
+    IntervalosParticipantes,
+    IntervalosActivosGeneracion,
+    IntervalosActivosAlmacenamiento,
+)
+
+
+ESTRATEGIAS_SIN_EXCEDENTES = (
+    TipoEstrategiaExcedentes.INDIVIDUAL_SIN_EXCEDENTES,
+    TipoEstrategiaExcedentes.COLECTIVO_SIN_EXCEDENTES,
+)
+
+ESTRATEGIAS_CON_EXCEDENTES = (
+    TipoEstrategiaExcedentes.INDIVIDUAL_EXCEDENTES_COMPENSACION,
+    TipoEstrategiaExcedentes.COLECTIVO_EXCEDENTES_COMPENSACION_RED_EXTERNA,
+)
+
+
+@dataclass
+class ResultadoSimulacionVectorizada:
+    # Ejes de las matrices
+    timestamps: List[datetime]
+    ids_participantes: List[int]
+    ids_activos_gen: List[int]
+    ids_activos_alm: List[int]
+
+    # Matrices (T x activos de generación)
+    generacion: np.ndarray
+
+    # Matrices (T x participantes)
+    consumo: np.ndarray
+    energia_asignada: np.ndarray
+    autoconsumo: np.ndarray
+    energia_diferencia: np.ndarray
+    energia_almacenamiento: np.ndarray
+    excedente: np.ndarray
+    energia_importada: np.ndarray
+    precio_importacion: np.ndarray
+    precio_exportacion: np.ndarray
+
+    # Matrices (T x participantes x activos de almacenamiento)
+    energia_cargada: np.ndarray
+    energia_descargada: np.ndarray
+    soc: np.ndarray
+
+    # Si la estrategia no está soportada no se generan resultados de participantes
+    estrategia_valida: bool = True
+    estado_almacenamiento: Dict[int, Dict[str, float]] = field(default_factory=dict)
+
+    def a_columnas(self, desde=0, hasta=None):
+        # Conversión a los almacenes columnares que consumen la agregación de resultados y la
+        # persistencia. Las matrices se aplanan en el orden de emisión de la implementación de
+        # referencia (intervalo, participante, batería) sin crear un objeto por registro.
+        # desde/hasta acotan los intervalos (p. ej. un mes) para trabajar por bloques
+        hasta = len(self.timestamps) if hasta is None else hasta
+        timestamps = self.timestamps[desde:hasta]
+        num_intervalos = len(timestamps)
+        indices_tiempo = np.arange(num_intervalos)
+
+        num_gen = len(self.ids_activos_gen)
+        intervalos_gen = IntervalosActivosGeneracion.desde_arrays(
+            timestamps,
+            np.repeat(indices_tiempo, num_gen),
+            np.tile(self.ids_activos_gen, num_intervalos),
+            {'energiaGenerada_kWh': self.generacion[desde:hasta].reshape(-1)}
+        )
+
+        if not self.estrategia_valida:
+            return IntervalosParticipantes(), intervalos_gen, IntervalosActivosAlmacenamiento()
+
+        num_part = len(self.ids_participantes)
+        intervalos_part = IntervalosParticipantes.desde_arrays(
+            timestamps,
+            np.repeat(indices_tiempo, num_part),
+            np.tile(self.ids_participantes, num_intervalos),
+            {
+                'consumoReal_kWh': self.consumo[desde:hasta].reshape(-1),
+                'autoconsumo_kWh': self.autoconsumo[desde:hasta].reshape(-1),
+                'energiaRecibidaReparto_kWh': self.energia_asignada[desde:hasta].reshape(-1),
+                'energiaAlmacenamiento_kWh': self.energia_almacenamiento[desde:hasta].reshape(-1),
+                'energiaDiferencia_kWh': self.energia_diferencia[desde:hasta].reshape(-1),
+                'excedenteVertidoCompensado_kWh': self.excedente[desde:hasta].reshape(-1),
+                'precioImportacionIntervalo': self.precio_importacion[desde:hasta].reshape(-1),
+                'precioExportacionIntervalo': self.precio_exportacion[desde:hasta].reshape(-1),
+            }
+        )
+
+        num_alm = len(self.ids_activos_alm)
+        intervalos_alm = IntervalosActivosAlmacenamiento.desde_arrays(
+            timestamps,
+            np.repeat(indices_tiempo, num_part * num_alm),
+            np.tile(self.ids_activos_alm, num_intervalos * num_part),
+            {
+                'energiaCargada_kWh': self.energia_cargada[desde:hasta].reshape(-1),
+                'energiaDescargada_kWh': self.energia_descargada[desde:hasta].reshape(-1),
+                'SoC_kWh': self.soc[desde:hasta].reshape(-1),
+            }
+        )
+
+        return intervalos_part, intervalos_gen, intervalos_alm
+
+
+def rangos_mensuales(timestamps):
+
+    # Pares (desde, hasta) de índices que agrupan timestamps ordenados por mes natural
+    rangos = []
+    inicio = 0
+    for idx in range(1, len(timestamps) + 1):
+        if idx == len(timestamps) or (timestamps[idx].year, timestamps[idx].month) != (timestamps[inicio].year, timestamps[inicio].month):
+            rangos.append((inicio, idx))
+            inicio = idx
+    return rangos
+
+
+def construir_matriz_consumo(consumo_por_intervalo, timestamps, ids_participantes):
+
+    indice_participante = {id_p: idx for idx, id_p in enumerate(ids_participantes)}
+    consumo = np.zeros((len(timestamps), len(ids_participantes)), dtype=np.float64)
+
+    for idx_t, ts in enumerate(timestamps):
+        for id_p, valor in consumo_por_intervalo.get(ts, {}).items():
+            idx_p = indice_participante.get(id_p)
+            if idx_p is not None:
+                consumo[idx_t, idx_p] = valor
+
+    return consumo
+
+
+def construir_matriz_generacion(activos_gen, timestamps, ambiental_por_intervalo, cache_generacion_pv, horas_intervalo=1.0):
+
+    # La caché FV ya está en energía por intervalo; las estimaciones a partir de potencia
+    # (radiación o curva del aerogenerador) se multiplican por la duración del intervalo
+
+    n_t = len(timestamps)
+    generacion = np.zeros((n_t, len(activos_gen)), dtype=np.float64)
+
+    # Series ambientales alineadas con los timestamps (NaN donde no hay dato)
+    ghi = np.full(n_t, np.nan)
+    viento = np.full(n_t, np.nan)
+    for idx_t, ts in enumerate(timestamps):
+        datos_amb = ambiental_por_intervalo.get(ts)
+        if datos_amb:
+            ghi[idx_t] = datos_amb['radiacionGlobalHoriz_Wh_m2']
+            viento[idx_t] = datos_amb['velocidadViento_m_s']
+
+    for idx_a, activo in enumerate(activos_gen):
+        if activo.tipo_activo == TipoActivoGeneracion.INSTALACION_FOTOVOLTAICA:
+            cache_activo = cache_generacion_pv.get(activo.idActivoGeneracion, {})
+            valores = np.array([cache_activo.get(ts, np.nan) for ts in timestamps], dtype=np.float64)
+
+            # Fallback: estimación simplificada a partir de la radiación horizontal
+            factor_rendimiento = 0.8
+            if activo.perdidaSistema:
+                factor_rendimiento *= (1 - activo.perdidaSistema / 100)
+            potencia_kw = activo.potenciaNominal_kWp or 1.0
+            estimacion = potencia_kw * (ghi / 1000) * factor_rendimiento * horas_intervalo
+
+            sin_cache = np.isnan(valores)
+            valores[sin_cache] = estimacion[sin_cache]
+            generacion[:, idx_a] = np.nan_to_num(valores, nan=0.0)
+
+        elif activo.tipo_activo == TipoActivoGeneracion.AEROGENERADOR:
+            if not (activo.curvaPotencia and isinstance(activo.curvaPotencia, dict)):
+                continue
+
+            # Se evalúa la curva de potencia una sola vez por velocidad redondeada
+            con_dato = ~np.isnan(viento)
+            velocidades = np.round(viento[con_dato]).astype(np.int64)
+            potencia_por_velocidad = {
+                v: float(activo.curvaPotencia[str(v)]) / 1000.0 * horas_intervalo if str(v) in activo.curvaPotencia else 0.0
+                for v in np.unique(velocidades).tolist()
+            }
+            generacion[con_dato, idx_a] = [potencia_por_velocidad[v] for v in velocidades.tolist()]
+
+    return generacion
+
+
+def construir_matriz_coeficientes(plan_coeficientes, timestamps, ids_participantes):
+
+    # Columnas del plan precompilado en el orden de ids_participantes
+    columnas = [plan_coeficientes.ids_participantes.index(id_p) for id_p in ids_participantes]
+    return plan_coeficientes.matriz(timestamps)[:, columnas]
+
+
+def construir_matrices_precios(contratos, timestamps, ids_participantes, pvpc_repo, calcular_exportacion=True):
+
+    n_t = len(timestamps)
+    precio_imp = np.zeros((n_t, len(ids_participantes)), dtype=np.float64)
+    precio_exp = np.zeros((n_t, len(ids_participantes)), dtype=np.float64)
+
+    if n_t == 0:
+        return precio_imp, precio_exp
+
+    hay_pvpc = False
+    for id_p in ids_participantes:
+        contrato = contratos.get(id_p)
+        if contrato is None:
+            raise ValueError(f"El participante {id_p} no tiene contrato de autoconsumo asociado")
+        hay_pvpc = hay_pvpc or contrato.tipoContrato == TipoContrato.PVPC
+
+    # Vectores PVPC compartidos por todos los participantes (NaN donde falta el precio)
+    if hay_pvpc:
+        if pvpc_repo is None:
+            raise ValueError("Se requiere pvpc_repo para contratos PVPC")
+        if not isinstance(pvpc_repo, PvpcPreciosPrecargados):
+            pvpc_repo = PvpcPreciosPrecargados(pvpc_repo).cargar(timestamps[0], timestamps[-1])
+        pvpc_importacion = pvpc_repo.vector_precios(timestamps, tipo_precio="importacion")
+        pvpc_exportacion = pvpc_repo.vector_precios(timestamps, tipo_precio="exportacion") if calcular_exportacion else None
+
+        faltan = int(np.isnan(pvpc_importacion).sum())
+        if faltan:
+            logging.warning(f"No se encontró precio PVPC para {faltan} de {n_t} intervalos. "
+                            f"Usando precio fijo del contrato como fallback")
+
+    for idx_p, id_p in enumerate(ids_participantes):
+        contrato = contratos[id_p]
+
+        if contrato.tipoContrato == TipoContrato.PVPC:
+            # Precio horario con fallback al precio fijo del contrato
+            precio_imp[:, idx_p] = np.where(
+                np.isnan(pvpc_importacion), contrato.precioEnergiaImportacion_eur_kWh, pvpc_importacion
+            )
+            if calcular_exportacion:
+                precio_exp[:, idx_p] = np.where(
+                    np.isnan(pvpc_exportacion), contrato.precioCompensacionExcedentes_eur_kWh, pvpc_exportacion
+                )
+        else:
+            # Precio fijo: independiente del timestamp
+            precio_imp[:, idx_p] = obtener_precio_energia(contrato, timestamps[0], pvpc_repo, tipo_precio="importacion")
+            if calcular_exportacion:
+                precio_exp[:, idx_p] = obtener_precio_energia(contrato, timestamps[0], pvpc_repo, tipo_precio="exportacion")
+
+    return precio_imp, precio_exp
+
+
+def simular_almacenamiento(energia_diferencia, activos_alm, estado_almacenamiento, horas_intervalo=1.0):
+
+    n_t, n_p = energia_diferencia.shape
+    n_b = len(activos_alm)
+
+    energia_gestionada = np.zeros((n_t, n_p), dtype=np.float64)
+    energia_cargada = np.zeros((n_t, n_p, n_b), dtype=np.float64)
+    energia_descargada = np.zeros((n_t, n_p, n_b), dtype=np.float64)
+    soc = np.zeros((n_t, n_p, n_b), dtype=np.float64)
+
+    if n_b == 0:
+        return energia_gestionada, energia_cargada, energia_descargada, soc
+
+    # Parámetros constantes de cada batería (sin ciclos acumulados, igual que el motor de referencia)
+    capacidad_nominal = []
+    eta_carga = []
+    soc_min = []
+    soc_max = []
+    p_max_carga = []
+    p_max_descarga = []
+    for activo in activos_alm:
+        degradacion = _calcular_degradacion_bateria(activo, 0)
+        capacidad = activo.capacidadNominal_kWh * degradacion['factor_capacidad']
+
+        if activo.eficienciaCicloCompleto_pct <= 1.0:
+            eta_total_nominal = activo.eficienciaCicloCompleto_pct
+        else:
+            eta_total_nominal = activo.eficienciaCicloCompleto_pct / 100
+        eta_total = eta_total_nominal * degradacion['factor_eficiencia']
+
+        if activo.profundidadDescargaMax_pct <= 1.0:
+            profundidad_descarga = activo.profundidadDescargaMax_pct
+        else:
+            profundidad_descarga = activo.profundidadDescargaMax_pct / 100
+
+        capacidad_nominal.append(activo.capacidadNominal_kWh)
+        eta_carga.append(eta_total ** 0.5)
+        soc_min.append((1 - profundidad_descarga) * capacidad)
+        soc_max.append(capacidad)
+        # Límite de potencia como energía máxima por intervalo
+        p_max_carga.append(activo.potenciaMaximaCarga_kW * horas_intervalo)
+        p_max_descarga.append(activo.potenciaMaximaDescarga_kW * horas_intervalo)
+
+    # Estado de carga como lista de floats para el bucle secuencial
+    ids_alm = [a.idActivoAlmacenamiento for a in activos_alm]
+    soc_actual = [estado_almacenamiento[id_alm]['soc_kwh'] for id_alm in ids_alm]
+    orden_base = list(range(n_b))
+
+    diferencias = energia_diferencia.tolist()
+    gestionada_out = [[0.0] * n_p for _ in range(n_t)]
+    cargada_out = np.zeros(n_t * n_p * n_b, dtype=np.float64)
+    descargada_out = np.zeros(n_t * n_p * n_b, dtype=np.float64)
+    soc_out = np.zeros(n_t * n_p * n_b, dtype=np.float64)
+
+    posicion = 0
+    for idx_t in range(n_t):
+        fila_diferencia = diferencias[idx_t]
+        fila_gestionada = gestionada_out[idx_t]
+        for idx_p in range(n_p):
+            diferencia = fila_diferencia[idx_p]
+
+            if diferencia > 0:
+                # Carga: prioridad a las baterías con menor SoC relativo
+                restante = diferencia
+                gestionada = 0.0
+                for b in sorted(orden_base, key=lambda i: soc_actual[i] / capacidad_nominal[i]):
+                    disponible = soc_max[b] - soc_actual[b]
+                    if disponible > 0 and restante > 0:
+                        a_cargar = min(restante, disponible, p_max_carga[b])
+                        soc_actual[b] += a_cargar
+                        restante -= a_cargar / eta_carga[b]
+                        gestionada += a_cargar
+                        cargada_out[posicion + b] = a_cargar
+                    soc_out[posicion + b] = soc_actual[b]
+                fila_gestionada[idx_p] = gestionada
+
+            elif diferencia < 0:
+                # Descarga: prioridad a las baterías con mayor SoC relativo
+                deficit = -diferencia
+                descargada_total = 0.0
+                for b in sorted(orden_base, key=lambda i: soc_actual[i] / capacidad_nominal[i], reverse=True):
+                    if soc_actual[b] > soc_min[b] and deficit > 0:
+                        eta_descarga = eta_carga[b]
+                        a_descargar = min(deficit / eta_descarga, soc_actual[b] - soc_min[b], p_max_descarga[b])
+                        salida = a_descargar * eta_descarga
+                        soc_actual[b] -= a_descargar
+                        deficit -= salida
+                        descargada_total += salida
+                        descargada_out[posicion + b] = salida
+                    soc_out[posicion + b] = soc_actual[b]
+                fila_gestionada[idx_p] = -descargada_total
+
+            else:
+                for b in orden_base:
+                    soc_out[posicion + b] = soc_actual[b]
+
+            posicion += n_b
+
+    for b, id_alm in enumerate(ids_alm):
+        estado_almacenamiento[id_alm]['soc_kwh'] = soc_actual[b]
+
+    energia_gestionada = np.array(gestionada_out, dtype=np.float64).reshape(n_t, n_p)
+    energia_cargada = cargada_out.reshape(n_t, n_p, n_b)
+    energia_descargada = descargada_out.reshape(n_t, n_p, n_b)
+    soc = soc_out.reshape(n_t, n_p, n_b)
+
+    return energia_gestionada, energia_cargada, energia_descargada, soc
+
+
+def simular_intervalos_vectorizado(simulacion, participantes, activos_gen, activos_alm, contratos, coeficientes,
+                                   timestamps, consumo_por_intervalo, ambiental_por_intervalo,
+                                   cache_generacion_pv, estado_almacenamiento, pvpc_repo=None):
+
+    ids_participantes = [p.idParticipante for p in participantes]
+    ids_activos_gen = [a.idActivoGeneracion for a in activos_gen]
+    ids_activos_alm = [a.idActivoAlmacenamiento for a in activos_alm]
+
+    estrategia = simulacion.tipoEstrategiaExcedentes
+    estrategia_valida = estrategia in ESTRATEGIAS_SIN_EXCEDENTES or estrategia in ESTRATEGIAS_CON_EXCEDENTES
+    con_excedentes = estrategia in ESTRATEGIAS_CON_EXCEDENTES
+    horas_intervalo = horas_por_intervalo(simulacion)
+
+    # 1. Matrices densas de entrada
+    generacion = construir_matriz_generacion(
+        activos_gen, timestamps, ambiental_por_intervalo, cache_generacion_pv, horas_intervalo
+    )
+    consumo = construir_matriz_consumo(consumo_por_intervalo, timestamps, ids_participantes)
+    coeficientes_t = construir_matriz_coeficientes(coeficientes, timestamps, ids_participantes)
+
+    n_t, n_p = consumo.shape
+    if estrategia_valida:
+        precio_imp, precio_exp = construir_matrices_precios(
+            contratos, timestamps, ids_participantes, pvpc_repo, calcular_exportacion=con_excedentes
+        )
+    else:
+        precio_imp = np.zeros((n_t, n_p), dtype=np.float64)
+        precio_exp = np.zeros((n_t, n_p), dtype=np.float64)
+
+    # 2. Reparto de la generación total según coeficientes
+    generacion_total = generacion.sum(axis=1)
+    energia_asignada = np.where(
+        (generacion_total > 0)[:, None],
+        generacion_total[:, None] * (coeficientes_t / 100),
+        0.0
+    )
+
+    # 3. Autoconsumo y balance por participante
+    autoconsumo = np.minimum(consumo, energia_asignada)
+    energia_diferencia = energia_asignada - consumo
+
+    # 4. Almacenamiento (único tramo secuencial)
+    if estrategia_valida:
+        energia_almacenamiento, energia_cargada, energia_descargada, soc = simular_almacenamiento(
+            energia_diferencia, activos_alm, estado_almacenamiento, horas_intervalo
+        )
+    else:
+        energia_almacenamiento = np.zeros((n_t, n_p), dtype=np.float64)
+        energia_cargada = np.zeros((n_t, n_p, len(activos_alm)), dtype=np.float64)
+        energia_descargada = np.zeros((n_t, n_p, len(activos_alm)), dtype=np.float64)
+        soc = np.zeros((n_t, n_p, len(activos_alm)), dtype=np.float64)
+
+    # 5. Excedentes compensados tras el almacenamiento
+    if con_excedentes:
+        hay_excedente = (energia_diferencia > 0) & (energia_almacenamiento < energia_diferencia)
+        excedente = np.where(hay_excedente, energia_diferencia - energia_almacenamiento, 0.0)
+    else:
+        excedente = np.zeros((n_t, n_p), dtype=np.float64)
+
+    # 6. Importación de red (déficit no cubierto por el almacenamiento)
+    energia_importada = np.where(
+        energia_diferencia < 0,
+        np.abs(energia_diferencia - energia_almacenamiento),
+        0.0
+    )
+
+    return ResultadoSimulacionVectorizada(
+        timestamps=timestamps,
+        ids_participantes=ids_participantes,
+        ids_activos_gen=ids_activos_gen,
+        ids_activos_alm=ids_activos_alm,
+        generacion=generacion,
+        consumo=consumo,
+        energia_asignada=energia_asignada,
+        autoconsumo=autoconsumo,
+        energia_diferencia=energia_diferencia,
+        energia_almacenamiento=energia_almacenamiento,
+        excedente=excedente,
+        energia_importada=energia_importada,
+        precio_importacion=precio_imp,
+        precio_exportacion=precio_exp,
+        energia_cargada=energia_cargada,
+        energia_descargada=energia_descargada,
+        soc=soc,
+        estrategia_valida=estrategia_valida,
+        estado_almacenamiento=estado_almacenamiento,
+    )
@@ -2,11 +2,13 @@ from fastapi import HTTPException
 from app.domain.repositories.simulacion_repository import SimulacionRepository
 from app.domain.entities.simulacion import SimulacionEntity
 from app.domain.entities.estado_simulacion import EstadoSimulacion
+from app.domain.use_cases.simulacion.create_simulacion import validar_tiempo_medicion
 
 def modificar_simulacion_use_case(simulacion_id: int, simulacion_datos: SimulacionEntity, repo: SimulacionRepository) -> SimulacionEntity:
     simulacion_existente = repo.get_by_id(simulacion_id)
     if not simulacion_existente:
         raise HTTPException(status_code=404, detail="Simulación no encontrada")
+    validar_tiempo_medicion(simulacion_datos.tiempo_medicion)
     return repo.update(simulacion_id, simulacion_datos)
 
 def actualizar_estado_simulacion_use_case(simulacion_id: int, nuevo_estado: str, repo: SimulacionRepository) -> SimulacionEntity:
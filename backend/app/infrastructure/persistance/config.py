@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pydantic_settings import BaseSettings  # Importación corregida
 
 class Settings(BaseSettings):
@@ -17,6 +18,38 @@ class Settings(BaseSettings):
     # Database URL
     DATABASE_URL: str = f"mysql+pymysql://{DATABASE_USERNAME}:{DATABASE_PASSWORD}@{DATABASE_HOSTNAME}:{DATABASE_PORT}/{DATABASE_NAME}"
     
+    # Simulation persistence configuration
+    PERSISTENCIA_TAMANO_LOTE: int = int(os.getenv("PERSISTENCIA_TAMANO_LOTE", "5000"))
+    
+    # Simulation worker pool configuration
+    SIMULACION_WORKERS: int = int(os.getenv("SIMULACION_WORKERS", str(os.cpu_count() or 1)))
+    SIMULACION_WORKER_ESPERA_SEGUNDOS: float = float(os.getenv("SIMULACION_WORKER_ESPERA_SEGUNDOS", "2"))
+    SIMULACION_JOB_LATIDO_SEGUNDOS: float = float(os.getenv("SIMULACION_JOB_LATIDO_SEGUNDOS", "10"))
+    SIMULACION_JOB_TIMEOUT_SEGUNDOS: float = float(os.getenv("SIMULACION_JOB_TIMEOUT_SEGUNDOS", "120"))
+    SIMULACION_JOB_MAX_INTENTOS: int = int(os.getenv("SIMULACION_JOB_MAX_INTENTOS", "2"))
+    SIMULACION_PROGRESO_SEGUNDOS: float = float(os.getenv("SIMULACION_PROGRESO_SEGUNDOS", "1"))
+    SIMULACION_MEMOIZACION: bool = os.getenv("SIMULACION_MEMOIZACION", "true").lower() in ("1", "true", "yes")
+    SIMULACION_PUNTOS_CONTROL: bool = os.getenv("SIMULACION_PUNTOS_CONTROL", "true").lower() in ("1", "true", "yes")
+    
+    # Community import configuration
+    IMPORTACION_HILOS: int = int(os.getenv("IMPORTACION_HILOS", "4"))
+    IMPORTACION_JOBS_CONCURRENTES: int = int(os.getenv("IMPORTACION_JOBS_CONCURRENTES", "2"))
+    IMPORTACION_TIMEOUT_SEGUNDOS: float = float(os.getenv("IMPORTACION_TIMEOUT_SEGUNDOS", "300"))
+    
+    # Scenario sweep configuration
+    BARRIDO_PROCESOS: int = int(os.getenv("BARRIDO_PROCESOS", str(os.cpu_count() or 1)))
+    BARRIDO_MAX_VARIANTES: int = int(os.getenv("BARRIDO_MAX_VARIANTES", "1000"))
+    
+    # PVGIS configuration
+    PVGIS_API_URL: str = os.getenv("PVGIS_API_URL", "https://re.jrc.ec.europa.eu/api/v5_3/seriescalc")
+    PVGIS_CACHE_DIR: str = os.getenv("PVGIS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "pvgis_cache"))
+    PVGIS_CACHE_TTL_DIAS: float = float(os.getenv("PVGIS_CACHE_TTL_DIAS", "30"))
+    PVGIS_CACHE_MAX_MB: float = float(os.getenv("PVGIS_CACHE_MAX_MB", "512"))
+    PVGIS_CACHE_ACTIVA: bool = os.getenv("PVGIS_CACHE_ACTIVA", "true").lower() in ("1", "true", "yes")
+    PVGIS_OFFLINE: bool = os.getenv("PVGIS_OFFLINE", "false").lower() in ("1", "true", "yes")
+    PVGIS_MAX_PETICIONES_POR_HOST: int = int(os.getenv("PVGIS_MAX_PETICIONES_POR_HOST", "8"))
+    PVGIS_MAX_DESCARGAS_CONCURRENTES: int = int(os.getenv("PVGIS_MAX_DESCARGAS_CONCURRENTES", "16"))
+    
     class Config:
         env_file = ".env"
 
@@ -12,4 +12,11 @@ from .resultado_simulacion_tabla import ResultadoSimulacion
 from .resultado_simulacion_participante_tabla import ResultadoSimulacionParticipante
 from .resultado_simulacion_activo_almacenamiento_tabla import ResultadoSimulacionActivoAlmacenamiento
 from .resultado_simulacion_activo_generacion_tabla import ResultadoSimulacionActivoGeneracion
-from .pvpc_precios_tabla import PvpcPrecios
\ No newline at end of file
+from .pvpc_precios_tabla import PvpcPrecios
+from .simulacion_job_tabla import SimulacionJob
+from .barrido_simulacion_tabla import BarridoSimulacion
+from .variante_barrido_tabla import VarianteBarrido
+from .punto_control_simulacion_tabla import PuntoControlSimulacion
+from .importacion_comunidad_job_tabla import ImportacionComunidadJob
+from .agregado_intervalo_participante_tabla import AgregadoIntervaloParticipante
+from .agregado_intervalo_activo_tabla import AgregadoIntervaloActivo
\ No newline at end of file
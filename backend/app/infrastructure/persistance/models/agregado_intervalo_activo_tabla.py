@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.infrastructure.persistance.database import Base
+
+class AgregadoIntervaloActivo(Base):
+    __tablename__ = "AGREGADO_INTERVALO_ACTIVO"
+    
+    idAgregadoActivo = Column(Integer, primary_key=True, autoincrement=True)
+    # 'DIA' o 'MES'; inicioPeriodo es el primer día del periodo
+    granularidad = Column(String(5), nullable=False)
+    inicioPeriodo = Column(Date, nullable=False)
+    numIntervalos = Column(Integer, nullable=False)
+    # Activos de generación
+    energiaGenerada_kWh = Column(Float)
+    intervalosConProduccion = Column(Integer)
+    # Activos de almacenamiento
+    energiaCargada_kWh = Column(Float)
+    energiaDescargada_kWh = Column(Float)
+    SoCMedio_kWh = Column(Float)
+    SoCMin_kWh = Column(Float)
+    SoCMax_kWh = Column(Float)
+    idResultadoActivoGen = Column(Integer, ForeignKey("RESULTADO_SIMULACION_ACTIVO_GENERACION.idResultadoActivoGen", ondelete="CASCADE"), nullable=True)
+    idResultadoActivoAlm = Column(Integer, ForeignKey("RESULTADO_SIMULACION_ACTIVO_ALMACENAMIENTO.idResultadoActivoAlm", ondelete="CASCADE"), nullable=True)
+    
+    resultado_activo_gen = relationship("ResultadoSimulacionActivoGeneracion", back_populates="agregados_intervalos")
+    resultado_activo_alm = relationship("ResultadoSimulacionActivoAlmacenamiento", back_populates="agregados_intervalos")
+    
+    __table_args__ = (
+        Index('idx_agregado_activo_gen_periodo', 'idResultadoActivoGen', 'granularidad', 'inicioPeriodo'),
+        Index('idx_agregado_activo_alm_periodo', 'idResultadoActivoAlm', 'granularidad', 'inicioPeriodo'),
+    )
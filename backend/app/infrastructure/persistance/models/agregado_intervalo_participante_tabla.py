@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.infrastructure.persistance.database import Base
+
+class AgregadoIntervaloParticipante(Base):
+    __tablename__ = "AGREGADO_INTERVALO_PARTICIPANTE"
+    
+    idAgregadoParticipante = Column(Integer, primary_key=True, autoincrement=True)
+    # 'DIA' o 'MES'; inicioPeriodo es el primer día del periodo
+    granularidad = Column(String(5), nullable=False)
+    inicioPeriodo = Column(Date, nullable=False)
+    numIntervalos = Column(Integer, nullable=False)
+    consumoTotal_kWh = Column(Float)
+    energiaAutoconsumidaDirecta_kWh = Column(Float)
+    energiaRecibidaRepartoConsumida_kWh = Column(Float)
+    energiaAlmacenamiento_kWh = Column(Float)
+    energiaAlmacenamientoDescargada_kWh = Column(Float)
+    energiaAlmacenamientoCargada_kWh = Column(Float)
+    energiaImportadaRed_kWh = Column(Float)
+    energiaExportadaRed_kWh = Column(Float)
+    costeImportacion_eur = Column(Float)
+    ingresoExportacion_eur = Column(Float)
+    costeBaseEstimado_eur = Column(Float)
+    idResultadoParticipante = Column(Integer, ForeignKey("RESULTADO_SIMULACION_PARTICIPANTE.idResultadoParticipante", ondelete="CASCADE"), nullable=False)
+    
+    resultado_simulacion_participante = relationship("ResultadoSimulacionParticipante", back_populates="agregados_intervalos")
+    
+    __table_args__ = (
+        Index('idx_agregado_participante_periodo', 'idResultadoParticipante', 'granularidad', 'inicioPeriodo'),
+    )
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.infrastructure.persistance.database import Base
+
+class BarridoSimulacion(Base):
+    __tablename__ = "SIMULACION_BARRIDO"
+    
+    idBarrido = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    idSimulacion = Column(Integer, ForeignKey("SIMULACION.idSimulacion", ondelete="CASCADE"), nullable=False, index=True)
+    nombre = Column(String(255), nullable=True)
+    # Rejilla de parámetros en JSON
+    parametros = Column(Text, nullable=False)
+    estado = Column(String(20), nullable=False, default="PENDIENTE")
+    numVariantes = Column(Integer, nullable=False, default=0)
+    mensajeError = Column(Text, nullable=True)
+    fechaCreacion = Column(DateTime, default=func.current_timestamp())
+    fechaFin = Column(DateTime, nullable=True)
+    
+    # Relaciones
+    simulacion = relationship("Simulacion")
+    variantes = relationship("VarianteBarrido", back_populates="barrido", cascade="all, delete-orphan")
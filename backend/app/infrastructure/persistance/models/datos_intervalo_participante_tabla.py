@@ -20,3 +20,7 @@ class DatosIntervaloParticipante(Base):
     # Relación con el resultado de la simulación del participante
     resultado_simulacion_participante = relationship("ResultadoSimulacionParticipante", back_populates="datos_intervalos_participante")
     
+    # Índice para el filtrado por resultado y la paginación por (timestamp, id)
+    __table_args__ = (
+        Index('idx_intervalo_participante_ts', 'idResultadoParticipante', 'timestamp'),
+    )
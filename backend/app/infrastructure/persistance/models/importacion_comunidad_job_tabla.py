@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy.sql import func
+from app.infrastructure.persistance.database import Base
+
+class ImportacionComunidadJob(Base):
+    __tablename__ = "IMPORTACION_COMUNIDAD_JOB"
+    
+    idImportacion = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    idUsuario = Column(Integer, ForeignKey("USUARIO.idUsuario", ondelete="CASCADE"), nullable=False, index=True)
+    nombreArchivo = Column(String(255), nullable=True)
+    estado = Column(String(20), nullable=False, default="PENDIENTE")
+    idComunidadEnergetica = Column(Integer, ForeignKey("COMUNIDAD_ENERGETICA.idComunidadEnergetica", ondelete="SET NULL"), nullable=True)
+    mensajeError = Column(Text, nullable=True)
+    fechaCreacion = Column(DateTime, default=func.current_timestamp())
+    fechaInicio = Column(DateTime, nullable=True)
+    fechaFin = Column(DateTime, nullable=True)
+    # Se actualiza con cada progreso: una importación en curso sin actualizaciones se da por interrumpida
+    fechaActualizacion = Column(DateTime, nullable=True)
+    # Último progreso y estadísticas finales, serializados en JSON
+    progreso = Column(Text, nullable=True)
+    resultado = Column(Text, nullable=True)
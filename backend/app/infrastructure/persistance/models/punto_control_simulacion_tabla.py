@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, ForeignKey
+from sqlalchemy.sql import func
+from app.infrastructure.persistance.database import Base
+
+class PuntoControlSimulacion(Base):
+    __tablename__ = "SIMULACION_PUNTO_CONTROL"
+    
+    idSimulacion = Column(Integer, ForeignKey("SIMULACION.idSimulacion", ondelete="CASCADE"), primary_key=True)
+    idResultado = Column(Integer, ForeignKey("RESULTADO_SIMULACION.idResultado", ondelete="CASCADE"), nullable=False)
+    huellaEntradas = Column(String(64), nullable=False)
+    ultimoTimestamp = Column(DateTime, nullable=False)
+    intervalosCompletados = Column(Integer, nullable=False)
+    # JSON versionado comprimido con zlib (LONGBLOB en MySQL)
+    estadoMotor = Column(LargeBinary(length=2**32 - 1), nullable=False)
+    entradas = Column(LargeBinary(length=2**32 - 1), nullable=True)
+    fechaActualizacion = Column(DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, Float, DateTime
+from sqlalchemy import Column, ForeignKey, Integer, Float, DateTime, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.infrastructure.persistance.database import Base
 
@@ -11,4 +11,9 @@ class RegistroConsumo(Base):
     idParticipante = Column(Integer, ForeignKey("PARTICIPANTE.idParticipante"), nullable=False)
     
     # Relación con el participante
-    participante = relationship("Participante", back_populates="registros_consumo")
\ No newline at end of file
+    participante = relationship("Participante", back_populates="registros_consumo")
+    
+    # Un único registro por participante e instante: las reimportaciones actualizan el valor
+    __table_args__ = (
+        UniqueConstraint('idParticipante', 'timestamp', name='uq_registro_consumo_participante_ts'),
+    )
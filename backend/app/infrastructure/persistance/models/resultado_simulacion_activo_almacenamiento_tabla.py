@@ -22,6 +22,7 @@ class ResultadoSimulacionActivoAlmacenamiento(Base):
     resultado_simulacion = relationship("ResultadoSimulacion", back_populates="resultados_activos_alm")
     activo_almacenamiento = relationship("ActivoAlmacenamiento", back_populates="resultados_simulacion")
     datos_intervalos = relationship("DatosIntervaloActivo", back_populates="resultado_activo_alm", cascade="all, delete-orphan")
+    agregados_intervalos = relationship("AgregadoIntervaloActivo", back_populates="resultado_activo_alm", cascade="all, delete-orphan")
     
     # Restricción única para evitar duplicados
     __table_args__ = (
@@ -19,6 +19,7 @@ class ResultadoSimulacionActivoGeneracion(Base):
     
     # Relación con los datos de intervalo (nueva relación)
     datos_intervalos = relationship("DatosIntervaloActivo", back_populates="resultado_activo_gen", cascade="all, delete-orphan")
+    agregados_intervalos = relationship("AgregadoIntervaloActivo", back_populates="resultado_activo_gen", cascade="all, delete-orphan")
     
     # Restricción única para evitar duplicados
     __table_args__ = (
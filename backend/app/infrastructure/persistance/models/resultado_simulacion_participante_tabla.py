@@ -21,3 +21,4 @@ class ResultadoSimulacionParticipante(Base):
     resultado_simulacion = relationship("ResultadoSimulacion") 
     participante = relationship("Participante") 
     datos_intervalos_participante = relationship("DatosIntervaloParticipante", back_populates="resultado_simulacion_participante", cascade="all, delete-orphan")
+    agregados_intervalos = relationship("AgregadoIntervaloParticipante", back_populates="resultado_simulacion_participante", cascade="all, delete-orphan")
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.infrastructure.persistance.database import Base
+
+class SimulacionJob(Base):
+    __tablename__ = "SIMULACION_JOB"
+    
+    idJob = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    idSimulacion = Column(Integer, ForeignKey("SIMULACION.idSimulacion", ondelete="CASCADE"), nullable=False, index=True)
+    idBarrido = Column(Integer, ForeignKey("SIMULACION_BARRIDO.idBarrido", ondelete="CASCADE"), nullable=True)
+    estado = Column(String(20), nullable=False, default="PENDIENTE")
+    prioridad = Column(Integer, nullable=False, default=0)
+    cancelacionSolicitada = Column(Boolean, nullable=False, default=False)
+    intentos = Column(Integer, nullable=False, default=0)
+    worker = Column(String(255), nullable=True)
+    mensajeError = Column(Text, nullable=True)
+    fechaCreacion = Column(DateTime, default=func.current_timestamp())
+    fechaInicio = Column(DateTime, nullable=True)
+    fechaFin = Column(DateTime, nullable=True)
+    ultimoLatido = Column(DateTime, nullable=True)
+    # Último progreso publicado por el worker, serializado en JSON
+    progreso = Column(Text, nullable=True)
+    
+    # Índice para reclamar el siguiente trabajo: estado, prioridad descendente y orden de llegada
+    __table_args__ = (
+        Index("idx_simulacion_job_cola", "estado", "prioridad", "idJob"),
+    )
+    
+    # Relaciones
+    simulacion = relationship("Simulacion")
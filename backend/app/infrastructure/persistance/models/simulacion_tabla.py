@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.infrastructure.persistance.database import Base
 
@@ -14,9 +14,15 @@ class Simulacion(Base):
     tipoEstrategiaExcedentes = Column(String(100))  
     idUsuario_creador = Column(Integer, ForeignKey("USUARIO.idUsuario", ondelete="RESTRICT", onupdate="CASCADE"), nullable=False)
     idComunidadEnergetica = Column(Integer, ForeignKey("COMUNIDAD_ENERGETICA.idComunidadEnergetica", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    # SHA-256 de las entradas del motor; solo se rellena al completar la simulación
+    huellaEntradas = Column(String(64), nullable=True)
     
     # Relaciones
     usuario = relationship("Usuario")
     comunidad = relationship("ComunidadEnergetica")
     resultado = relationship("ResultadoSimulacion", back_populates="simulacion", uselist=False, cascade="all, delete-orphan")
-    datos_ambientales = relationship("DatosAmbientales", back_populates="simulacion", cascade="all, delete-orphan")
\ No newline at end of file
+    datos_ambientales = relationship("DatosAmbientales", back_populates="simulacion", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index('idx_simulacion_huella', 'huellaEntradas', 'estado'),
+    )
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, Float, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.infrastructure.persistance.database import Base
+
+class VarianteBarrido(Base):
+    __tablename__ = "SIMULACION_BARRIDO_VARIANTE"
+    
+    idVariante = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    idBarrido = Column(Integer, ForeignKey("SIMULACION_BARRIDO.idBarrido", ondelete="CASCADE"), nullable=False)
+    indice = Column(Integer, nullable=False)
+    # Parámetros de la variante en JSON
+    parametros = Column(Text, nullable=False)
+    costeTotalEnergia_eur = Column(Float, nullable=True)
+    ahorroTotal_eur = Column(Float, nullable=True)
+    ingresoTotalExportacion_eur = Column(Float, nullable=True)
+    paybackPeriod_anios = Column(Float, nullable=True)
+    roi_pct = Column(Float, nullable=True)
+    tasaAutoconsumoSCR_pct = Column(Float, nullable=True)
+    tasaAutosuficienciaSSR_pct = Column(Float, nullable=True)
+    energiaTotalImportada_kWh = Column(Float, nullable=True)
+    energiaTotalExportada_kWh = Column(Float, nullable=True)
+    reduccionCO2_kg = Column(Float, nullable=True)
+    mensajeError = Column(Text, nullable=True)
+    
+    __table_args__ = (
+        Index("idx_barrido_variante_indice", "idBarrido", "indice"),
+    )
+    
+    # Relaciones
+    barrido = relationship("BarridoSimulacion", back_populates="variantes")
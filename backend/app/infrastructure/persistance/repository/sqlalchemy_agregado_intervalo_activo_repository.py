@@ -0,0 +1,135 @@
+from typing import List, Optional
+from datetime import date, datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, delete, func, insert, literal, or_, select
+
+from app.domain.entities.agregado_intervalo_activo import AgregadoIntervaloActivoEntity
+from app.domain.repositories.agregado_intervalo_activo_repository import AgregadoIntervaloActivoRepository
+from app.infrastructure.persistance.models.agregado_intervalo_activo_tabla import AgregadoIntervaloActivo
+from app.infrastructure.persistance.models.datos_intervalo_activo_tabla import DatosIntervaloActivo
+from app.infrastructure.persistance.models.resultado_simulacion_activo_generacion_tabla import ResultadoSimulacionActivoGeneracion
+from app.infrastructure.persistance.models.resultado_simulacion_activo_almacenamiento_tabla import ResultadoSimulacionActivoAlmacenamiento
+
+class SqlAlchemyAgregadoIntervaloActivoRepository(AgregadoIntervaloActivoRepository):
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def recalcular_por_resultado_simulacion(self, resultado_simulacion_id: int, desde: Optional[datetime] = None) -> int:
+        # Agregados diarios con un INSERT ... SELECT ... GROUP BY por tipo de activo y mensuales a
+        # partir de los diarios; todo en el servidor, sin traer los intervalos. Con desde solo se
+        # rehacen los días a partir de ese instante y los meses que lo contienen
+        agregados = AgregadoIntervaloActivo.__table__
+        intervalos = DatosIntervaloActivo.__table__
+        resultados_gen = ResultadoSimulacionActivoGeneracion.__table__
+        resultados_alm = ResultadoSimulacionActivoAlmacenamiento.__table__
+        ids_gen = select(resultados_gen.c.idResultadoActivoGen).where(
+            resultados_gen.c.idResultadoSimulacion == resultado_simulacion_id
+        )
+        ids_alm = select(resultados_alm.c.idResultadoActivoAlm).where(
+            resultados_alm.c.idResultadoSimulacion == resultado_simulacion_id
+        )
+        clave = ['granularidad', 'inicioPeriodo', 'numIntervalos']
+        filtro_dias, filtro_meses, filtro_intervalos = _filtros_desde(desde, agregados, intervalos)
+        
+        try:
+            self.db.execute(delete(agregados).where(
+                or_(agregados.c.idResultadoActivoGen.in_(ids_gen), agregados.c.idResultadoActivoAlm.in_(ids_alm)),
+                or_(and_(agregados.c.granularidad == 'DIA', *filtro_dias),
+                    and_(agregados.c.granularidad == 'MES', *filtro_meses))
+            ))
+            
+            dia = func.date(intervalos.c.timestamp)
+            energia = func.coalesce(intervalos.c.energiaGenerada_kWh, 0.0)
+            filas = self.db.execute(insert(agregados).from_select(
+                ['idResultadoActivoGen', *clave, 'energiaGenerada_kWh', 'intervalosConProduccion'],
+                select(
+                    intervalos.c.idResultadoActivoGen, literal('DIA'), dia, func.count(),
+                    func.sum(energia), func.sum(case((energia > 0, 1), else_=0))
+                ).where(
+                    intervalos.c.idResultadoActivoGen.in_(ids_gen), *filtro_intervalos
+                ).group_by(intervalos.c.idResultadoActivoGen, dia)
+            )).rowcount
+            filas += self.db.execute(insert(agregados).from_select(
+                ['idResultadoActivoAlm', *clave, 'energiaCargada_kWh', 'energiaDescargada_kWh', 'SoCMedio_kWh', 'SoCMin_kWh', 'SoCMax_kWh'],
+                select(
+                    intervalos.c.idResultadoActivoAlm, literal('DIA'), dia, func.count(),
+                    func.sum(func.coalesce(intervalos.c.energiaCargada_kWh, 0.0)),
+                    func.sum(func.coalesce(intervalos.c.energiaDescargada_kWh, 0.0)),
+                    func.avg(intervalos.c.SoC_kWh), func.min(intervalos.c.SoC_kWh), func.max(intervalos.c.SoC_kWh)
+                ).where(
+                    intervalos.c.idResultadoActivoAlm.in_(ids_alm), *filtro_intervalos
+                ).group_by(intervalos.c.idResultadoActivoAlm, dia)
+            )).rowcount
+            
+            # El SoC medio del mes pondera el de cada día por su número de intervalos
+            mes = self._inicio_mes(agregados.c.inicioPeriodo)
+            filas += self.db.execute(insert(agregados).from_select(
+                ['idResultadoActivoGen', 'idResultadoActivoAlm', *clave, 'energiaGenerada_kWh', 'intervalosConProduccion',
+                 'energiaCargada_kWh', 'energiaDescargada_kWh', 'SoCMedio_kWh', 'SoCMin_kWh', 'SoCMax_kWh'],
+                select(
+                    agregados.c.idResultadoActivoGen, agregados.c.idResultadoActivoAlm, literal('MES'), mes,
+                    func.sum(agregados.c.numIntervalos),
+                    func.sum(agregados.c.energiaGenerada_kWh), func.sum(agregados.c.intervalosConProduccion),
+                    func.sum(agregados.c.energiaCargada_kWh), func.sum(agregados.c.energiaDescargada_kWh),
+                    func.sum(agregados.c.SoCMedio_kWh * agregados.c.numIntervalos) / func.sum(agregados.c.numIntervalos),
+                    func.min(agregados.c.SoCMin_kWh), func.max(agregados.c.SoCMax_kWh)
+                ).where(
+                    or_(agregados.c.idResultadoActivoGen.in_(ids_gen), agregados.c.idResultadoActivoAlm.in_(ids_alm)),
+                    agregados.c.granularidad == 'DIA', *filtro_meses
+                ).group_by(agregados.c.idResultadoActivoGen, agregados.c.idResultadoActivoAlm, mes)
+            )).rowcount
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return filas
+    
+    def get_by_resultado_activo(self, resultado_activo_id: int, is_generacion: bool, granularidad: str,
+                                desde: Optional[date], hasta: Optional[date]) -> List[AgregadoIntervaloActivoEntity]:
+        columna_resultado = AgregadoIntervaloActivo.idResultadoActivoGen if is_generacion else AgregadoIntervaloActivo.idResultadoActivoAlm
+        query = self.db.query(AgregadoIntervaloActivo).filter(
+            columna_resultado == resultado_activo_id,
+            AgregadoIntervaloActivo.granularidad == granularidad
+        )
+        if desde is not None:
+            query = query.filter(AgregadoIntervaloActivo.inicioPeriodo >= desde)
+        if hasta is not None:
+            query = query.filter(AgregadoIntervaloActivo.inicioPeriodo <= hasta)
+        return [self._to_entity(agregado) for agregado in query.order_by(AgregadoIntervaloActivo.inicioPeriodo).all()]
+    
+    def _inicio_mes(self, columna):
+        # Primer día del mes de una fecha (no hay una función común a MySQL y SQLite)
+        if self.db.get_bind().dialect.name == 'mysql':
+            return func.date_format(columna, '%Y-%m-01')
+        return func.strftime('%Y-%m-01', columna)
+    
+    def _to_entity(self, agregado: AgregadoIntervaloActivo) -> AgregadoIntervaloActivoEntity:
+        return AgregadoIntervaloActivoEntity(
+            idAgregadoActivo=agregado.idAgregadoActivo,
+            granularidad=agregado.granularidad,
+            inicioPeriodo=agregado.inicioPeriodo,
+            numIntervalos=agregado.numIntervalos,
+            energiaGenerada_kWh=agregado.energiaGenerada_kWh,
+            intervalosConProduccion=agregado.intervalosConProduccion,
+            energiaCargada_kWh=agregado.energiaCargada_kWh,
+            energiaDescargada_kWh=agregado.energiaDescargada_kWh,
+            SoCMedio_kWh=agregado.SoCMedio_kWh,
+            SoCMin_kWh=agregado.SoCMin_kWh,
+            SoCMax_kWh=agregado.SoCMax_kWh,
+            idResultadoActivoGen=agregado.idResultadoActivoGen,
+            idResultadoActivoAlm=agregado.idResultadoActivoAlm
+        )
+
+
+def _filtros_desde(desde: Optional[datetime], agregados, intervalos):
+    # Condiciones para los agregados diarios, los mensuales y los intervalos afectados a partir
+    # de desde (sin desde, ninguna: se rehace todo)
+    if desde is None:
+        return [], [], []
+    dia = desde.date()
+    mes = dia.replace(day=1)
+    return (
+        [agregados.c.inicioPeriodo >= dia],
+        [agregados.c.inicioPeriodo >= mes],
+        [intervalos.c.timestamp >= datetime.combine(dia, datetime.min.time())],
+    )
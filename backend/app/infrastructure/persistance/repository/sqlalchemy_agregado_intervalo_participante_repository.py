@@ -0,0 +1,132 @@
+from typing import List, Optional
+from datetime import date, datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, delete, func, insert, literal, or_, select
+
+from app.domain.entities.agregado_intervalo_participante import AgregadoIntervaloParticipanteEntity
+from app.domain.repositories.agregado_intervalo_participante_repository import AgregadoIntervaloParticipanteRepository
+from app.infrastructure.persistance.models.agregado_intervalo_participante_tabla import AgregadoIntervaloParticipante
+from app.infrastructure.persistance.models.datos_intervalo_participante_tabla import DatosIntervaloParticipante
+from app.infrastructure.persistance.models.resultado_simulacion_participante_tabla import ResultadoSimulacionParticipante
+
+CAMPOS_SUMA = (
+    'consumoTotal_kWh',
+    'energiaAutoconsumidaDirecta_kWh',
+    'energiaRecibidaRepartoConsumida_kWh',
+    'energiaAlmacenamiento_kWh',
+    'energiaAlmacenamientoDescargada_kWh',
+    'energiaAlmacenamientoCargada_kWh',
+    'energiaImportadaRed_kWh',
+    'energiaExportadaRed_kWh',
+    'costeImportacion_eur',
+    'ingresoExportacion_eur',
+    'costeBaseEstimado_eur',
+)
+
+class SqlAlchemyAgregadoIntervaloParticipanteRepository(AgregadoIntervaloParticipanteRepository):
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def recalcular_por_resultado_simulacion(self, resultado_simulacion_id: int, desde: Optional[datetime] = None) -> int:
+        # Agregados diarios con un INSERT ... SELECT ... GROUP BY sobre los intervalos del resultado
+        # y mensuales a partir de los diarios; todo en el servidor, sin traer los intervalos.
+        # Las magnitudes son las mismas que los buckets mensuales del cálculo de resultados.
+        # Con desde solo se rehacen los días a partir de ese instante y los meses que lo contienen
+        agregados = AgregadoIntervaloParticipante.__table__
+        intervalos = DatosIntervaloParticipante.__table__
+        resultados = ResultadoSimulacionParticipante.__table__
+        ids_resultado = select(resultados.c.idResultadoParticipante).where(
+            resultados.c.idResultadoSimulacion == resultado_simulacion_id
+        )
+        columnas = ['idResultadoParticipante', 'granularidad', 'inicioPeriodo', 'numIntervalos', *CAMPOS_SUMA]
+        filtro_dias, filtro_meses, filtro_intervalos = _filtros_desde(desde, agregados, intervalos)
+        
+        try:
+            self.db.execute(delete(agregados).where(
+                agregados.c.idResultadoParticipante.in_(ids_resultado),
+                or_(and_(agregados.c.granularidad == 'DIA', *filtro_dias),
+                    and_(agregados.c.granularidad == 'MES', *filtro_meses))
+            ))
+            
+            valor = lambda campo: func.coalesce(intervalos.c[campo], 0.0)
+            consumo = valor('consumoReal_kWh')
+            almacenamiento = valor('energiaAlmacenamiento_kWh')
+            diferencia = valor('energiaDiferencia_kWh')
+            excedente = valor('excedenteVertidoCompensado_kWh')
+            precio_importacion = valor('precioImportacionIntervalo')
+            precio_exportacion = valor('precioExportacionIntervalo')
+            importada = case((diferencia < 0, func.abs(diferencia - almacenamiento)), else_=0.0)
+            dia = func.date(intervalos.c.timestamp)
+            filas = self.db.execute(insert(agregados).from_select(columnas, select(
+                intervalos.c.idResultadoParticipante, literal('DIA'), dia, func.count(),
+                func.sum(consumo),
+                func.sum(valor('autoconsumo_kWh')),
+                func.sum(valor('energiaRecibidaReparto_kWh')),
+                func.sum(almacenamiento),
+                func.sum(case((almacenamiento < 0, almacenamiento), else_=0.0)),
+                func.sum(case((almacenamiento > 0, almacenamiento), else_=0.0)),
+                func.sum(importada),
+                func.sum(excedente),
+                func.sum(importada * precio_importacion),
+                func.sum(excedente * precio_exportacion),
+                func.sum(consumo * precio_importacion),
+            ).where(
+                intervalos.c.idResultadoParticipante.in_(ids_resultado), *filtro_intervalos
+            ).group_by(intervalos.c.idResultadoParticipante, dia))).rowcount
+            
+            mes = self._inicio_mes(agregados.c.inicioPeriodo)
+            filas += self.db.execute(insert(agregados).from_select(columnas, select(
+                agregados.c.idResultadoParticipante, literal('MES'), mes, func.sum(agregados.c.numIntervalos),
+                *[func.sum(agregados.c[campo]) for campo in CAMPOS_SUMA]
+            ).where(
+                agregados.c.idResultadoParticipante.in_(ids_resultado),
+                agregados.c.granularidad == 'DIA', *filtro_meses
+            ).group_by(agregados.c.idResultadoParticipante, mes))).rowcount
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return filas
+    
+    def get_by_resultado_participante(self, resultado_participante_id: int, granularidad: str,
+                                      desde: Optional[date], hasta: Optional[date]) -> List[AgregadoIntervaloParticipanteEntity]:
+        query = self.db.query(AgregadoIntervaloParticipante).filter(
+            AgregadoIntervaloParticipante.idResultadoParticipante == resultado_participante_id,
+            AgregadoIntervaloParticipante.granularidad == granularidad
+        )
+        if desde is not None:
+            query = query.filter(AgregadoIntervaloParticipante.inicioPeriodo >= desde)
+        if hasta is not None:
+            query = query.filter(AgregadoIntervaloParticipante.inicioPeriodo <= hasta)
+        return [self._to_entity(agregado) for agregado in query.order_by(AgregadoIntervaloParticipante.inicioPeriodo).all()]
+    
+    def _inicio_mes(self, columna):
+        # Primer día del mes de una fecha (no hay una función común a MySQL y SQLite)
+        if self.db.get_bind().dialect.name == 'mysql':
+            return func.date_format(columna, '%Y-%m-01')
+        return func.strftime('%Y-%m-01', columna)
+    
+    def _to_entity(self, agregado: AgregadoIntervaloParticipante) -> AgregadoIntervaloParticipanteEntity:
+        return AgregadoIntervaloParticipanteEntity(
+            idAgregadoParticipante=agregado.idAgregadoParticipante,
+            granularidad=agregado.granularidad,
+            inicioPeriodo=agregado.inicioPeriodo,
+            numIntervalos=agregado.numIntervalos,
+            idResultadoParticipante=agregado.idResultadoParticipante,
+            **{campo: getattr(agregado, campo) for campo in CAMPOS_SUMA}
+        )
+
+
+def _filtros_desde(desde: Optional[datetime], agregados, intervalos):
+    # Condiciones para los agregados diarios, los mensuales y los intervalos afectados a partir
+    # de desde (sin desde, ninguna: se rehace todo). Los días empiezan en el día de desde y los
+    # meses en el primer día de su mes, así las filas anteriores se conservan
+    if desde is None:
+        return [], [], []
+    dia = desde.date()
+    mes = dia.replace(day=1)
+    return (
+        [agregados.c.inicioPeriodo >= dia],
+        [agregados.c.inicioPeriodo >= mes],
+        [intervalos.c.timestamp >= datetime.combine(dia, datetime.min.time())],
+    )
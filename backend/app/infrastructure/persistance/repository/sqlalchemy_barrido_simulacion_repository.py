@@ -0,0 +1,67 @@
+import json
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.domain.entities.barrido_simulacion import BarridoSimulacionEntity
+from app.domain.entities.estado_simulacion import EstadoSimulacion
+from app.domain.repositories.barrido_simulacion_repository import BarridoSimulacionRepository
+from app.infrastructure.persistance.models.barrido_simulacion_tabla import BarridoSimulacion
+
+class SqlAlchemyBarridoSimulacionRepository(BarridoSimulacionRepository):
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_by_id(self, barrido_id: int) -> Optional[BarridoSimulacionEntity]:
+        barrido = self.db.query(BarridoSimulacion).filter(BarridoSimulacion.idBarrido == barrido_id).first()
+        if barrido:
+            return self._map_to_entity(barrido)
+        return None
+    
+    def list_by_simulacion(self, simulacion_id: int) -> List[BarridoSimulacionEntity]:
+        barridos = self.db.query(BarridoSimulacion).filter(
+            BarridoSimulacion.idSimulacion == simulacion_id
+        ).order_by(BarridoSimulacion.idBarrido.desc()).all()
+        return [self._map_to_entity(b) for b in barridos]
+    
+    def create(self, barrido: BarridoSimulacionEntity) -> BarridoSimulacionEntity:
+        db_barrido = BarridoSimulacion(
+            idSimulacion=barrido.idSimulacion,
+            nombre=barrido.nombre,
+            parametros=json.dumps(barrido.parametros),
+            estado=barrido.estado.value,
+            numVariantes=barrido.numVariantes
+        )
+        self.db.add(db_barrido)
+        self.db.commit()
+        self.db.refresh(db_barrido)
+        return self._map_to_entity(db_barrido)
+    
+    def update_estado(self, barrido_id: int, estado: str, mensaje_error: Optional[str] = None) -> BarridoSimulacionEntity:
+        barrido = self.db.query(BarridoSimulacion).filter(BarridoSimulacion.idBarrido == barrido_id).first()
+        if not barrido:
+            return None
+        barrido.estado = estado
+        barrido.mensajeError = mensaje_error
+        barrido.fechaFin = datetime.now() if estado in (EstadoSimulacion.COMPLETADA.value, EstadoSimulacion.FALLIDA.value) else None
+        self.db.commit()
+        self.db.refresh(barrido)
+        return self._map_to_entity(barrido)
+    
+    def delete(self, barrido_id: int) -> None:
+        barrido = self.db.query(BarridoSimulacion).filter(BarridoSimulacion.idBarrido == barrido_id).first()
+        if barrido:
+            self.db.delete(barrido)
+            self.db.commit()
+    
+    def _map_to_entity(self, barrido: BarridoSimulacion) -> BarridoSimulacionEntity:
+        return BarridoSimulacionEntity(
+            idBarrido=barrido.idBarrido,
+            idSimulacion=barrido.idSimulacion,
+            nombre=barrido.nombre,
+            parametros=json.loads(barrido.parametros) if barrido.parametros else None,
+            estado=EstadoSimulacion(barrido.estado),
+            numVariantes=barrido.numVariantes,
+            mensajeError=barrido.mensajeError,
+            fechaCreacion=barrido.fechaCreacion,
+            fechaFin=barrido.fechaFin
+        )
@@ -1,7 +1,7 @@
 from typing import List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import between
+from sqlalchemy import between, insert, literal, select
 
 from app.domain.entities.datos_ambientales import DatosAmbientalesEntity
 from app.domain.repositories.datos_ambientales_repository import DatosAmbientalesRepository
@@ -68,4 +68,22 @@ class SqlAlchemyDatosAmbientalesRepository(DatosAmbientalesRepository):
         ]
         self.db.bulk_save_objects(models, return_defaults=True)
         self.db.commit()
-        return [self._map_to_entity(model) for model in models]
\ No newline at end of file
+        return [self._map_to_entity(model) for model in models]
+
+    def copiar_de_simulacion(self, idSimulacionOrigen: int, idSimulacionDestino: int) -> int:
+        # INSERT ... SELECT: las filas se copian en el servidor sin pasar por Python
+        columnas = ['timestamp', 'fuenteDatos', 'radiacionGlobalHoriz_Wh_m2', 'temperaturaAmbiente_C', 'velocidadViento_m_s']
+        origen = select(
+            *[getattr(DatosAmbientales, columna) for columna in columnas],
+            literal(idSimulacionDestino).label('idSimulacion')
+        ).where(DatosAmbientales.idSimulacion == idSimulacionOrigen)
+        resultado = self.db.execute(insert(DatosAmbientales).from_select(columnas + ['idSimulacion'], origen))
+        self.db.commit()
+        return resultado.rowcount
+
+    def delete_by_simulacion(self, idSimulacion: int) -> int:
+        eliminados = self.db.query(DatosAmbientales).filter(
+            DatosAmbientales.idSimulacion == idSimulacion
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return eliminados
\ No newline at end of file
@@ -1,9 +1,12 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from datetime import datetime
+from sqlalchemy import and_, insert, or_, select
 from sqlalchemy.orm import Session
 from app.domain.entities.datos_intervalo_activo import DatosIntervaloActivoEntity
 from app.domain.repositories.datos_intervalo_activo_repository import DatosIntervaloActivoRepository
 from app.infrastructure.persistance.models.datos_intervalo_activo_tabla import DatosIntervaloActivo
+from app.infrastructure.persistance.models.resultado_simulacion_activo_generacion_tabla import ResultadoSimulacionActivoGeneracion
+from app.infrastructure.persistance.models.resultado_simulacion_activo_almacenamiento_tabla import ResultadoSimulacionActivoAlmacenamiento
 
 class SqlAlchemyDatosIntervaloActivoRepository(DatosIntervaloActivoRepository):
     def __init__(self, db: Session):
@@ -65,6 +68,67 @@ class SqlAlchemyDatosIntervaloActivoRepository(DatosIntervaloActivoRepository):
         datos_list = query.order_by(DatosIntervaloActivo.timestamp).all()
         return [self._to_entity(datos) for datos in datos_list]
     
+    def get_pagina(self, resultado_activo_id: int, is_generacion: bool, campos: List[str], start_time: Optional[datetime], end_time: Optional[datetime],
+                   despues_de: Optional[Tuple[datetime, int]], limite: int) -> List[Dict[str, Any]]:
+        # SQLAlchemy Core: solo las columnas pedidas (más la clave de paginación), sin objetos ORM.
+        # Usa los índices (idResultadoActivoGen|Alm, timestamp), que en InnoDB incluyen la clave primaria
+        tabla = DatosIntervaloActivo.__table__
+        clave = [tabla.c.timestamp, tabla.c.idDatosIntervaloActivo]
+        columna_resultado = tabla.c.idResultadoActivoGen if is_generacion else tabla.c.idResultadoActivoAlm
+        consulta = select(*clave, *[tabla.c[campo] for campo in campos if campo not in {columna.name for columna in clave}]).where(
+            columna_resultado == resultado_activo_id
+        )
+        if start_time is not None:
+            consulta = consulta.where(tabla.c.timestamp >= start_time)
+        if end_time is not None:
+            consulta = consulta.where(tabla.c.timestamp <= end_time)
+        if despues_de is not None:
+            timestamp, id_fila = despues_de
+            consulta = consulta.where(or_(
+                tabla.c.timestamp > timestamp,
+                and_(tabla.c.timestamp == timestamp, tabla.c.idDatosIntervaloActivo > id_fila)
+            ))
+        consulta = consulta.order_by(*clave).limit(limite)
+        return [dict(fila) for fila in self.db.execute(consulta).mappings()]
+    
+    def get_series(self, resultado_activo_id: int, is_generacion: bool, campos: List[str], start_time: Optional[datetime], end_time: Optional[datetime]) -> List[Tuple]:
+        # Tuplas (timestamp, campo_1, ...) de todo el rango, para reducirlas en memoria con NumPy
+        tabla = DatosIntervaloActivo.__table__
+        columna_resultado = tabla.c.idResultadoActivoGen if is_generacion else tabla.c.idResultadoActivoAlm
+        consulta = select(tabla.c.timestamp, *[tabla.c[campo] for campo in campos]).where(
+            columna_resultado == resultado_activo_id
+        )
+        if start_time is not None:
+            consulta = consulta.where(tabla.c.timestamp >= start_time)
+        if end_time is not None:
+            consulta = consulta.where(tabla.c.timestamp <= end_time)
+        consulta = consulta.order_by(tabla.c.timestamp, tabla.c.idDatosIntervaloActivo)
+        return [tuple(fila) for fila in self.db.execute(consulta)]
+    
+    def iterar_exportacion(self, resultado_simulacion_id: int, is_generacion: bool, campos: List[str], tamano_bloque: int) -> Iterator[List[Tuple]]:
+        # Tuplas (idActivo, timestamp, campo_1, ...) de toda la simulación, por bloques:
+        # yield_per abre un cursor de servidor, así que no se carga el resultado entero
+        tabla = DatosIntervaloActivo.__table__
+        if is_generacion:
+            resultados = ResultadoSimulacionActivoGeneracion.__table__
+            columna_resultado, columna_activo = tabla.c.idResultadoActivoGen, resultados.c.idActivoGeneracion
+            clave_resultado = resultados.c.idResultadoActivoGen
+        else:
+            resultados = ResultadoSimulacionActivoAlmacenamiento.__table__
+            columna_resultado, columna_activo = tabla.c.idResultadoActivoAlm, resultados.c.idActivoAlmacenamiento
+            clave_resultado = resultados.c.idResultadoActivoAlm
+        consulta = select(columna_activo, tabla.c.timestamp, *[tabla.c[campo] for campo in campos]).join(
+            resultados, clave_resultado == columna_resultado
+        ).where(
+            resultados.c.idResultadoSimulacion == resultado_simulacion_id
+        ).order_by(columna_resultado, tabla.c.timestamp, tabla.c.idDatosIntervaloActivo)
+        resultado = self.db.execute(consulta, execution_options={'yield_per': tamano_bloque})
+        try:
+            for bloque in resultado.partitions():
+                yield [tuple(fila) for fila in bloque]
+        finally:
+            resultado.close()
+    
     def list(self, skip: int = 0, limit: int = 100) -> List[DatosIntervaloActivoEntity]:
         datos_list = self.db.query(DatosIntervaloActivo).order_by(
             DatosIntervaloActivo.timestamp
@@ -91,6 +155,27 @@ class SqlAlchemyDatosIntervaloActivoRepository(DatosIntervaloActivoRepository):
         
         return [self._to_entity(db_datos) for db_datos in db_datos_list]
     
+    def insertar_bulk(self, filas: List[Dict[str, Any]], tamano_lote: int = 5000) -> int:
+        # INSERT de SQLAlchemy Core con executemany por lotes: sin unidad de trabajo ni identity map
+        tabla = DatosIntervaloActivo.__table__
+        for inicio in range(0, len(filas), tamano_lote):
+            self.db.execute(insert(tabla), filas[inicio:inicio + tamano_lote])
+        self.db.commit()
+        return len(filas)
+    
+    def delete_posteriores(self, resultado_activo_gen_ids: List[int], resultado_activo_alm_ids: List[int], timestamp: datetime) -> int:
+        # Intervalos persistidos después de un punto de control (bloque a medias al fallar)
+        eliminados = 0
+        for columna, ids in ((DatosIntervaloActivo.idResultadoActivoGen, resultado_activo_gen_ids),
+                             (DatosIntervaloActivo.idResultadoActivoAlm, resultado_activo_alm_ids)):
+            if ids:
+                eliminados += self.db.query(DatosIntervaloActivo).filter(
+                    columna.in_(ids),
+                    DatosIntervaloActivo.timestamp > timestamp
+                ).delete(synchronize_session=False)
+        self.db.commit()
+        return eliminados
+    
     def update(self, datos_intervalo_id: int, datos_intervalo: DatosIntervaloActivoEntity) -> DatosIntervaloActivoEntity:
         db_datos = self.db.query(DatosIntervaloActivo).filter(
             DatosIntervaloActivo.idDatosIntervaloActivo == datos_intervalo_id
@@ -1,9 +1,11 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from datetime import datetime
+from sqlalchemy import and_, insert, or_, select
 from sqlalchemy.orm import Session
 from app.domain.entities.datos_intervalo_participante import DatosIntervaloParticipanteEntity
 from app.domain.repositories.datos_intervalo_participante_repository import DatosIntervaloParticipanteRepository
 from app.infrastructure.persistance.models.datos_intervalo_participante_tabla import DatosIntervaloParticipante
+from app.infrastructure.persistance.models.resultado_simulacion_participante_tabla import ResultadoSimulacionParticipante
 
 class SqlAlchemyDatosIntervaloParticipanteRepository(DatosIntervaloParticipanteRepository):
     def __init__(self, db: Session):
@@ -59,6 +61,58 @@ class SqlAlchemyDatosIntervaloParticipanteRepository(DatosIntervaloParticipanteR
         ).order_by(DatosIntervaloParticipante.timestamp).all()
         return [self._to_entity(datos) for datos in datos_list]
     
+    def get_pagina(self, resultado_participante_id: int, campos: List[str], start_time: Optional[datetime], end_time: Optional[datetime],
+                   despues_de: Optional[Tuple[datetime, int]], limite: int) -> List[Dict[str, Any]]:
+        # SQLAlchemy Core: solo las columnas pedidas (más la clave de paginación), sin objetos ORM.
+        # Usa el índice (idResultadoParticipante, timestamp), que en InnoDB incluye la clave primaria
+        tabla = DatosIntervaloParticipante.__table__
+        clave = [tabla.c.timestamp, tabla.c.idDatosIntervaloParticipante]
+        consulta = select(*clave, *[tabla.c[campo] for campo in campos if campo not in {columna.name for columna in clave}]).where(
+            tabla.c.idResultadoParticipante == resultado_participante_id
+        )
+        if start_time is not None:
+            consulta = consulta.where(tabla.c.timestamp >= start_time)
+        if end_time is not None:
+            consulta = consulta.where(tabla.c.timestamp <= end_time)
+        if despues_de is not None:
+            timestamp, id_fila = despues_de
+            consulta = consulta.where(or_(
+                tabla.c.timestamp > timestamp,
+                and_(tabla.c.timestamp == timestamp, tabla.c.idDatosIntervaloParticipante > id_fila)
+            ))
+        consulta = consulta.order_by(*clave).limit(limite)
+        return [dict(fila) for fila in self.db.execute(consulta).mappings()]
+    
+    def get_series(self, resultado_participante_id: int, campos: List[str], start_time: Optional[datetime], end_time: Optional[datetime]) -> List[Tuple]:
+        # Tuplas (timestamp, campo_1, ...) de todo el rango, para reducirlas en memoria con NumPy
+        tabla = DatosIntervaloParticipante.__table__
+        consulta = select(tabla.c.timestamp, *[tabla.c[campo] for campo in campos]).where(
+            tabla.c.idResultadoParticipante == resultado_participante_id
+        )
+        if start_time is not None:
+            consulta = consulta.where(tabla.c.timestamp >= start_time)
+        if end_time is not None:
+            consulta = consulta.where(tabla.c.timestamp <= end_time)
+        consulta = consulta.order_by(tabla.c.timestamp, tabla.c.idDatosIntervaloParticipante)
+        return [tuple(fila) for fila in self.db.execute(consulta)]
+    
+    def iterar_exportacion(self, resultado_simulacion_id: int, campos: List[str], tamano_bloque: int) -> Iterator[List[Tuple]]:
+        # Tuplas (idParticipante, timestamp, campo_1, ...) de toda la simulación, por bloques:
+        # yield_per abre un cursor de servidor, así que no se carga el resultado entero
+        tabla = DatosIntervaloParticipante.__table__
+        resultados = ResultadoSimulacionParticipante.__table__
+        consulta = select(resultados.c.idParticipante, tabla.c.timestamp, *[tabla.c[campo] for campo in campos]).join(
+            resultados, resultados.c.idResultadoParticipante == tabla.c.idResultadoParticipante
+        ).where(
+            resultados.c.idResultadoSimulacion == resultado_simulacion_id
+        ).order_by(tabla.c.idResultadoParticipante, tabla.c.timestamp)
+        resultado = self.db.execute(consulta, execution_options={'yield_per': tamano_bloque})
+        try:
+            for bloque in resultado.partitions():
+                yield [tuple(fila) for fila in bloque]
+        finally:
+            resultado.close()
+    
     def list(self, skip: int = 0, limit: int = 100) -> List[DatosIntervaloParticipanteEntity]:
         datos_list = self.db.query(DatosIntervaloParticipante).order_by(
             DatosIntervaloParticipante.idResultadoParticipante, 
@@ -86,6 +140,25 @@ class SqlAlchemyDatosIntervaloParticipanteRepository(DatosIntervaloParticipanteR
         
         return [self._to_entity(db_datos) for db_datos in db_datos_list]
     
+    def insertar_bulk(self, filas: List[Dict[str, Any]], tamano_lote: int = 5000) -> int:
+        # INSERT de SQLAlchemy Core con executemany por lotes: sin unidad de trabajo ni identity map
+        tabla = DatosIntervaloParticipante.__table__
+        for inicio in range(0, len(filas), tamano_lote):
+            self.db.execute(insert(tabla), filas[inicio:inicio + tamano_lote])
+        self.db.commit()
+        return len(filas)
+    
+    def delete_posteriores(self, resultado_participante_ids: List[int], timestamp: datetime) -> int:
+        # Intervalos persistidos después de un punto de control (bloque a medias al fallar)
+        if not resultado_participante_ids:
+            return 0
+        eliminados = self.db.query(DatosIntervaloParticipante).filter(
+            DatosIntervaloParticipante.idResultadoParticipante.in_(resultado_participante_ids),
+            DatosIntervaloParticipante.timestamp > timestamp
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return eliminados
+    
     def update(self, datos_intervalo_id: int, datos_intervalo: DatosIntervaloParticipanteEntity) -> DatosIntervaloParticipanteEntity:
         db_datos = self.db.query(DatosIntervaloParticipante).filter(
             DatosIntervaloParticipante.idDatosIntervaloParticipante == datos_intervalo_id
@@ -0,0 +1,98 @@
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.domain.entities.importacion_comunidad_job import ImportacionComunidadJobEntity
+from app.domain.entities.simulacion_job import EstadoJob
+from app.domain.repositories.importacion_comunidad_job_repository import ImportacionComunidadJobRepository
+from app.infrastructure.persistance.models.importacion_comunidad_job_tabla import ImportacionComunidadJob
+
+class SqlAlchemyImportacionComunidadJobRepository(ImportacionComunidadJobRepository):
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_by_id(self, importacion_id: int) -> Optional[ImportacionComunidadJobEntity]:
+        job = self.db.query(ImportacionComunidadJob).filter(ImportacionComunidadJob.idImportacion == importacion_id).first()
+        if job:
+            return self._map_to_entity(job)
+        return None
+    
+    def crear(self, id_usuario: int, nombre_archivo: str) -> ImportacionComunidadJobEntity:
+        db_job = ImportacionComunidadJob(
+            idUsuario=id_usuario,
+            nombreArchivo=nombre_archivo,
+            estado=EstadoJob.PENDIENTE.value,
+            fechaActualizacion=datetime.now()
+        )
+        self.db.add(db_job)
+        self.db.commit()
+        self.db.refresh(db_job)
+        return self._map_to_entity(db_job)
+    
+    def iniciar(self, importacion_id: int) -> ImportacionComunidadJobEntity:
+        job = self.db.query(ImportacionComunidadJob).filter(ImportacionComunidadJob.idImportacion == importacion_id).first()
+        if not job:
+            return None
+        ahora = datetime.now()
+        job.estado = EstadoJob.EJECUTANDO.value
+        job.fechaInicio = ahora
+        job.fechaActualizacion = ahora
+        self.db.commit()
+        self.db.refresh(job)
+        return self._map_to_entity(job)
+    
+    def registrar_progreso(self, importacion_id: int, progreso: Dict[str, Any]) -> None:
+        self.db.query(ImportacionComunidadJob).filter(
+            ImportacionComunidadJob.idImportacion == importacion_id
+        ).update({
+            ImportacionComunidadJob.progreso: json.dumps(progreso),
+            ImportacionComunidadJob.fechaActualizacion: datetime.now()
+        }, synchronize_session=False)
+        self.db.commit()
+    
+    def finalizar(self, importacion_id: int, estado: str, resultado: Optional[Dict[str, Any]] = None,
+                  id_comunidad: Optional[int] = None, mensaje_error: Optional[str] = None) -> ImportacionComunidadJobEntity:
+        job = self.db.query(ImportacionComunidadJob).filter(ImportacionComunidadJob.idImportacion == importacion_id).first()
+        if not job:
+            return None
+        ahora = datetime.now()
+        job.estado = estado
+        job.resultado = json.dumps(resultado) if resultado is not None else None
+        job.idComunidadEnergetica = id_comunidad
+        job.mensajeError = mensaje_error
+        job.fechaFin = ahora
+        job.fechaActualizacion = ahora
+        self.db.commit()
+        self.db.refresh(job)
+        return self._map_to_entity(job)
+    
+    def marcar_interrumpidas(self, timeout_segundos: float) -> int:
+        # Importaciones que dejaron de actualizarse (el proceso que las ejecutaba se detuvo)
+        limite = datetime.now() - timedelta(seconds=timeout_segundos)
+        marcadas = self.db.query(ImportacionComunidadJob).filter(
+            ImportacionComunidadJob.estado.in_([EstadoJob.PENDIENTE.value, EstadoJob.EJECUTANDO.value]),
+            func.coalesce(ImportacionComunidadJob.fechaActualizacion, ImportacionComunidadJob.fechaCreacion) < limite
+        ).update({
+            ImportacionComunidadJob.estado: EstadoJob.FALLIDO.value,
+            ImportacionComunidadJob.mensajeError: "La importación se interrumpió antes de completarse",
+            ImportacionComunidadJob.fechaFin: datetime.now()
+        }, synchronize_session=False)
+        self.db.commit()
+        return marcadas
+    
+    def _map_to_entity(self, job: ImportacionComunidadJob) -> ImportacionComunidadJobEntity:
+        return ImportacionComunidadJobEntity(
+            idImportacion=job.idImportacion,
+            idUsuario=job.idUsuario,
+            nombreArchivo=job.nombreArchivo,
+            estado=EstadoJob(job.estado),
+            idComunidadEnergetica=job.idComunidadEnergetica,
+            mensajeError=job.mensajeError,
+            fechaCreacion=job.fechaCreacion,
+            fechaInicio=job.fechaInicio,
+            fechaFin=job.fechaFin,
+            fechaActualizacion=job.fechaActualizacion,
+            progreso=json.loads(job.progreso) if job.progreso else None,
+            resultado=json.loads(job.resultado) if job.resultado else None
+        )
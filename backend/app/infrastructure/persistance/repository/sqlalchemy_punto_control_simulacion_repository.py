@@ -0,0 +1,72 @@
+import json
+import zlib
+from typing import Optional
+from sqlalchemy.orm import Session, defer
+from app.domain.entities.punto_control_simulacion import PuntoControlSimulacionEntity
+from app.domain.repositories.punto_control_simulacion_repository import PuntoControlSimulacionRepository
+from app.infrastructure.persistance.models.punto_control_simulacion_tabla import PuntoControlSimulacion
+
+class SqlAlchemyPuntoControlSimulacionRepository(PuntoControlSimulacionRepository):
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_by_simulacion(self, simulacion_id: int, incluir_entradas: bool = True) -> Optional[PuntoControlSimulacionEntity]:
+        query = self.db.query(PuntoControlSimulacion).filter(PuntoControlSimulacion.idSimulacion == simulacion_id)
+        if not incluir_entradas:
+            query = query.options(defer(PuntoControlSimulacion.entradas))
+        punto_control = query.first()
+        if not punto_control:
+            return None
+        return PuntoControlSimulacionEntity(
+            idSimulacion=punto_control.idSimulacion,
+            idResultado=punto_control.idResultado,
+            huellaEntradas=punto_control.huellaEntradas,
+            ultimoTimestamp=punto_control.ultimoTimestamp,
+            intervalosCompletados=punto_control.intervalosCompletados,
+            estadoMotor=_deserializar(punto_control.estadoMotor),
+            entradas=_deserializar(punto_control.entradas) if incluir_entradas else None,
+            fechaActualizacion=punto_control.fechaActualizacion
+        )
+    
+    def guardar(self, punto_control: PuntoControlSimulacionEntity) -> None:
+        # Un único punto de control por simulación; entradas=None conserva las ya guardadas
+        try:
+            db_punto = self.db.query(PuntoControlSimulacion).options(defer(PuntoControlSimulacion.entradas)).filter(
+                PuntoControlSimulacion.idSimulacion == punto_control.idSimulacion
+            ).first()
+            if not db_punto:
+                db_punto = PuntoControlSimulacion(idSimulacion=punto_control.idSimulacion)
+                self.db.add(db_punto)
+            
+            db_punto.idResultado = punto_control.idResultado
+            db_punto.huellaEntradas = punto_control.huellaEntradas
+            db_punto.ultimoTimestamp = punto_control.ultimoTimestamp
+            db_punto.intervalosCompletados = punto_control.intervalosCompletados
+            db_punto.estadoMotor = _serializar(punto_control.estadoMotor)
+            if punto_control.entradas is not None:
+                db_punto.entradas = _serializar(punto_control.entradas)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+    
+    def descartar_entradas(self, simulacion_id: int) -> None:
+        self.db.query(PuntoControlSimulacion).filter(
+            PuntoControlSimulacion.idSimulacion == simulacion_id
+        ).update({PuntoControlSimulacion.entradas: None}, synchronize_session=False)
+        self.db.commit()
+    
+    def delete_by_simulacion(self, simulacion_id: int) -> None:
+        self.db.query(PuntoControlSimulacion).filter(
+            PuntoControlSimulacion.idSimulacion == simulacion_id
+        ).delete(synchronize_session=False)
+        self.db.commit()
+
+
+# Estado del motor como JSON comprimido con zlib: el formato (y su versión) lo fija el dominio
+def _serializar(valor) -> bytes:
+    return zlib.compress(json.dumps(valor, separators=(',', ':')).encode('utf-8'))
+
+
+def _deserializar(datos: Optional[bytes]):
+    return json.loads(zlib.decompress(datos).decode('utf-8')) if datos else None
@@ -1,9 +1,11 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
+from sqlalchemy import BigInteger, cast, func
 from sqlalchemy.orm import Session
 from app.domain.repositories.pvpc_precios_repository import PvpcPreciosRepository
 from app.domain.entities.pvpc_precios import PvpcPreciosEntity
 from app.infrastructure.persistance.models.pvpc_precios_tabla import PvpcPrecios
+from app.infrastructure.persistance.repository.sqlalchemy_registro_consumo_repository import minutos_desde
 
 class PvpcPreciosRepositoryImpl(PvpcPreciosRepository):
     
@@ -40,4 +42,25 @@ class PvpcPreciosRepositoryImpl(PvpcPreciosRepository):
                 precio_exportacion=result.precio_exportacion
             )
             for result in results
-        ] 
\ No newline at end of file
+        ]
+    
+    def resumen_range(self, fecha_inicio: datetime, fecha_fin: datetime) -> Tuple:
+        
+        # (registros, suma de precios de importación y exportación, sus sumas ponderadas por
+        # posición y último timestamp) de la ventana; las ponderadas, como en el resumen de
+        # consumos, detectan precios intercambiados o movidos a otra hora
+        minutos = minutos_desde(self.db_session, PvpcPrecios.timestamp, fecha_inicio)
+        ponderada = lambda columna: func.sum(cast(func.round(columna * 1000000), BigInteger) * minutos)
+        resumen = self.db_session.query(
+            func.count(PvpcPrecios.id),
+            func.sum(PvpcPrecios.precio_importacion),
+            func.sum(PvpcPrecios.precio_exportacion),
+            ponderada(PvpcPrecios.precio_importacion),
+            ponderada(PvpcPrecios.precio_exportacion),
+            func.max(PvpcPrecios.timestamp)
+        ).filter(
+            PvpcPrecios.timestamp >= fecha_inicio,
+            PvpcPrecios.timestamp <= fecha_fin
+        ).one()
+        
+        return tuple(resumen) 
\ No newline at end of file
@@ -1,7 +1,8 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import between, and_, or_
+from sqlalchemy import BigInteger, between, and_, cast, or_, func, select, text
+from sqlalchemy.dialects import mysql, sqlite
 
 from app.domain.entities.registro_consumo import RegistroConsumoEntity
 from app.domain.repositories.registro_consumo_repository import RegistroConsumoRepository
@@ -57,6 +58,50 @@ class SqlAlchemyRegistroConsumoRepository(RegistroConsumoRepository):
         
         return [self._map_to_entity(model) for model in models]
     
+    def resumen_range_for_participantes(self, id_participantes: List[int], fecha_inicio: datetime, fecha_fin: datetime) -> List[Tuple]:
+        
+        # (idParticipante, registros, suma de consumo, suma ponderada por posición, primer y último
+        # timestamp) por participante: detecta altas, bajas y cambios de valor sin traer las filas
+        # de la ventana. La suma ponderada (consumo en millonésimas por minutos desde fecha_inicio,
+        # en enteros para que no dependa del orden de suma) cambia también si se intercambian
+        # dos valores o se mueve un registro a otro instante
+        if not id_participantes:
+            return []
+        
+        filas = self.db.query(
+            RegistroConsumo.idParticipante,
+            func.count(RegistroConsumo.idRegistroConsumo),
+            func.sum(RegistroConsumo.consumoEnergia),
+            func.sum(
+                cast(func.round(RegistroConsumo.consumoEnergia * 1000000), BigInteger)
+                * minutos_desde(self.db, RegistroConsumo.timestamp, fecha_inicio)
+            ),
+            func.min(RegistroConsumo.timestamp),
+            func.max(RegistroConsumo.timestamp)
+        ).filter(
+            RegistroConsumo.idParticipante.in_(id_participantes),
+            between(RegistroConsumo.timestamp, fecha_inicio, fecha_fin)
+        ).group_by(RegistroConsumo.idParticipante).order_by(RegistroConsumo.idParticipante).all()
+        
+        return [tuple(fila) for fila in filas]
+    
+    def iterar_por_participante(self, idParticipante: int, fecha_inicio: Optional[datetime], fecha_fin: Optional[datetime], tamano_bloque: int) -> Iterator[List[Tuple]]:
+        
+        # Tuplas (timestamp, consumoEnergia) ordenadas por tiempo, por bloques: yield_per abre
+        # un cursor de servidor, así que el consumo del participante no se carga entero
+        tabla = RegistroConsumo.__table__
+        consulta = select(tabla.c.timestamp, tabla.c.consumoEnergia).where(tabla.c.idParticipante == idParticipante)
+        if fecha_inicio is not None:
+            consulta = consulta.where(tabla.c.timestamp >= fecha_inicio)
+        if fecha_fin is not None:
+            consulta = consulta.where(tabla.c.timestamp <= fecha_fin)
+        resultado = self.db.execute(consulta.order_by(tabla.c.timestamp), execution_options={'yield_per': tamano_bloque})
+        try:
+            for bloque in resultado.partitions():
+                yield [tuple(fila) for fila in bloque]
+        finally:
+            resultado.close()
+    
     def list(self) -> List[RegistroConsumoEntity]:
         models = self.db.query(RegistroConsumo).order_by(RegistroConsumo.timestamp).all()
         return [self._map_to_entity(model) for model in models]
@@ -72,6 +117,46 @@ class SqlAlchemyRegistroConsumoRepository(RegistroConsumoRepository):
         self.db.commit()
         self.db.refresh(model)
         return self._map_to_entity(model)
+    
+    def upsert_bulk(self, filas: List[Dict[str, Any]], tamano_lote: int = 5000) -> Tuple[int, int]:
+        # INSERT multi-fila por lotes, todo en una única transacción. Si ya existe un registro
+        # del participante en ese instante (uq_registro_consumo_participante_ts) se actualiza
+        # su consumo, así reimportar datos solapados no crea duplicados. Devuelve (creados,
+        # actualizados): el rowcount de MySQL no distingue una fila nueva de una actualizada
+        # con el mismo valor, así que se cuentan las filas del rango de cada lote antes y después
+        sentencia = self._sentencia_upsert()
+        creados = 0
+        try:
+            for inicio in range(0, len(filas), tamano_lote):
+                lote = filas[inicio:inicio + tamano_lote]
+                existentes = self._contar_rango_lote(lote)
+                self.db.execute(sentencia, lote)
+                creados += self._contar_rango_lote(lote) - existentes
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return creados, len(filas) - creados
+    
+    def _contar_rango_lote(self, lote: List[Dict[str, Any]]) -> int:
+        # Registros de los participantes del lote entre su primer y último instante (usa el índice único)
+        timestamps = [fila['timestamp'] for fila in lote]
+        return self.db.query(func.count(RegistroConsumo.idRegistroConsumo)).filter(
+            RegistroConsumo.idParticipante.in_({fila['idParticipante'] for fila in lote}),
+            between(RegistroConsumo.timestamp, min(timestamps), max(timestamps))
+        ).scalar()
+    
+    def _sentencia_upsert(self):
+        tabla = RegistroConsumo.__table__
+        if self.db.get_bind().dialect.name == 'mysql':
+            sentencia = mysql.insert(tabla)
+            return sentencia.on_duplicate_key_update(consumoEnergia=sentencia.inserted.consumoEnergia)
+        # SQLite (entornos locales): ON CONFLICT sobre la misma clave única
+        sentencia = sqlite.insert(tabla)
+        return sentencia.on_conflict_do_update(
+            index_elements=[tabla.c.idParticipante, tabla.c.timestamp],
+            set_={'consumoEnergia': sentencia.excluded.consumoEnergia}
+        )
         
     def update(self, registro: RegistroConsumoEntity) -> RegistroConsumoEntity:
         model = self.db.query(RegistroConsumo).filter_by(idRegistroConsumo=registro.idRegistroConsumo).first()
@@ -94,4 +179,12 @@ class SqlAlchemyRegistroConsumoRepository(RegistroConsumoRepository):
         
         deleted_count = self.db.query(RegistroConsumo).filter_by(idParticipante=idParticipante).delete()
         self.db.commit()
-        return deleted_count
\ No newline at end of file
+        return deleted_count
+
+
+def minutos_desde(db: Session, columna, inicio: datetime):
+    # Minutos enteros entre inicio y una columna DATETIME (no hay una función común a MySQL y SQLite)
+    if db.get_bind().dialect.name == 'mysql':
+        return func.timestampdiff(text('MINUTE'), inicio, columna)
+    segundos = lambda valor: cast(func.strftime('%s', valor), BigInteger)
+    return (segundos(columna) - segundos(inicio)) // 60
@@ -1,8 +1,21 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, insert, literal, select
+from sqlalchemy.orm import Session, aliased
 from app.domain.entities.resultado_simulacion import ResultadoSimulacionEntity
 from app.domain.repositories.resultado_simulacion_repository import ResultadoSimulacionRepository
 from app.infrastructure.persistance.models.resultado_simulacion_tabla import ResultadoSimulacion
+from app.infrastructure.persistance.models.resultado_simulacion_participante_tabla import ResultadoSimulacionParticipante
+from app.infrastructure.persistance.models.resultado_simulacion_activo_generacion_tabla import ResultadoSimulacionActivoGeneracion
+from app.infrastructure.persistance.models.resultado_simulacion_activo_almacenamiento_tabla import ResultadoSimulacionActivoAlmacenamiento
+from app.infrastructure.persistance.models.datos_intervalo_participante_tabla import DatosIntervaloParticipante
+from app.infrastructure.persistance.models.datos_intervalo_activo_tabla import DatosIntervaloActivo
+
+# (tabla de resultados, clave primaria, entidad a la que se refiere, tabla de intervalos, FK del intervalo)
+RESULTADOS_HIJOS = (
+    (ResultadoSimulacionParticipante, 'idResultadoParticipante', 'idParticipante', DatosIntervaloParticipante, 'idResultadoParticipante'),
+    (ResultadoSimulacionActivoGeneracion, 'idResultadoActivoGen', 'idActivoGeneracion', DatosIntervaloActivo, 'idResultadoActivoGen'),
+    (ResultadoSimulacionActivoAlmacenamiento, 'idResultadoActivoAlm', 'idActivoAlmacenamiento', DatosIntervaloActivo, 'idResultadoActivoAlm'),
+)
 
 class SqlAlchemyResultadoSimulacionRepository(ResultadoSimulacionRepository):
     def __init__(self, db: Session):
@@ -79,6 +92,52 @@ class SqlAlchemyResultadoSimulacionRepository(ResultadoSimulacionRepository):
         
         return self._map_to_entity(db_resultado)
     
+    def clonar(self, resultado_id: int, simulacion_id: int) -> Optional[ResultadoSimulacionEntity]:
+        
+        # Copia un resultado completo (global, por participante y activo, e intervalos) a otra
+        # simulación. Cada tabla se copia con un INSERT ... SELECT en el servidor; los intervalos
+        # se enlazan con la nueva fila de resultados a través del participante o activo
+        origen = self.db.query(ResultadoSimulacion).filter(ResultadoSimulacion.idResultado == resultado_id).first()
+        if not origen:
+            return None
+        
+        try:
+            columnas = [c.name for c in ResultadoSimulacion.__table__.columns
+                        if c.name not in ('idResultado', 'fechaCreacion', 'idSimulacion')]
+            destino = ResultadoSimulacion(idSimulacion=simulacion_id, **{c: getattr(origen, c) for c in columnas})
+            self.db.add(destino)
+            self.db.flush()
+            
+            for tabla, clave_primaria, clave_entidad, tabla_intervalos, clave_intervalo in RESULTADOS_HIJOS:
+                columnas = [c.name for c in tabla.__table__.columns
+                            if c.name not in (clave_primaria, 'idResultadoSimulacion')]
+                self.db.execute(insert(tabla).from_select(
+                    columnas + ['idResultadoSimulacion'],
+                    select(*[tabla.__table__.c[c] for c in columnas], literal(destino.idResultado))
+                    .where(tabla.idResultadoSimulacion == resultado_id)
+                ))
+                
+                viejo, nuevo = aliased(tabla), aliased(tabla)
+                columnas = [c.name for c in tabla_intervalos.__table__.columns
+                            if not c.primary_key and c.name not in ('idResultadoParticipante', 'idResultadoActivoGen', 'idResultadoActivoAlm')]
+                self.db.execute(insert(tabla_intervalos).from_select(
+                    [clave_intervalo] + columnas,
+                    select(getattr(nuevo, clave_primaria), *[tabla_intervalos.__table__.c[c] for c in columnas])
+                    .select_from(tabla_intervalos)
+                    .join(viejo, getattr(tabla_intervalos, clave_intervalo) == getattr(viejo, clave_primaria))
+                    .join(nuevo, and_(getattr(nuevo, clave_entidad) == getattr(viejo, clave_entidad),
+                                      nuevo.idResultadoSimulacion == destino.idResultado))
+                    .where(viejo.idResultadoSimulacion == resultado_id)
+                ))
+            
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        self.db.refresh(destino)
+        return self._map_to_entity(destino)
+    
     def delete(self, resultado_id: int) -> None:
         db_resultado = self.db.query(ResultadoSimulacion).filter(ResultadoSimulacion.idResultado == resultado_id).first()
         if db_resultado:
@@ -0,0 +1,172 @@
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from app.domain.entities.simulacion_job import SimulacionJobEntity, EstadoJob
+from app.domain.repositories.simulacion_job_repository import SimulacionJobRepository
+from app.infrastructure.persistance.models.simulacion_job_tabla import SimulacionJob
+
+class SqlAlchemySimulacionJobRepository(SimulacionJobRepository):
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_by_id(self, job_id: int) -> Optional[SimulacionJobEntity]:
+        job = self.db.query(SimulacionJob).filter(SimulacionJob.idJob == job_id).first()
+        if job:
+            return self._map_to_entity(job)
+        return None
+    
+    def get_ultimo_by_simulacion(self, simulacion_id: int) -> Optional[SimulacionJobEntity]:
+        # Los trabajos de barrido no cuentan como ejecución de la simulación
+        job = self.db.query(SimulacionJob).filter(
+            SimulacionJob.idSimulacion == simulacion_id,
+            SimulacionJob.idBarrido.is_(None)
+        ).order_by(SimulacionJob.idJob.desc()).first()
+        if job:
+            return self._map_to_entity(job)
+        return None
+    
+    def get_ultimo_by_barrido(self, barrido_id: int) -> Optional[SimulacionJobEntity]:
+        job = self.db.query(SimulacionJob).filter(
+            SimulacionJob.idBarrido == barrido_id
+        ).order_by(SimulacionJob.idJob.desc()).first()
+        if job:
+            return self._map_to_entity(job)
+        return None
+    
+    def list_activos(self) -> List[SimulacionJobEntity]:
+        jobs = self.db.query(SimulacionJob).filter(
+            SimulacionJob.estado.in_([EstadoJob.PENDIENTE.value, EstadoJob.EJECUTANDO.value])
+        ).order_by(SimulacionJob.prioridad.desc(), SimulacionJob.idJob.asc()).all()
+        return [self._map_to_entity(j) for j in jobs]
+    
+    def encolar(self, simulacion_id: int, prioridad: int = 0, barrido_id: Optional[int] = None) -> SimulacionJobEntity:
+        db_job = SimulacionJob(
+            idSimulacion=simulacion_id,
+            idBarrido=barrido_id,
+            estado=EstadoJob.PENDIENTE.value,
+            prioridad=prioridad,
+            cancelacionSolicitada=False,
+            intentos=0
+        )
+        self.db.add(db_job)
+        self.db.commit()
+        self.db.refresh(db_job)
+        return self._map_to_entity(db_job)
+    
+    def reclamar_siguiente(self, worker: str, timeout_latido_segundos: float, max_intentos: int) -> Optional[SimulacionJobEntity]:
+        # SELECT ... FOR UPDATE SKIP LOCKED: cada worker se queda con una fila distinta sin
+        # esperar a los demás. También se recuperan trabajos cuyo worker dejó de dar latidos
+        ahora = datetime.now()
+        limite_latido = ahora - timedelta(seconds=timeout_latido_segundos)
+        try:
+            job = self.db.query(SimulacionJob).filter(
+                SimulacionJob.cancelacionSolicitada == False,
+                or_(
+                    SimulacionJob.estado == EstadoJob.PENDIENTE.value,
+                    and_(
+                        SimulacionJob.estado == EstadoJob.EJECUTANDO.value,
+                        SimulacionJob.ultimoLatido < limite_latido,
+                        SimulacionJob.intentos < max_intentos
+                    )
+                )
+            ).order_by(
+                SimulacionJob.prioridad.desc(), SimulacionJob.idJob.asc()
+            ).with_for_update(skip_locked=True).first()
+            
+            if not job:
+                self.db.commit()
+                return None
+            
+            job.estado = EstadoJob.EJECUTANDO.value
+            job.worker = worker
+            job.fechaInicio = ahora
+            job.ultimoLatido = ahora
+            job.intentos = (job.intentos or 0) + 1
+            self.db.commit()
+            self.db.refresh(job)
+            return self._map_to_entity(job)
+        except Exception:
+            self.db.rollback()
+            raise
+    
+    def registrar_latido(self, job_id: int, progreso: Optional[Dict[str, Any]] = None) -> bool:
+        # Actualiza el latido (y el progreso, si lo hay) y devuelve si se ha solicitado la cancelación
+        job = self.db.query(SimulacionJob).filter(SimulacionJob.idJob == job_id).first()
+        if not job:
+            return True
+        job.ultimoLatido = datetime.now()
+        if progreso is not None:
+            job.progreso = json.dumps(progreso)
+        self.db.commit()
+        return bool(job.cancelacionSolicitada)
+    
+    def solicitar_cancelacion(self, job_id: int) -> SimulacionJobEntity:
+        # Con la fila bloqueada: un trabajo pendiente se cancela directamente y uno en
+        # ejecución queda marcado para que el worker lo detenga en el siguiente punto de control
+        job = self.db.query(SimulacionJob).filter(SimulacionJob.idJob == job_id).with_for_update().first()
+        if not job:
+            self.db.rollback()
+            return None
+        
+        if job.estado == EstadoJob.PENDIENTE.value:
+            job.estado = EstadoJob.CANCELADO.value
+            job.fechaFin = datetime.now()
+        elif job.estado == EstadoJob.EJECUTANDO.value:
+            job.cancelacionSolicitada = True
+        self.db.commit()
+        self.db.refresh(job)
+        return self._map_to_entity(job)
+    
+    def finalizar(self, job_id: int, estado: str, mensaje_error: Optional[str] = None) -> SimulacionJobEntity:
+        job = self.db.query(SimulacionJob).filter(SimulacionJob.idJob == job_id).first()
+        if not job:
+            return None
+        job.estado = estado
+        job.mensajeError = mensaje_error
+        job.fechaFin = datetime.now()
+        self.db.commit()
+        self.db.refresh(job)
+        return self._map_to_entity(job)
+    
+    def marcar_abandonados(self, timeout_latido_segundos: float, max_intentos: int) -> List[SimulacionJobEntity]:
+        # Trabajos sin latido que ya agotaron sus intentos: no se vuelven a reclamar
+        limite_latido = datetime.now() - timedelta(seconds=timeout_latido_segundos)
+        try:
+            jobs = self.db.query(SimulacionJob).filter(
+                SimulacionJob.estado == EstadoJob.EJECUTANDO.value,
+                SimulacionJob.ultimoLatido < limite_latido,
+                or_(SimulacionJob.intentos >= max_intentos, SimulacionJob.cancelacionSolicitada == True)
+            ).with_for_update(skip_locked=True).all()
+            
+            for job in jobs:
+                if job.cancelacionSolicitada:
+                    job.estado = EstadoJob.CANCELADO.value
+                else:
+                    job.estado = EstadoJob.FALLIDO.value
+                    job.mensajeError = f"El worker dejó de responder ({job.intentos} intentos)"
+                job.fechaFin = datetime.now()
+            self.db.commit()
+            return [self._map_to_entity(j) for j in jobs]
+        except Exception:
+            self.db.rollback()
+            raise
+    
+    def _map_to_entity(self, job: SimulacionJob) -> SimulacionJobEntity:
+        return SimulacionJobEntity(
+            idJob=job.idJob,
+            idSimulacion=job.idSimulacion,
+            idBarrido=job.idBarrido,
+            estado=EstadoJob(job.estado),
+            prioridad=job.prioridad,
+            cancelacionSolicitada=bool(job.cancelacionSolicitada),
+            intentos=job.intentos,
+            worker=job.worker,
+            mensajeError=job.mensajeError,
+            fechaCreacion=job.fechaCreacion,
+            fechaInicio=job.fechaInicio,
+            fechaFin=job.fechaFin,
+            ultimoLatido=job.ultimoLatido,
+            progreso=json.loads(job.progreso) if job.progreso else None
+        )
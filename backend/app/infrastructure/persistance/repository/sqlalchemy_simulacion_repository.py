@@ -1,7 +1,9 @@
+from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.domain.entities.simulacion import SimulacionEntity, EstadoSimulacion, TipoEstrategiaExcedentes
 from app.infrastructure.persistance.models.simulacion_tabla import Simulacion
+from app.infrastructure.persistance.models.resultado_simulacion_tabla import ResultadoSimulacion
 from app.domain.repositories.simulacion_repository import SimulacionRepository
 
 class SqlAlchemySimulacionRepository(SimulacionRepository):
@@ -20,7 +22,8 @@ class SqlAlchemySimulacionRepository(SimulacionRepository):
                 estado=EstadoSimulacion(simulacion.estado),
                 tipoEstrategiaExcedentes=TipoEstrategiaExcedentes(simulacion.tipoEstrategiaExcedentes),
                 idUsuario_creador=simulacion.idUsuario_creador,
-                idComunidadEnergetica=simulacion.idComunidadEnergetica
+                idComunidadEnergetica=simulacion.idComunidadEnergetica,
+                huellaEntradas=simulacion.huellaEntradas
             )
         return None
 
@@ -36,7 +39,8 @@ class SqlAlchemySimulacionRepository(SimulacionRepository):
                 estado=EstadoSimulacion(s.estado),
                 tipoEstrategiaExcedentes=TipoEstrategiaExcedentes(s.tipoEstrategiaExcedentes),
                 idUsuario_creador=s.idUsuario_creador,
-                idComunidadEnergetica=s.idComunidadEnergetica
+                idComunidadEnergetica=s.idComunidadEnergetica,
+                huellaEntradas=s.huellaEntradas
             ) for s in simulaciones
         ]
 
@@ -55,7 +59,8 @@ class SqlAlchemySimulacionRepository(SimulacionRepository):
                 estado=EstadoSimulacion(s.estado),
                 tipoEstrategiaExcedentes=TipoEstrategiaExcedentes(s.tipoEstrategiaExcedentes),
                 idUsuario_creador=s.idUsuario_creador,
-                idComunidadEnergetica=s.idComunidadEnergetica
+                idComunidadEnergetica=s.idComunidadEnergetica,
+                huellaEntradas=s.huellaEntradas
             ) for s in simulaciones
         ]
 
@@ -74,7 +79,8 @@ class SqlAlchemySimulacionRepository(SimulacionRepository):
                 estado=EstadoSimulacion(s.estado),
                 tipoEstrategiaExcedentes=TipoEstrategiaExcedentes(s.tipoEstrategiaExcedentes),
                 idUsuario_creador=s.idUsuario_creador,
-                idComunidadEnergetica=s.idComunidadEnergetica
+                idComunidadEnergetica=s.idComunidadEnergetica,
+                huellaEntradas=s.huellaEntradas
             ) for s in simulaciones
         ]
 
@@ -87,7 +93,8 @@ class SqlAlchemySimulacionRepository(SimulacionRepository):
             estado=simulacion.estado.value,
             tipoEstrategiaExcedentes=simulacion.tipoEstrategiaExcedentes.value,
             idUsuario_creador=simulacion.idUsuario_creador,
-            idComunidadEnergetica=simulacion.idComunidadEnergetica
+            idComunidadEnergetica=simulacion.idComunidadEnergetica,
+            huellaEntradas=simulacion.huellaEntradas
         )
         self.db.add(db_simulacion)
         self.db.commit()
@@ -102,7 +109,8 @@ class SqlAlchemySimulacionRepository(SimulacionRepository):
             estado=EstadoSimulacion(db_simulacion.estado),
             tipoEstrategiaExcedentes=TipoEstrategiaExcedentes(db_simulacion.tipoEstrategiaExcedentes),
             idUsuario_creador=db_simulacion.idUsuario_creador,
-            idComunidadEnergetica=db_simulacion.idComunidadEnergetica
+            idComunidadEnergetica=db_simulacion.idComunidadEnergetica,
+            huellaEntradas=db_simulacion.huellaEntradas
         )
 
     def update(self, simulacion_id: int, simulacion: SimulacionEntity) -> SimulacionEntity:
@@ -131,7 +139,8 @@ class SqlAlchemySimulacionRepository(SimulacionRepository):
             estado=EstadoSimulacion(db_simulacion.estado),
             tipoEstrategiaExcedentes=TipoEstrategiaExcedentes(db_simulacion.tipoEstrategiaExcedentes),
             idUsuario_creador=db_simulacion.idUsuario_creador,
-            idComunidadEnergetica=db_simulacion.idComunidadEnergetica
+            idComunidadEnergetica=db_simulacion.idComunidadEnergetica,
+            huellaEntradas=db_simulacion.huellaEntradas
         )
 
     def update_estado(self, simulacion_id: int, estado: str) -> SimulacionEntity:
@@ -152,9 +161,46 @@ class SqlAlchemySimulacionRepository(SimulacionRepository):
             estado=EstadoSimulacion(db_simulacion.estado),
             tipoEstrategiaExcedentes=TipoEstrategiaExcedentes(db_simulacion.tipoEstrategiaExcedentes),
             idUsuario_creador=db_simulacion.idUsuario_creador,
-            idComunidadEnergetica=db_simulacion.idComunidadEnergetica
+            idComunidadEnergetica=db_simulacion.idComunidadEnergetica,
+            huellaEntradas=db_simulacion.huellaEntradas
         )
 
+    def update_estado_si(self, simulacion_id: int, estados_origen: List[str], estado: str,
+                         fecha_fin: Optional[datetime] = None) -> bool:
+        # Cambio de estado atómico: un único UPDATE condicionado al estado actual, así dos
+        # peticiones simultáneas no pueden pasar ambas la comprobación. fecha_fin (ampliación)
+        # solo se acepta si es posterior a la actual
+        consulta = self.db.query(Simulacion).filter(
+            Simulacion.idSimulacion == simulacion_id,
+            Simulacion.estado.in_(estados_origen)
+        )
+        valores = {Simulacion.estado: estado}
+        if fecha_fin is not None:
+            consulta = consulta.filter(Simulacion.fechaFin < fecha_fin)
+            valores[Simulacion.fechaFin] = fecha_fin
+        actualizadas = consulta.update(valores, synchronize_session=False)
+        self.db.commit()
+        return actualizadas == 1
+
+    def update_huella(self, simulacion_id: int, huella: Optional[str]) -> None:
+        self.db.query(Simulacion).filter(Simulacion.idSimulacion == simulacion_id).update(
+            {Simulacion.huellaEntradas: huella}, synchronize_session=False
+        )
+        self.db.commit()
+
+    def get_completada_by_huella(self, huella: str, excluir_id: Optional[int] = None) -> Optional[SimulacionEntity]:
+        # Simulación completada con resultados y las mismas entradas (la más reciente)
+        query = self.db.query(Simulacion).join(
+            ResultadoSimulacion, ResultadoSimulacion.idSimulacion == Simulacion.idSimulacion
+        ).filter(
+            Simulacion.huellaEntradas == huella,
+            Simulacion.estado == EstadoSimulacion.COMPLETADA.value
+        )
+        if excluir_id is not None:
+            query = query.filter(Simulacion.idSimulacion != excluir_id)
+        simulacion = query.order_by(Simulacion.idSimulacion.desc()).first()
+        return self.get_by_id(simulacion.idSimulacion) if simulacion else None
+
     def delete(self, simulacion_id: int) -> None:
         db_simulacion = self.db.query(Simulacion).filter(Simulacion.idSimulacion == simulacion_id).first()
         if db_simulacion:
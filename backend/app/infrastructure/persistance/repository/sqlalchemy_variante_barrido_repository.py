@@ -0,0 +1,61 @@
+import json
+from typing import List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.domain.entities.variante_barrido import VarianteBarridoEntity
+from app.domain.repositories.variante_barrido_repository import VarianteBarridoRepository
+from app.infrastructure.persistance.models.variante_barrido_tabla import VarianteBarrido
+
+class SqlAlchemyVarianteBarridoRepository(VarianteBarridoRepository):
+    
+    CAMPOS_METRICAS = (
+        'costeTotalEnergia_eur', 'ahorroTotal_eur', 'ingresoTotalExportacion_eur', 'paybackPeriod_anios',
+        'roi_pct', 'tasaAutoconsumoSCR_pct', 'tasaAutosuficienciaSSR_pct', 'energiaTotalImportada_kWh',
+        'energiaTotalExportada_kWh', 'reduccionCO2_kg'
+    )
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_by_barrido(self, barrido_id: int, ordenar_por: Optional[str] = None, descendente: bool = False) -> List[VarianteBarridoEntity]:
+        query = self.db.query(VarianteBarrido).filter(VarianteBarrido.idBarrido == barrido_id)
+        if ordenar_por in self.CAMPOS_METRICAS:
+            columna = getattr(VarianteBarrido, ordenar_por)
+            # Las variantes sin valor (p. ej. payback sin ahorro) van siempre al final
+            query = query.order_by(columna.is_(None), columna.desc() if descendente else columna.asc())
+        query = query.order_by(VarianteBarrido.indice.asc())
+        return [self._map_to_entity(v) for v in query.all()]
+    
+    def create_bulk(self, variantes: List[VarianteBarridoEntity]) -> int:
+        if not variantes:
+            return 0
+        filas = [
+            {
+                'idBarrido': v.idBarrido,
+                'indice': v.indice,
+                'parametros': json.dumps(v.parametros),
+                'mensajeError': v.mensajeError,
+                **{campo: getattr(v, campo) for campo in self.CAMPOS_METRICAS}
+            }
+            for v in variantes
+        ]
+        self.db.execute(insert(VarianteBarrido), filas)
+        self.db.commit()
+        return len(filas)
+    
+    def delete_by_barrido(self, barrido_id: int) -> int:
+        eliminadas = self.db.query(VarianteBarrido).filter(
+            VarianteBarrido.idBarrido == barrido_id
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return eliminadas
+    
+    def _map_to_entity(self, variante: VarianteBarrido) -> VarianteBarridoEntity:
+        return VarianteBarridoEntity(
+            idVariante=variante.idVariante,
+            idBarrido=variante.idBarrido,
+            indice=variante.indice,
+            parametros=json.loads(variante.parametros) if variante.parametros else None,
+            mensajeError=variante.mensajeError,
+            **{campo: getattr(variante, campo) for campo in self.CAMPOS_METRICAS}
+        )
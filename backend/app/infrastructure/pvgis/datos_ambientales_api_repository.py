@@ -2,17 +2,40 @@ import requests
 import logging
 import time
 import json
+import threading
+from concurrent.futures import Future
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, date, timezone
+from urllib.parse import urlparse
 
 from app.domain.repositories.datos_ambientales_repository import DatosAmbientalesRepository
 from app.domain.entities.datos_ambientales import DatosAmbientalesEntity
+from app.infrastructure.persistance.config import settings
+from app.infrastructure.pvgis.pvgis_cache import PvgisCache
 
 class DatosAmbientalesApiRepository(DatosAmbientalesRepository):
-    PVGIS_API_URL = "https://re.jrc.ec.europa.eu/api/v5_3/seriescalc"
+    PVGIS_API_URL = settings.PVGIS_API_URL
     DEFAULT_TIMEOUT = 180
     MAX_RETRIES = 3
     INITIAL_RETRY_DELAY = 5
+    MAX_PETICIONES_POR_HOST = settings.PVGIS_MAX_PETICIONES_POR_HOST
+
+    # Estado compartido por todas las instancias del proceso: peticiones idénticas
+    # en curso (se fusionan) y un semáforo por host para limitar la concurrencia
+    _peticiones_en_curso: Dict[str, Future] = {}
+    _semaforos_host: Dict[str, threading.BoundedSemaphore] = {}
+    _lock_compartido = threading.Lock()
+
+    def __init__(self, cache: Optional[PvgisCache] = None):
+        # Sin caché explícita se usa la caché en disco configurada en settings
+        if cache is None and settings.PVGIS_CACHE_ACTIVA:
+            cache = PvgisCache(
+                settings.PVGIS_CACHE_DIR,
+                ttl_segundos=settings.PVGIS_CACHE_TTL_DIAS * 24 * 3600,
+                tamano_maximo_bytes=int(settings.PVGIS_CACHE_MAX_MB * 1024 * 1024),
+                offline=settings.PVGIS_OFFLINE
+            )
+        self.cache = cache
 
     def get_datos_ambientales(
         self,
@@ -61,7 +84,16 @@ class DatosAmbientalesApiRepository(DatosAmbientalesRepository):
 
             # Extraer datos del registro
             try:
-                ghi = float(rec.get('G(h)', 0.0))  # Radiación global horizontal (Wh/m²)
+                # Con components=1 PVGIS devuelve directa/difusa/reflejada sobre el plano
+                # horizontal (Gb(i), Gd(i), Gr(i)) en lugar de la global
+                directa = float(rec['Gb(i)']) if 'Gb(i)' in rec else None
+                difusa = float(rec['Gd(i)']) if 'Gd(i)' in rec else None
+                if 'G(h)' in rec:
+                    ghi = float(rec['G(h)'])  # Radiación global horizontal (Wh/m²)
+                elif 'G(i)' in rec:
+                    ghi = float(rec['G(i)'])
+                else:
+                    ghi = (directa or 0.0) + (difusa or 0.0) + float(rec.get('Gr(i)', 0.0))
                 temp = float(rec.get('T2m', 20.0))  # Temperatura ambiente (°C)
                 wind = float(rec.get('WS10m', 0.0))  # Velocidad del viento (m/s)
             except (ValueError, TypeError) as e:
@@ -75,7 +107,9 @@ class DatosAmbientalesApiRepository(DatosAmbientalesRepository):
                 fuenteDatos="PVGIS",
                 radiacionGlobalHoriz_Wh_m2=ghi,
                 temperaturaAmbiente_C=temp,
-                velocidadViento_m_s=wind
+                velocidadViento_m_s=wind,
+                radiacionDirectaHoriz_Wh_m2=directa,
+                radiacionDifusaHoriz_Wh_m2=difusa
             ))
 
         logging.info(f"✓ PVGIS: Extraídos {len(resultados)} registros de datos ambientales "
@@ -257,17 +291,64 @@ class DatosAmbientalesApiRepository(DatosAmbientalesRepository):
                 if aspect is not None:
                     params['aspect'] = aspect
 
+        # Fusionar peticiones idénticas en vuelo: solo la primera llega a la red
+        clave = PvgisCache.calcular_clave(self.PVGIS_API_URL, params)
+        with self._lock_compartido:
+            futuro = self._peticiones_en_curso.get(clave)
+            es_propietario = futuro is None
+            if es_propietario:
+                futuro = Future()
+                self._peticiones_en_curso[clave] = futuro
+
+        if not es_propietario:
+            logging.info("Petición PVGIS idéntica ya en curso; esperando su resultado.")
+            return futuro.result()
+
+        try:
+            data = self._ejecutar_peticion(params)
+            futuro.set_result(data)
+            return data
+        except Exception as e:
+            futuro.set_exception(e)
+            raise
+        finally:
+            with self._lock_compartido:
+                self._peticiones_en_curso.pop(clave, None)
+
+    def _semaforo_host(self) -> threading.BoundedSemaphore:
+
+        host = urlparse(self.PVGIS_API_URL).netloc
+        with self._lock_compartido:
+            semaforo = self._semaforos_host.get(host)
+            if semaforo is None:
+                semaforo = threading.BoundedSemaphore(self.MAX_PETICIONES_POR_HOST)
+                self._semaforos_host[host] = semaforo
+        return semaforo
+
+    def _ejecutar_peticion(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+
+        # Consultar primero la caché local: misma petición, misma respuesta
+        if self.cache is not None:
+            datos_cache = self.cache.obtener(self.PVGIS_API_URL, params)
+            if datos_cache is not None:
+                logging.info("✓ Respuesta PVGIS obtenida de la caché local.")
+                return datos_cache
+            if self.cache.offline:
+                logging.error("Modo offline: la petición PVGIS no está en la caché local.")
+                return None
+
         # Lógica de petición con reintentos
         retry_delay = self.INITIAL_RETRY_DELAY
         for attempt in range(self.MAX_RETRIES):
             try:
                 logging.info(f"Solicitando datos a PVGIS (Intento {attempt+1}/{self.MAX_RETRIES})...")
                 
-                response = requests.get(
-                    self.PVGIS_API_URL,
-                    params=params,
-                    timeout=self.DEFAULT_TIMEOUT
-                )
+                with self._semaforo_host():
+                    response = requests.get(
+                        self.PVGIS_API_URL,
+                        params=params,
+                        timeout=self.DEFAULT_TIMEOUT
+                    )
                 
                 # Manejar errores HTTP
                 if response.status_code >= 400:
@@ -289,6 +370,11 @@ class DatosAmbientalesApiRepository(DatosAmbientalesRepository):
                     raise Exception(f"Errores internos de PVGIS: {error_msgs}")
                 
                 logging.info("✓ Respuesta correcta recibida de PVGIS.")
+                if self.cache is not None:
+                    try:
+                        self.cache.guardar(self.PVGIS_API_URL, params, data)
+                    except Exception as e:
+                        logging.warning(f"No se pudo guardar la respuesta PVGIS en la caché local: {e}")
                 return data
                 
             except requests.exceptions.Timeout:
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+class PvgisCache:
+
+    # Caché local de respuestas PVGIS direccionada por contenido: la clave es el
+    # hash SHA-256 de los parámetros canónicos de la petición y el valor es la
+    # respuesta JSON comprimida con zlib. Se guarda en una tabla SQLite para que
+    # varias simulaciones (y varios hilos) puedan compartirla.
+
+    NOMBRE_FICHERO = "pvgis_cache.sqlite3"
+
+    def __init__(
+        self,
+        directorio: str,
+        ttl_segundos: Optional[float] = 30 * 24 * 3600,
+        tamano_maximo_bytes: Optional[int] = 512 * 1024 * 1024,
+        offline: bool = False
+    ):
+        self.directorio = directorio
+        self.ttl_segundos = ttl_segundos
+        self.tamano_maximo_bytes = tamano_maximo_bytes
+        self.offline = offline
+        self.ruta = os.path.join(directorio, self.NOMBRE_FICHERO)
+        self._lock = threading.Lock()
+
+        self.aciertos = 0
+        self.fallos = 0
+
+        os.makedirs(directorio, exist_ok=True)
+        with self._conectar() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS PVGIS_RESPUESTA (
+                    clave TEXT PRIMARY KEY,
+                    parametros TEXT NOT NULL,
+                    datos BLOB NOT NULL,
+                    tamano INTEGER NOT NULL,
+                    creado REAL NOT NULL,
+                    ultimo_acceso REAL NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _conectar(self) -> Iterator[sqlite3.Connection]:
+
+        conn = sqlite3.connect(self.ruta, timeout=30)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def calcular_clave(url: str, params: Dict[str, Any]) -> str:
+
+        # Representación canónica: claves ordenadas y valores normalizados a texto
+        canonico = json.dumps(
+            {"url": url, "params": {k: str(v) for k, v in params.items()}},
+            sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(canonico.encode("utf-8")).hexdigest()
+
+    def obtener(self, url: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+
+        clave = self.calcular_clave(url, params)
+        ahora = time.time()
+
+        with self._lock, self._conectar() as conn:
+            fila = conn.execute(
+                "SELECT datos, creado FROM PVGIS_RESPUESTA WHERE clave = ?", (clave,)
+            ).fetchone()
+
+            if fila is None:
+                self.fallos += 1
+                return None
+
+            datos, creado = fila
+            # En modo offline se aceptan entradas caducadas: es mejor que no tener datos
+            if self.ttl_segundos is not None and ahora - creado > self.ttl_segundos and not self.offline:
+                conn.execute("DELETE FROM PVGIS_RESPUESTA WHERE clave = ?", (clave,))
+                self.fallos += 1
+                return None
+
+            conn.execute("UPDATE PVGIS_RESPUESTA SET ultimo_acceso = ? WHERE clave = ?", (ahora, clave))
+
+        try:
+            respuesta = json.loads(zlib.decompress(datos).decode("utf-8"))
+        except (zlib.error, ValueError) as e:
+            logging.warning(f"Entrada de caché PVGIS corrupta ({clave[:12]}): {e}. Se descarta.")
+            self.invalidar(url, params)
+            self.fallos += 1
+            return None
+
+        self.aciertos += 1
+        return respuesta
+
+    def guardar(self, url: str, params: Dict[str, Any], respuesta: Dict[str, Any]) -> None:
+
+        clave = self.calcular_clave(url, params)
+        datos = zlib.compress(json.dumps(respuesta, separators=(",", ":")).encode("utf-8"))
+        ahora = time.time()
+
+        with self._lock, self._conectar() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO PVGIS_RESPUESTA (clave, parametros, datos, tamano, creado, ultimo_acceso) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (clave, json.dumps(params, sort_keys=True, default=str), datos, len(datos), ahora, ahora)
+            )
+            self._purgar(conn, ahora)
+
+    def invalidar(self, url: str, params: Dict[str, Any]) -> None:
+
+        clave = self.calcular_clave(url, params)
+        with self._lock, self._conectar() as conn:
+            conn.execute("DELETE FROM PVGIS_RESPUESTA WHERE clave = ?", (clave,))
+
+    def limpiar(self) -> None:
+
+        with self._lock, self._conectar() as conn:
+            conn.execute("DELETE FROM PVGIS_RESPUESTA")
+
+    def tamano_total(self) -> int:
+
+        with self._conectar() as conn:
+            return conn.execute("SELECT COALESCE(SUM(tamano), 0) FROM PVGIS_RESPUESTA").fetchone()[0]
+
+    def _purgar(self, conn: sqlite3.Connection, ahora: float) -> None:
+
+        # 1. Entradas caducadas por TTL
+        if self.ttl_segundos is not None:
+            conn.execute("DELETE FROM PVGIS_RESPUESTA WHERE creado < ?", (ahora - self.ttl_segundos,))
+
+        # 2. Expulsión por tamaño: se eliminan las menos usadas recientemente
+        if self.tamano_maximo_bytes is None:
+            return
+
+        total = conn.execute("SELECT COALESCE(SUM(tamano), 0) FROM PVGIS_RESPUESTA").fetchone()[0]
+        if total <= self.tamano_maximo_bytes:
+            return
+
+        filas = conn.execute("SELECT clave, tamano FROM PVGIS_RESPUESTA ORDER BY ultimo_acceso ASC").fetchall()
+        for clave, tamano in filas:
+            if total <= self.tamano_maximo_bytes:
+                break
+            conn.execute("DELETE FROM PVGIS_RESPUESTA WHERE clave = ?", (clave,))
+            total -= tamano
+            logging.info(f"Caché PVGIS: expulsada entrada {clave[:12]} ({tamano} bytes) por límite de tamaño")
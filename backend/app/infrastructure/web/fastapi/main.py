@@ -12,6 +12,7 @@ from app.infrastructure.web.fastapi.routes import activo_almacenamiento_routes
 from app.infrastructure.web.fastapi.routes import coeficiente_reparto_routes
 from app.infrastructure.web.fastapi.routes import registro_consumo_routes
 from app.infrastructure.web.fastapi.routes import simulacion_routes
+from app.infrastructure.web.fastapi.routes import barrido_simulacion_routes
 from app.infrastructure.web.fastapi.routes import resultado_simulacion_routes
 from app.infrastructure.web.fastapi.routes import datos_ambientales_routes
 from app.infrastructure.web.fastapi.routes import resultado_simulacion_activo_almacenamiento_routes
@@ -19,6 +20,7 @@ from app.infrastructure.web.fastapi.routes import resultado_simulacion_participa
 from app.infrastructure.web.fastapi.routes import resultado_simulacion_activo_generacion_routes
 from app.infrastructure.web.fastapi.routes import datos_intervalo_participante_routes
 from app.infrastructure.web.fastapi.routes import datos_intervalo_activo_routes
+from app.infrastructure.worker.importacion_comunidad_worker import marcar_importaciones_interrumpidas
 from fastapi.middleware.cors import CORSMiddleware
 
 # Configurar logging
@@ -69,6 +71,10 @@ def read_root():
 def health_check():
     return {"status": "ok"}
 
+@app.on_event("startup")
+def revisar_importaciones_interrumpidas():
+    marcar_importaciones_interrumpidas()
+
 app.include_router(comunidad_energetica_routes.router)
 app.include_router(usuario_routes.router)
 app.include_router(participante_routes.router)
@@ -78,6 +84,7 @@ app.include_router(activo_almacenamiento_routes.router)
 app.include_router(coeficiente_reparto_routes.router)
 app.include_router(registro_consumo_routes.router)
 app.include_router(simulacion_routes.router)
+app.include_router(barrido_simulacion_routes.router)
 app.include_router(resultado_simulacion_routes.router)
 app.include_router(datos_ambientales_routes.router)
 app.include_router(resultado_simulacion_activo_almacenamiento_routes.router)
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.infrastructure.persistance.database import get_db
+from app.infrastructure.persistance.config import settings
+from app.interfaces.schemas_barrido_simulacion import (
+    BarridoSimulacionCreate,
+    BarridoSimulacionResponse,
+    VarianteBarridoResponse,
+)
+from app.interfaces.schemas_simulacion_job import SimulacionJobResponse
+from app.domain.entities.barrido_simulacion import BarridoSimulacionEntity
+from app.domain.use_cases.barrido_simulacion.create_barrido_simulacion import crear_barrido_simulacion_use_case
+from app.domain.use_cases.barrido_simulacion.get_barrido_simulacion import mostrar_barrido_simulacion_use_case
+from app.domain.use_cases.barrido_simulacion.cancelar_barrido_simulacion import cancelar_barrido_simulacion_use_case
+from app.domain.use_cases.simulacion.get_simulacion import mostrar_simulacion_use_case
+from app.domain.use_cases.simulacion.motor_simulacion.plan_coeficientes import PlanCoeficientesReparto
+from app.infrastructure.persistance.repository.sqlalchemy_simulacion_repository import SqlAlchemySimulacionRepository
+from app.infrastructure.persistance.repository.sqlalchemy_participante_repository import SqlAlchemyParticipanteRepository
+from app.infrastructure.persistance.repository.sqlalchemy_coeficiente_reparto_repository import SqlAlchemyCoeficienteRepartoRepository
+from app.infrastructure.persistance.repository.sqlalchemy_simulacion_job_repository import SqlAlchemySimulacionJobRepository
+from app.infrastructure.persistance.repository.sqlalchemy_barrido_simulacion_repository import SqlAlchemyBarridoSimulacionRepository
+from app.infrastructure.persistance.repository.sqlalchemy_variante_barrido_repository import SqlAlchemyVarianteBarridoRepository
+
+router = APIRouter(prefix="/simulaciones", tags=["barridos"])
+
+@router.post("/{id_simulacion}/barridos", status_code=202, response_model=BarridoSimulacionResponse)
+def crear_barrido_simulacion(id_simulacion: int, barrido: BarridoSimulacionCreate, prioridad: int = 0, db: Session = Depends(get_db)):
+    # Un único trabajo en la cola evalúa todas las variantes de la rejilla
+    simulacion_repo = SqlAlchemySimulacionRepository(db)
+    simulacion = mostrar_simulacion_use_case(id_simulacion, simulacion_repo)
+    
+    participantes = SqlAlchemyParticipanteRepository(db).get_by_comunidad(simulacion.idComunidadEnergetica)
+    coeficiente_repo = SqlAlchemyCoeficienteRepartoRepository(db)
+    plan_coeficientes = PlanCoeficientesReparto.compilar(
+        {p.idParticipante: coeficiente_repo.get_by_participante(p.idParticipante) for p in participantes},
+        [p.idParticipante for p in participantes]
+    )
+    
+    barrido_entity = BarridoSimulacionEntity(
+        nombre=barrido.nombre,
+        parametros=barrido.model_dump(mode="json", exclude={"nombre"})
+    )
+    return crear_barrido_simulacion_use_case(
+        id_simulacion, barrido_entity, prioridad, settings.BARRIDO_MAX_VARIANTES, plan_coeficientes,
+        simulacion_repo, SqlAlchemyBarridoSimulacionRepository(db), SqlAlchemySimulacionJobRepository(db)
+    )
+
+@router.get("/{id_simulacion}/barridos", response_model=List[BarridoSimulacionResponse])
+def listar_barridos_simulacion(id_simulacion: int, db: Session = Depends(get_db)):
+    return SqlAlchemyBarridoSimulacionRepository(db).list_by_simulacion(id_simulacion)
+
+@router.get("/barridos/{id_barrido}", response_model=BarridoSimulacionResponse)
+def obtener_barrido_simulacion(id_barrido: int, db: Session = Depends(get_db)):
+    return mostrar_barrido_simulacion_use_case(id_barrido, SqlAlchemyBarridoSimulacionRepository(db))
+
+@router.get("/barridos/{id_barrido}/variantes", response_model=List[VarianteBarridoResponse])
+def listar_variantes_barrido(id_barrido: int, ordenar_por: Optional[str] = None, descendente: bool = False, db: Session = Depends(get_db)):
+    # ordenar_por admite cualquiera de las métricas (p. ej. ahorroTotal_eur); por defecto, orden de la rejilla
+    mostrar_barrido_simulacion_use_case(id_barrido, SqlAlchemyBarridoSimulacionRepository(db))
+    return SqlAlchemyVarianteBarridoRepository(db).get_by_barrido(id_barrido, ordenar_por, descendente)
+
+@router.get("/barridos/{id_barrido}/job", response_model=SimulacionJobResponse)
+def obtener_job_barrido(id_barrido: int, db: Session = Depends(get_db)):
+    mostrar_barrido_simulacion_use_case(id_barrido, SqlAlchemyBarridoSimulacionRepository(db))
+    return SqlAlchemySimulacionJobRepository(db).get_ultimo_by_barrido(id_barrido)
+
+@router.post("/barridos/{id_barrido}/cancelar", response_model=SimulacionJobResponse)
+def cancelar_barrido_simulacion(id_barrido: int, db: Session = Depends(get_db)):
+    return cancelar_barrido_simulacion_use_case(
+        id_barrido, SqlAlchemyBarridoSimulacionRepository(db), SqlAlchemySimulacionJobRepository(db)
+    )
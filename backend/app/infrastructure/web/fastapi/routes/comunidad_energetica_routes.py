@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 import os
 import shutil
 from datetime import datetime
 import logging
-import asyncio
 import tempfile
+from urllib.parse import quote
 
 from app.interfaces.schemas_comunidad_energetica import ComunidadEnergeticaCreate, ComunidadEnergeticaRead, ComunidadEnergeticaUpdate
 from app.infrastructure.persistance.database import get_db
@@ -17,8 +18,13 @@ from app.domain.use_cases.comunidad_energetica.mostrar_comunidad_energetica impo
 from app.domain.use_cases.comunidad_energetica.modificar_comunidad_energetica import modificar_comunidad_energetica_use_case
 from app.domain.use_cases.comunidad_energetica.eliminar_comunidad_energetica import eliminar_comunidad_energetica_use_case
 from app.domain.use_cases.comunidad_energetica.exportar_comunidad_completa import exportar_comunidad_completa_use_case
-from app.domain.use_cases.comunidad_energetica.importar_comunidad_completa import importar_comunidad_completa_use_case
+from app.domain.use_cases.comunidad_energetica.importar_comunidad_completa import importar_comunidad_completa_use_case, resumen_importacion
+from app.infrastructure.persistance.config import settings
+from app.infrastructure.persistance.database import SessionLocal
 from app.infrastructure.persistance.repository.sqlalchemy_comunidad_energetica_repository import SqlAlchemyComunidadEnergeticaRepository
+from app.infrastructure.persistance.repository.sqlalchemy_importacion_comunidad_job_repository import SqlAlchemyImportacionComunidadJobRepository
+from app.infrastructure.worker.importacion_comunidad_worker import lanzar_importacion
+from app.interfaces.schemas_importacion_comunidad_job import ImportacionComunidadJobResponse
 
 # Configurar logger
 logger = logging.getLogger(__name__)
@@ -115,52 +121,30 @@ async def exportar_comunidad_completa(
         
         logger.info("Llamando al caso de uso de exportación")
         
-        # Ejecutar exportación
-        ruta_zip, metadatos = exportar_comunidad_completa_use_case(
+        # Ejecutar exportación: valida y recopila los metadatos; el ZIP se genera al enviarlo
+        nombre_archivo, metadatos, contenido_zip = await run_in_threadpool(
+            exportar_comunidad_completa_use_case,
             comunidad_id=id_comunidad,
             db=db,
             fecha_inicio=fecha_inicio_dt,
             fecha_fin=fecha_fin_dt
         )
         
-        logger.info(f"Exportación completada. Archivo generado: {ruta_zip}")
-        
-        # Verificar que el archivo existe
-        if not os.path.exists(ruta_zip):
-            logger.error(f"El archivo ZIP no existe: {ruta_zip}")
-            raise HTTPException(status_code=500, detail="Error: archivo ZIP no generado")
-        
-        # Obtener información del archivo
-        nombre_archivo = os.path.basename(ruta_zip)
-        tamaño_archivo = os.path.getsize(ruta_zip)
-        
-        logger.info(f"Archivo listo para descarga: {nombre_archivo} ({tamaño_archivo} bytes)")
-        
-        # Guardar la ruta del directorio para limpiar después
-        parent_dir = os.path.dirname(ruta_zip)
-        
-        # Crear response que descargue el archivo
-        response = FileResponse(
-            path=ruta_zip,
-            filename=nombre_archivo,
-            media_type='application/zip'
+        logger.info(f"Exportación preparada: {nombre_archivo} ({metadatos['total_participantes']} participantes)")
+        
+        # Sin ficheros temporales: el ZIP se comprime y se envía por trozos. El nombre lleva
+        # el de la comunidad, que puede tener caracteres fuera de latin-1 (RFC 5987)
+        nombre_codificado = quote(nombre_archivo)
+        if nombre_codificado != nombre_archivo:
+            disposicion = f"attachment; filename*=utf-8''{nombre_codificado}"
+        else:
+            disposicion = f'attachment; filename="{nombre_archivo}"'
+        return StreamingResponse(
+            contenido_zip,
+            media_type='application/zip',
+            headers={"Content-Disposition": disposicion}
         )
         
-        # Programar limpieza en background (sin await)
-        async def cleanup_background():
-            try:
-                # Esperar un poco antes de limpiar para asegurar que la descarga termine
-                await asyncio.sleep(2)
-                logger.info(f"Limpiando directorio temporal: {parent_dir}")
-                shutil.rmtree(parent_dir, ignore_errors=True)
-            except Exception as e:
-                logger.error(f"Error limpiando archivos temporales: {e}")
-        
-        # Ejecutar limpieza en background sin bloquear la respuesta
-        asyncio.create_task(cleanup_background())
-        
-        return response
-        
     except ValueError as e:
         logger.error(f"Error de validación: {e}")
         raise HTTPException(status_code=404, detail=str(e))
@@ -195,11 +179,14 @@ async def importar_comunidad_completa(
         logger.info(f"Archivo ZIP guardado temporalmente en: {temp_zip_path}")
         logger.info(f"Tamaño del archivo: {len(content)} bytes")
         
-        # Ejecutar importación
-        resultado = importar_comunidad_completa_use_case(
+        # Ejecutar importación (fuera del bucle de eventos; los consumos se cargan en paralelo)
+        resultado = await run_in_threadpool(
+            importar_comunidad_completa_use_case,
             archivo_zip_path=temp_zip_path,
             db=db,
-            id_usuario=id_usuario
+            id_usuario=id_usuario,
+            crear_sesion=SessionLocal,
+            hilos=settings.IMPORTACION_HILOS
         )
         
         logger.info("Importación completada exitosamente")
@@ -208,16 +195,7 @@ async def importar_comunidad_completa(
         response_data = {
             "success": True,
             "message": "Importación completada exitosamente",
-            "estadisticas": {
-                "comunidad_nombre": resultado['comunidad_creada'].nombre if resultado['comunidad_creada'] else None,
-                "comunidad_id": resultado['comunidad_creada'].idComunidadEnergetica if resultado['comunidad_creada'] else None,
-                "participantes_creados": resultado['participantes_creados'],
-                "activos_generacion_creados": resultado['activos_generacion_creados'],
-                "activos_almacenamiento_creados": resultado['activos_almacenamiento_creados'],
-                "coeficientes_creados": resultado['coeficientes_creados'],
-                "contratos_creados": resultado['contratos_creados'],
-                "registros_consumo_creados": resultado['registros_consumo_creados']
-            }
+            "estadisticas": resumen_importacion(resultado)
         }
         
         return response_data
@@ -235,4 +213,33 @@ async def importar_comunidad_completa(
             except Exception as e:
                 logger.error(f"Error eliminando archivo temporal: {e}")
 
+@router.post("/importaciones", status_code=202, response_model=ImportacionComunidadJobResponse)
+def encolar_importacion_comunidad(
+    file: UploadFile = File(..., description="Archivo ZIP con datos de la comunidad"),
+    id_usuario: int = Query(..., description="ID del usuario que realiza la importación"),
+    db: Session = Depends(get_db)
+):
+    # Importación en segundo plano: responde en cuanto el ZIP está guardado y el avance se
+    # consulta en GET /comunidades/importaciones/{id_importacion}
+    if not file.filename.endswith('.zip'):
+        raise HTTPException(status_code=400, detail="El archivo debe ser un ZIP")
+    
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_file:
+        temp_zip_path = temp_file.name
+        shutil.copyfileobj(file.file, temp_file)
+    
+    try:
+        job = SqlAlchemyImportacionComunidadJobRepository(db).crear(id_usuario, file.filename)
+    except Exception:
+        os.unlink(temp_zip_path)
+        raise
+    lanzar_importacion(job.idImportacion, temp_zip_path, id_usuario)
+    logger.info(f"Importación {job.idImportacion} encolada para usuario {id_usuario}: {file.filename}")
+    return job
 
+@router.get("/importaciones/{id_importacion}", response_model=ImportacionComunidadJobResponse)
+def obtener_importacion_comunidad(id_importacion: int, db: Session = Depends(get_db)):
+    job = SqlAlchemyImportacionComunidadJobRepository(db).get_by_id(id_importacion)
+    if not job:
+        raise HTTPException(status_code=404, detail="Importación no encontrada")
+    return job
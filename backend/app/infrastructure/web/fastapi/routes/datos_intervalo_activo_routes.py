@@ -1,7 +1,7 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import date, datetime
 
 from app.domain.entities.datos_intervalo_activo import DatosIntervaloActivoEntity
 from app.domain.use_cases.datos_intervalo_activo.get_datos_intervalo_activo_by_id import get_datos_intervalo_activo_by_id_use_case
@@ -11,12 +11,21 @@ from app.domain.use_cases.datos_intervalo_activo.get_datos_intervalo_activo_by_r
 )
 from app.domain.use_cases.datos_intervalo_activo.get_datos_intervalo_activo_by_timestamp_range import get_datos_intervalo_activo_by_timestamp_range_use_case
 from app.domain.use_cases.datos_intervalo_activo.create_bulk_datos_intervalo_activo import create_bulk_datos_intervalo_activo_use_case
+from app.domain.use_cases.datos_intervalo_activo.get_pagina_datos_intervalo_activo import get_pagina_datos_intervalo_activo_use_case
+from app.domain.use_cases.datos_intervalo_activo.get_series_datos_intervalo_activo import get_series_datos_intervalo_activo_use_case
+from app.domain.use_cases.datos_intervalo_activo.get_agregados_datos_intervalo_activo import get_agregados_datos_intervalo_activo_use_case
+from app.domain.use_cases.paginacion_intervalos import LIMITE_PAGINA_DEFECTO
+from app.domain.use_cases.series_intervalos import ANCHO_DEFECTO
 from app.domain.repositories.datos_intervalo_activo_repository import DatosIntervaloActivoRepository
 from app.infrastructure.persistance.database import get_db
 from app.infrastructure.persistance.repository.sqlalchemy_datos_intervalo_activo_repository import SqlAlchemyDatosIntervaloActivoRepository
+from app.infrastructure.persistance.repository.sqlalchemy_agregado_intervalo_activo_repository import SqlAlchemyAgregadoIntervaloActivoRepository
 from app.interfaces.schemas_datos_intervalo_activo import (
     DatosIntervaloActivoRead,
-    DatosIntervaloActivoBulkCreate
+    DatosIntervaloActivoBulkCreate,
+    PaginaDatosIntervaloActivoRead,
+    SerieDatosIntervaloActivoRead,
+    SerieAgregadaActivoRead
 )
 
 router = APIRouter(
@@ -61,6 +70,80 @@ def get_datos_by_activo_almacenamiento(
         return get_datos_intervalo_activo_by_timestamp_range_use_case(resultado_activo_alm_id, False, start_time, end_time, repo)
     return get_datos_intervalo_activo_by_resultado_activo_alm_id_use_case(resultado_activo_alm_id, repo)
 
+@router.get("/activo-generacion/{resultado_activo_gen_id}/paginado", response_model=PaginaDatosIntervaloActivoRead)
+def get_pagina_datos_by_activo_generacion(
+    resultado_activo_gen_id: int,
+    fields: Optional[str] = Query(None, description="Campos separados por comas (por defecto, todos)"),
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    cursor: Optional[str] = Query(None, description="siguienteCursor de la página anterior"),
+    limit: int = Query(LIMITE_PAGINA_DEFECTO, description="Intervalos por página"),
+    db: Session = Depends(get_db)
+):
+    repo = SqlAlchemyDatosIntervaloActivoRepository(db)
+    return get_pagina_datos_intervalo_activo_use_case(resultado_activo_gen_id, True, fields, start_time, end_time, cursor, limit, repo)
+
+@router.get("/activo-almacenamiento/{resultado_activo_alm_id}/paginado", response_model=PaginaDatosIntervaloActivoRead)
+def get_pagina_datos_by_activo_almacenamiento(
+    resultado_activo_alm_id: int,
+    fields: Optional[str] = Query(None, description="Campos separados por comas (por defecto, todos)"),
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    cursor: Optional[str] = Query(None, description="siguienteCursor de la página anterior"),
+    limit: int = Query(LIMITE_PAGINA_DEFECTO, description="Intervalos por página"),
+    db: Session = Depends(get_db)
+):
+    repo = SqlAlchemyDatosIntervaloActivoRepository(db)
+    return get_pagina_datos_intervalo_activo_use_case(resultado_activo_alm_id, False, fields, start_time, end_time, cursor, limit, repo)
+
+@router.get("/activo-generacion/{resultado_activo_gen_id}/series", response_model=List[SerieDatosIntervaloActivoRead])
+def get_series_datos_by_activo_generacion(
+    resultado_activo_gen_id: int,
+    fields: Optional[str] = Query(None, description="Campos numéricos separados por comas (por defecto, todos)"),
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    width: int = Query(ANCHO_DEFECTO, description="Ancho del gráfico en píxeles: puntos máximos por serie"),
+    method: str = Query('lttb', description="Reducción: lttb o minmax"),
+    db: Session = Depends(get_db)
+):
+    repo = SqlAlchemyDatosIntervaloActivoRepository(db)
+    return get_series_datos_intervalo_activo_use_case(resultado_activo_gen_id, True, fields, start_time, end_time, width, method, repo)
+
+@router.get("/activo-almacenamiento/{resultado_activo_alm_id}/series", response_model=List[SerieDatosIntervaloActivoRead])
+def get_series_datos_by_activo_almacenamiento(
+    resultado_activo_alm_id: int,
+    fields: Optional[str] = Query(None, description="Campos numéricos separados por comas (por defecto, todos)"),
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    width: int = Query(ANCHO_DEFECTO, description="Ancho del gráfico en píxeles: puntos máximos por serie"),
+    method: str = Query('lttb', description="Reducción: lttb o minmax"),
+    db: Session = Depends(get_db)
+):
+    repo = SqlAlchemyDatosIntervaloActivoRepository(db)
+    return get_series_datos_intervalo_activo_use_case(resultado_activo_alm_id, False, fields, start_time, end_time, width, method, repo)
+
+@router.get("/activo-generacion/{resultado_activo_gen_id}/agregados", response_model=SerieAgregadaActivoRead)
+def get_agregados_datos_by_activo_generacion(
+    resultado_activo_gen_id: int,
+    granularity: str = Query('mes', description="Periodo: dia, semana, mes o anio"),
+    start_date: Optional[date] = Query(None, description="Primer día incluido"),
+    end_date: Optional[date] = Query(None, description="Último día incluido"),
+    db: Session = Depends(get_db)
+):
+    repo = SqlAlchemyAgregadoIntervaloActivoRepository(db)
+    return get_agregados_datos_intervalo_activo_use_case(resultado_activo_gen_id, True, granularity, start_date, end_date, repo)
+
+@router.get("/activo-almacenamiento/{resultado_activo_alm_id}/agregados", response_model=SerieAgregadaActivoRead)
+def get_agregados_datos_by_activo_almacenamiento(
+    resultado_activo_alm_id: int,
+    granularity: str = Query('mes', description="Periodo: dia, semana, mes o anio"),
+    start_date: Optional[date] = Query(None, description="Primer día incluido"),
+    end_date: Optional[date] = Query(None, description="Último día incluido"),
+    db: Session = Depends(get_db)
+):
+    repo = SqlAlchemyAgregadoIntervaloActivoRepository(db)
+    return get_agregados_datos_intervalo_activo_use_case(resultado_activo_alm_id, False, granularity, start_date, end_date, repo)
+
 @router.get("/", response_model=List[DatosIntervaloActivoRead])
 def list_datos_intervalo(
     skip: int = 0, 
@@ -1,18 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 from app.infrastructure.persistance.database import get_db
 from app.infrastructure.persistance.repository.sqlalchemy_datos_intervalo_participante_repository import SqlAlchemyDatosIntervaloParticipanteRepository
+from app.infrastructure.persistance.repository.sqlalchemy_agregado_intervalo_participante_repository import SqlAlchemyAgregadoIntervaloParticipanteRepository
 from app.domain.entities.datos_intervalo_participante import DatosIntervaloParticipanteEntity
 from app.domain.use_cases.datos_intervalo_participante.create_bulk_datos_intervalo_participante import create_bulk_datos_intervalo_participante_use_case
 from app.domain.use_cases.datos_intervalo_participante.get_datos_intervalo_participante_by_id import get_datos_intervalo_participante_by_id_use_case
 from app.domain.use_cases.datos_intervalo_participante.get_datos_intervalo_participante_by_resultado_id import get_datos_intervalo_participante_by_resultado_id_use_case
 from app.domain.use_cases.datos_intervalo_participante.get_datos_intervalo_participante_by_timestamp_range import get_datos_intervalo_participante_by_timestamp_range_use_case
+from app.domain.use_cases.datos_intervalo_participante.get_pagina_datos_intervalo_participante import get_pagina_datos_intervalo_participante_use_case
+from app.domain.use_cases.datos_intervalo_participante.get_series_datos_intervalo_participante import get_series_datos_intervalo_participante_use_case
+from app.domain.use_cases.datos_intervalo_participante.get_agregados_datos_intervalo_participante import get_agregados_datos_intervalo_participante_use_case
+from app.domain.use_cases.paginacion_intervalos import LIMITE_PAGINA_DEFECTO
+from app.domain.use_cases.series_intervalos import ANCHO_DEFECTO
 from app.interfaces.schemas_datos_intervalo_participante import (
     DatosIntervaloParticipanteRead,
     DatosIntervaloParticipanteCreate,
-    DatosIntervaloParticipanteBulkCreate
+    DatosIntervaloParticipanteBulkCreate,
+    PaginaDatosIntervaloParticipanteRead,
+    SerieDatosIntervaloParticipanteRead,
+    SerieAgregadaParticipanteRead
 )
 
 router = APIRouter(
@@ -38,6 +47,43 @@ def get_datos_by_resultado_participante(
         return get_datos_intervalo_participante_by_timestamp_range_use_case(resultado_participante_id, start_time, end_time, repo)
     return get_datos_intervalo_participante_by_resultado_id_use_case(resultado_participante_id, repo)
 
+@router.get("/resultado-participante/{resultado_participante_id}/paginado", response_model=PaginaDatosIntervaloParticipanteRead)
+def get_pagina_datos_by_resultado_participante(
+    resultado_participante_id: int,
+    fields: Optional[str] = Query(None, description="Campos separados por comas (por defecto, todos)"),
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    cursor: Optional[str] = Query(None, description="siguienteCursor de la página anterior"),
+    limit: int = Query(LIMITE_PAGINA_DEFECTO, description="Intervalos por página"),
+    db: Session = Depends(get_db)
+):
+    repo = SqlAlchemyDatosIntervaloParticipanteRepository(db)
+    return get_pagina_datos_intervalo_participante_use_case(resultado_participante_id, fields, start_time, end_time, cursor, limit, repo)
+
+@router.get("/resultado-participante/{resultado_participante_id}/series", response_model=List[SerieDatosIntervaloParticipanteRead])
+def get_series_datos_by_resultado_participante(
+    resultado_participante_id: int,
+    fields: Optional[str] = Query(None, description="Campos numéricos separados por comas (por defecto, todos)"),
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    width: int = Query(ANCHO_DEFECTO, description="Ancho del gráfico en píxeles: puntos máximos por serie"),
+    method: str = Query('lttb', description="Reducción: lttb o minmax"),
+    db: Session = Depends(get_db)
+):
+    repo = SqlAlchemyDatosIntervaloParticipanteRepository(db)
+    return get_series_datos_intervalo_participante_use_case(resultado_participante_id, fields, start_time, end_time, width, method, repo)
+
+@router.get("/resultado-participante/{resultado_participante_id}/agregados", response_model=SerieAgregadaParticipanteRead)
+def get_agregados_datos_by_resultado_participante(
+    resultado_participante_id: int,
+    granularity: str = Query('mes', description="Periodo: dia, semana, mes o anio"),
+    start_date: Optional[date] = Query(None, description="Primer día incluido"),
+    end_date: Optional[date] = Query(None, description="Último día incluido"),
+    db: Session = Depends(get_db)
+):
+    repo = SqlAlchemyAgregadoIntervaloParticipanteRepository(db)
+    return get_agregados_datos_intervalo_participante_use_case(resultado_participante_id, granularity, start_date, end_date, repo)
+
 @router.post("/bulk", response_model=List[DatosIntervaloParticipanteRead], status_code=status.HTTP_201_CREATED)
 def create_many_datos_intervalo(
     bulk_datos: DatosIntervaloParticipanteBulkCreate,
@@ -2,9 +2,6 @@ from fastapi import APIRouter, Depends, status, Query, File, UploadFile, Form, B
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 from datetime import datetime
-import json
-import csv
-import io
 from pydantic import BaseModel
 
 from app.infrastructure.persistance.database import get_db
@@ -21,7 +18,7 @@ from app.domain.use_cases.registro_consumo.mostrar_registro_consumo import mostr
 from app.domain.use_cases.registro_consumo.modificar_registro_consumo import modificar_registro_consumo_use_case
 from app.domain.use_cases.registro_consumo.eliminar_registro_consumo import eliminar_registro_consumo_use_case
 from app.domain.use_cases.registro_consumo.eliminar_todos_registros_participante import eliminar_todos_registros_participante_use_case
-from app.domain.use_cases.registro_consumo.importar_registros_consumo import importar_registros_consumo_use_case
+from app.domain.use_cases.registro_consumo.importar_registros_consumo_csv import importar_registros_consumo_csv_use_case
 from app.domain.use_cases.registro_consumo.listar_registros_consumo import (
     listar_registros_consumo_by_participante_use_case,
     listar_registros_consumo_by_periodo_use_case,
@@ -61,37 +58,13 @@ def importar_registros_consumo(
         raise HTTPException(status_code=400, detail="El archivo debe tener extensión .csv")
     
     try:
-        # Leer el contenido del archivo
-        contenido = archivo_csv.file.read().decode('utf-8')
-        csv_reader = csv.DictReader(io.StringIO(contenido))
-        
-        # Convertir CSV a lista de diccionarios
-        datos = []
-        for fila in csv_reader:
-            if 'timestamp' not in fila or 'consumoEnergia' not in fila:
-                raise HTTPException(
-                    status_code=400, 
-                    detail="El CSV debe contener las columnas 'timestamp' y 'consumoEnergia'"
-                )
-            
-            # Normalizar el formato de timestamp si es necesario
-            timestamp = fila['timestamp'].strip()
-            if ' ' in timestamp and 'T' not in timestamp:
-                timestamp = timestamp.replace(' ', 'T')
-            
-            datos.append({
-                'timestamp': timestamp,
-                'consumoEnergia': float(fila['consumoEnergia'])
-            })
-        
-        if not datos:
-            raise HTTPException(status_code=400, detail="El archivo CSV está vacío o no contiene datos válidos")
-        
+        # El CSV se procesa por bloques directamente desde el fichero subido
         participante_repo = SqlAlchemyParticipanteRepository(db)
         registro_repo = SqlAlchemyRegistroConsumoRepository(db)
-        datos_json = json.dumps(datos)
-        return importar_registros_consumo_use_case(datos_json, id_participante, participante_repo, registro_repo)
+        return importar_registros_consumo_csv_use_case(archivo_csv.file, id_participante, participante_repo, registro_repo)
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Error en el formato de los datos: {str(e)}")
     except Exception as e:
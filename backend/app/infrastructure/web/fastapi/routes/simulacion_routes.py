@@ -1,25 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app.infrastructure.persistance.database import get_db
+from app.infrastructure.persistance.database import get_db, SessionLocal
+from app.infrastructure.persistance.config import settings
 from app.interfaces.schemas_simulacion import (
     SimulacionCreate,
     SimulacionResponse,
     SimulacionUpdate,
+    SimulacionAmpliacion,
 )
 from app.domain.entities.simulacion import SimulacionEntity, EstadoSimulacion, TipoEstrategiaExcedentes
 from app.domain.use_cases.simulacion.create_simulacion import crear_simulacion_use_case
 from app.domain.use_cases.simulacion.get_simulacion import mostrar_simulacion_use_case
 from app.domain.use_cases.simulacion.list_simulaciones import listar_simulaciones_use_case, listar_simulaciones_por_comunidad_use_case, listar_simulaciones_por_usuario_use_case
-from app.domain.use_cases.simulacion.update_simulacion import modificar_simulacion_use_case, actualizar_estado_simulacion_use_case
+from app.domain.use_cases.simulacion.update_simulacion import modificar_simulacion_use_case
 from app.domain.use_cases.simulacion.delete_simulacion import eliminar_simulacion_use_case
-from app.domain.use_cases.simulacion.motor_simulacion.motor_simulacion import MotorSimulacion
+from app.domain.use_cases.simulacion.encolar_simulacion import encolar_simulacion_use_case
+from app.domain.use_cases.simulacion.ampliar_simulacion import ampliar_simulacion_use_case
+from app.domain.use_cases.simulacion.cancelar_simulacion import cancelar_simulacion_use_case
+from app.domain.use_cases.simulacion.exportar_intervalos_simulacion import (
+    preparar_exportacion_intervalos_use_case,
+    generar_exportacion,
+    TAMANO_BLOQUE_EXPORTACION,
+)
+from app.domain.use_cases.simulacion.motor_simulacion.plan_coeficientes import PlanCoeficientesReparto
 from app.infrastructure.persistance.repository.sqlalchemy_simulacion_repository import SqlAlchemySimulacionRepository
+from app.infrastructure.persistance.repository.sqlalchemy_participante_repository import SqlAlchemyParticipanteRepository
+from app.infrastructure.persistance.repository.sqlalchemy_coeficiente_reparto_repository import SqlAlchemyCoeficienteRepartoRepository
+from app.infrastructure.persistance.repository.sqlalchemy_simulacion_job_repository import SqlAlchemySimulacionJobRepository
+from app.interfaces.schemas_simulacion_job import SimulacionJobResponse
+from app.domain.entities.simulacion_job import EstadoJob
 from typing import List
+import asyncio
+import json
 import time
-from app.interfaces.schemas_resultado_simulacion import ResultadoSimulacionCreate
-from app.domain.entities.resultado_simulacion import ResultadoSimulacionEntity
 from app.infrastructure.persistance.repository.sqlalchemy_resultado_simulacion_repository import SqlAlchemyResultadoSimulacionRepository
-from app.domain.entities.estado_simulacion import EstadoSimulacion
+from app.infrastructure.persistance.repository.sqlalchemy_datos_intervalo_participante_repository import SqlAlchemyDatosIntervaloParticipanteRepository
+from app.infrastructure.persistance.repository.sqlalchemy_datos_intervalo_activo_repository import SqlAlchemyDatosIntervaloActivoRepository
 
 router = APIRouter(prefix="/simulaciones", tags=["simulaciones"])
 
@@ -82,8 +100,8 @@ def eliminar_simulacion(id_simulacion: int, db: Session = Depends(get_db)):
     repo = SqlAlchemySimulacionRepository(db)
     return eliminar_simulacion_use_case(id_simulacion, repo)
 
-@router.post("/{id_simulacion}/ejecutar", status_code=202)
-def ejecutar_simulacion(id_simulacion: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+@router.post("/{id_simulacion}/ejecutar", status_code=202, response_model=SimulacionJobResponse)
+def ejecutar_simulacion(id_simulacion: int, prioridad: int = 0, db: Session = Depends(get_db)):
     # Verificar que la simulación existe
     repo = SqlAlchemySimulacionRepository(db)
     simulacion = mostrar_simulacion_use_case(id_simulacion, repo)
@@ -91,93 +109,134 @@ def ejecutar_simulacion(id_simulacion: int, background_tasks: BackgroundTasks, d
     if not simulacion:
         raise HTTPException(status_code=404, detail="Simulación no encontrada")
     
-    # Verificar que la simulación esté en estado que permita ejecución
-    estados_permitidos = [EstadoSimulacion.PENDIENTE.value, EstadoSimulacion.FALLIDA.value]
-    if simulacion.estado not in estados_permitidos:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"La simulación no puede ser ejecutada desde el estado '{simulacion.estado}'"
-        )
+    # Validar los coeficientes de reparto antes de encolar la simulación
+    participantes = SqlAlchemyParticipanteRepository(db).get_by_comunidad(simulacion.idComunidadEnergetica)
+    coeficiente_repo = SqlAlchemyCoeficienteRepartoRepository(db)
+    errores_coeficientes = PlanCoeficientesReparto.compilar(
+        {p.idParticipante: coeficiente_repo.get_by_participante(p.idParticipante) for p in participantes},
+        [p.idParticipante for p in participantes]
+    ).errores()
+    if errores_coeficientes:
+        raise HTTPException(status_code=400, detail="; ".join(errores_coeficientes))
     
-    # Función para ejecutar el motor de simulación en segundo plano
-    def ejecutar_motor_simulacion(sim_id: int, db_session: Session):
+    # La simulación pasa a 'En ejecución' y queda en la cola del pool de workers
+    # (app.infrastructure.worker.simulacion_worker); a mayor prioridad antes se atiende
+    job_repo = SqlAlchemySimulacionJobRepository(db)
+    return encolar_simulacion_use_case(id_simulacion, prioridad, repo, job_repo)
+
+@router.post("/{id_simulacion}/ampliar", status_code=202, response_model=SimulacionJobResponse)
+def ampliar_simulacion(id_simulacion: int, ampliacion: SimulacionAmpliacion, db: Session = Depends(get_db)):
+    # Amplía la ventana de una simulación completada; el worker continúa desde su estado
+    # final y solo simula los intervalos nuevos
+    repo = SqlAlchemySimulacionRepository(db)
+    job_repo = SqlAlchemySimulacionJobRepository(db)
+    return ampliar_simulacion_use_case(id_simulacion, ampliacion.fechaFin, ampliacion.prioridad, repo, job_repo)
+
+@router.post("/{id_simulacion}/cancelar", response_model=SimulacionJobResponse)
+def cancelar_simulacion(id_simulacion: int, db: Session = Depends(get_db)):
+    repo = SqlAlchemySimulacionRepository(db)
+    job_repo = SqlAlchemySimulacionJobRepository(db)
+    return cancelar_simulacion_use_case(id_simulacion, repo, job_repo)
+
+@router.get("/{id_simulacion}/job", response_model=SimulacionJobResponse)
+def obtener_job_simulacion(id_simulacion: int, db: Session = Depends(get_db)):
+    job = SqlAlchemySimulacionJobRepository(db).get_ultimo_by_simulacion(id_simulacion)
+    if not job:
+        raise HTTPException(status_code=404, detail="La simulación no se ha ejecutado todavía")
+    return job
+
+@router.get("/{id_simulacion}/export")
+def exportar_intervalos_simulacion(
+    id_simulacion: int,
+    formato: str = Query('parquet', alias="format", description="parquet, arrow o csv"),
+    dataset: str = Query('participantes', description="participantes, activos-generacion o activos-almacenamiento"),
+    db: Session = Depends(get_db)
+):
+    # Descarga de todos los intervalos de la simulación en un formato por columnas; el
+    # fichero se genera mientras se envía, bloque a bloque desde un cursor de servidor
+    exportacion = preparar_exportacion_intervalos_use_case(
+        id_simulacion, dataset, formato,
+        SqlAlchemySimulacionRepository(db), SqlAlchemyResultadoSimulacionRepository(db)
+    )
+    
+    def contenido():
+        # Sesión propia: la de la petición se cierra antes de terminar de enviar la respuesta
+        db_exportacion = SessionLocal()
         try:
-            # Importar los repositorios necesarios
-            from app.infrastructure.persistance.repository.sqlalchemy_comunidad_energetica_repository import SqlAlchemyComunidadEnergeticaRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_participante_repository import SqlAlchemyParticipanteRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_activo_generacion_repository import SqlAlchemyActivoGeneracionRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_activo_almacenamiento_repository import SqlAlchemyActivoAlmacenamientoRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_coeficiente_reparto_repository import SqlAlchemyCoeficienteRepartoRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_contrato_autoconsumo_repository import SqlAlchemyContratoAutoconsumoRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_registro_consumo_repository import SqlAlchemyRegistroConsumoRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_datos_ambientales_repository import SqlAlchemyDatosAmbientalesRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_resultado_simulacion_repository import SqlAlchemyResultadoSimulacionRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_resultado_simulacion_participante_repository import SqlAlchemyResultadoSimulacionParticipanteRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_resultado_simulacion_activo_generacion_repository import SqlAlchemyResultadoSimulacionActivoGeneracionRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_resultado_simulacion_activo_almacenamiento_repository import SqlAlchemyResultadoSimulacionActivoAlmacenamientoRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_datos_intervalo_participante_repository import SqlAlchemyDatosIntervaloParticipanteRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_datos_intervalo_activo_repository import SqlAlchemyDatosIntervaloActivoRepository
-            from app.infrastructure.pvgis.datos_ambientales_api_repository import DatosAmbientalesApiRepository
-            from app.infrastructure.persistance.repository.sqlalchemy_pvpc_precios_repository import PvpcPreciosRepositoryImpl
-            # Inicializar todos los repositorios necesarios
-            simulacion_repo = SqlAlchemySimulacionRepository(db_session)
-            comunidad_repo = SqlAlchemyComunidadEnergeticaRepository(db_session)
-            participante_repo = SqlAlchemyParticipanteRepository(db_session)
-            activo_gen_repo = SqlAlchemyActivoGeneracionRepository(db_session)
-            activo_alm_repo = SqlAlchemyActivoAlmacenamientoRepository(db_session)
-            coeficiente_repo = SqlAlchemyCoeficienteRepartoRepository(db_session)
-            contrato_repo = SqlAlchemyContratoAutoconsumoRepository(db_session)
-            registro_consumo_repo = SqlAlchemyRegistroConsumoRepository(db_session)
-            datos_ambientales_repo = SqlAlchemyDatosAmbientalesRepository(db_session)
-            resultado_simulacion_repo = SqlAlchemyResultadoSimulacionRepository(db_session)
-            resultado_participante_repo = SqlAlchemyResultadoSimulacionParticipanteRepository(db_session)
-            resultado_activo_gen_repo = SqlAlchemyResultadoSimulacionActivoGeneracionRepository(db_session)
-            resultado_activo_alm_repo = SqlAlchemyResultadoSimulacionActivoAlmacenamientoRepository(db_session)
-            datos_intervalo_participante_repo = SqlAlchemyDatosIntervaloParticipanteRepository(db_session)
-            datos_intervalo_activo_repo = SqlAlchemyDatosIntervaloActivoRepository(db_session)
-            datos_ambientales_api_repo = DatosAmbientalesApiRepository()
-            pvpc_precios_repo = PvpcPreciosRepositoryImpl(db_session)
-        
-            
-            # Inicializar el motor de simulación con todos los repositorios requeridos
-            motor = MotorSimulacion(
-                simulacion_repo=simulacion_repo,
-                comunidad_repo=comunidad_repo,
-                participante_repo=participante_repo,
-                activo_gen_repo=activo_gen_repo,
-                activo_alm_repo=activo_alm_repo,
-                coeficiente_repo=coeficiente_repo,
-                contrato_repo=contrato_repo,
-                registro_consumo_repo=registro_consumo_repo,
-                datos_ambientales_repo=datos_ambientales_repo,
-                resultado_simulacion_repo=resultado_simulacion_repo,
-                resultado_participante_repo=resultado_participante_repo,
-                resultado_activo_gen_repo=resultado_activo_gen_repo,
-                resultado_activo_alm_repo=resultado_activo_alm_repo,
-                datos_intervalo_participante_repo=datos_intervalo_participante_repo,
-                datos_intervalo_activo_repo=datos_intervalo_activo_repo,
-                pvpc_precios_repo=pvpc_precios_repo,
-                datos_ambientales_api_repo=datos_ambientales_api_repo,
-                db_session=db_session
-            )
-            
-            # Ejecutar la simulación
-            print(f"Iniciando motor de simulación avanzado para simulación ID: {sim_id}")
-            motor.ejecutar_simulacion(sim_id)
-            print(f"Simulación {sim_id} procesada correctamente con el motor avanzado")
-        except Exception as e:
-            print(f"Error al ejecutar la simulación {sim_id}: {str(e)}")
-            # Actualizar el estado a error en caso de fallo
-            try:
-                repo = SqlAlchemySimulacionRepository(db_session)
-                actualizar_estado_simulacion_use_case(sim_id, EstadoSimulacion.FALLIDA.value, repo)
-            except Exception as update_error:
-                print(f"Error adicional al actualizar el estado: {str(update_error)}")
+            campos = list(exportacion.columnas[2:])
+            if exportacion.dataset == 'participantes':
+                bloques = SqlAlchemyDatosIntervaloParticipanteRepository(db_exportacion).iterar_exportacion(
+                    exportacion.idResultado, campos, TAMANO_BLOQUE_EXPORTACION
+                )
+            else:
+                bloques = SqlAlchemyDatosIntervaloActivoRepository(db_exportacion).iterar_exportacion(
+                    exportacion.idResultado, exportacion.dataset == 'activos-generacion', campos, TAMANO_BLOQUE_EXPORTACION
+                )
+            yield from generar_exportacion(exportacion, bloques)
+        finally:
+            db_exportacion.close()
     
-    # Actualizar el estado a 'En ejecución'
-    actualizar_estado_simulacion_use_case(id_simulacion, EstadoSimulacion.EJECUTANDO.value, repo)
+    return StreamingResponse(
+        contenido(),
+        media_type=exportacion.tipoContenido,
+        headers={"Content-Disposition": f'attachment; filename="{exportacion.nombreArchivo}"'}
+    )
+
+# Segundos sin cambios tras los que se envía un comentario para mantener viva la conexión
+SSE_KEEPALIVE_SEGUNDOS = 15
+
+def _leer_estado_ejecucion(id_simulacion: int):
+    # Sesión propia por consulta: el stream puede durar toda la simulación
+    db = SessionLocal()
+    try:
+        simulacion = SqlAlchemySimulacionRepository(db).get_by_id(id_simulacion)
+        job = SqlAlchemySimulacionJobRepository(db).get_ultimo_by_simulacion(id_simulacion)
+        return simulacion, job
+    finally:
+        db.close()
+
+def _evento_sse(evento: str, datos: dict) -> str:
+    return f"event: {evento}\ndata: {json.dumps(datos, default=str)}\n\n"
+
+@router.get("/{id_simulacion}/progreso")
+async def progreso_simulacion(id_simulacion: int, request: Request):
+    # Server-Sent Events con el progreso publicado por el worker en SIMULACION_JOB:
+    # eventos 'progreso' cuando cambia y un evento 'fin' cuando el trabajo termina
+    simulacion, _ = await run_in_threadpool(_leer_estado_ejecucion, id_simulacion)
+    if not simulacion:
+        raise HTTPException(status_code=404, detail="Simulación no encontrada")
     
-    # Programar la ejecución en segundo plano
-    background_tasks.add_task(ejecutar_motor_simulacion, id_simulacion, db)
+    estados_finales = [EstadoJob.COMPLETADO, EstadoJob.FALLIDO, EstadoJob.CANCELADO]
     
-    return {"mensaje": f"Simulación {id_simulacion} iniciada correctamente", "status": "procesando"}
\ No newline at end of file
+    async def eventos():
+        yield "retry: 3000\n\n"
+        ultimos_datos = None
+        ultimo_envio = time.time()
+        while not await request.is_disconnected():
+            simulacion, job = await run_in_threadpool(_leer_estado_ejecucion, id_simulacion)
+            datos = {
+                'idSimulacion': id_simulacion,
+                'estadoSimulacion': simulacion.estado.value if simulacion else None,
+                'idJob': job.idJob if job else None,
+                'estadoJob': job.estado.value if job else None,
+                'mensajeError': job.mensajeError if job else None,
+                'progreso': job.progreso if job else None,
+            }
+            if datos != ultimos_datos:
+                yield _evento_sse("progreso", datos)
+                ultimos_datos = datos
+                ultimo_envio = time.time()
+            elif time.time() - ultimo_envio >= SSE_KEEPALIVE_SEGUNDOS:
+                yield ": keepalive\n\n"
+                ultimo_envio = time.time()
+            
+            if simulacion is None or job is None or job.estado in estados_finales:
+                yield _evento_sse("fin", datos)
+                break
+            await asyncio.sleep(settings.SIMULACION_PROGRESO_SEGUNDOS)
+    
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,82 @@
+import time
+
+from app.domain.entities.estado_simulacion import EstadoSimulacion
+from app.domain.entities.variante_barrido import VarianteBarridoEntity
+from app.domain.use_cases.simulacion.motor_simulacion.barrido_escenarios import (
+    METRICAS_VARIANTE, generar_variantes, evaluar_variantes
+)
+from app.domain.use_cases.simulacion.motor_simulacion.motor_simulacion import SimulacionCancelada
+from app.infrastructure.persistance.config import settings
+from app.infrastructure.persistance.repository.sqlalchemy_barrido_simulacion_repository import SqlAlchemyBarridoSimulacionRepository
+from app.infrastructure.persistance.repository.sqlalchemy_variante_barrido_repository import SqlAlchemyVarianteBarridoRepository
+from app.infrastructure.worker.fabrica_motor import crear_motor_simulacion
+
+# Variantes por inserción en SIMULACION_BARRIDO_VARIANTE
+TAMANO_LOTE_VARIANTES = 50
+
+
+def ejecutar_barrido(sesion, job, latido):
+
+    # Carga las entradas de la simulación base una vez, evalúa las variantes en un pool
+    # de BARRIDO_PROCESOS procesos y guarda las métricas de cada una según terminan
+    barrido_repo = SqlAlchemyBarridoSimulacionRepository(sesion)
+    variante_repo = SqlAlchemyVarianteBarridoRepository(sesion)
+
+    barrido = barrido_repo.get_by_id(job.idBarrido)
+    barrido_repo.update_estado(barrido.idBarrido, EstadoSimulacion.EJECUTANDO.value)
+    variante_repo.delete_by_barrido(barrido.idBarrido)  # Reintento tras la caída de otro worker
+
+    try:
+        variantes = generar_variantes(barrido.parametros)
+        inicio = time.time()
+        print(f"Barrido {barrido.idBarrido}: {len(variantes)} variantes sobre la simulación {barrido.idSimulacion}")
+
+        motor = crear_motor_simulacion(sesion)
+        contexto = motor.cargar_contexto_barrido(
+            barrido.idSimulacion,
+            validar_coeficientes=any(v.coeficientes is None for v in variantes)
+        )
+        print(f"  Entradas cargadas ({time.time() - inicio:.2f}s)")
+
+        evaluadas = 0
+        fallidas = 0
+        pendientes = []
+        inicio_evaluacion = time.time()
+        for variante, resultado, error in evaluar_variantes(contexto, variantes, settings.BARRIDO_PROCESOS):
+            if latido.cancelado.is_set():
+                raise SimulacionCancelada(f"Barrido {barrido.idBarrido} cancelado")
+
+            pendientes.append(VarianteBarridoEntity(
+                idBarrido=barrido.idBarrido,
+                indice=variante.indice,
+                parametros=variante.parametros(),
+                mensajeError=error,
+                **{metrica: getattr(resultado, metrica) if resultado else None for metrica in METRICAS_VARIANTE}
+            ))
+            evaluadas += 1
+            fallidas += error is not None
+            if len(pendientes) >= TAMANO_LOTE_VARIANTES:
+                variante_repo.create_bulk(pendientes)
+                pendientes = []
+
+            transcurrido = time.time() - inicio_evaluacion
+            latido.publicar_progreso({
+                'variantesEvaluadas': evaluadas,
+                'variantesTotales': len(variantes),
+                'variantesFallidas': fallidas,
+                'segundosTranscurridos': round(time.time() - inicio, 1),
+                'etaSegundos': round(transcurrido / evaluadas * (len(variantes) - evaluadas), 1),
+            })
+        variante_repo.create_bulk(pendientes)
+
+        barrido_repo.update_estado(barrido.idBarrido, EstadoSimulacion.COMPLETADA.value)
+        print(f"Barrido {barrido.idBarrido} completado: {evaluadas} variantes ({fallidas} con error) "
+              f"en {time.time() - inicio:.2f}s")
+    except SimulacionCancelada:
+        sesion.rollback()
+        barrido_repo.update_estado(barrido.idBarrido, EstadoSimulacion.FALLIDA.value, "Barrido cancelado")
+        raise
+    except Exception as e:
+        sesion.rollback()
+        barrido_repo.update_estado(barrido.idBarrido, EstadoSimulacion.FALLIDA.value, str(e))
+        raise
@@ -0,0 +1,53 @@
+from sqlalchemy.orm import Session
+from app.domain.use_cases.simulacion.motor_simulacion.motor_simulacion import MotorSimulacion
+from app.infrastructure.persistance.repository.sqlalchemy_simulacion_repository import SqlAlchemySimulacionRepository
+from app.infrastructure.persistance.repository.sqlalchemy_comunidad_energetica_repository import SqlAlchemyComunidadEnergeticaRepository
+from app.infrastructure.persistance.repository.sqlalchemy_participante_repository import SqlAlchemyParticipanteRepository
+from app.infrastructure.persistance.repository.sqlalchemy_activo_generacion_repository import SqlAlchemyActivoGeneracionRepository
+from app.infrastructure.persistance.repository.sqlalchemy_activo_almacenamiento_repository import SqlAlchemyActivoAlmacenamientoRepository
+from app.infrastructure.persistance.repository.sqlalchemy_coeficiente_reparto_repository import SqlAlchemyCoeficienteRepartoRepository
+from app.infrastructure.persistance.repository.sqlalchemy_contrato_autoconsumo_repository import SqlAlchemyContratoAutoconsumoRepository
+from app.infrastructure.persistance.repository.sqlalchemy_registro_consumo_repository import SqlAlchemyRegistroConsumoRepository
+from app.infrastructure.persistance.repository.sqlalchemy_datos_ambientales_repository import SqlAlchemyDatosAmbientalesRepository
+from app.infrastructure.persistance.repository.sqlalchemy_resultado_simulacion_repository import SqlAlchemyResultadoSimulacionRepository
+from app.infrastructure.persistance.repository.sqlalchemy_resultado_simulacion_participante_repository import SqlAlchemyResultadoSimulacionParticipanteRepository
+from app.infrastructure.persistance.repository.sqlalchemy_resultado_simulacion_activo_generacion_repository import SqlAlchemyResultadoSimulacionActivoGeneracionRepository
+from app.infrastructure.persistance.repository.sqlalchemy_resultado_simulacion_activo_almacenamiento_repository import SqlAlchemyResultadoSimulacionActivoAlmacenamientoRepository
+from app.infrastructure.persistance.repository.sqlalchemy_datos_intervalo_participante_repository import SqlAlchemyDatosIntervaloParticipanteRepository
+from app.infrastructure.persistance.repository.sqlalchemy_datos_intervalo_activo_repository import SqlAlchemyDatosIntervaloActivoRepository
+from app.infrastructure.persistance.repository.sqlalchemy_pvpc_precios_repository import PvpcPreciosRepositoryImpl
+from app.infrastructure.persistance.repository.sqlalchemy_punto_control_simulacion_repository import SqlAlchemyPuntoControlSimulacionRepository
+from app.infrastructure.persistance.repository.sqlalchemy_agregado_intervalo_participante_repository import SqlAlchemyAgregadoIntervaloParticipanteRepository
+from app.infrastructure.persistance.repository.sqlalchemy_agregado_intervalo_activo_repository import SqlAlchemyAgregadoIntervaloActivoRepository
+from app.infrastructure.persistance.config import settings
+from app.infrastructure.pvgis.datos_ambientales_api_repository import DatosAmbientalesApiRepository
+
+def crear_motor_simulacion(db_session: Session, **opciones) -> MotorSimulacion:
+    # Motor de simulación con todos los repositorios sobre la misma sesión;
+    # las opciones (modo, persistencia, comprobar_cancelacion...) se pasan tal cual
+    return MotorSimulacion(
+        simulacion_repo=SqlAlchemySimulacionRepository(db_session),
+        comunidad_repo=SqlAlchemyComunidadEnergeticaRepository(db_session),
+        participante_repo=SqlAlchemyParticipanteRepository(db_session),
+        activo_gen_repo=SqlAlchemyActivoGeneracionRepository(db_session),
+        activo_alm_repo=SqlAlchemyActivoAlmacenamientoRepository(db_session),
+        coeficiente_repo=SqlAlchemyCoeficienteRepartoRepository(db_session),
+        contrato_repo=SqlAlchemyContratoAutoconsumoRepository(db_session),
+        registro_consumo_repo=SqlAlchemyRegistroConsumoRepository(db_session),
+        datos_ambientales_repo=SqlAlchemyDatosAmbientalesRepository(db_session),
+        resultado_simulacion_repo=SqlAlchemyResultadoSimulacionRepository(db_session),
+        resultado_participante_repo=SqlAlchemyResultadoSimulacionParticipanteRepository(db_session),
+        resultado_activo_gen_repo=SqlAlchemyResultadoSimulacionActivoGeneracionRepository(db_session),
+        resultado_activo_alm_repo=SqlAlchemyResultadoSimulacionActivoAlmacenamientoRepository(db_session),
+        datos_intervalo_participante_repo=SqlAlchemyDatosIntervaloParticipanteRepository(db_session),
+        datos_intervalo_activo_repo=SqlAlchemyDatosIntervaloActivoRepository(db_session),
+        pvpc_precios_repo=PvpcPreciosRepositoryImpl(db_session),
+        datos_ambientales_api_repo=DatosAmbientalesApiRepository(),
+        db_session=db_session,
+        punto_control_repo=(
+            SqlAlchemyPuntoControlSimulacionRepository(db_session) if settings.SIMULACION_PUNTOS_CONTROL else None
+        ),
+        agregado_participante_repo=SqlAlchemyAgregadoIntervaloParticipanteRepository(db_session),
+        agregado_activo_repo=SqlAlchemyAgregadoIntervaloActivoRepository(db_session),
+        **opciones
+    )
@@ -0,0 +1,103 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.domain.entities.simulacion_job import EstadoJob
+from app.domain.use_cases.comunidad_energetica.importar_comunidad_completa import (
+    importar_comunidad_completa_use_case,
+    resumen_importacion,
+)
+from app.infrastructure.persistance.config import settings
+from app.infrastructure.persistance.database import SessionLocal
+from app.infrastructure.persistance.repository.sqlalchemy_importacion_comunidad_job_repository import SqlAlchemyImportacionComunidadJobRepository
+
+# Las importaciones de comunidades (ZIP) se ejecutan en un pool de hilos del propio proceso
+# de la API, porque el ZIP subido solo está en este host. El estado y el progreso quedan en
+# IMPORTACION_COMUNIDAD_JOB, así que se pueden consultar desde cualquier proceso.
+
+_ejecutor = ThreadPoolExecutor(
+    max_workers=max(1, settings.IMPORTACION_JOBS_CONCURRENTES),
+    thread_name_prefix="importacion-comunidad"
+)
+
+
+class ProgresoImportacion:
+
+    # Publica el progreso de la importación con su propia sesión. Lo llaman los hilos que
+    # cargan los consumos, así que se serializa con un cerrojo y se escribe como mucho una
+    # vez por intervalo
+
+    def __init__(self, crear_sesion, importacion_id, intervalo_segundos):
+        self._crear_sesion = crear_sesion
+        self.importacion_id = importacion_id
+        self.intervalo_segundos = intervalo_segundos
+        self._cerrojo = threading.Lock()
+        self._ultima_escritura = 0.0
+
+    def publicar(self, progreso):
+        with self._cerrojo:
+            ahora = time.time()
+            if ahora - self._ultima_escritura < self.intervalo_segundos:
+                return
+            sesion = self._crear_sesion()
+            try:
+                SqlAlchemyImportacionComunidadJobRepository(sesion).registrar_progreso(self.importacion_id, progreso)
+                self._ultima_escritura = ahora
+            except Exception as e:
+                logging.error(f"Error al registrar el progreso de la importación {self.importacion_id}: {str(e)}")
+            finally:
+                sesion.close()
+
+
+def ejecutar_importacion(importacion_id, archivo_zip_path, id_usuario, crear_sesion=SessionLocal):
+
+    sesion = crear_sesion()
+    try:
+        job_repo = SqlAlchemyImportacionComunidadJobRepository(sesion)
+        job_repo.iniciar(importacion_id)
+        progreso = ProgresoImportacion(crear_sesion, importacion_id, settings.SIMULACION_PROGRESO_SEGUNDOS)
+        try:
+            resultado = importar_comunidad_completa_use_case(
+                archivo_zip_path=archivo_zip_path,
+                db=sesion,
+                id_usuario=id_usuario,
+                notificar_progreso=progreso.publicar,
+                crear_sesion=crear_sesion,
+                hilos=settings.IMPORTACION_HILOS
+            )
+        except Exception as e:
+            logging.error(f"Error en la importación {importacion_id}: {str(e)}")
+            sesion.rollback()
+            job_repo.finalizar(importacion_id, EstadoJob.FALLIDO.value, mensaje_error=str(e))
+            return
+
+        resumen = resumen_importacion(resultado)
+        job_repo.finalizar(importacion_id, EstadoJob.COMPLETADO.value, resultado=resumen, id_comunidad=resumen['comunidad_id'])
+    except Exception as e:
+        logging.error(f"Error al ejecutar la importación {importacion_id}: {str(e)}")
+    finally:
+        sesion.close()
+        if os.path.exists(archivo_zip_path):
+            os.unlink(archivo_zip_path)
+
+
+def lanzar_importacion(importacion_id, archivo_zip_path, id_usuario):
+    # El ZIP pasa a ser del trabajo, que lo elimina al terminar
+    return _ejecutor.submit(ejecutar_importacion, importacion_id, archivo_zip_path, id_usuario)
+
+
+def marcar_importaciones_interrumpidas():
+
+    # Al arrancar la API: las importaciones que llevan demasiado sin progresar pertenecían
+    # a un proceso que ya no existe
+    sesion = SessionLocal()
+    try:
+        marcadas = SqlAlchemyImportacionComunidadJobRepository(sesion).marcar_interrumpidas(settings.IMPORTACION_TIMEOUT_SEGUNDOS)
+        if marcadas:
+            logging.warning(f"Importaciones de comunidad interrumpidas marcadas como fallidas: {marcadas}")
+    except Exception as e:
+        logging.error(f"Error al revisar las importaciones interrumpidas: {str(e)}")
+    finally:
+        sesion.close()
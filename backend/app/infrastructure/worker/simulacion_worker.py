@@ -0,0 +1,201 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.entities.estado_simulacion import EstadoSimulacion
+from app.domain.entities.simulacion_job import EstadoJob
+from app.domain.use_cases.simulacion.motor_simulacion.motor_simulacion import SimulacionCancelada
+from app.infrastructure.persistance.config import settings
+from app.infrastructure.persistance.repository.sqlalchemy_simulacion_repository import SqlAlchemySimulacionRepository
+from app.infrastructure.persistance.repository.sqlalchemy_simulacion_job_repository import SqlAlchemySimulacionJobRepository
+from app.infrastructure.persistance.repository.sqlalchemy_barrido_simulacion_repository import SqlAlchemyBarridoSimulacionRepository
+from app.infrastructure.worker.fabrica_motor import crear_motor_simulacion
+from app.infrastructure.worker.barrido_worker import ejecutar_barrido
+
+# Pool de procesos que consume la cola SIMULACION_JOB. Cada proceso tiene su propio
+# motor de BD y reclama trabajos con SELECT ... FOR UPDATE SKIP LOCKED, así que se
+# pueden lanzar tantos workers (y contenedores) como se quiera sobre la misma cola.
+# Los trabajos con idBarrido evalúan un barrido de escenarios en lugar de una simulación.
+#   python -m app.infrastructure.worker.simulacion_worker
+
+
+class LatidoJob:
+
+    # Hilo que mantiene vivo el trabajo mientras se simula, publica el último progreso
+    # del motor y recoge la petición de cancelación; usa su propia sesión porque la del
+    # motor no es thread-safe. El progreso se escribe como mucho una vez por intervalo
+    # de progreso y solo si ha cambiado; el latido, al menos una vez por intervalo de latido
+
+    def __init__(self, crear_sesion, job_id, intervalo_segundos, intervalo_progreso_segundos=None):
+        self._crear_sesion = crear_sesion
+        self.job_id = job_id
+        self.intervalo_segundos = intervalo_segundos
+        self.intervalo_progreso_segundos = min(intervalo_progreso_segundos or intervalo_segundos, intervalo_segundos)
+        self.cancelado = threading.Event()
+        self._parar = threading.Event()
+        self._progreso = None
+        self._hilo = threading.Thread(target=self._ejecutar, name=f"latido-job-{job_id}", daemon=True)
+
+    def publicar_progreso(self, progreso):
+        # Lo llama el motor (y su hilo escritor); solo se guarda la última instantánea
+        self._progreso = progreso
+
+    def __enter__(self):
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *excepcion):
+        self._parar.set()
+        self._hilo.join()
+
+    def _ejecutar(self):
+        sesion = self._crear_sesion()
+        try:
+            job_repo = SqlAlchemySimulacionJobRepository(sesion)
+            publicado = None
+            ultimo_latido = time.time()
+            while True:
+                parar = self._parar.wait(self.intervalo_progreso_segundos)
+                progreso = self._progreso
+                if progreso is publicado and not parar and time.time() - ultimo_latido < self.intervalo_segundos:
+                    continue
+                try:
+                    if job_repo.registrar_latido(self.job_id, None if progreso is publicado else progreso):
+                        self.cancelado.set()
+                    publicado = progreso
+                    ultimo_latido = time.time()
+                except Exception as e:
+                    logging.error(f"Error al registrar el latido del trabajo {self.job_id}: {str(e)}")
+                    sesion.rollback()
+                if parar:
+                    break
+        finally:
+            sesion.close()
+
+
+def ejecutar_simulacion(sesion, job, latido):
+
+    # El motor descarta los resultados previos (o a medias, tras la caída de otro worker)
+    # salvo que las entradas no hayan cambiado desde la ejecución que los generó
+    motor = crear_motor_simulacion(
+        sesion,
+        comprobar_cancelacion=latido.cancelado.is_set,
+        notificar_progreso=latido.publicar_progreso
+    )
+    motor.ejecutar_simulacion(job.idSimulacion)
+
+
+def ejecutar_job(crear_sesion, job):
+
+    sesion = crear_sesion()
+    try:
+        job_repo = SqlAlchemySimulacionJobRepository(sesion)
+
+        with LatidoJob(crear_sesion, job.idJob, settings.SIMULACION_JOB_LATIDO_SEGUNDOS,
+                       settings.SIMULACION_PROGRESO_SEGUNDOS) as latido:
+            try:
+                if job.idBarrido is not None:
+                    ejecutar_barrido(sesion, job, latido)
+                else:
+                    ejecutar_simulacion(sesion, job, latido)
+            except SimulacionCancelada:
+                job_repo.finalizar(job.idJob, EstadoJob.CANCELADO.value)
+                return
+            except Exception as e:
+                sesion.rollback()
+                job_repo.finalizar(job.idJob, EstadoJob.FALLIDO.value, str(e))
+                return
+
+        job_repo.finalizar(job.idJob, EstadoJob.COMPLETADO.value)
+    finally:
+        sesion.close()
+
+
+def bucle_worker(nombre, parar):
+
+    # Cada proceso crea su propio motor de BD: las conexiones no se comparten entre procesos
+    engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+    crear_sesion = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    timeout = settings.SIMULACION_JOB_TIMEOUT_SEGUNDOS
+    max_intentos = settings.SIMULACION_JOB_MAX_INTENTOS
+
+    print(f"Worker {nombre} iniciado")
+    try:
+        while not parar.is_set():
+            sesion = crear_sesion()
+            try:
+                job_repo = SqlAlchemySimulacionJobRepository(sesion)
+                simulacion_repo = SqlAlchemySimulacionRepository(sesion)
+                barrido_repo = SqlAlchemyBarridoSimulacionRepository(sesion)
+                for abandonado in job_repo.marcar_abandonados(timeout, max_intentos):
+                    if abandonado.idBarrido is not None:
+                        barrido_repo.update_estado(abandonado.idBarrido, EstadoSimulacion.FALLIDA.value,
+                                                   abandonado.mensajeError or "Barrido cancelado")
+                        continue
+                    estado = (EstadoSimulacion.PENDIENTE if abandonado.estado == EstadoJob.CANCELADO
+                              else EstadoSimulacion.FALLIDA)
+                    simulacion_repo.update_estado(abandonado.idSimulacion, estado.value)
+                job = job_repo.reclamar_siguiente(nombre, timeout, max_intentos)
+            except Exception as e:
+                logging.error(f"Worker {nombre}: error al consultar la cola: {str(e)}")
+                job = None
+            finally:
+                sesion.close()
+
+            if job is None:
+                parar.wait(settings.SIMULACION_WORKER_ESPERA_SEGUNDOS)
+                continue
+
+            tarea = f"barrido {job.idBarrido}" if job.idBarrido is not None else f"simulación {job.idSimulacion}"
+            print(f"Worker {nombre}: {tarea} (trabajo {job.idJob}, intento {job.intentos})")
+            try:
+                ejecutar_job(crear_sesion, job)
+            except Exception as e:
+                logging.error(f"Worker {nombre}: error al ejecutar el trabajo {job.idJob}: {str(e)}")
+    finally:
+        engine.dispose()
+        print(f"Worker {nombre} detenido")
+
+
+def _iniciar_worker(nombre, parar):
+    # El proceso padre gestiona las señales; los hijos terminan el trabajo en curso
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    bucle_worker(nombre, parar)
+
+
+def main():
+
+    num_workers = max(1, settings.SIMULACION_WORKERS)
+    contexto = multiprocessing.get_context("spawn")
+    parar = contexto.Event()
+
+    def detener(signum, frame):
+        print("Deteniendo workers de simulación...")
+        parar.set()
+
+    signal.signal(signal.SIGINT, detener)
+    signal.signal(signal.SIGTERM, detener)
+
+    prefijo = f"{socket.gethostname()}-{os.getpid()}"
+    procesos = [
+        contexto.Process(target=_iniciar_worker, args=(f"{prefijo}-{i}", parar), name=f"worker-simulacion-{i}")
+        for i in range(num_workers)
+    ]
+    for proceso in procesos:
+        proceso.start()
+    print(f"Pool de simulación iniciado con {num_workers} workers")
+
+    for proceso in procesos:
+        proceso.join()
+
+
+if __name__ == "__main__":
+    main()
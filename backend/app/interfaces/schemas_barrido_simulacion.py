@@ -0,0 +1,53 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from app.domain.entities.estado_simulacion import EstadoSimulacion
+from app.domain.entities.tipo_estrategia_excedentes import TipoEstrategiaExcedentes
+
+class AlmacenamientoAdicional(BaseModel):
+    capacidad_kWh: float = Field(..., ge=0, description="Capacidad de la batería añadida")
+    potencia_kW: float = Field(..., gt=0, description="Potencia máxima de carga y descarga")
+    eficienciaCicloCompleto_pct: float = Field(90.0, gt=0, le=100, description="Eficiencia de ciclo completo")
+    profundidadDescargaMax_pct: float = Field(90.0, gt=0, le=100, description="Profundidad de descarga máxima")
+
+class BarridoSimulacionCreate(BaseModel):
+    nombre: Optional[str] = Field(None, description="Nombre descriptivo del barrido")
+    # Cada lista es una dimensión de la rejilla; se evalúa su producto cartesiano.
+    # Omitida = valor de la simulación base; null dentro de la lista = valor base como una opción más
+    tiposEstrategiaExcedentes: Optional[List[Optional[TipoEstrategiaExcedentes]]] = Field(None, description="Estrategias de excedentes a evaluar")
+    factoresPotenciaFV: Optional[List[float]] = Field(None, description="Multiplicadores de la potencia pico FV instalada")
+    almacenamientoAdicional: Optional[List[Optional[AlmacenamientoAdicional]]] = Field(None, description="Baterías a añadir a la comunidad")
+    conjuntosCoeficientes: Optional[List[Optional[Dict[int, float]]]] = Field(None, description="Coeficientes fijos (%) por participante")
+
+class BarridoSimulacionResponse(BaseModel):
+    idBarrido: int
+    idSimulacion: int
+    nombre: Optional[str] = None
+    parametros: Dict[str, Any]
+    estado: EstadoSimulacion
+    numVariantes: int
+    mensajeError: Optional[str] = None
+    fechaCreacion: Optional[datetime] = None
+    fechaFin: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class VarianteBarridoResponse(BaseModel):
+    idVariante: int
+    indice: int
+    parametros: Dict[str, Any]
+    costeTotalEnergia_eur: Optional[float] = None
+    ahorroTotal_eur: Optional[float] = None
+    ingresoTotalExportacion_eur: Optional[float] = None
+    paybackPeriod_anios: Optional[float] = None
+    roi_pct: Optional[float] = None
+    tasaAutoconsumoSCR_pct: Optional[float] = None
+    tasaAutosuficienciaSSR_pct: Optional[float] = None
+    energiaTotalImportada_kWh: Optional[float] = None
+    energiaTotalExportada_kWh: Optional[float] = None
+    reduccionCO2_kg: Optional[float] = None
+    mensajeError: Optional[str] = None
+
+    class Config:
+        from_attributes = True
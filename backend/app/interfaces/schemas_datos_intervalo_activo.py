@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, model_validator
-from typing import Optional, List
-from datetime import datetime
+from typing import Any, Dict, Optional, List
+from datetime import date, datetime
 
 class DatosIntervaloActivoBase(BaseModel):
     
@@ -42,5 +42,46 @@ class DatosIntervaloActivoRead(DatosIntervaloActivoBase):
     idResultadoActivoGen: Optional[int] = None
     idResultadoActivoAlm: Optional[int] = None
 
+    class Config:
+        from_attributes = True
+
+class PaginaDatosIntervaloActivoRead(BaseModel):
+    
+    datos: List[Dict[str, Any]] = Field(..., description="Intervalos con los campos pedidos, ordenados por (timestamp, id)")
+    campos: List[str] = Field(..., description="Campos incluidos en cada intervalo")
+    siguienteCursor: Optional[str] = Field(None, description="Cursor de la página siguiente (null en la última)")
+
+class SerieDatosIntervaloActivoRead(BaseModel):
+    
+    campo: str
+    metodo: str = Field(..., description="Reducción aplicada: lttb, minmax o ninguno si la serie ya cabía en el ancho")
+    puntosOriginales: int = Field(..., description="Intervalos con dato antes de reducir la serie")
+    timestamps: List[datetime]
+    valores: List[float]
+
+    class Config:
+        from_attributes = True
+
+class AgregadoIntervaloActivoRead(BaseModel):
+    
+    inicioPeriodo: date = Field(..., description="Primer día del periodo")
+    numIntervalos: int
+    energiaGenerada_kWh: Optional[float] = None
+    intervalosConProduccion: Optional[int] = None
+    energiaCargada_kWh: Optional[float] = None
+    energiaDescargada_kWh: Optional[float] = None
+    SoCMedio_kWh: Optional[float] = None
+    SoCMin_kWh: Optional[float] = None
+    SoCMax_kWh: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+class SerieAgregadaActivoRead(BaseModel):
+    
+    granularidad: str = Field(..., description="Periodo de agregación: dia, semana, mes o anio")
+    fuente: str = Field(..., description="Agregados de los que se ha calculado la serie: DIA o MES")
+    periodos: List[AgregadoIntervaloActivoRead]
+
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import Optional
-from datetime import datetime
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
 
 class DatosIntervaloParticipanteBase(BaseModel):
     
@@ -39,5 +39,50 @@ class DatosIntervaloParticipanteRead(DatosIntervaloParticipanteBase):
     idDatosIntervaloParticipante: int
     idResultadoParticipante: int
 
+    class Config:
+        from_attributes = True
+
+class PaginaDatosIntervaloParticipanteRead(BaseModel):
+    
+    datos: List[Dict[str, Any]] = Field(..., description="Intervalos con los campos pedidos, ordenados por (timestamp, id)")
+    campos: List[str] = Field(..., description="Campos incluidos en cada intervalo")
+    siguienteCursor: Optional[str] = Field(None, description="Cursor de la página siguiente (null en la última)")
+
+class SerieDatosIntervaloParticipanteRead(BaseModel):
+    
+    campo: str
+    metodo: str = Field(..., description="Reducción aplicada: lttb, minmax o ninguno si la serie ya cabía en el ancho")
+    puntosOriginales: int = Field(..., description="Intervalos con dato antes de reducir la serie")
+    timestamps: List[datetime]
+    valores: List[float]
+
+    class Config:
+        from_attributes = True
+
+class AgregadoIntervaloParticipanteRead(BaseModel):
+    
+    inicioPeriodo: date = Field(..., description="Primer día del periodo")
+    numIntervalos: int
+    consumoTotal_kWh: float
+    energiaAutoconsumidaDirecta_kWh: float
+    energiaRecibidaRepartoConsumida_kWh: float
+    energiaAlmacenamiento_kWh: float
+    energiaAlmacenamientoDescargada_kWh: float
+    energiaAlmacenamientoCargada_kWh: float
+    energiaImportadaRed_kWh: float
+    energiaExportadaRed_kWh: float
+    costeImportacion_eur: float
+    ingresoExportacion_eur: float
+    costeBaseEstimado_eur: float
+
+    class Config:
+        from_attributes = True
+
+class SerieAgregadaParticipanteRead(BaseModel):
+    
+    granularidad: str = Field(..., description="Periodo de agregación: dia, semana, mes o anio")
+    fuente: str = Field(..., description="Agregados de los que se ha calculado la serie: DIA o MES")
+    periodos: List[AgregadoIntervaloParticipanteRead]
+
     class Config:
         from_attributes = True
\ No newline at end of file
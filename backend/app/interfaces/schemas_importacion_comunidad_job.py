@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.domain.entities.simulacion_job import EstadoJob
+
+class ImportacionComunidadJobResponse(BaseModel):
+    idImportacion: int
+    idUsuario: int
+    nombreArchivo: Optional[str] = None
+    estado: EstadoJob
+    idComunidadEnergetica: Optional[int] = None
+    mensajeError: Optional[str] = None
+    fechaCreacion: Optional[datetime] = None
+    fechaInicio: Optional[datetime] = None
+    fechaFin: Optional[datetime] = None
+    fechaActualizacion: Optional[datetime] = None
+    progreso: Optional[Dict[str, Any]] = None
+    resultado: Optional[Dict[str, Any]] = None
+
+    class Config:
+        from_attributes = True
@@ -8,7 +8,7 @@ class SimulacionCreate(BaseModel):
     nombreSimulacion: str = Field(..., description="Nombre descriptivo de la simulación")
     fechaInicio: datetime = Field(..., description="Fecha de inicio del periodo a simular")
     fechaFin: datetime = Field(..., description="Fecha de fin del periodo a simular")
-    tiempo_medicion: int = Field(..., description="Intervalo de tiempo para la simulación en minutos")
+    tiempo_medicion: int = Field(..., description="Paso de la simulación en minutos (15, 30 o 60)")
     tipoEstrategiaExcedentes: TipoEstrategiaExcedentes = Field(..., description="Estrategia para gestionar excedentes")
     idUsuario_creador: int = Field(..., description="ID del usuario que crea la simulación")
     idComunidadEnergetica: int = Field(..., description="ID de la comunidad energética a simular")
@@ -17,10 +17,14 @@ class SimulacionUpdate(BaseModel):
     nombreSimulacion: Optional[str] = Field(None, description="Nombre descriptivo de la simulación")
     fechaInicio: Optional[datetime] = Field(None, description="Fecha de inicio del periodo a simular")
     fechaFin: Optional[datetime] = Field(None, description="Fecha de fin del periodo a simular")
-    tiempo_medicion: Optional[int] = Field(None, description="Intervalo de tiempo para la simulación en minutos")
+    tiempo_medicion: Optional[int] = Field(None, description="Paso de la simulación en minutos (15, 30 o 60)")
     tipoEstrategiaExcedentes: Optional[TipoEstrategiaExcedentes] = Field(None, description="Estrategia para gestionar excedentes")
     estado: Optional[EstadoSimulacion] = Field(None, description="Estado actual de la simulación")
 
+class SimulacionAmpliacion(BaseModel):
+    fechaFin: datetime = Field(..., description="Nueva fecha de fin, posterior a la actual")
+    prioridad: int = Field(0, description="Prioridad del trabajo en la cola de simulación")
+
 class SimulacionResponse(BaseModel):
     idSimulacion: int
     nombreSimulacion: str
@@ -31,6 +35,7 @@ class SimulacionResponse(BaseModel):
     tipoEstrategiaExcedentes: TipoEstrategiaExcedentes
     idUsuario_creador: int
     idComunidadEnergetica: int
+    huellaEntradas: Optional[str] = None
 
     class Config:
         from_attributes = True
\ No newline at end of file
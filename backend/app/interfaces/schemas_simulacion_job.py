@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.domain.entities.simulacion_job import EstadoJob
+
+class SimulacionJobResponse(BaseModel):
+    idJob: int
+    idSimulacion: int
+    idBarrido: Optional[int] = None
+    estado: EstadoJob
+    prioridad: int
+    cancelacionSolicitada: bool
+    intentos: int
+    worker: Optional[str] = None
+    mensajeError: Optional[str] = None
+    fechaCreacion: Optional[datetime] = None
+    fechaInicio: Optional[datetime] = None
+    fechaFin: Optional[datetime] = None
+    ultimoLatido: Optional[datetime] = None
+    progreso: Optional[Dict[str, Any]] = None
+
+    class Config:
+        from_attributes = True
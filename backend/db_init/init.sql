@@ -3,6 +3,13 @@ CREATE DATABASE IF NOT EXISTS `comunidad_energetica_db` DEFAULT CHARACTER SET ut
 USE `comunidad_energetica_db`;
 
 -- Borrar tablas existentes (en orden inverso de creación para evitar problemas de FK)
+DROP TABLE IF EXISTS `IMPORTACION_COMUNIDAD_JOB`;
+DROP TABLE IF EXISTS `AGREGADO_INTERVALO_ACTIVO`;
+DROP TABLE IF EXISTS `AGREGADO_INTERVALO_PARTICIPANTE`;
+DROP TABLE IF EXISTS `SIMULACION_JOB`;
+DROP TABLE IF EXISTS `SIMULACION_PUNTO_CONTROL`;
+DROP TABLE IF EXISTS `SIMULACION_BARRIDO_VARIANTE`;
+DROP TABLE IF EXISTS `SIMULACION_BARRIDO`;
 DROP TABLE IF EXISTS `DATOS_INTERVALO_ACTIVO`;
 DROP TABLE IF EXISTS `DATOS_INTERVALO_PARTICIPANTE`;
 DROP TABLE IF EXISTS `RESULTADO_SIMULACION_ACTIVO_ALMACENAMIENTO`;
@@ -84,7 +91,7 @@ CREATE TABLE `REGISTRO_CONSUMO` (
     `idParticipante` INT NOT NULL,
     PRIMARY KEY (`idRegistroConsumo`),
     FOREIGN KEY (`idParticipante`) REFERENCES `PARTICIPANTE`(`idParticipante`) ON DELETE CASCADE ON UPDATE CASCADE,
-    INDEX `idx_registro_consumo_participante_ts` (`idParticipante`, `timestamp`) 
+    UNIQUE KEY `uq_registro_consumo_participante_ts` (`idParticipante`, `timestamp`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Tabla ACTIVO_GENERACION_UNICA (Combinación de las tablas anteriores)
@@ -136,7 +143,9 @@ CREATE TABLE `SIMULACION` (
     `tipoEstrategiaExcedentes` VARCHAR(100), 
     `idUsuario_creador` INT NOT NULL,
     `idComunidadEnergetica` INT NOT NULL,
+    `huellaEntradas` CHAR(64) NULL,
     PRIMARY KEY (`idSimulacion`),
+    INDEX `idx_simulacion_huella` (`huellaEntradas`, `estado`),
     FOREIGN KEY (`idUsuario_creador`) REFERENCES `USUARIO`(`idUsuario`) ON DELETE RESTRICT ON UPDATE CASCADE,
     FOREIGN KEY (`idComunidadEnergetica`) REFERENCES `COMUNIDAD_ENERGETICA`(`idComunidadEnergetica`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -258,5 +267,144 @@ CREATE TABLE `DATOS_INTERVALO_ACTIVO` (
     PRIMARY KEY (`idDatosIntervaloActivo`),
     FOREIGN KEY (`idResultadoActivoGen`) REFERENCES `RESULTADO_SIMULACION_ACTIVO_GENERACION`(`idResultadoActivoGen`) ON DELETE CASCADE ON UPDATE CASCADE,
     FOREIGN KEY (`idResultadoActivoAlm`) REFERENCES `RESULTADO_SIMULACION_ACTIVO_ALMACENAMIENTO`(`idResultadoActivoAlm`) ON DELETE CASCADE ON UPDATE CASCADE,
-    INDEX `idx_intervalo_activo_ts` (`timestamp`) 
+    INDEX `idx_intervalo_activo_ts` (`timestamp`),
+    INDEX `idx_intervalo_activo_gen` (`idResultadoActivoGen`, `timestamp`),
+    INDEX `idx_intervalo_activo_alm` (`idResultadoActivoAlm`, `timestamp`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Tabla SIMULACION_BARRIDO (barridos de escenarios sobre una simulación base)
+CREATE TABLE `SIMULACION_BARRIDO` (
+    `idBarrido` INT NOT NULL AUTO_INCREMENT,
+    `idSimulacion` INT NOT NULL,
+    `nombre` VARCHAR(255) NULL,
+    `parametros` TEXT NOT NULL,
+    `estado` VARCHAR(20) NOT NULL DEFAULT 'PENDIENTE',
+    `numVariantes` INT NOT NULL DEFAULT 0,
+    `mensajeError` TEXT NULL,
+    `fechaCreacion` DATETIME DEFAULT CURRENT_TIMESTAMP,
+    `fechaFin` DATETIME NULL,
+    PRIMARY KEY (`idBarrido`),
+    FOREIGN KEY (`idSimulacion`) REFERENCES `SIMULACION`(`idSimulacion`) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Tabla SIMULACION_BARRIDO_VARIANTE (métricas resumen de cada variante; sin intervalos)
+CREATE TABLE `SIMULACION_BARRIDO_VARIANTE` (
+    `idVariante` INT NOT NULL AUTO_INCREMENT,
+    `idBarrido` INT NOT NULL,
+    `indice` INT NOT NULL,
+    `parametros` TEXT NOT NULL,
+    `costeTotalEnergia_eur` FLOAT NULL,
+    `ahorroTotal_eur` FLOAT NULL,
+    `ingresoTotalExportacion_eur` FLOAT NULL,
+    `paybackPeriod_anios` FLOAT NULL,
+    `roi_pct` FLOAT NULL,
+    `tasaAutoconsumoSCR_pct` FLOAT NULL,
+    `tasaAutosuficienciaSSR_pct` FLOAT NULL,
+    `energiaTotalImportada_kWh` FLOAT NULL,
+    `energiaTotalExportada_kWh` FLOAT NULL,
+    `reduccionCO2_kg` FLOAT NULL,
+    `mensajeError` TEXT NULL,
+    PRIMARY KEY (`idVariante`),
+    FOREIGN KEY (`idBarrido`) REFERENCES `SIMULACION_BARRIDO`(`idBarrido`) ON DELETE CASCADE ON UPDATE CASCADE,
+    INDEX `idx_barrido_variante_indice` (`idBarrido`, `indice`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Tabla SIMULACION_PUNTO_CONTROL (estado del motor tras el último bloque persistido, para reanudar)
+CREATE TABLE `SIMULACION_PUNTO_CONTROL` (
+    `idSimulacion` INT NOT NULL,
+    `idResultado` INT NOT NULL,
+    `huellaEntradas` CHAR(64) NOT NULL,
+    `ultimoTimestamp` DATETIME NOT NULL,
+    `intervalosCompletados` INT NOT NULL,
+    `estadoMotor` LONGBLOB NOT NULL,
+    `entradas` LONGBLOB NULL,
+    `fechaActualizacion` DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (`idSimulacion`),
+    FOREIGN KEY (`idSimulacion`) REFERENCES `SIMULACION`(`idSimulacion`) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (`idResultado`) REFERENCES `RESULTADO_SIMULACION`(`idResultado`) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Tabla SIMULACION_JOB (cola de ejecución de simulaciones y barridos para los workers)
+CREATE TABLE `SIMULACION_JOB` (
+    `idJob` INT NOT NULL AUTO_INCREMENT,
+    `idSimulacion` INT NOT NULL,
+    `idBarrido` INT NULL,
+    `estado` VARCHAR(20) NOT NULL DEFAULT 'PENDIENTE',
+    `prioridad` INT NOT NULL DEFAULT 0,
+    `cancelacionSolicitada` BOOLEAN NOT NULL DEFAULT FALSE,
+    `intentos` INT NOT NULL DEFAULT 0,
+    `worker` VARCHAR(255) NULL,
+    `mensajeError` TEXT NULL,
+    `fechaCreacion` DATETIME DEFAULT CURRENT_TIMESTAMP,
+    `fechaInicio` DATETIME NULL,
+    `fechaFin` DATETIME NULL,
+    `ultimoLatido` DATETIME NULL,
+    `progreso` TEXT NULL,
+    PRIMARY KEY (`idJob`),
+    FOREIGN KEY (`idSimulacion`) REFERENCES `SIMULACION`(`idSimulacion`) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (`idBarrido`) REFERENCES `SIMULACION_BARRIDO`(`idBarrido`) ON DELETE CASCADE ON UPDATE CASCADE,
+    INDEX `idx_simulacion_job_cola` (`estado`, `prioridad`, `idJob`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Tabla IMPORTACION_COMUNIDAD_JOB (importaciones de comunidades en segundo plano y su progreso)
+CREATE TABLE `IMPORTACION_COMUNIDAD_JOB` (
+    `idImportacion` INT NOT NULL AUTO_INCREMENT,
+    `idUsuario` INT NOT NULL,
+    `nombreArchivo` VARCHAR(255) NULL,
+    `estado` VARCHAR(20) NOT NULL DEFAULT 'PENDIENTE',
+    `idComunidadEnergetica` INT NULL,
+    `mensajeError` TEXT NULL,
+    `fechaCreacion` DATETIME DEFAULT CURRENT_TIMESTAMP,
+    `fechaInicio` DATETIME NULL,
+    `fechaFin` DATETIME NULL,
+    `fechaActualizacion` DATETIME NULL,
+    `progreso` TEXT NULL,
+    `resultado` TEXT NULL,
+    PRIMARY KEY (`idImportacion`),
+    FOREIGN KEY (`idUsuario`) REFERENCES `USUARIO`(`idUsuario`) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (`idComunidadEnergetica`) REFERENCES `COMUNIDAD_ENERGETICA`(`idComunidadEnergetica`) ON DELETE SET NULL ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Tablas AGREGADO_INTERVALO_* (resúmenes diarios y mensuales de los intervalos de cada resultado)
+CREATE TABLE `AGREGADO_INTERVALO_PARTICIPANTE` (
+    `idAgregadoParticipante` INT NOT NULL AUTO_INCREMENT,
+    `granularidad` VARCHAR(5) NOT NULL,
+    `inicioPeriodo` DATE NOT NULL,
+    `numIntervalos` INT NOT NULL,
+    `consumoTotal_kWh` FLOAT,
+    `energiaAutoconsumidaDirecta_kWh` FLOAT,
+    `energiaRecibidaRepartoConsumida_kWh` FLOAT,
+    `energiaAlmacenamiento_kWh` FLOAT,
+    `energiaAlmacenamientoDescargada_kWh` FLOAT,
+    `energiaAlmacenamientoCargada_kWh` FLOAT,
+    `energiaImportadaRed_kWh` FLOAT,
+    `energiaExportadaRed_kWh` FLOAT,
+    `costeImportacion_eur` FLOAT,
+    `ingresoExportacion_eur` FLOAT,
+    `costeBaseEstimado_eur` FLOAT,
+    `idResultadoParticipante` INT NOT NULL,
+    PRIMARY KEY (`idAgregadoParticipante`),
+    FOREIGN KEY (`idResultadoParticipante`) REFERENCES `RESULTADO_SIMULACION_PARTICIPANTE`(`idResultadoParticipante`) ON DELETE CASCADE ON UPDATE CASCADE,
+    INDEX `idx_agregado_participante_periodo` (`idResultadoParticipante`, `granularidad`, `inicioPeriodo`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE `AGREGADO_INTERVALO_ACTIVO` (
+    `idAgregadoActivo` INT NOT NULL AUTO_INCREMENT,
+    `granularidad` VARCHAR(5) NOT NULL,
+    `inicioPeriodo` DATE NOT NULL,
+    `numIntervalos` INT NOT NULL,
+    `energiaGenerada_kWh` FLOAT NULL,
+    `intervalosConProduccion` INT NULL,
+    `energiaCargada_kWh` FLOAT NULL,
+    `energiaDescargada_kWh` FLOAT NULL,
+    `SoCMedio_kWh` FLOAT NULL,
+    `SoCMin_kWh` FLOAT NULL,
+    `SoCMax_kWh` FLOAT NULL,
+    `idResultadoActivoGen` INT NULL,
+    `idResultadoActivoAlm` INT NULL,
+    PRIMARY KEY (`idAgregadoActivo`),
+    FOREIGN KEY (`idResultadoActivoGen`) REFERENCES `RESULTADO_SIMULACION_ACTIVO_GENERACION`(`idResultadoActivoGen`) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (`idResultadoActivoAlm`) REFERENCES `RESULTADO_SIMULACION_ACTIVO_ALMACENAMIENTO`(`idResultadoActivoAlm`) ON DELETE CASCADE ON UPDATE CASCADE,
+    INDEX `idx_agregado_activo_gen_periodo` (`idResultadoActivoGen`, `granularidad`, `inicioPeriodo`),
+    INDEX `idx_agregado_activo_alm_periodo` (`idResultadoActivoAlm`, `granularidad`, `inicioPeriodo`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
\ No newline at end of file
@@ -0,0 +1,133 @@
+-- ========================================
+-- Agregados diarios y mensuales de los intervalos
+-- ========================================
+-- El motor los recalcula al persistir cada resultado (granularidad 'DIA' a partir de los
+-- intervalos y 'MES' a partir de los diarios). Los endpoints .../agregados responden con la
+-- tabla más gruesa que cubre el periodo pedido. Al final se rellenan los resultados existentes.
+
+CREATE TABLE `AGREGADO_INTERVALO_PARTICIPANTE` (
+    `idAgregadoParticipante` INT NOT NULL AUTO_INCREMENT,
+    `granularidad` VARCHAR(5) NOT NULL,
+    `inicioPeriodo` DATE NOT NULL,
+    `numIntervalos` INT NOT NULL,
+    `consumoTotal_kWh` FLOAT,
+    `energiaAutoconsumidaDirecta_kWh` FLOAT,
+    `energiaRecibidaRepartoConsumida_kWh` FLOAT,
+    `energiaAlmacenamiento_kWh` FLOAT,
+    `energiaAlmacenamientoDescargada_kWh` FLOAT,
+    `energiaAlmacenamientoCargada_kWh` FLOAT,
+    `energiaImportadaRed_kWh` FLOAT,
+    `energiaExportadaRed_kWh` FLOAT,
+    `costeImportacion_eur` FLOAT,
+    `ingresoExportacion_eur` FLOAT,
+    `costeBaseEstimado_eur` FLOAT,
+    `idResultadoParticipante` INT NOT NULL,
+    PRIMARY KEY (`idAgregadoParticipante`),
+    FOREIGN KEY (`idResultadoParticipante`) REFERENCES `RESULTADO_SIMULACION_PARTICIPANTE`(`idResultadoParticipante`) ON DELETE CASCADE ON UPDATE CASCADE,
+    INDEX `idx_agregado_participante_periodo` (`idResultadoParticipante`, `granularidad`, `inicioPeriodo`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE `AGREGADO_INTERVALO_ACTIVO` (
+    `idAgregadoActivo` INT NOT NULL AUTO_INCREMENT,
+    `granularidad` VARCHAR(5) NOT NULL,
+    `inicioPeriodo` DATE NOT NULL,
+    `numIntervalos` INT NOT NULL,
+    `energiaGenerada_kWh` FLOAT NULL,
+    `intervalosConProduccion` INT NULL,
+    `energiaCargada_kWh` FLOAT NULL,
+    `energiaDescargada_kWh` FLOAT NULL,
+    `SoCMedio_kWh` FLOAT NULL,
+    `SoCMin_kWh` FLOAT NULL,
+    `SoCMax_kWh` FLOAT NULL,
+    `idResultadoActivoGen` INT NULL,
+    `idResultadoActivoAlm` INT NULL,
+    PRIMARY KEY (`idAgregadoActivo`),
+    FOREIGN KEY (`idResultadoActivoGen`) REFERENCES `RESULTADO_SIMULACION_ACTIVO_GENERACION`(`idResultadoActivoGen`) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (`idResultadoActivoAlm`) REFERENCES `RESULTADO_SIMULACION_ACTIVO_ALMACENAMIENTO`(`idResultadoActivoAlm`) ON DELETE CASCADE ON UPDATE CASCADE,
+    INDEX `idx_agregado_activo_gen_periodo` (`idResultadoActivoGen`, `granularidad`, `inicioPeriodo`),
+    INDEX `idx_agregado_activo_alm_periodo` (`idResultadoActivoAlm`, `granularidad`, `inicioPeriodo`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT INTO `AGREGADO_INTERVALO_PARTICIPANTE` (
+    `idResultadoParticipante`, `granularidad`, `inicioPeriodo`, `numIntervalos`,
+    `consumoTotal_kWh`, `energiaAutoconsumidaDirecta_kWh`, `energiaRecibidaRepartoConsumida_kWh`,
+    `energiaAlmacenamiento_kWh`, `energiaAlmacenamientoDescargada_kWh`, `energiaAlmacenamientoCargada_kWh`,
+    `energiaImportadaRed_kWh`, `energiaExportadaRed_kWh`,
+    `costeImportacion_eur`, `ingresoExportacion_eur`, `costeBaseEstimado_eur`
+)
+SELECT
+    i.`idResultadoParticipante`, 'DIA', DATE(i.`timestamp`), COUNT(*),
+    SUM(i.consumo), SUM(i.autoconsumo), SUM(i.reparto),
+    SUM(i.almacenamiento),
+    SUM(CASE WHEN i.almacenamiento < 0 THEN i.almacenamiento ELSE 0 END),
+    SUM(CASE WHEN i.almacenamiento > 0 THEN i.almacenamiento ELSE 0 END),
+    SUM(i.importada), SUM(i.excedente),
+    SUM(i.importada * i.precioImportacion), SUM(i.excedente * i.precioExportacion), SUM(i.consumo * i.precioImportacion)
+FROM (
+    SELECT
+        `idResultadoParticipante`, `timestamp`,
+        COALESCE(`consumoReal_kWh`, 0) AS consumo,
+        COALESCE(`autoconsumo_kWh`, 0) AS autoconsumo,
+        COALESCE(`energiaRecibidaReparto_kWh`, 0) AS reparto,
+        COALESCE(`energiaAlmacenamiento_kWh`, 0) AS almacenamiento,
+        COALESCE(`excedenteVertidoCompensado_kWh`, 0) AS excedente,
+        CASE WHEN COALESCE(`energiaDiferencia_kWh`, 0) < 0
+             THEN ABS(COALESCE(`energiaDiferencia_kWh`, 0) - COALESCE(`energiaAlmacenamiento_kWh`, 0))
+             ELSE 0 END AS importada,
+        COALESCE(`precioImportacionIntervalo`, 0) AS precioImportacion,
+        COALESCE(`precioExportacionIntervalo`, 0) AS precioExportacion
+    FROM `DATOS_INTERVALO_PARTICIPANTE`
+) i
+GROUP BY i.`idResultadoParticipante`, DATE(i.`timestamp`);
+
+INSERT INTO `AGREGADO_INTERVALO_PARTICIPANTE` (
+    `idResultadoParticipante`, `granularidad`, `inicioPeriodo`, `numIntervalos`,
+    `consumoTotal_kWh`, `energiaAutoconsumidaDirecta_kWh`, `energiaRecibidaRepartoConsumida_kWh`,
+    `energiaAlmacenamiento_kWh`, `energiaAlmacenamientoDescargada_kWh`, `energiaAlmacenamientoCargada_kWh`,
+    `energiaImportadaRed_kWh`, `energiaExportadaRed_kWh`,
+    `costeImportacion_eur`, `ingresoExportacion_eur`, `costeBaseEstimado_eur`
+)
+SELECT
+    `idResultadoParticipante`, 'MES', DATE_FORMAT(`inicioPeriodo`, '%Y-%m-01'), SUM(`numIntervalos`),
+    SUM(`consumoTotal_kWh`), SUM(`energiaAutoconsumidaDirecta_kWh`), SUM(`energiaRecibidaRepartoConsumida_kWh`),
+    SUM(`energiaAlmacenamiento_kWh`), SUM(`energiaAlmacenamientoDescargada_kWh`), SUM(`energiaAlmacenamientoCargada_kWh`),
+    SUM(`energiaImportadaRed_kWh`), SUM(`energiaExportadaRed_kWh`),
+    SUM(`costeImportacion_eur`), SUM(`ingresoExportacion_eur`), SUM(`costeBaseEstimado_eur`)
+FROM `AGREGADO_INTERVALO_PARTICIPANTE`
+WHERE `granularidad` = 'DIA'
+GROUP BY `idResultadoParticipante`, DATE_FORMAT(`inicioPeriodo`, '%Y-%m-01');
+
+INSERT INTO `AGREGADO_INTERVALO_ACTIVO` (
+    `idResultadoActivoGen`, `granularidad`, `inicioPeriodo`, `numIntervalos`, `energiaGenerada_kWh`, `intervalosConProduccion`
+)
+SELECT
+    `idResultadoActivoGen`, 'DIA', DATE(`timestamp`), COUNT(*),
+    SUM(COALESCE(`energiaGenerada_kWh`, 0)), SUM(CASE WHEN COALESCE(`energiaGenerada_kWh`, 0) > 0 THEN 1 ELSE 0 END)
+FROM `DATOS_INTERVALO_ACTIVO`
+WHERE `idResultadoActivoGen` IS NOT NULL
+GROUP BY `idResultadoActivoGen`, DATE(`timestamp`);
+
+INSERT INTO `AGREGADO_INTERVALO_ACTIVO` (
+    `idResultadoActivoAlm`, `granularidad`, `inicioPeriodo`, `numIntervalos`,
+    `energiaCargada_kWh`, `energiaDescargada_kWh`, `SoCMedio_kWh`, `SoCMin_kWh`, `SoCMax_kWh`
+)
+SELECT
+    `idResultadoActivoAlm`, 'DIA', DATE(`timestamp`), COUNT(*),
+    SUM(COALESCE(`energiaCargada_kWh`, 0)), SUM(COALESCE(`energiaDescargada_kWh`, 0)),
+    AVG(`SoC_kWh`), MIN(`SoC_kWh`), MAX(`SoC_kWh`)
+FROM `DATOS_INTERVALO_ACTIVO`
+WHERE `idResultadoActivoAlm` IS NOT NULL
+GROUP BY `idResultadoActivoAlm`, DATE(`timestamp`);
+
+INSERT INTO `AGREGADO_INTERVALO_ACTIVO` (
+    `idResultadoActivoGen`, `idResultadoActivoAlm`, `granularidad`, `inicioPeriodo`, `numIntervalos`,
+    `energiaGenerada_kWh`, `intervalosConProduccion`, `energiaCargada_kWh`, `energiaDescargada_kWh`,
+    `SoCMedio_kWh`, `SoCMin_kWh`, `SoCMax_kWh`
+)
+SELECT
+    `idResultadoActivoGen`, `idResultadoActivoAlm`, 'MES', DATE_FORMAT(`inicioPeriodo`, '%Y-%m-01'), SUM(`numIntervalos`),
+    SUM(`energiaGenerada_kWh`), SUM(`intervalosConProduccion`), SUM(`energiaCargada_kWh`), SUM(`energiaDescargada_kWh`),
+    SUM(`SoCMedio_kWh` * `numIntervalos`) / SUM(`numIntervalos`), MIN(`SoCMin_kWh`), MAX(`SoCMax_kWh`)
+FROM `AGREGADO_INTERVALO_ACTIVO`
+WHERE `granularidad` = 'DIA'
+GROUP BY `idResultadoActivoGen`, `idResultadoActivoAlm`, DATE_FORMAT(`inicioPeriodo`, '%Y-%m-01');
@@ -0,0 +1,8 @@
+-- ========================================
+-- Paginación de intervalos por activo
+-- ========================================
+-- Los endpoints /paginado recorren los intervalos de un resultado en orden (timestamp, id):
+-- con estos índices cada página es un rango del índice en lugar de un recorrido de la tabla.
+
+CREATE INDEX `idx_intervalo_activo_gen` ON `DATOS_INTERVALO_ACTIVO` (`idResultadoActivoGen`, `timestamp`);
+CREATE INDEX `idx_intervalo_activo_alm` ON `DATOS_INTERVALO_ACTIVO` (`idResultadoActivoAlm`, `timestamp`);
@@ -0,0 +1,25 @@
+-- ========================================
+-- Importaciones de comunidades en segundo plano
+-- ========================================
+-- POST /comunidades/importaciones guarda el ZIP, registra la importación y la ejecuta en
+-- un hilo de la API; el estado, el progreso y las estadísticas finales se consultan en
+-- GET /comunidades/importaciones/{id}. Una importación en curso cuya fechaActualizacion
+-- queda atrás (reinicio de la API) se marca como fallida al arrancar.
+
+CREATE TABLE `IMPORTACION_COMUNIDAD_JOB` (
+    `idImportacion` INT NOT NULL AUTO_INCREMENT,
+    `idUsuario` INT NOT NULL,
+    `nombreArchivo` VARCHAR(255) NULL,
+    `estado` VARCHAR(20) NOT NULL DEFAULT 'PENDIENTE',
+    `idComunidadEnergetica` INT NULL,
+    `mensajeError` TEXT NULL,
+    `fechaCreacion` DATETIME DEFAULT CURRENT_TIMESTAMP,
+    `fechaInicio` DATETIME NULL,
+    `fechaFin` DATETIME NULL,
+    `fechaActualizacion` DATETIME NULL,
+    `progreso` TEXT NULL,
+    `resultado` TEXT NULL,
+    PRIMARY KEY (`idImportacion`),
+    FOREIGN KEY (`idUsuario`) REFERENCES `USUARIO`(`idUsuario`) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (`idComunidadEnergetica`) REFERENCES `COMUNIDAD_ENERGETICA`(`idComunidadEnergetica`) ON DELETE SET NULL ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,18 @@
+-- ========================================
+-- Registro de consumo único por participante e instante
+-- ========================================
+-- Las importaciones hacen upsert (INSERT ... ON DUPLICATE KEY UPDATE) sobre esta clave, así
+-- que reimportar datos solapados actualiza el consumo en lugar de duplicar filas.
+-- Antes de crear la clave se eliminan los duplicados existentes conservando el último
+-- registro insertado de cada participante e instante.
+
+DELETE r_antiguo FROM `REGISTRO_CONSUMO` r_antiguo
+JOIN `REGISTRO_CONSUMO` r_nuevo
+    ON r_nuevo.`idParticipante` = r_antiguo.`idParticipante`
+    AND r_nuevo.`timestamp` = r_antiguo.`timestamp`
+    AND r_nuevo.`idRegistroConsumo` > r_antiguo.`idRegistroConsumo`;
+
+-- La clave única sustituye al índice (idParticipante, timestamp)
+ALTER TABLE `REGISTRO_CONSUMO`
+    ADD UNIQUE KEY `uq_registro_consumo_participante_ts` (`idParticipante`, `timestamp`),
+    DROP INDEX `idx_registro_consumo_participante_ts`;
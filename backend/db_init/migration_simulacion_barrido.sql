@@ -0,0 +1,45 @@
+-- ========================================
+-- Barridos de escenarios (SIMULACION_BARRIDO / SIMULACION_BARRIDO_VARIANTE)
+-- ========================================
+-- Un barrido evalúa muchas variantes de una simulación base en un único trabajo
+-- de SIMULACION_JOB (idBarrido informado) y guarda solo las métricas de cada variante.
+
+-- Tabla SIMULACION_BARRIDO (barridos de escenarios sobre una simulación base)
+CREATE TABLE `SIMULACION_BARRIDO` (
+    `idBarrido` INT NOT NULL AUTO_INCREMENT,
+    `idSimulacion` INT NOT NULL,
+    `nombre` VARCHAR(255) NULL,
+    `parametros` TEXT NOT NULL,
+    `estado` VARCHAR(20) NOT NULL DEFAULT 'PENDIENTE',
+    `numVariantes` INT NOT NULL DEFAULT 0,
+    `mensajeError` TEXT NULL,
+    `fechaCreacion` DATETIME DEFAULT CURRENT_TIMESTAMP,
+    `fechaFin` DATETIME NULL,
+    PRIMARY KEY (`idBarrido`),
+    FOREIGN KEY (`idSimulacion`) REFERENCES `SIMULACION`(`idSimulacion`) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Tabla SIMULACION_BARRIDO_VARIANTE (métricas resumen de cada variante; sin intervalos)
+CREATE TABLE `SIMULACION_BARRIDO_VARIANTE` (
+    `idVariante` INT NOT NULL AUTO_INCREMENT,
+    `idBarrido` INT NOT NULL,
+    `indice` INT NOT NULL,
+    `parametros` TEXT NOT NULL,
+    `costeTotalEnergia_eur` FLOAT NULL,
+    `ahorroTotal_eur` FLOAT NULL,
+    `ingresoTotalExportacion_eur` FLOAT NULL,
+    `paybackPeriod_anios` FLOAT NULL,
+    `roi_pct` FLOAT NULL,
+    `tasaAutoconsumoSCR_pct` FLOAT NULL,
+    `tasaAutosuficienciaSSR_pct` FLOAT NULL,
+    `energiaTotalImportada_kWh` FLOAT NULL,
+    `energiaTotalExportada_kWh` FLOAT NULL,
+    `reduccionCO2_kg` FLOAT NULL,
+    `mensajeError` TEXT NULL,
+    PRIMARY KEY (`idVariante`),
+    FOREIGN KEY (`idBarrido`) REFERENCES `SIMULACION_BARRIDO`(`idBarrido`) ON DELETE CASCADE ON UPDATE CASCADE,
+    INDEX `idx_barrido_variante_indice` (`idBarrido`, `indice`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+ALTER TABLE `SIMULACION_JOB` ADD COLUMN `idBarrido` INT NULL AFTER `idSimulacion`;
+ALTER TABLE `SIMULACION_JOB` ADD FOREIGN KEY (`idBarrido`) REFERENCES `SIMULACION_BARRIDO`(`idBarrido`) ON DELETE CASCADE ON UPDATE CASCADE;
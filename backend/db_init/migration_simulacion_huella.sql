@@ -0,0 +1,9 @@
+-- ========================================
+-- Huella de las entradas de la simulación
+-- ========================================
+-- SHA-256 de todas las entradas del motor (configuración, comunidad, activos, contratos,
+-- coeficientes y resumen de consumos y precios PVPC de la ventana). Solo se rellena al
+-- completar la simulación; una simulación con la misma huella reutiliza sus resultados.
+
+ALTER TABLE `SIMULACION` ADD COLUMN `huellaEntradas` CHAR(64) NULL AFTER `idComunidadEnergetica`;
+CREATE INDEX `idx_simulacion_huella` ON `SIMULACION` (`huellaEntradas`, `estado`);
@@ -0,0 +1,23 @@
+-- ========================================
+-- Cola de trabajos de simulación (SIMULACION_JOB)
+-- ========================================
+-- Los workers reclaman trabajos con SELECT ... FOR UPDATE SKIP LOCKED
+-- (MariaDB >= 10.6), ordenados por prioridad descendente y orden de llegada.
+
+CREATE TABLE `SIMULACION_JOB` (
+    `idJob` INT NOT NULL AUTO_INCREMENT,
+    `idSimulacion` INT NOT NULL,
+    `estado` VARCHAR(20) NOT NULL DEFAULT 'PENDIENTE',
+    `prioridad` INT NOT NULL DEFAULT 0,
+    `cancelacionSolicitada` BOOLEAN NOT NULL DEFAULT FALSE,
+    `intentos` INT NOT NULL DEFAULT 0,
+    `worker` VARCHAR(255) NULL,
+    `mensajeError` TEXT NULL,
+    `fechaCreacion` DATETIME DEFAULT CURRENT_TIMESTAMP,
+    `fechaInicio` DATETIME NULL,
+    `fechaFin` DATETIME NULL,
+    `ultimoLatido` DATETIME NULL,
+    PRIMARY KEY (`idJob`),
+    FOREIGN KEY (`idSimulacion`) REFERENCES `SIMULACION`(`idSimulacion`) ON DELETE CASCADE ON UPDATE CASCADE,
+    INDEX `idx_simulacion_job_cola` (`estado`, `prioridad`, `idJob`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,7 @@
+-- ========================================
+-- Progreso de la ejecución en SIMULACION_JOB
+-- ========================================
+-- Último progreso publicado por el worker (JSON con fase, intervalos, filas y ETA),
+-- expuesto por GET /simulaciones/{id}/progreso como Server-Sent Events.
+
+ALTER TABLE `SIMULACION_JOB` ADD COLUMN `progreso` TEXT NULL AFTER `ultimoLatido`;
@@ -0,0 +1,22 @@
+-- ========================================
+-- Puntos de control de la simulación
+-- ========================================
+-- Tras persistir cada bloque mensual de intervalos el motor guarda su estado (agregados,
+-- SoC de las baterías, último instante persistido) y, una vez, las entradas ya descargadas.
+-- Al volver a ejecutar una simulación fallida con la misma huella de entradas se reanuda
+-- desde el último punto de control. Requiere migration_simulacion_huella.sql.
+
+-- Tabla SIMULACION_PUNTO_CONTROL (estado del motor tras el último bloque persistido, para reanudar)
+CREATE TABLE `SIMULACION_PUNTO_CONTROL` (
+    `idSimulacion` INT NOT NULL,
+    `idResultado` INT NOT NULL,
+    `huellaEntradas` CHAR(64) NOT NULL,
+    `ultimoTimestamp` DATETIME NOT NULL,
+    `intervalosCompletados` INT NOT NULL,
+    `estadoMotor` LONGBLOB NOT NULL,
+    `entradas` LONGBLOB NULL,
+    `fechaActualizacion` DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (`idSimulacion`),
+    FOREIGN KEY (`idSimulacion`) REFERENCES `SIMULACION`(`idSimulacion`) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (`idResultado`) REFERENCES `RESULTADO_SIMULACION`(`idResultado`) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
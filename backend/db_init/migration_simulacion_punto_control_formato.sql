@@ -0,0 +1,10 @@
+-- ========================================
+-- Formato versionado de los puntos de control
+-- ========================================
+-- estadoMotor y entradas pasan de pickle a JSON versionado comprimido con zlib. Los puntos
+-- de control finales se conservan para ampliar la simulación: los guardados con el formato
+-- anterior se eliminan aquí en lugar de quedarse en la tabla hasta la próxima ejecución.
+-- Una simulación sin punto de control se vuelve a simular entera al reanudarla o ampliarla.
+-- Requiere migration_simulacion_punto_control.sql.
+
+DELETE FROM `SIMULACION_PUNTO_CONTROL`;